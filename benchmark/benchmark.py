@@ -0,0 +1,21 @@
+from time import perf_counter
+from typing import Callable
+
+
+def measure(function: Callable, repeat: int = 3) -> float:
+    """
+    :param function: the function to measure
+    :param repeat: how many times the function is executed
+    :returns: the best execution time, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def print_throughput(name: str, count: int, seconds: float, unit: str):
+    print(f"{name:40} {count / seconds:14,.0f} {unit}/s  ({seconds:.3f}s)")
@@ -0,0 +1,63 @@
+"""
+Benchmark of the peak memory of the JSON report, built as a whole by json.dumps() or written incrementally by
+ApkJsonWriter (as JSON and as JSON Lines), for dex files with more and more strings.
+
+Usage: python3 -m benchmark.json_report [APK_FILE]
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from typing import Callable
+
+from ninjadroid.parsers.apk import APK, ApkParser
+from ninjadroid.parsers.dex import Dex
+from ninjadroid.use_cases.apk_json_writer import ApkJsonWriter
+
+EXAMPLE_APK = os.path.join(os.path.dirname(__file__), "..", "regression", "data", "Example.apk")
+
+
+class NullStream:  # pylint: disable=too-few-public-methods
+    """
+    Text stream discarding whatever is written, so that only the serialization itself is measured.
+    """
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def measure_peak_memory(function: Callable) -> int:
+    """
+    :param function: the function to measure
+    :returns: the peak memory allocated by the function, in bytes
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def print_peak_memory(apk: APK, count: int):
+    dumps = measure_peak_memory(
+        lambda: NullStream().write(json.dumps(apk.as_dict(), sort_keys=True, ensure_ascii=False, indent=4))
+    )
+    write_json = measure_peak_memory(lambda: ApkJsonWriter.write_json(apk, NullStream()))
+    write_json_lines = measure_peak_memory(lambda: ApkJsonWriter.write_json_lines(apk, NullStream()))
+    print(f"{count:>10} {dumps / 1024:>14,.0f}KiB {write_json / 1024:>14,.0f}KiB {write_json_lines / 1024:>18,.0f}KiB")
+
+
+def main():
+    # NOTE: the dex files of the APK package are replaced by a single one, with more and more strings.
+    apk = ApkParser().parse(sys.argv[1] if len(sys.argv) > 1 else EXAMPLE_APK, in_memory=True).as_dict()
+    print(f"{'strings':>10} {'json.dumps()':>17} {'write_json()':>17} {'write_json_lines()':>21}")
+    for count in (10000, 100000, 1000000):
+        strings = [f"Lcom/example/app/Class{index};->method{index}()V" for index in range(count)]
+        dex = Dex("classes.dex", 0, "", "", "", "", strings, [], [], [])
+        print_peak_memory(APK.from_dict({**apk, "dex": [dex.as_dict()]}), count)
+
+
+if __name__ == "__main__":
+    main()
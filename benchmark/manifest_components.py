@@ -0,0 +1,52 @@
+"""
+Benchmark of the AndroidManifest.xml parsing with all its components (i.e. extended processing), on a synthetic text
+manifest with thousands of activities, services and receivers, each one with meta-data and an intent filter.
+
+Usage: python3 -m benchmark.manifest_components [COMPONENTS]
+"""
+
+import sys
+
+from benchmark.benchmark import measure, print_throughput
+from ninjadroid.parsers.manifest import AndroidManifestParser
+
+
+def generate_manifest(count: int) -> bytes:
+    """
+    Generate a text AndroidManifest.xml with the given number of components, evenly split among activities, services
+    and receivers.
+    """
+    components = []
+    for index in range(count):
+        tag = ("activity", "service", "receiver")[index % 3]
+        components.append(
+            f"<{tag} android:name=\"com.example.app.Component{index}\" android:exported=\"false\">"
+            f"<meta-data android:name=\"com.example.app.KEY{index}\" android:value=\"value{index}\"/>"
+            f"<intent-filter android:priority=\"{index}\">"
+            f"<action android:name=\"com.example.app.action.ACTION{index}\"/>"
+            f"<category android:name=\"android.intent.category.DEFAULT\"/>"
+            f"<data android:scheme=\"example{index}\"/>"
+            f"</intent-filter>"
+            f"</{tag}>"
+        )
+    return (
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+        "<manifest xmlns:android=\"http://schemas.android.com/apk/res/android\" package=\"com.example.app\" "
+        "android:versionCode=\"1\" android:versionName=\"1.0\">"
+        "<uses-sdk android:minSdkVersion=\"21\" android:targetSdkVersion=\"33\"/>"
+        "<uses-permission android:name=\"android.permission.INTERNET\"/>"
+        f"<application>{''.join(components)}</application>"
+        "</manifest>"
+    ).encode("utf-8")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    raw = generate_manifest(count)
+    parser = AndroidManifestParser(hash_algorithms=())
+    seconds = measure(lambda: parser.parse_bytes(raw, binary=False, extended_processing=True))
+    print_throughput(f"parse_bytes() ({count} components)", count, seconds, "components")
+
+
+if __name__ == "__main__":
+    main()
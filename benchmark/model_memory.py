@@ -0,0 +1,53 @@
+"""
+Benchmark of the memory taken by the result models (e.g. one File per other file of an APK package), not counting
+their field values (e.g. file names and digests), which are shared by all the measured instances.
+
+Usage: python3 -m benchmark.model_memory
+"""
+
+import tracemalloc
+from typing import Callable
+
+from ninjadroid.parsers.apk import ApkEntry
+from ninjadroid.parsers.cert import CertParticipant
+from ninjadroid.parsers.dex import Dex
+from ninjadroid.parsers.file import File
+from ninjadroid.parsers.manifest import AppActivity
+
+
+COUNT = 100000
+
+
+def measure_bytes_per_instance(create: Callable, count: int = COUNT) -> float:
+    """
+    :param create: the function creating one model instance
+    :param count: how many instances are created
+    :returns: the memory allocated per instance, in bytes
+    """
+    tracemalloc.start()
+    try:
+        instances = [create() for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instances
+    return allocated / count
+
+
+def main():
+    filename = "res/drawable/any-file.png"
+    digest = "0" * 64
+    strings = []
+    models = {
+        "File": lambda: File(filename, 1024, digest, digest, digest, digest),
+        "ApkEntry": lambda: ApkEntry(filename, 1024, "01234567"),
+        "Dex": lambda: Dex("classes.dex", 1024, digest, digest, digest, digest, strings, strings, strings, strings),
+        "CertParticipant": lambda: CertParticipant("name", "", "unit", "org", "city", "state", "country", ""),
+        "AppActivity": lambda: AppActivity("com.example.app.MainActivity"),
+    }
+    for name, create in models.items():
+        print(f"{name:40} {measure_bytes_per_instance(create):14,.0f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
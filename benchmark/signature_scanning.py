@@ -0,0 +1,60 @@
+"""
+Benchmark of the signature extraction from the strings of a dex file, searching the strings one by one or all at once
+with Signature.search_all().
+
+Usage: python3 -m benchmark.signature_scanning [DEX_FILE]
+"""
+
+import sys
+from typing import List, Optional
+
+from benchmark.benchmark import measure, print_throughput
+from benchmark.uri_signature import generate_strings
+from ninjadroid.parsers.dex import DexParser
+from ninjadroid.signatures.shell_signature import ShellSignature
+from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.uri_signature import UriSignature
+
+
+def search_one_by_one(signature: Signature, strings: List[str], min_string_len: Optional[int]) -> List[str]:
+    """
+    The signature extraction searching each string on its own, as DexParser.parse_signatures() used to do.
+    """
+    signatures = []
+    for string in strings:
+        if min_string_len is None or len(string) > min_string_len:
+            match, is_valid = signature.search(string)
+            if is_valid and match is not None and match != "":
+                signatures.append(match)
+    return sorted(signatures)
+
+
+def print_search_throughput(signature: Signature, strings: List[str], min_string_len: Optional[int]):
+    name = type(signature).__name__
+    expected = search_one_by_one(signature, strings, min_string_len)
+    if DexParser.parse_signatures(signature, strings, min_string_len) != expected:
+        sys.exit(f"{name}.search_all() changed the extracted signatures!")
+    print_throughput(
+        f"{name} (one by one)",
+        len(strings),
+        measure(lambda: search_one_by_one(signature, strings, min_string_len)),
+        "strings"
+    )
+    print_throughput(
+        f"{name} (search_all)",
+        len(strings),
+        measure(lambda: DexParser.parse_signatures(signature, strings, min_string_len)),
+        "strings"
+    )
+
+
+def main():
+    strings = DexParser.parse_strings(sys.argv[1]) if len(sys.argv) > 1 else sorted(generate_strings(200000))
+    print(f"{len(strings)} strings")
+    print_search_throughput(UriSignature(), strings, 6)
+    print_search_throughput(ShellSignature(), strings, None)
+    print_search_throughput(Signature(), strings, None)
+
+
+if __name__ == "__main__":
+    main()
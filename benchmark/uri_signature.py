@@ -0,0 +1,65 @@
+"""
+Benchmark of the URI extraction from dex strings, with and without the UriSignature prefilter.
+
+Usage: python3 -m benchmark.uri_signature [DEX_FILE]
+"""
+
+import random
+import sys
+from typing import List
+
+from benchmark.benchmark import measure, print_throughput
+from ninjadroid.parsers.dex import DexParser
+from ninjadroid.signatures.uri_signature import UriSignature
+
+
+def generate_strings(count: int) -> List[str]:
+    """
+    Generate dex-like strings: type descriptors, member names, dotted class names, messages and a few URIs.
+    """
+    rand = random.Random(0)
+    words = ["android", "app", "content", "example", "util", "view", "widget", "service", "manager", "activity",
+             "receiver", "intent", "bundle", "string", "list", "map", "value", "config", "helper", "impl"]
+    uris = ["http://www.example.com/path/to/page.php?a=1", "https://api.example.org/v1/", "www.example.net",
+            "127.0.0.1:8080", "ftp://files.example.co.uk"]
+
+    def name(length: int, separator: str) -> str:
+        return separator.join(rand.choice(words) for _ in range(length))
+
+    generators = [
+        lambda: "L" + name(rand.randint(2, 5), "/") + ";",
+        lambda: name(1, "") + name(1, "").capitalize(),
+        lambda: name(rand.randint(2, 5), "."),
+        lambda: " ".join(name(1, "") for _ in range(rand.randint(3, 12))) + ".",
+        lambda: rand.choice(uris),
+    ]
+    weights = [40, 30, 15, 14, 1]
+    return [rand.choices(generators, weights)[0]() for _ in range(count)]
+
+
+def main():
+    strings = DexParser.parse_strings(sys.argv[1]) if len(sys.argv) > 1 else generate_strings(20000)
+
+    signature = UriSignature()
+    urls_with_prefilter = DexParser.parse_signatures(signature=signature, strings=strings, min_string_len=6)
+    seconds_with_prefilter = measure(
+        lambda: DexParser.parse_signatures(signature=signature, strings=strings, min_string_len=6)
+    )
+
+    prefilter = UriSignature.PREFILTER
+    UriSignature.PREFILTER = None
+    urls_without_prefilter = DexParser.parse_signatures(signature=signature, strings=strings, min_string_len=6)
+    seconds_without_prefilter = measure(
+        lambda: DexParser.parse_signatures(signature=signature, strings=strings, min_string_len=6)
+    )
+    UriSignature.PREFILTER = prefilter
+
+    if urls_with_prefilter != urls_without_prefilter:
+        sys.exit("The prefilter changed the extracted URIs!")
+    print(f"{len(strings)} strings, {len(urls_with_prefilter)} URIs")
+    print_throughput("UriSignature (regex only)", len(strings), seconds_without_prefilter, "strings")
+    print_throughput("UriSignature (prefilter + regex)", len(strings), seconds_with_prefilter, "strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,22 @@ Ninja Reverse Engineering of Android APK packages.
 :copyright: GNU General Public License v3.0 (https://www.gnu.org/licenses/gpl.html).
 """
 
-from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from argparse import ArgumentParser, ArgumentTypeError, Namespace, RawTextHelpFormatter
 import logging
 import os
 import re
 import sys
 from typing import Optional
 
+from ninjadroid.use_cases.analyse_apk_batch import AnalyseApkBatch
 from ninjadroid.use_cases.extract_certificate_file import ExtractCertificateFile
 from ninjadroid.use_cases.extract_dex_file import ExtractDexFile
 from ninjadroid.use_cases.generate_apk_info_report import GenerateApkInfoReport
 from ninjadroid.use_cases.launch_apk_tool import LaunchApkTool
 from ninjadroid.use_cases.launch_dex2jar import LaunchDex2Jar
 from ninjadroid.use_cases.print_apk_info import PrintApkInfo
-from ninjadroid.parsers.file import FileParsingError
+from ninjadroid.parsers.cache import ResultCache
+from ninjadroid.parsers.file import FileParsingError, HashProfile
 from ninjadroid.parsers.apk import APK, ApkParser, ApkParsingError
 
 
@@ -39,23 +41,69 @@ def main():
     if args.verbose:
         logger.setLevel(logging.DEBUG)
 
-    apk = read_file(args.target, args.extended_processing)
+    cache = None if args.no_cache else ResultCache(ResultCache.get_default_directory(), VERSION)
+    if args.batch:
+        return read_batch(args, cache)
+
+    apk = read_file(
+        args.target,
+        args.extended_processing,
+        args.in_memory,
+        args.hash_profile,
+        args.threads,
+        cache,
+        args.fast
+    )
     if apk is None:
         return 1
 
     filename = get_filename_without_extension(args.target)
     if args.output_directory is None:
-        PrintApkInfo().execute(apk, as_json=args.json)
+        PrintApkInfo().execute(apk, as_json=args.json, as_json_lines=args.json_lines)
     else:
         output_directory = setup_output_directory(args.output_directory, filename)
-        LaunchApkTool(logger).execute(args.target, output_directory)
-        LaunchDex2Jar(logger).execute(args.target, filename, output_directory)
-        ExtractCertificateFile(logger).execute(apk, output_directory)
-        ExtractDexFile(logger).execute(apk, output_directory)
-        GenerateApkInfoReport(logger).execute(apk, filename, output_directory)
+        extract(args.target, apk, filename, output_directory, args.json_lines)
     return 0
 
 
+def read_batch(args: Namespace, cache: Optional[ResultCache] = None) -> int:
+    failures = 0
+    batch = AnalyseApkBatch(logger, args.hash_profile, args.threads, cache)
+    filepaths = AnalyseApkBatch.list_apk_files(args.target)
+    results = batch.execute(
+        filepaths,
+        args.extended_processing,
+        args.in_memory,
+        args.jobs,
+        not args.unordered,
+        args.fast
+    )
+    try:
+        for result in results:
+            if result.apk is None:
+                failures += 1
+            if args.output_directory is None or result.apk is None:
+                result.write(sys.stdout, args.json_lines)
+                sys.stdout.flush()
+            else:
+                filename = get_filename_without_extension(result.filepath)
+                output_directory = setup_output_directory(os.path.join(args.output_directory, filename), filename)
+                extract(result.filepath, result.apk, filename, output_directory, args.json_lines)
+    except FileParsingError:
+        # NOTE: the APK paths are listed lazily, hence a missing or unreadable target shows up only while reading them.
+        logger.error("The target file ('%s') must be an existing, readable file!", args.target)
+        return 1
+    return 1 if failures > 0 else 0
+
+
+def extract(filepath: str, apk: APK, filename: str, output_directory: str, as_json_lines: bool = False):
+    LaunchApkTool(logger).execute(filepath, output_directory)
+    LaunchDex2Jar(logger).execute(filepath, filename, output_directory)
+    ExtractCertificateFile(logger).execute(apk, output_directory)
+    ExtractDexFile(logger).execute(apk, output_directory)
+    GenerateApkInfoReport(logger).execute(apk, filename, output_directory, as_json_lines)
+
+
 def get_args() -> Namespace:
     parser = ArgumentParser(
         description="examples: \n"
@@ -63,14 +111,17 @@ def get_args() -> Namespace:
                     "  >> %(prog)s /path/to/file.apk --all\n"
                     "  >> %(prog)s /path/to/file.apk --all --json\n"
                     "  >> %(prog)s /path/to/file.apk --all --extract\n"
-                    "  >> %(prog)s /path/to/file.apk --all --extract /path/to/output/directory/\n",
+                    "  >> %(prog)s /path/to/file.apk --all --extract /path/to/output/directory/\n"
+                    "  >> %(prog)s /path/to/directory/ --batch --all\n"
+                    "  >> %(prog)s '/path/to/directory/*.apk' --batch --jobs 8 --unordered\n"
+                    "  >> find /path/to/directory/ -name '*.apk' | %(prog)s - --batch\n",
         formatter_class=RawTextHelpFormatter
     )
     parser.add_argument(
         "target",
         metavar="TARGET_FILE",
         type=str,
-        help="the APK package to analyse"
+        help="the APK package to analyse (or the APK packages, see -b / --batch)"
     )
     parser.add_argument(
         "-a",
@@ -79,6 +130,15 @@ def get_args() -> Namespace:
         dest="extended_processing",
         help="retrieve and show all the information, only a summary otherwise"
     )
+    parser.add_argument(
+        "-f",
+        "--fast",
+        action="store_true",
+        dest="fast",
+        help="retrieve and show only a fast summary, reading just the zip central directory, the manifest and the\n"
+             "cert (i.e. no digests and no app name, the dex and other files listed by name, size and CRC32)\n"
+             "NOTE: this cannot be combined with the -a / --all and -e / --extract options"
+    )
     parser.add_argument(
         "-j",
         "--json",
@@ -86,6 +146,14 @@ def get_args() -> Namespace:
         dest="json",
         help="show the output in JSON format"
     )
+    parser.add_argument(
+        "--json-lines",
+        action="store_true",
+        dest="json_lines",
+        help="show the output in JSON Lines format, with one compact record per line (i.e. the APK package itself\n"
+             "and then each one of its entries), written incrementally also for huge dex files\n"
+             "NOTE: with the -e / --extract option, the report file is in this format too (i.e. report-*.jsonl)"
+    )
     parser.add_argument(
         "-e",
         "--extract",
@@ -97,6 +165,63 @@ def get_args() -> Namespace:
         help="extract and store all the APK entries and information retrieved into a given folder (default: './')\n"
              "NOTE: this will automatically force the -j / --json option"
     )
+    parser.add_argument(
+        "--hashes",
+        type=get_hash_profile,
+        default=HashProfile(),
+        action="store",
+        dest="hash_profile",
+        metavar="PROFILE",
+        help="select the digests to compute for each category of file (i.e. apk, dex, cert, manifest and other)\n"
+             "e.g. 'sha256' or 'sha256,apk=md5+sha256' or 'sha256,other=none' (default: all the digests)"
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        dest="in_memory",
+        help="read the APK entries in memory, without extracting them to a temporary directory"
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        action="store_true",
+        dest="batch",
+        help="analyse many APK packages in the same process and show one JSON line per APK, where TARGET_FILE is\n"
+             "either a directory, a glob pattern, a file listing one APK path per line or '-' to read it from stdin\n"
+             "NOTE: with the -e / --extract option, each APK is extracted into its own sub-folder of the given folder"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=get_jobs,
+        default=1,
+        action="store",
+        dest="jobs",
+        metavar="N",
+        help="in batch mode, analyse up to N APK packages in parallel, each one in a separate process (default: 1)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=get_threads,
+        default=1,
+        action="store",
+        dest="threads",
+        metavar="N",
+        help="parse the entries of each APK package (e.g. manifest, cert and dex files) with up to N threads\n"
+             "(default: 1)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        dest="no_cache",
+        help="neither read nor store the analyses in the result cache, which otherwise skips the APK packages already\n"
+             "analysed (i.e. same content, whatever their path) and is stored in $XDG_CACHE_HOME/ninjadroid/"
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        dest="unordered",
+        help="in batch mode with more than one job, show each APK as soon as it is analysed, not in the input order"
+    )
     parser.add_argument(
         "-d",
         "--verbose",
@@ -111,14 +236,55 @@ def get_args() -> Namespace:
         version=f"NinjaDroid {VERSION}",
         help="show version"
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.fast and args.extended_processing:
+        parser.error("argument -f/--fast: not allowed with argument -a/--all")
+    if args.fast and args.output_directory is not None:
+        parser.error("argument -f/--fast: not allowed with argument -e/--extract")
+    return args
+
+
+def get_hash_profile(profile: str) -> HashProfile:
+    try:
+        return HashProfile.from_string(profile)
+    except ValueError as error:
+        raise ArgumentTypeError(str(error)) from error
+
+
+def get_jobs(jobs: str) -> int:
+    try:
+        value = int(jobs)
+    except ValueError as error:
+        raise ArgumentTypeError(f"invalid number of jobs: '{jobs}'") from error
+    if value < 1:
+        raise ArgumentTypeError(f"invalid number of jobs: '{jobs}' (must be at least 1)")
+    return value
+
+
+def get_threads(threads: str) -> int:
+    try:
+        value = int(threads)
+    except ValueError as error:
+        raise ArgumentTypeError(f"invalid number of threads: '{threads}'") from error
+    if value < 1:
+        raise ArgumentTypeError(f"invalid number of threads: '{threads}' (must be at least 1)")
+    return value
 
 
-def read_file(filepath: str, extended_processing: bool) -> Optional[APK]:
+# pylint: disable=too-many-arguments
+def read_file(
+        filepath: str,
+        extended_processing: bool,
+        in_memory: bool = False,
+        hash_profile: Optional[HashProfile] = None,
+        threads: int = 1,
+        cache: Optional[ResultCache] = None,
+        fast: bool = False
+) -> Optional[APK]:
     apk = None
     logger.debug("Reading %s...", filepath)
     try:
-        apk = ApkParser(logger).parse(filepath, extended_processing)
+        apk = ApkParser(logger, hash_profile, threads, cache).parse(filepath, extended_processing, in_memory, fast)
     except ApkParsingError:
         logger.error("The target file ('%s') must be an APK package!", filepath)
     except FileParsingError:
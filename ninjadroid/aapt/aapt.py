@@ -1,8 +1,15 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os.path
 import re
 from subprocess import PIPE, Popen
-from typing import Dict, Optional, List
+from threading import Lock
+from typing import Callable, Dict, Iterator, Optional, List, Sequence, Tuple
+
+from ninjadroid.parsers.axml import AxmlAttribute, AxmlDocument, AxmlElement
+from ninjadroid.parsers.axml_manifest import AxmlManifest
 
 global_logger = logging.getLogger(__name__)
 
@@ -19,15 +26,31 @@ class Aapt:
         self.logger.debug("aapt exec path: %s", self.__AAPT_EXEC_PATH)
 
     @classmethod
-    def get_app_name(cls, filepath: str) -> Dict:
+    def get_app_name(cls, filepath: str) -> str:
+        return AaptSession(filepath).get_app_name()
+
+    @classmethod
+    def get_apk_info(cls, filepath: str) -> Dict:
+        return AaptSession(filepath).get_apk_info()
+
+    @classmethod
+    def get_manifest_info(cls, filepath: str) -> Dict:
+        return AaptSession(filepath).get_manifest_info()
+
+    @classmethod
+    def get_app_permissions(cls, filepath: str) -> List:
+        return AaptSession(filepath).get_app_permissions()
+
+    @classmethod
+    def _parse_app_name(cls, dump_badging: Callable[[], str]) -> str:
         try:
-            info = cls._execute_dump_badging(filepath)
+            info = dump_badging()
         except RuntimeError:
             return ""
         return cls._extract_app_name(info)
 
     @classmethod
-    def get_apk_info(cls, filepath: str) -> Dict:
+    def _parse_apk_info(cls, dump_badging: Callable[[], str]) -> Dict:
         apk = {
             "package_name": "",
             "version": {
@@ -38,7 +61,7 @@ class Aapt:
         }
 
         try:
-            info = cls._execute_dump_badging(filepath)
+            info = dump_badging()
         except RuntimeError:
             return apk
 
@@ -65,30 +88,17 @@ class Aapt:
         return apk
 
     @classmethod
-    def get_manifest_info(cls, filepath: str) -> Dict:
-        activities = []
-        services = []
-        receivers = []
-
+    def _parse_manifest_info(cls, dump_xmltree: Callable[[], str]) -> Dict:
         try:
-            xmltree = cls._execute_dump_xmltree(filepath)
-            xmltree = xmltree[xmltree.index("application"):-1]
-            activities = cls._extract_activities(xmltree)
-            services = cls._extract_services(xmltree)
-            receivers = cls._extract_broadcast_receivers(xmltree)
-        except (RuntimeError, ValueError):
-            pass
-
-        return {
-            "activities": activities,
-            "services": services,
-            "receivers": receivers,
-        }
+            xmltree = dump_xmltree()
+        except RuntimeError:
+            xmltree = ""
+        return cls._extract_components(xmltree)
 
     @classmethod
-    def get_app_permissions(cls, filepath: str) -> List:
+    def _parse_app_permissions(cls, dump_permissions: Callable[[], str]) -> List:
         try:
-            dump = cls._execute_dump_permissions(filepath).splitlines()
+            dump = dump_permissions().splitlines()
         except RuntimeError:
             return []
 
@@ -119,6 +129,40 @@ class Aapt:
             command=cls.__AAPT_EXEC_PATH + " dump xmltree " + filepath + " AndroidManifest.xml"
         )
 
+    @classmethod
+    def _execute_dumps(cls, filepath: str, dumps: Sequence[str]) -> Dict[str, str]:
+        """
+        Run the given aapt dumps (e.g. "badging", "permissions" and "xmltree") as concurrent subprocesses.
+
+        :return: the output of each dump, leaving out those which failed
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            results = asyncio.run(cls.__execute_dumps_async(filepath, dumps))
+        else:
+            # NOTE: asyncio.run() cannot be called from a running event loop (i.e. from an async caller), hence the
+            #       dumps get their own event loop in a helper thread.
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ninjadroid-aapt") as executor:
+                results = executor.submit(lambda: asyncio.run(cls.__execute_dumps_async(filepath, dumps))).result()
+        return {dump: result for dump, result in zip(dumps, results) if isinstance(result, str)}
+
+    @classmethod
+    async def __execute_dumps_async(cls, filepath: str, dumps: Sequence[str]) -> List:
+        return await asyncio.gather(
+            *(cls.__execute_dump_async(filepath, dump) for dump in dumps),
+            return_exceptions=True
+        )
+
+    @classmethod
+    async def __execute_dump_async(cls, filepath: str, dump: str) -> str:
+        arguments = [cls.__AAPT_EXEC_PATH, "dump", dump, filepath]
+        if dump == "xmltree":
+            arguments.append("AndroidManifest.xml")
+        process = await asyncio.create_subprocess_exec(*arguments, stdout=asyncio.subprocess.PIPE, stderr=None)
+        stdout, _ = await process.communicate()
+        return stdout.decode("utf-8")
+
     @classmethod
     def _launch_shell_command_and_get_result(cls, command: str) -> str:
         with Popen(command, stdout=PIPE, stderr=None, shell=True) as process:
@@ -165,31 +209,23 @@ class Aapt:
         return Aapt._extract_string_pattern(info, apk_sdk_min_pattern)
 
     @classmethod
-    def _extract_activities(cls, xmltree: str) -> List[str]:
-        activities = []
-        for offs in cls._find_all(xmltree, "E: activity"):
-            activity = xmltree[offs:-1]
-            idx = cls._find_between(activity, "A: android:name(", ")=\"")
-            activities.append(cls._find_between(activity, "A: android:name(" + idx + ")=\"", "\""))
-        return activities
-
-    @classmethod
-    def _extract_services(cls, xmltree: str) -> List[str]:
-        services = []
-        for offs in cls._find_all(xmltree, "E: service"):
-            service = xmltree[offs:-1]
-            idx = cls._find_between(service, "A: android:name(", ")=\"")
-            services.append(cls._find_between(service, "A: android:name(" + idx + ")=\"", "\""))
-        return services
-
-    @classmethod
-    def _extract_broadcast_receivers(cls, xmltree: str) -> List[str]:
-        receivers = []
-        for offs in cls._find_all(xmltree, "E: receiver"):
-            receiver = xmltree[offs:-1]
-            idx = cls._find_between(receiver, "A: android:name(", ")=\"")
-            receivers.append(cls._find_between(receiver, "A: android:name(" + idx + ")=\"", "\""))
-        return receivers
+    def _extract_components(cls, xmltree: str) -> Dict:
+        """
+        :return: the names of the activities, services and receivers, in a single pass over the aapt xmltree dump
+        """
+        try:
+            manifest = AxmlManifest(AaptXmlTree(xmltree).iter_elements())
+        except ValueError:
+            return {"activities": [], "services": [], "receivers": []}
+        return {
+            key: [AxmlManifest.get_attribute(component["element"], "name") or "" for component in
+                  manifest.get_components(tag)]
+            for key, tag in (
+                ("activities", AxmlManifest.ACTIVITY),
+                ("services", AxmlManifest.SERVICE),
+                ("receivers", AxmlManifest.RECEIVER)
+            )
+        }
 
     @staticmethod
     def _extract_string_pattern(string: str, pattern: str) -> str:
@@ -198,26 +234,202 @@ class Aapt:
             return match.group(1).strip()
         return ""
 
-    @staticmethod
-    def _find_between(string: str, prefix: str, suffix: str) -> str:
+
+class AaptXmlTree:  # pylint: disable=too-few-public-methods
+    """
+    Tokenizer of the "aapt dump xmltree" output, with the same events of AxmlDocument (i.e. the elements of the binary
+    XML file, with their typed attributes), so that they can be read by the same code.
+
+    The dump is read line by line in a single pass, where the indentation tells when the open elements end, e.g.:
+
+        N: android=http://schemas.android.com/apk/res/android
+          E: manifest (line=2)
+            A: android:versionCode(0x0101021b)=(type 0x10)0x1
+            A: package="com.example.app" (Raw: "com.example.app")
+            E: application (line=8)
+              A: android:label(0x01010001)=@0x7f040000
+    """
+
+    __NAMESPACE = re.compile(r"N: ([^=]*)=(.*)")
+    __ELEMENT = re.compile(r"E: (?:([^:\s]*):)?(\S+)")
+    __ATTRIBUTE = re.compile(r"A: (?:([^:=(]*):)?([^:=(]+)(?:\((0x[0-9a-fA-F]+)\))?=(.*)")
+    __TYPED_VALUE = re.compile(r"\(type (0x[0-9a-fA-F]+)\)(0x[0-9a-fA-F]+)")
+    __REFERENCE_VALUE = re.compile(r"([@?])(0x[0-9a-fA-F]+)")
+    __RAW_SUFFIX = "\" (Raw: \""
+    __ESCAPE = re.compile(r"\\(.)")
+    __ESCAPES = {"n": "\n", "t": "\t"}
+
+    def __init__(self, dump: str):
         """
-        Find a substring in a string, starting after a specified prefix and ended before a specified suffix.
+        :param dump: the output of "aapt dump xmltree"
         """
-        try:
-            start = string.index(prefix) + len(prefix)
-            end = string.index(suffix, start)
-            return string[start:end]
-        except ValueError:
-            return ""
+        self.__dump = dump
+
+    def iter_elements(self) -> Iterator[Tuple[int, AxmlElement]]:
+        """
+        :return: the (START_ELEMENT or END_ELEMENT, element) events, in document order (unknown lines are skipped)
+        """
+        namespaces = {}
+        # NOTE: the (indentation, element) of the open elements, and the element being started (until its attributes
+        #       end).
+        opened: List[Tuple[int, AxmlElement]] = []
+        started: Optional[Tuple[str, str, List[AxmlAttribute]]] = None
+        for line in self.__dump.splitlines():
+            content = line.lstrip(" ")
+            if content.startswith("A: "):
+                attribute = AaptXmlTree.__get_attribute(content, namespaces)
+                if started is not None and attribute is not None:
+                    started[2].append(attribute)
+                continue
+            if started is not None:
+                yield AxmlDocument.START_ELEMENT, AxmlElement(started[0], started[1], tuple(started[2]))
+                started = None
+            if content.startswith("E: "):
+                match = AaptXmlTree.__ELEMENT.match(content)
+                depth = len(line) - len(content)
+                while opened and opened[-1][0] >= depth:
+                    yield AxmlDocument.END_ELEMENT, opened.pop()[1]
+                started = (namespaces.get(match.group(1), match.group(1) or ""), match.group(2), [])
+                opened.append((depth, AxmlElement(started[0], started[1])))
+            elif content.startswith("N: "):
+                match = AaptXmlTree.__NAMESPACE.match(content)
+                if match is not None:
+                    namespaces[match.group(1)] = match.group(2)
+        if started is not None:
+            yield AxmlDocument.START_ELEMENT, AxmlElement(started[0], started[1], tuple(started[2]))
+        while opened:
+            yield AxmlDocument.END_ELEMENT, opened.pop()[1]
 
     @staticmethod
-    def _find_all(haystack: str, needle: str) -> str:
+    def __get_attribute(content: str, namespaces: Dict[str, str]) -> Optional[AxmlAttribute]:
+        match = AaptXmlTree.__ATTRIBUTE.match(content)
+        if match is None:
+            return None
+        prefix, name, resource_id, value = match.groups()
+        namespace = namespaces.get(prefix, prefix) if prefix else ""
+        resource_id = int(resource_id, 16) if resource_id is not None else None
+        if value.startswith("\""):
+            end = value.rfind(AaptXmlTree.__RAW_SUFFIX)
+            if end == -1:
+                end = len(value) - 1 if value.endswith("\"") and len(value) > 1 else len(value)
+            raw_value = AaptXmlTree.__ESCAPE.sub(
+                lambda escape: AaptXmlTree.__ESCAPES.get(escape.group(1), escape.group(1)),
+                value[1:end]
+            )
+            return AxmlAttribute(namespace, name, resource_id, raw_value, AxmlAttribute.TYPE_STRING, 0)
+        typed = AaptXmlTree.__TYPED_VALUE.match(value)
+        if typed is not None:
+            return AxmlAttribute(namespace, name, resource_id, None, int(typed.group(1), 16), int(typed.group(2), 16))
+        reference = AaptXmlTree.__REFERENCE_VALUE.match(value)
+        if reference is not None:
+            value_type = AxmlAttribute.TYPE_REFERENCE if reference.group(1) == "@" else AxmlAttribute.TYPE_ATTRIBUTE
+            return AxmlAttribute(namespace, name, resource_id, None, value_type, int(reference.group(2), 16))
+        return AxmlAttribute(namespace, name, resource_id, value, AxmlAttribute.TYPE_STRING, 0)
+
+
+class AaptSession:
+    """
+    The aapt dumps of a single APK package, each one executed at most once and shared by all the information retrieved
+    from it (e.g. both the app name and the package name come from the same "dump badging").
+    """
+
+    __MAX_SESSIONS = 8
+    __sessions = OrderedDict()
+    __sessions_lock = Lock()
+
+    def __init__(self, filepath: str, checksum: str = ""):
+        """
+        :param filepath: path of the APK package
+        :param checksum: (optional) digest of the APK package, to tell apart different contents at the same path
+        """
+        self.filepath = filepath
+        self.checksum = checksum
+        self.__dumps = {}
+        self.__locks = {}
+        self.__lock = Lock()
+
+    @classmethod
+    def of(cls, filepath: str, checksum: str) -> "AaptSession":
         """
-        Find all the substring starting position in a string.
+        :param filepath: path of the APK package
+        :param checksum: digest of the APK package
+        :return: the session of the given APK package, shared with the latest parsing of the same path and digest
         """
-        offs = -1
-        while True:
-            offs = haystack.find(needle, offs+1)
-            if offs == -1:
-                break
-            yield offs
+        if checksum == "":
+            # NOTE: without a digest, a changed APK package at the same path could not be told apart.
+            return AaptSession(filepath)
+        key = (filepath, checksum)
+        with cls.__sessions_lock:
+            session = cls.__sessions.pop(key, None)
+            if session is None:
+                session = AaptSession(filepath, checksum)
+            cls.__sessions[key] = session
+            while len(cls.__sessions) > cls.__MAX_SESSIONS:
+                cls.__sessions.popitem(last=False)
+        return session
+
+    @classmethod
+    def clear(cls):
+        with cls.__sessions_lock:
+            cls.__sessions.clear()
+
+    def get_key(self) -> Tuple[str, str]:
+        return self.filepath, self.checksum
+
+    def get_app_name(self) -> str:
+        # pylint: disable=protected-access
+        return Aapt._parse_app_name(self.dump_badging)
+
+    def get_apk_info(self) -> Dict:
+        # pylint: disable=protected-access
+        return Aapt._parse_apk_info(self.dump_badging)
+
+    def get_manifest_info(self) -> Dict:
+        # pylint: disable=protected-access
+        return Aapt._parse_manifest_info(self.dump_xmltree)
+
+    def get_app_permissions(self) -> List:
+        # pylint: disable=protected-access
+        return Aapt._parse_app_permissions(self.dump_permissions)
+
+    def dump_badging(self) -> str:
+        # pylint: disable=protected-access
+        return self.__dump("badging", Aapt._execute_dump_badging)
+
+    def dump_xmltree(self) -> str:
+        # pylint: disable=protected-access
+        return self.__dump("xmltree", Aapt._execute_dump_xmltree)
+
+    def dump_permissions(self) -> str:
+        # pylint: disable=protected-access
+        return self.__dump("permissions", Aapt._execute_dump_permissions)
+
+    def prefetch(self, *names: str):
+        """
+        Run the given dumps (e.g. "badging", "permissions" and "xmltree") which are not done yet all at once, so that
+        getting the information out of them waits for the slowest dump rather than for each one after the other.
+        Whatever dump fails is left to be run again by its getter.
+        """
+        with self.__lock:
+            locks = [(name, self.__locks.setdefault(name, Lock())) for name in sorted(set(names))]
+        # NOTE: the locks are always taken in the same order, so that concurrent prefetches cannot deadlock.
+        for _, lock in locks:
+            lock.acquire()  # pylint: disable=consider-using-with
+        try:
+            missing = [name for name, _ in locks if name not in self.__dumps]
+            if missing:
+                # pylint: disable=protected-access
+                self.__dumps.update(Aapt._execute_dumps(self.filepath, missing))
+        finally:
+            for _, lock in reversed(locks):
+                lock.release()
+
+    def __dump(self, name: str, execute: Callable[[str], str]) -> str:
+        # NOTE: the same dump may be requested by many threads at once (e.g. app name and manifest), hence a lock per
+        #       dump makes the others wait for the first one, while different dumps can still run concurrently.
+        with self.__lock:
+            lock = self.__locks.setdefault(name, Lock())
+        with lock:
+            if name not in self.__dumps:
+                self.__dumps[name] = execute(self.filepath)
+            return self.__dumps[name]
@@ -0,0 +1,88 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayInputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.security.GeneralSecurityException;
+import java.security.MessageDigest;
+import java.security.cert.Certificate;
+import java.security.cert.CertificateException;
+import java.security.cert.CertificateFactory;
+import java.security.cert.X509Certificate;
+import java.util.Base64;
+import java.util.Collection;
+
+/**
+ * Long-lived helper printing certificates as "keytool -printcert" does, so that a single JVM serves many of them.
+ *
+ * Each request is a line with the Base64 encoded content of a certificate file (e.g. META-INF/CERT.RSA) and each
+ * response is the printed certificates followed by a line with the end marker. It exits when its stdin is closed.
+ */
+public final class KeytoolWorker {
+
+    private static final String END_MARKER = "--- ninjadroid keytool worker: end ---";
+
+    private KeytoolWorker() {
+    }
+
+    public static void main(String[] args) throws IOException, CertificateException {
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.US_ASCII));
+        PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), false, "UTF-8");
+        CertificateFactory factory = CertificateFactory.getInstance("X.509");
+        String request;
+        while ((request = in.readLine()) != null) {
+            try {
+                printCertificates(factory, Base64.getDecoder().decode(request.trim()), out);
+            } catch (GeneralSecurityException | IllegalArgumentException | ClassCastException e) {
+                out.println("keytool error: " + e);
+            }
+            out.println(END_MARKER);
+            out.flush();
+        }
+    }
+
+    private static void printCertificates(CertificateFactory factory, byte[] content, PrintStream out)
+            throws GeneralSecurityException {
+        Collection<? extends Certificate> certificates = factory.generateCertificates(
+            new ByteArrayInputStream(content)
+        );
+        if (certificates.isEmpty()) {
+            throw new CertificateException("Empty input");
+        }
+        int index = 0;
+        for (Certificate certificate : certificates) {
+            X509Certificate x509 = (X509Certificate) certificate;
+            index++;
+            if (certificates.size() > 1) {
+                out.println("Certificate[" + index + "]:");
+            }
+            out.println("Owner: " + x509.getSubjectX500Principal());
+            out.println("Issuer: " + x509.getIssuerX500Principal());
+            out.println("Serial number: " + x509.getSerialNumber().toString(16));
+            out.println("Valid from: " + x509.getNotBefore() + " until: " + x509.getNotAfter());
+            out.println("Certificate fingerprints:");
+            out.println("\t MD5: " + getFingerprint("MD5", x509));
+            out.println("\t SHA1: " + getFingerprint("SHA-1", x509));
+            out.println("\t SHA256: " + getFingerprint("SHA-256", x509));
+            out.println("Signature algorithm name: " + x509.getSigAlgName());
+            out.println("Version: " + x509.getVersion());
+            out.println();
+        }
+    }
+
+    private static String getFingerprint(String algorithm, X509Certificate certificate)
+            throws GeneralSecurityException {
+        byte[] digest = MessageDigest.getInstance(algorithm).digest(certificate.getEncoded());
+        StringBuilder fingerprint = new StringBuilder();
+        for (byte value : digest) {
+            if (fingerprint.length() > 0) {
+                fingerprint.append(':');
+            }
+            fingerprint.append(String.format("%02X", value));
+        }
+        return fingerprint.toString();
+    }
+}
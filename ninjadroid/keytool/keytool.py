@@ -0,0 +1,123 @@
+import atexit
+import base64
+import logging
+import os.path
+from subprocess import DEVNULL, PIPE, Popen, TimeoutExpired
+from threading import Lock
+from typing import Optional
+
+global_logger = logging.getLogger(__name__)
+
+
+class KeytoolWorkerError(Exception):
+    """
+    Keytool worker failure (e.g. no JVM to start it), not to be confused with a certificate keytool cannot print.
+    """
+
+
+class KeytoolWorker:
+    """
+    Long-lived JVM printing certificates as "keytool -printcert" does, so that the JVM start-up is paid once per process
+    rather than once per certificate (e.g. once per batch instead of once per APK package).
+    """
+
+    END_MARKER = "--- ninjadroid keytool worker: end ---"
+
+    __SOURCE_PATH = os.path.join(os.path.dirname(__file__), "KeytoolWorker.java")
+    __SHUTDOWN_TIMEOUT = 5
+    __instance = None
+    __instance_lock = Lock()
+    __disabled = False
+
+    def __init__(self, logger=global_logger):
+        self.logger = logger
+        self.__process: Optional[Popen] = None
+        self.__pid: Optional[int] = None
+        self.__lock = Lock()
+
+    @classmethod
+    def get(cls) -> Optional["KeytoolWorker"]:
+        """
+        :return: the worker shared by the whole process, started lazily on its first request and shut down at exit,
+                 or None if it has been disabled (e.g. because it failed)
+        """
+        with cls.__instance_lock:
+            if cls.__disabled:
+                return None
+            if cls.__instance is None:
+                cls.__instance = KeytoolWorker()
+                atexit.register(cls.__instance.shutdown)
+            return cls.__instance
+
+    @classmethod
+    def disable(cls):
+        """
+        Shut down the shared worker and stop handing it out, so that callers go back to launching keytool on their own.
+        """
+        with cls.__instance_lock:
+            cls.__disabled = True
+            instance = cls.__instance
+        if instance is not None:
+            instance.shutdown()
+
+    def print_cert(self, cert: bytes) -> str:
+        """
+        :param cert: content of the certificate file (e.g. META-INF/CERT.RSA)
+        :return: the same output of "keytool -printcert"
+        :raise: KeytoolWorkerError if the worker cannot be started or stops responding
+        """
+        with self.__lock:
+            try:
+                process = self.__start()
+                process.stdin.write(base64.b64encode(cert) + b"\n")
+                process.stdin.flush()
+                lines = []
+                while True:
+                    line = process.stdout.readline()
+                    if not line:
+                        raise KeytoolWorkerError("keytool worker exited unexpectedly")
+                    line = line.decode("utf-8")
+                    if line.rstrip("\r\n") == KeytoolWorker.END_MARKER:
+                        return "".join(lines)
+                    lines.append(line)
+            except (OSError, ValueError) as error:
+                self.__stop()
+                raise KeytoolWorkerError(str(error)) from error
+            except KeytoolWorkerError:
+                self.__stop()
+                raise
+
+    def shutdown(self):
+        with self.__lock:
+            self.__stop()
+
+    def __start(self) -> Popen:
+        # NOTE: a forked process (e.g. a --jobs worker) must not share the pipes of its parent's JVM.
+        if self.__process is None or self.__process.poll() is not None or self.__pid != os.getpid():
+            self.__stop()
+            self.logger.debug("Starting keytool worker: %s", KeytoolWorker.__SOURCE_PATH)
+            # pylint: disable=consider-using-with
+            self.__process = Popen(
+                ["java", KeytoolWorker.__SOURCE_PATH],
+                stdin=PIPE,
+                stdout=PIPE,
+                stderr=DEVNULL
+            )
+            self.__pid = os.getpid()
+        return self.__process
+
+    def __stop(self):
+        process = self.__process
+        self.__process = None
+        if process is None or self.__pid != os.getpid():
+            return
+        self.logger.debug("Stopping keytool worker")
+        try:
+            # NOTE: the worker exits as soon as its stdin is closed.
+            process.stdin.close()
+            process.wait(timeout=KeytoolWorker.__SHUTDOWN_TIMEOUT)
+        except (OSError, TimeoutExpired):
+            process.kill()
+            process.wait()
+        finally:
+            process.stdout.close()
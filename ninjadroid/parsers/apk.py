@@ -1,24 +1,66 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+import hashlib
 from logging import getLogger, Logger
+import os
 from shutil import rmtree
 from tempfile import mkdtemp
-from typing import Dict, List, Optional, Union
-from zipfile import ZipFile
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+from zipfile import BadZipFile, ZipFile, ZipInfo
 
-from ninjadroid.aapt.aapt import Aapt
-from ninjadroid.parsers.manifest import AndroidManifest, AndroidManifestParser, AndroidManifestParsingError
-from ninjadroid.parsers.cert import Cert, CertParser, CertParsingError
-from ninjadroid.parsers.dex import Dex, DexParser
-from ninjadroid.parsers.file import File, FileParser, FileParsingError
+from ninjadroid.aapt.aapt import AaptSession
+from ninjadroid.parsers.manifest import AndroidManifest, AndroidManifestParser, AndroidManifestParsingError, \
+    LazyAndroidManifest
+from ninjadroid.parsers.arsc import ResourceTable
+from ninjadroid.parsers.axml import AxmlDocument
+from ninjadroid.parsers.cache import EntryCache, EntryKey, ResultCache
+from ninjadroid.parsers.cert import Cert, CertParser, CertParsingError, LazyCert
+from ninjadroid.parsers.dex import Dex, DexParser, LazyDex
+from ninjadroid.parsers.file import File, FileParser, FileParsingError, HashProfile, Lazy, LazyDigests, LazyFile
 
 
 default_logger = getLogger(__name__)
 
+ApkEntries = Tuple[Optional[AndroidManifest], Optional[Union[Cert, File]], List[Union[Dex, File]], List[File]]
+
+
+class ApkEntry(File):
+    """
+    APK entry information read from the zip central directory alone (i.e. name, size and CRC32), without digests.
+    """
+
+    __slots__ = ("__crc32",)
+
+    def __init__(self, filename: str, size: int, crc32: str):
+        super().__init__(filename, size, "", "", "", "")
+        self.__crc32 = crc32
+
+    def get_crc32(self) -> str:
+        return self.__crc32
+
+    def as_dict(self) -> Dict:
+        return {
+            "file": self.get_file_name(),
+            "size": self.get_size(),
+            "crc32": self.__crc32,
+        }
+
+    @staticmethod
+    def from_dict(dump: Dict) -> "ApkEntry":
+        return ApkEntry(filename=dump["file"], size=dump["size"], crc32=dump["crc32"])
+
+    @staticmethod
+    def from_zip_info(entry: ZipInfo) -> "ApkEntry":
+        return ApkEntry(filename=entry.filename, size=entry.file_size, crc32=f"{entry.CRC:08x}")
+
 
 class APK(File):
     """
     Android APK package information.
     """
 
+    __slots__ = ("__app_name", "__cert", "__manifest", "__dex", "__other")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -58,13 +100,80 @@ class APK(File):
 
     def as_dict(self) -> Dict:
         dump = super().as_dict()
-        dump["name"] = self.__app_name
-        dump["cert"] = self.__cert.as_dict()
-        dump["manifest"] = self.__manifest.as_dict()
-        dump["dex"] = [dex.as_dict() for dex in self.__dex]
-        dump["other"] = [file.as_dict() for file in self.__other]
+        dump["name"] = self.get_app_name()
+        dump["cert"] = self.get_cert().as_dict()
+        dump["manifest"] = self.get_manifest().as_dict()
+        dump["dex"] = [dex.as_dict() for dex in self.get_dex_files()]
+        dump["other"] = [file.as_dict() for file in self.get_other_files()]
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "APK":
+        """
+        :param dump: the APK information, as returned by as_dict() with either all the information or only a summary
+        :return: the equivalent APK package
+        """
+        # NOTE: without extended processing, the cert and the dex files are parsed as generic files (or just listed from
+        # the zip central directory, in the fast summary).
+        cert = dump["cert"]
+        return APK(
+            filename=dump["file"],
+            size=dump["size"],
+            md5hash=dump["md5"],
+            sha1hash=dump["sha1"],
+            sha256hash=dump["sha256"],
+            sha512hash=dump["sha512"],
+            app_name=dump["name"],
+            cert=Cert.from_dict(cert) if "serial_number" in cert else File.from_dict(cert),
+            manifest=AndroidManifest.from_dict(dump["manifest"]),
+            dex_files=[APK.__entry_from_dict(dex, Dex) for dex in dump["dex"]],
+            other_files=[APK.__entry_from_dict(file, File) for file in dump["other"]]
+        )
+
+    @staticmethod
+    def __entry_from_dict(dump: Dict, parsed_class: Type[File]) -> File:
+        if "crc32" in dump:
+            return ApkEntry.from_dict(dump)
+        if parsed_class is Dex and "strings" not in dump:
+            return File.from_dict(dump)
+        return parsed_class.from_dict(dump)
+
+
+class LazyAPK(LazyDigests, APK):
+    """
+    Android APK package information, computed piece by piece on first access (i.e. the APK digests and app name, as
+    well as everything about its entries), so that one pays only for what is read.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            filename: str,
+            size: int,
+            parse_file: Callable[[], File],
+            get_app_name: Callable[[], str],
+            cert: LazyCert,
+            manifest: LazyAndroidManifest,
+            dex_files: List[LazyDex],
+            other_files: List[LazyFile]
+    ):
+        """
+        :param filename: name of the APK package
+        :param size: size of the APK package
+        :param parse_file: the parsing of the APK package, which computes its digests
+        :param get_app_name: the resolution of the app name
+        :param cert: the lazy cert
+        :param manifest: the lazy manifest
+        :param dex_files: the lazy dex files
+        :param other_files: the lazy other files
+        """
+        APK.__init__(self, filename, size, "", "", "", "", "", cert, manifest, dex_files, other_files)
+        LazyDigests.__init__(self, parse_file)
+        self.__app_name = Lazy(get_app_name)
+
+    def get_app_name(self) -> str:
+        return self.__app_name.get()
+
 
 class ApkParsingError(FileParsingError):
     """
@@ -78,62 +187,221 @@ class ApkParsingError(FileParsingError):
         return "Cannot parse the file as an APK!"
 
 
+# pylint: disable=too-many-instance-attributes
 class ApkParser:
     """
     Parser implementation for Android APK packages.
     """
 
     __TEMPORARY_DIR = ".ninjadroid"
+    __LABEL_RESOURCE_ID = 0x01010001
 
-    def __init__(self, logger: Logger = default_logger):
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            logger: Logger = default_logger,
+            hash_profile: Optional[HashProfile] = None,
+            max_workers: int = 1,
+            cache: Optional[ResultCache] = None,
+            entry_cache: Optional[EntryCache] = None
+    ):
+        """
+        :param logger: (optional) logger.
+        :param hash_profile: (optional) digests to compute per category of file. All the digests by default.
+        :param max_workers: (optional) how many threads to use to parse the entries of an APK (i.e. manifest, cert,
+                            dex and other files) concurrently. 1 by default, meaning one entry after the other.
+        :param cache: (optional) cache of the APK analyses, to skip the parsing of the already analysed APK packages.
+                      None by default, meaning no cache.
+        :param entry_cache: (optional) cache of the parsed dex and cert files, to skip the parsing of the entries which
+                            are byte-identical to those of the already analysed APK packages (e.g. in a batch). None by
+                            default, meaning no cache.
+        """
         self.logger = logger
-        self.file_parser = FileParser(logger)
-        self.manifest_parser = AndroidManifestParser(logger)
-        self.cert_parser = CertParser(logger)
-        self.dex_parser = DexParser(logger)
+        self.max_workers = max_workers
+        self.cache = cache
+        self.entry_cache = entry_cache
+        self.__executor = None
+        self.hash_profile = hash_profile if hash_profile is not None else HashProfile()
+        self.file_parsers = {
+            category: FileParser(logger, self.hash_profile.get_algorithms(category))
+            for category in HashProfile.CATEGORIES
+        }
+        self.manifest_parser = AndroidManifestParser(logger, self.hash_profile.get_algorithms(HashProfile.MANIFEST))
+        self.cert_parser = CertParser(logger, self.hash_profile.get_algorithms(HashProfile.CERT))
+        self.dex_parser = DexParser(logger, self.hash_profile.get_algorithms(HashProfile.DEX))
+        # NOTE: the fast summary computes no digest at all, as it never reads more than the manifest and the cert.
+        self.summary_manifest_parser = AndroidManifestParser(logger, ())
+        self.summary_cert_parser = CertParser(logger, ())
 
-    def parse(self, filepath: str, extended_processing: bool = True):
+    def parse(self, filepath: str, extended_processing: bool = True, in_memory: bool = False, fast: bool = False):
         """
         :param filepath: path of the APK file
         :param extended_processing: (optional) whether should parse all information or only a summary. True by default.
+        :param in_memory: (optional) whether should parse the APK entries in memory, without extracting them to a
+                          temporary directory. False by default.
+        :param fast: (optional) whether should parse only a fast summary (see parse_fast_summary()), in which case
+                     both extended_processing and in_memory are ignored. False by default.
         :return: the parsed APK file
         :raise: ApkParsingError if cannot parse the file as an APK
         """
         self.logger.debug("Parsing APK file: filepath=\"%s\"", filepath)
         if not self.looks_like_apk(filepath):
             raise ApkParsingError
+        if fast:
+            return self.parse_fast_summary(filepath)
 
-        file = self.file_parser.parse(filepath)
-        cert = None
+        file = self.file_parsers[HashProfile.APK].parse(filepath)
+        cache_key = self.__get_cache_key(filepath, file, extended_processing)
+        if cache_key is not None:
+            apk = self.__get_cached_apk(cache_key, file)
+            if apk is not None:
+                return apk
+
+        apk = self.__parse_apk(filepath, file, extended_processing, in_memory)
+        if cache_key is not None:
+            self.cache.put(cache_key, apk.as_dict())
+        return apk
+
+    def parse_fast_summary(self, filepath: str) -> APK:
+        """
+        Parse only what a triage needs (i.e. package, version, SDK, permissions and cert), reading nothing but the zip
+        central directory, the AndroidManifest.xml and the cert: neither the APK package nor its entries are hashed,
+        the dex and the other files are just listed (i.e. name, size and CRC32) and the app name is not resolved.
+        The result cache is not used either, as its key would need the sha256 of the whole APK package.
+
+        :param filepath: path of the APK file
+        :return: the parsed APK file
+        :raise: ApkParsingError if cannot parse the file as an APK
+        """
+        self.logger.debug("Parsing APK file fast summary: filepath=\"%s\"", filepath)
         manifest = None
+        cert = None
         dex_files = []
         other_files = []
-
-        with ZipFile(filepath) as apk:
-            tmpdir = self.__create_temporary_directory(ApkParser.__TEMPORARY_DIR)
-            for filename in apk.namelist():
-                entry_filepath = apk.extract(filename, tmpdir)
-                self.logger.debug("Extracting APK resource %s to %s", filename, entry_filepath)
-                try:
+        try:
+            with ZipFile(filepath) as apk:
+                for entry in apk.infolist():
+                    filename = entry.filename
                     if AndroidManifestParser.looks_like_manifest(filename):
-                        self.logger.debug("%s looks like an AndroidManifest.xml file", filename)
-                        manifest = self.manifest_parser.parse(entry_filepath, True, filepath, extended_processing)
+                        manifest = self.summary_manifest_parser.parse_bytes(apk.read(entry), True, filepath, False)
                     elif CertParser.looks_like_cert(filename):
-                        self.logger.debug("%s looks like a CERT file", filename)
-                        cert = self.__parse_cert(entry_filepath, filename, extended_processing)
+                        cert = self.summary_cert_parser.parse_bytes(apk.read(entry), filename)
                     elif DexParser.looks_like_dex(filename):
-                        self.logger.debug("%s looks like a dex file", filename)
-                        dex = self.__parse_dex(entry_filepath, filename, extended_processing)
-                        dex_files.append(dex)
-                    else:
-                        self.logger.debug("%s looks like a generic file", filename)
-                        entry = self.__parse_file(entry_filepath, filename, extended_processing)
-                        if entry is not None:
-                            other_files.append(entry)
-                except (AndroidManifestParsingError, CertParsingError, FileParsingError) as error:
-                    self.__remove_directory(tmpdir)
-                    raise ApkParsingError from error
-            self.__remove_directory(tmpdir)
+                        dex_files.append(ApkEntry.from_zip_info(entry))
+                    elif not entry.is_dir():
+                        other_files.append(ApkEntry.from_zip_info(entry))
+        except (AndroidManifestParsingError, CertParsingError, BadZipFile, OSError) as error:
+            raise ApkParsingError from error
+
+        if manifest is None or cert is None or not dex_files:
+            raise ApkParsingError
+
+        return APK(
+            filename=filepath,
+            size=os.path.getsize(filepath),
+            md5hash="",
+            sha1hash="",
+            sha256hash="",
+            sha512hash="",
+            app_name="",
+            cert=cert,
+            manifest=manifest,
+            dex_files=dex_files,
+            other_files=other_files
+        )
+
+    def parse_lazy(self, filepath: str) -> LazyAPK:
+        """
+        Parse only the zip central directory, leaving everything else to be computed on first access and memoized
+        (e.g. the digests, the manifest, the cert details and the dex strings and signatures). Each entry is read from
+        the APK package on demand, without extracting it, and its parsing errors (e.g. CertParsingError) are raised on
+        the first access to what cannot be parsed.
+
+        :param filepath: path of the APK file
+        :return: the lazily parsed APK file, with all the information of the extended processing
+        :raise: ApkParsingError if cannot parse the file as an APK (e.g. no manifest, cert or dex in the zip file)
+        """
+        self.logger.debug("Parsing APK file lazily: filepath=\"%s\"", filepath)
+        if not self.looks_like_apk(filepath):
+            raise ApkParsingError
+        try:
+            with ZipFile(filepath) as apk:
+                entries = apk.infolist()
+        except (BadZipFile, OSError) as error:
+            raise ApkParsingError from error
+
+        manifest = None
+        cert = None
+        dex_files = []
+        other_files = []
+        for entry in entries:
+            filename = entry.filename
+            read = partial(ApkParser.__read_entry, filepath, filename)
+            if AndroidManifestParser.looks_like_manifest(filename):
+                manifest = LazyAndroidManifest(filename, entry.file_size, read, filepath, self.manifest_parser)
+            elif CertParser.looks_like_cert(filename):
+                cert = LazyCert(filename, entry.file_size, read, self.cert_parser)
+            elif DexParser.looks_like_dex(filename):
+                dex_files.append(LazyDex(filename, entry.file_size, read, self.dex_parser))
+            elif not entry.is_dir():
+                other_files.append(
+                    LazyFile(filename, entry.file_size, partial(self.__parse_entry_stream, filepath, filename))
+                )
+
+        if manifest is None or cert is None or not dex_files:
+            raise ApkParsingError
+
+        return LazyAPK(
+            filename=filepath,
+            size=os.path.getsize(filepath),
+            parse_file=partial(self.file_parsers[HashProfile.APK].parse, filepath),
+            get_app_name=partial(self.__get_app_name, filepath),
+            cert=cert,
+            manifest=manifest,
+            dex_files=dex_files,
+            other_files=other_files
+        )
+
+    @staticmethod
+    def __read_entry(filepath: str, filename: str) -> bytes:
+        with ZipFile(filepath) as apk:
+            return apk.read(filename)
+
+    def __parse_entry_stream(self, filepath: str, filename: str) -> File:
+        with ZipFile(filepath) as apk, apk.open(filename) as stream:
+            return self.file_parsers[HashProfile.OTHER].parse_stream(stream, filename)
+
+    def __get_app_name(self, filepath: str) -> str:
+        with ZipFile(filepath) as apk:
+            app_name = self.parse_app_name(apk)
+        if app_name == "":
+            self.logger.debug("Cannot resolve the app name natively, falling back to aapt...")
+            app_name = AaptSession(filepath).get_app_name()
+        return app_name
+
+    def __parse_apk(self, filepath: str, file: File, extended_processing: bool, in_memory: bool) -> APK:
+        aapt = AaptSession.of(filepath, self.__get_checksum(file))
+
+        with ZipFile(filepath) as apk:
+            app_name = self.__completed(self.parse_app_name(apk))
+            if app_name.result() == "":
+                self.logger.debug("Cannot resolve the app name natively, falling back to aapt...")
+                # NOTE: with more than one worker, aapt runs while parsing the entries.
+                app_name = self.__submit(aapt.get_app_name)
+            if in_memory:
+                manifest, cert, dex_files, other_files = self.__parse_entries_in_memory(
+                    apk,
+                    filepath,
+                    extended_processing,
+                    aapt
+                )
+            else:
+                manifest, cert, dex_files, other_files = self.__parse_entries_from_temporary_directory(
+                    apk,
+                    filepath,
+                    extended_processing,
+                    aapt
+                )
 
         if manifest is None or cert is None or not dex_files:
             raise ApkParsingError
@@ -145,27 +413,331 @@ class ApkParser:
             sha1hash=file.get_sha1(),
             sha256hash=file.get_sha256(),
             sha512hash=file.get_sha512(),
-            app_name=Aapt.get_app_name(filepath),
+            app_name=app_name.result(),
             cert=cert,
             manifest=manifest,
             dex_files=dex_files,
             other_files=other_files
         )
 
-    def __parse_cert(self, filepath: str, filename: str, extended_processing: bool) -> Union[Cert, File]:
+    def __parse_entries_from_temporary_directory(
+            self,
+            apk: ZipFile,
+            apk_path: str,
+            extended_processing: bool,
+            aapt: AaptSession
+    ) -> ApkEntries:
+        cert = None
+        manifest = None
+        dex_files = []
+        other_files = []
+
+        tmpdir = self.__create_temporary_directory(ApkParser.__TEMPORARY_DIR)
+        try:
+            for filename in apk.namelist():
+                entry_filepath = apk.extract(filename, tmpdir)
+                self.logger.debug("Extracting APK resource %s to %s", filename, entry_filepath)
+                if AndroidManifestParser.looks_like_manifest(filename):
+                    self.logger.debug("%s looks like an AndroidManifest.xml file", filename)
+                    manifest = self.__submit(
+                        self.manifest_parser.parse,
+                        entry_filepath,
+                        True,
+                        apk_path,
+                        extended_processing,
+                        aapt
+                    )
+                elif CertParser.looks_like_cert(filename):
+                    self.logger.debug("%s looks like a CERT file", filename)
+                    cert = self.__submit(
+                        self.__parse_cert,
+                        entry_filepath,
+                        filename,
+                        extended_processing,
+                        self.__get_entry_info(apk, filename, extended_processing)
+                    )
+                elif DexParser.looks_like_dex(filename):
+                    self.logger.debug("%s looks like a dex file", filename)
+                    dex_files.append(self.__submit(
+                        self.__parse_dex,
+                        entry_filepath,
+                        filename,
+                        extended_processing,
+                        self.__get_entry_info(apk, filename, extended_processing)
+                    ))
+                else:
+                    self.logger.debug("%s looks like a generic file", filename)
+                    other_files.append(self.__submit(self.__parse_file, entry_filepath, filename, extended_processing))
+            return self.__get_entries(manifest, cert, dex_files, other_files)
+        except (AndroidManifestParsingError, CertParsingError, FileParsingError) as error:
+            raise ApkParsingError from error
+        finally:
+            self.__remove_directory(tmpdir)
+
+    def __parse_entries_in_memory(
+            self,
+            apk: ZipFile,
+            apk_path: str,
+            extended_processing: bool,
+            aapt: AaptSession
+    ) -> ApkEntries:
+        cert = None
+        manifest = None
+        dex_files = []
+        other_files = []
+
+        try:
+            for entry in apk.infolist():
+                filename = entry.filename
+                self.logger.debug("Reading APK resource %s in memory", filename)
+                if AndroidManifestParser.looks_like_manifest(filename):
+                    self.logger.debug("%s looks like an AndroidManifest.xml file", filename)
+                    manifest = self.__submit(
+                        self.manifest_parser.parse_bytes,
+                        apk.read(entry),
+                        True,
+                        apk_path,
+                        extended_processing,
+                        aapt
+                    )
+                elif CertParser.looks_like_cert(filename):
+                    self.logger.debug("%s looks like a CERT file", filename)
+                    cert = self.__submit(
+                        self.__parse_cert_from_bytes,
+                        apk.read(entry),
+                        filename,
+                        extended_processing,
+                        entry
+                    )
+                elif DexParser.looks_like_dex(filename):
+                    self.logger.debug("%s looks like a dex file", filename)
+                    dex_files.append(
+                        self.__submit(
+                            self.__parse_dex_from_bytes,
+                            apk.read(entry),
+                            filename,
+                            extended_processing,
+                            entry
+                        )
+                    )
+                elif extended_processing and not entry.is_dir():
+                    self.logger.debug("%s looks like a generic file", filename)
+                    # NOTE: the generic files are streamed from the APK in the current thread, instead of being read
+                    # in memory as a whole.
+                    with apk.open(entry) as stream:
+                        other_files.append(
+                            self.__completed(self.file_parsers[HashProfile.OTHER].parse_stream(stream, filename))
+                        )
+            return self.__get_entries(manifest, cert, dex_files, other_files)
+        except (AndroidManifestParsingError, CertParsingError, FileParsingError) as error:
+            raise ApkParsingError from error
+
+    def __submit(self, function: Callable, *args) -> Future:
+        """
+        Run the given function in the thread pool, or in the current thread if the entries are parsed one after the
+        other (in which case any error is raised straight away).
+        """
+        if self.max_workers <= 1:
+            return self.__completed(function(*args))
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ninjadroid")
+        return self.__executor.submit(function, *args)
+
+    @staticmethod
+    def __completed(result) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    @staticmethod
+    def __get_entries(
+            manifest: Optional[Future],
+            cert: Optional[Future],
+            dex_files: List[Future],
+            other_files: List[Future]
+    ) -> ApkEntries:
+        """
+        Assemble the parsed entries in the same order as in the APK, regardless of the order in which they completed.
+        """
+        futures = [future for future in (manifest, cert) if future is not None] + dex_files + other_files
+        # NOTE: wait for all the entries before raising any error, so that none of them is still being parsed (e.g. in
+        # a temporary directory which is about to be removed).
+        wait(futures)
+        return (
+            manifest.result() if manifest is not None else None,
+            cert.result() if cert is not None else None,
+            [dex.result() for dex in dex_files],
+            [file for file in (other.result() for other in other_files) if file is not None]
+        )
+
+    def __parse_cert(
+            self,
+            filepath: str,
+            filename: str,
+            extended_processing: bool,
+            info: Optional[ZipInfo] = None
+    ) -> Union[Cert, File]:
         if extended_processing:
-            return self.cert_parser.parse(filepath, filename)
-        return self.file_parser.parse(filepath, filename)
+            return self.__parse_with_entry_cache(
+                HashProfile.CERT,
+                info,
+                filename,
+                lambda: self.__read(filepath),
+                lambda: self.cert_parser.parse(filepath, filename)
+            )
+        return self.file_parsers[HashProfile.CERT].parse(filepath, filename)
 
-    def __parse_dex(self, filepath: str, filename: str, extended_processing: bool) -> Union[Dex, File]:
+    def __parse_cert_from_bytes(
+            self,
+            raw: bytes,
+            filename: str,
+            extended_processing: bool,
+            info: Optional[ZipInfo] = None
+    ) -> Union[Cert, File]:
         if extended_processing:
-            return self.dex_parser.parse(filepath, filename)
-        return self.file_parser.parse(filepath, filename)
+            return self.__parse_with_entry_cache(
+                HashProfile.CERT,
+                info,
+                filename,
+                lambda: raw,
+                lambda: self.cert_parser.parse_bytes(raw, filename)
+            )
+        return self.file_parsers[HashProfile.CERT].parse_bytes(raw, filename)
+
+    def __parse_dex(
+            self,
+            filepath: str,
+            filename: str,
+            extended_processing: bool,
+            info: Optional[ZipInfo] = None
+    ) -> Union[Dex, File]:
+        if extended_processing:
+            return self.__parse_with_entry_cache(
+                HashProfile.DEX,
+                info,
+                filename,
+                lambda: self.__read(filepath),
+                lambda: self.dex_parser.parse(filepath, filename)
+            )
+        return self.file_parsers[HashProfile.DEX].parse(filepath, filename)
+
+    def __parse_dex_from_bytes(
+            self,
+            raw: bytes,
+            filename: str,
+            extended_processing: bool,
+            info: Optional[ZipInfo] = None
+    ) -> Union[Dex, File]:
+        if extended_processing:
+            return self.__parse_with_entry_cache(
+                HashProfile.DEX,
+                info,
+                filename,
+                lambda: raw,
+                lambda: self.dex_parser.parse_bytes(raw, filename)
+            )
+        return self.file_parsers[HashProfile.DEX].parse_bytes(raw, filename)
+
+    # pylint: disable=too-many-arguments
+    def __parse_with_entry_cache(
+            self,
+            category: str,
+            info: Optional[ZipInfo],
+            filename: str,
+            read: Callable[[], bytes],
+            parse: Callable[[], File]
+    ) -> File:
+        """
+        Parse the given APK entry, unless a byte-identical one has already been parsed.
+
+        The entry content is only read again (to compute its sha256) when an entry with the same CRC32 and size, which
+        come from the zip central directory, is in the cache.
+        """
+        if self.entry_cache is None or info is None:
+            return parse()
+        sha256 = None
+        if self.entry_cache.may_contain(category, info.CRC, info.file_size):
+            sha256 = hashlib.sha256(read()).hexdigest()
+            cached = self.entry_cache.get(EntryKey(category, info.CRC, info.file_size, sha256))
+            if cached is not None:
+                self.logger.debug("%s is identical to an already parsed entry, reusing it", filename)
+                # NOTE: the same content may have a different name (e.g. classes.dex and classes2.dex).
+                dump = cached.as_dict()
+                dump["file"] = filename
+                return type(cached).from_dict(dump)
+        file = parse()
+        if sha256 is None:
+            sha256 = file.get_sha256() or hashlib.sha256(read()).hexdigest()
+        self.entry_cache.put(EntryKey(category, info.CRC, info.file_size, sha256), file)
+        return file
+
+    def __get_entry_info(self, apk: ZipFile, filename: str, extended_processing: bool) -> Optional[ZipInfo]:
+        if self.entry_cache is None or not extended_processing:
+            return None
+        return apk.getinfo(filename)
+
+    @staticmethod
+    def __read(filepath: str) -> bytes:
+        with open(filepath, "rb") as file:
+            return file.read()
+
+    @staticmethod
+    def parse_app_name(apk: ZipFile) -> str:
+        """
+        :param apk: the APK package
+        :return: the label of the application, resolved from the binary AndroidManifest.xml and resources.arsc without
+                 aapt, or an empty string if it cannot be resolved (e.g. missing, malformed or not a string)
+        """
+        try:
+            label = None
+            for event, element in AxmlDocument(apk.read("AndroidManifest.xml")).iter_elements():
+                if event == AxmlDocument.START_ELEMENT and element.name == "application":
+                    label = element.get_attribute(ApkParser.__LABEL_RESOURCE_ID, "label")
+                    break
+            if label is None:
+                return ""
+            if label.raw_value is not None:
+                return label.raw_value.strip()
+            if label.value_type == AxmlDocument.TYPE_REFERENCE:
+                app_name = ResourceTable(apk.read("resources.arsc")).get_string(label.data)
+                return app_name.strip() if app_name is not None else ""
+        except (KeyError, ValueError):
+            pass
+        return ""
+
+    def __get_cache_key(self, filepath: str, file: File, extended_processing: bool) -> Optional[str]:
+        if self.cache is None:
+            return None
+        sha256 = file.get_sha256()
+        if sha256 == "":
+            # NOTE: the cache is content-addressed, even when the sha256 of the APK package is not to be shown.
+            sha256 = FileParser(self.logger, ("sha256",)).parse(filepath).get_sha256()
+        return self.cache.get_key(sha256, extended_processing, self.hash_profile)
+
+    def __get_cached_apk(self, cache_key: str, file: File) -> Optional[APK]:
+        dump = self.cache.get(cache_key)
+        if dump is None:
+            return None
+        self.logger.debug("Reading APK analysis from cache: key=%s", cache_key)
+        # NOTE: the same APK package may have been analysed from another path.
+        dump["file"] = file.get_file_name()
+        try:
+            return APK.from_dict(dump)
+        except (KeyError, TypeError) as error:
+            self.logger.debug("Cannot read APK analysis from cache: %s", repr(error))
+            return None
+
+    @staticmethod
+    def __get_checksum(file: File) -> str:
+        """
+        The strongest digest of the APK package which has been computed, if any.
+        """
+        return file.get_sha256() or file.get_sha512() or file.get_sha1() or file.get_md5() or ""
 
     def __parse_file(self, filepath: str, filename: str, extended_processing: bool) -> Optional[File]:
         if extended_processing and not FileParser.is_directory(filepath):
             try:
-                return self.file_parser.parse(filepath, filename)
+                return self.file_parsers[HashProfile.OTHER].parse(filepath, filename)
             except FileParsingError:
                 self.logger.error("Could not parse file '%s'!", filename)
         return None
@@ -0,0 +1,146 @@
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from ninjadroid.parsers.axml import AxmlDocument, StringPool
+
+
+class ResourceTable:
+    """
+    Reader of the resources table of an APK package (i.e. resources.arsc), resolving resource ids to their values in
+    the default configuration.
+    """
+
+    __TABLE_TYPE = 0x0002
+    __PACKAGE_TYPE = 0x0200
+    __TYPE_TYPE = 0x0201
+    __CHUNK_HEADER = struct.Struct("<HHI")
+    __PACKAGE_ID_OFFSET = 8
+    __TYPE_ID_OFFSET_OFFSET = 284
+    __TYPE = struct.Struct("<BBHII")
+    __LOCALE_OFFSET = 28
+    __ENTRY = struct.Struct("<HHI")
+    __VALUE = struct.Struct("<HBBI")
+    __FLAG_SPARSE = 0x01
+    __FLAG_OFFSET16 = 0x02
+    __FLAG_COMPLEX = 0x0001
+    __FLAG_COMPACT = 0x0008
+    __NO_ENTRY = 0xFFFFFFFF
+    __MAX_REFERENCES = 8
+
+    def __init__(self, data: bytes):
+        """
+        :param data: content of the resources.arsc file
+        :raise: ValueError if the content is not a valid resources table
+        """
+        if len(data) < ResourceTable.__CHUNK_HEADER.size:
+            raise ValueError("Not a resources table")
+        chunk_type, header_size, size = ResourceTable.__CHUNK_HEADER.unpack_from(data, 0)
+        if chunk_type != ResourceTable.__TABLE_TYPE or size > len(data):
+            raise ValueError("Not a resources table")
+        self.__data = data
+        self.__strings = None
+        # NOTE: for each (package id, type id), the offsets of its type chunks, the default configuration ones first.
+        self.__types: Dict[Tuple[int, int], List[int]] = {}
+        try:
+            for offset, chunk_type, chunk_header_size, chunk_size in self.__iter_chunks(header_size, size):
+                if chunk_type == StringPool.TYPE and self.__strings is None:
+                    self.__strings = StringPool(data, offset)
+                elif chunk_type == ResourceTable.__PACKAGE_TYPE:
+                    self.__index_package(offset, chunk_header_size, chunk_size)
+        except (IndexError, struct.error) as error:
+            raise ValueError("Truncated package chunk") from error
+
+    def __iter_chunks(self, start: int, end: int):
+        offset = start
+        while offset + ResourceTable.__CHUNK_HEADER.size <= end:
+            chunk_type, header_size, size = ResourceTable.__CHUNK_HEADER.unpack_from(self.__data, offset)
+            if size < ResourceTable.__CHUNK_HEADER.size or offset + size > end:
+                raise ValueError("Malformed chunk")
+            yield offset, chunk_type, header_size, size
+            offset += size
+
+    def __index_package(self, offset: int, header_size: int, size: int):
+        package_id = struct.unpack_from("<I", self.__data, offset + ResourceTable.__PACKAGE_ID_OFFSET)[0]
+        type_id_offset = 0
+        if header_size >= ResourceTable.__TYPE_ID_OFFSET_OFFSET + 4:
+            type_id_offset = struct.unpack_from("<I", self.__data, offset + ResourceTable.__TYPE_ID_OFFSET_OFFSET)[0]
+        for type_offset, chunk_type, _, _ in self.__iter_chunks(offset + header_size, offset + size):
+            if chunk_type != ResourceTable.__TYPE_TYPE:
+                continue
+            type_id = self.__data[type_offset + ResourceTable.__CHUNK_HEADER.size] + type_id_offset
+            self.__types.setdefault((package_id, type_id), []).append(type_offset)
+        for offsets in self.__types.values():
+            offsets.sort(key=self.__has_locale)
+
+    def __has_locale(self, type_offset: int) -> bool:
+        start = type_offset + ResourceTable.__LOCALE_OFFSET
+        return any(self.__data[start:start + 4])
+
+    def get_value(self, resource_id: int) -> Optional[Tuple[int, int]]:
+        """
+        :param resource_id: the resource id (i.e. 0xPPTTEEEE)
+        :return: the (type, data) value of the resource, preferring the default configuration, or None if it is either
+                 missing or a complex value (e.g. a style)
+        """
+        package_id = resource_id >> 24
+        type_id = (resource_id >> 16) & 0xFF
+        entry_id = resource_id & 0xFFFF
+        try:
+            for type_offset in self.__types.get((package_id, type_id), []):
+                value = self.__get_entry_value(type_offset, entry_id)
+                if value is not None:
+                    return value
+        except (IndexError, struct.error) as error:
+            raise ValueError("Truncated type chunk") from error
+        return None
+
+    # pylint: disable=too-many-locals
+    def __get_entry_value(self, type_offset: int, entry_id: int) -> Optional[Tuple[int, int]]:
+        header_size = struct.unpack_from("<H", self.__data, type_offset + 2)[0]
+        _, flags, _, entry_count, entries_start = ResourceTable.__TYPE.unpack_from(
+            self.__data,
+            type_offset + ResourceTable.__CHUNK_HEADER.size
+        )
+        offsets_start = type_offset + header_size
+        entry_offset = None
+        if flags & ResourceTable.__FLAG_SPARSE:
+            for index in range(entry_count):
+                sparse_id, sparse_offset = struct.unpack_from("<HH", self.__data, offsets_start + 4 * index)
+                if sparse_id == entry_id:
+                    entry_offset = sparse_offset * 4
+                    break
+        elif entry_id < entry_count:
+            if flags & ResourceTable.__FLAG_OFFSET16:
+                entry_offset = struct.unpack_from("<H", self.__data, offsets_start + 2 * entry_id)[0]
+                entry_offset = entry_offset * 4 if entry_offset != 0xFFFF else None
+            else:
+                entry_offset = struct.unpack_from("<I", self.__data, offsets_start + 4 * entry_id)[0]
+                entry_offset = entry_offset if entry_offset != ResourceTable.__NO_ENTRY else None
+        if entry_offset is None:
+            return None
+
+        entry = type_offset + entries_start + entry_offset
+        entry_size, entry_flags, entry_data = ResourceTable.__ENTRY.unpack_from(self.__data, entry)
+        if entry_flags & ResourceTable.__FLAG_COMPACT:
+            return entry_flags >> 8, entry_data
+        if entry_flags & ResourceTable.__FLAG_COMPLEX:
+            return None
+        _, _, value_type, data = ResourceTable.__VALUE.unpack_from(self.__data, entry + entry_size)
+        return value_type, data
+
+    def get_string(self, resource_id: int) -> Optional[str]:
+        """
+        :param resource_id: the resource id (i.e. 0xPPTTEEEE) of a string, possibly through other references
+        :return: the string in the default configuration, or None if the resource is not a string
+        """
+        for _ in range(ResourceTable.__MAX_REFERENCES):
+            value = self.get_value(resource_id)
+            if value is None:
+                return None
+            value_type, data = value
+            if value_type == AxmlDocument.TYPE_STRING:
+                return self.__strings.get(data) if self.__strings is not None else None
+            if value_type != AxmlDocument.TYPE_REFERENCE:
+                return None
+            resource_id = data
+        return None
@@ -0,0 +1,341 @@
+import struct
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.parsers import expat
+
+
+class StringPool:
+    """
+    Lazily decoded view of a string pool chunk (ResStringPool), as used by binary XML and resources.arsc files.
+    """
+
+    TYPE = 0x0001
+
+    __HEADER = struct.Struct("<HHIIIIII")
+    __UTF8_FLAG = 0x100
+
+    def __init__(self, data: bytes, offset: int = 0):
+        """
+        :param data: content of the file containing the string pool
+        :param offset: position of the string pool chunk in the given content
+        :raise: ValueError if the content is not a valid string pool
+        """
+        if offset + StringPool.__HEADER.size > len(data):
+            raise ValueError("Truncated string pool")
+        chunk_type, header_size, size, count, _, flags, strings_start, _ = StringPool.__HEADER.unpack_from(data, offset)
+        if chunk_type != StringPool.TYPE or offset + size > len(data) or offset + header_size + 4 * count > len(data):
+            raise ValueError("Not a string pool")
+        self.__data = data
+        self.__strings_start = offset + strings_start
+        self.__utf8 = flags & StringPool.__UTF8_FLAG != 0
+        self.__offsets = struct.unpack_from(f"<{count}I", data, offset + header_size)
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def __getitem__(self, index: int) -> str:
+        offset = self.__strings_start + self.__offsets[index]
+        try:
+            if self.__utf8:
+                # NOTE: UTF-8 strings start with both their UTF-16 length and their UTF-8 length, on 1 or 2 bytes each.
+                offset += 2 if self.__data[offset] & 0x80 else 1
+                length = self.__data[offset]
+                if length & 0x80:
+                    length = (length & 0x7f) << 8 | self.__data[offset + 1]
+                    offset += 1
+                offset += 1
+                return bytes(self.__data[offset:offset + length]).decode("utf-8", "replace")
+            length = struct.unpack_from("<H", self.__data, offset)[0]
+            offset += 2
+            if length & 0x8000:
+                length = (length & 0x7fff) << 16 | struct.unpack_from("<H", self.__data, offset)[0]
+                offset += 2
+            return bytes(self.__data[offset:offset + 2 * length]).decode("utf-16-le", "replace")
+        except (IndexError, struct.error) as error:
+            raise ValueError("Truncated string") from error
+
+    def get(self, index: int) -> Optional[str]:
+        """
+        :return: the string at the given index, or None if there is no such string (e.g. 0xFFFFFFFF, the "no string")
+        """
+        if 0 <= index < len(self.__offsets):
+            return self[index]
+        return None
+
+
+class AxmlAttribute(NamedTuple):
+    """
+    Attribute of a binary XML element: its value is either a string (i.e. raw_value) or typed data.
+    """
+
+    namespace: str
+    name: str
+    resource_id: Optional[int]
+    raw_value: Optional[str]
+    value_type: int
+    data: int
+
+    TYPE_REFERENCE = 0x01
+    TYPE_ATTRIBUTE = 0x02
+    TYPE_STRING = 0x03
+    TYPE_FLOAT = 0x04
+    TYPE_DIMENSION = 0x05
+    TYPE_FRACTION = 0x06
+    TYPE_INT_DEC = 0x10
+    TYPE_INT_HEX = 0x11
+    TYPE_INT_BOOLEAN = 0x12
+    TYPE_FIRST_COLOR_INT = 0x1c
+    TYPE_LAST_COLOR_INT = 0x1f
+
+    DIMENSION_UNITS = ("px", "dip", "sp", "pt", "in", "mm")
+    FRACTION_UNITS = ("%", "%p")
+    RADIX_MULTIPLIERS = (1.0 / (1 << 8), 1.0 / (1 << 15), 1.0 / (1 << 23), 1.0 / (1 << 31))
+
+    # pylint: disable=too-many-return-statements
+    def get_value(self) -> str:
+        """
+        :return: the value of the attribute as text, the same as it is shown by decompiling the binary XML file (e.g.
+                 "1" for android:versionCode, "true" for android:exported and "@7F040000" for a string resource)
+        """
+        if self.value_type == AxmlAttribute.TYPE_STRING:
+            # NOTE: like aapt, the strings are read up to their first NUL character.
+            return (self.raw_value or "").split("\x00", 1)[0]
+        if self.value_type in (AxmlAttribute.TYPE_REFERENCE, AxmlAttribute.TYPE_ATTRIBUTE):
+            prefix = "@" if self.value_type == AxmlAttribute.TYPE_REFERENCE else "?"
+            package = "android:" if self.data >> 24 == 1 else ""
+            return f"{prefix}{package}{self.data:08X}"
+        if self.value_type == AxmlAttribute.TYPE_FLOAT:
+            return f"{struct.unpack('<f', struct.pack('<I', self.data))[0]:f}"
+        if self.value_type == AxmlAttribute.TYPE_INT_HEX:
+            return f"0x{self.data:08X}"
+        if self.value_type == AxmlAttribute.TYPE_INT_BOOLEAN:
+            return "false" if self.data == 0 else "true"
+        if self.value_type == AxmlAttribute.TYPE_DIMENSION:
+            unit = AxmlAttribute.DIMENSION_UNITS[self.data & 0xf] if self.data & 0xf < 6 else ""
+            return f"{self.__get_complex_value():f}{unit}"
+        if self.value_type == AxmlAttribute.TYPE_FRACTION:
+            unit = AxmlAttribute.FRACTION_UNITS[self.data & 0xf] if self.data & 0xf < 2 else ""
+            return f"{self.__get_complex_value() * 100:f}{unit}"
+        if AxmlAttribute.TYPE_FIRST_COLOR_INT <= self.value_type <= AxmlAttribute.TYPE_LAST_COLOR_INT:
+            return f"#{self.data:08X}"
+        if AxmlAttribute.TYPE_INT_DEC <= self.value_type <= AxmlAttribute.TYPE_LAST_COLOR_INT:
+            return str(self.data - (1 << 32) if self.data & 0x80000000 else self.data)
+        return f"<0x{self.data:X}, type 0x{self.value_type:02X}>"
+
+    def __get_complex_value(self) -> float:
+        return float(self.data & 0xffffff00) * AxmlAttribute.RADIX_MULTIPLIERS[(self.data >> 4) & 3]
+
+
+class AxmlElement(NamedTuple):
+    """
+    Start (with attributes) or end (without attributes) of a binary XML element.
+    """
+
+    namespace: str
+    name: str
+    attributes: Tuple[AxmlAttribute, ...] = ()
+
+    ANDROID_NAMESPACE = "http://schemas.android.com/apk/res/android"
+
+    def get_attribute(self, resource_id: Optional[int], name: str) -> Optional[AxmlAttribute]:
+        """
+        :param resource_id: the resource id of the android: attribute (e.g. 0x01010001 for android:label), or None if
+                            it is not an android: attribute (e.g. the package of the manifest)
+        :param name: the local name of the attribute, used only if the attribute has no resource id (e.g. in a text
+                     XML file), together with its namespace
+        """
+        if resource_id is not None:
+            for attribute in self.attributes:
+                if attribute.resource_id == resource_id:
+                    return attribute
+        # NOTE: an un-namespaced attribute (e.g. name) is not the android: one (e.g. android:name), and vice versa.
+        namespace = AxmlElement.ANDROID_NAMESPACE if resource_id is not None else ""
+        for attribute in self.attributes:
+            if attribute.resource_id is None and attribute.name == name and attribute.namespace == namespace:
+                return attribute
+        return None
+
+
+# pylint: disable=too-few-public-methods
+class AxmlDocument:
+    """
+    Reader of Android binary XML files (e.g. the AndroidManifest.xml of an APK package), chunk by chunk.
+    """
+
+    START_ELEMENT = 0x0102
+    END_ELEMENT = 0x0103
+
+    TYPE_REFERENCE = 0x01
+    TYPE_STRING = 0x03
+
+    __XML_TYPE = 0x0003
+    __RESOURCE_MAP_TYPE = 0x0180
+    __CHUNK_HEADER = struct.Struct("<HHI")
+    __ELEMENT = struct.Struct("<IIHHH")
+    __END_ELEMENT = struct.Struct("<II")
+    __ATTRIBUTE = struct.Struct("<IIIHBBI")
+    __NO_INDEX = 0xFFFFFFFF
+
+    def __init__(self, data: bytes):
+        """
+        :param data: content of the binary XML file
+        :raise: ValueError if the content is not a valid binary XML file
+        """
+        if len(data) < AxmlDocument.__CHUNK_HEADER.size:
+            raise ValueError("Not a binary XML file")
+        chunk_type, header_size, _ = AxmlDocument.__CHUNK_HEADER.unpack_from(data, 0)
+        if chunk_type != AxmlDocument.__XML_TYPE or header_size < AxmlDocument.__CHUNK_HEADER.size:
+            raise ValueError("Not a binary XML file")
+        self.__data = data
+        self.__start = header_size
+        self.__strings = None
+        self.__resource_ids = ()
+
+    def iter_elements(self) -> Iterator[Tuple[int, AxmlElement]]:
+        """
+        :return: the (START_ELEMENT or END_ELEMENT, element) events, in document order
+        :raise: ValueError if the content is malformed
+        """
+        offset = self.__start
+        while offset + AxmlDocument.__CHUNK_HEADER.size <= len(self.__data):
+            chunk_type, header_size, size = AxmlDocument.__CHUNK_HEADER.unpack_from(self.__data, offset)
+            if not AxmlDocument.__CHUNK_HEADER.size <= header_size <= size or offset + size > len(self.__data):
+                raise ValueError("Malformed chunk")
+            event = self.__parse_chunk(chunk_type, offset, header_size, size)
+            if event is not None:
+                yield event
+            offset += size
+
+    def __parse_chunk(
+            self,
+            chunk_type: int,
+            offset: int,
+            header_size: int,
+            size: int
+    ) -> Optional[Tuple[int, AxmlElement]]:
+        """
+        :return: the (START_ELEMENT or END_ELEMENT, element) event of the chunk, if any
+        :raise: ValueError if the chunk is malformed
+        """
+        try:
+            if chunk_type == StringPool.TYPE and self.__strings is None:
+                self.__strings = StringPool(self.__data, offset)
+            elif chunk_type == AxmlDocument.__RESOURCE_MAP_TYPE:
+                count = (size - header_size) // 4
+                self.__resource_ids = struct.unpack_from(f"<{count}I", self.__data, offset + header_size)
+            elif chunk_type == AxmlDocument.START_ELEMENT:
+                return chunk_type, self.__parse_start_element(offset + header_size)
+            elif chunk_type == AxmlDocument.END_ELEMENT:
+                return chunk_type, self.__parse_end_element(offset + header_size)
+        except struct.error as error:
+            raise ValueError("Malformed chunk") from error
+        return None
+
+    # pylint: disable=too-many-locals
+    def __parse_start_element(self, start: int) -> AxmlElement:
+        # NOTE: the element comes right after the node header, whose size is not always the usual 16 bytes (e.g. some
+        #       obfuscators pad it).
+        try:
+            namespace, name, attribute_start, attribute_size, attribute_count = AxmlDocument.__ELEMENT.unpack_from(
+                self.__data,
+                start
+            )
+            attributes = []
+            for index in range(attribute_count):
+                attribute_namespace, attribute_name, raw_value, _, _, value_type, data = \
+                    AxmlDocument.__ATTRIBUTE.unpack_from(self.__data, start + attribute_start + index * attribute_size)
+                attributes.append(AxmlAttribute(
+                    namespace=self.__get_string(attribute_namespace),
+                    name=self.__get_string(attribute_name),
+                    resource_id=self.__get_resource_id(attribute_name),
+                    raw_value=self.__get_string(raw_value) if raw_value != AxmlDocument.__NO_INDEX else None,
+                    value_type=value_type,
+                    data=data
+                ))
+        except struct.error as error:
+            raise ValueError("Truncated element") from error
+        return AxmlElement(self.__get_string(namespace), self.__get_string(name), tuple(attributes))
+
+    def __parse_end_element(self, start: int) -> AxmlElement:
+        try:
+            namespace, name = AxmlDocument.__END_ELEMENT.unpack_from(self.__data, start)
+        except struct.error as error:
+            raise ValueError("Truncated element") from error
+        return AxmlElement(self.__get_string(namespace), self.__get_string(name))
+
+    def __get_string(self, index: int) -> str:
+        if self.__strings is None:
+            raise ValueError("Missing string pool")
+        string = self.__strings.get(index)
+        return string if string is not None else ""
+
+    def __get_resource_id(self, index: int) -> Optional[int]:
+        # NOTE: the resource map lists the resource ids of the first strings of the pool (i.e. the attribute names), in
+        #       order, which is what identifies the attributes even when their names are obfuscated.
+        if index < len(self.__resource_ids):
+            return self.__resource_ids[index]
+        return None
+
+
+# pylint: disable=too-few-public-methods
+class XmlDocument:
+    """
+    Streaming reader of text XML files (e.g. a decoded AndroidManifest.xml), with the same events of AxmlDocument, so
+    that they can be read by the same code.
+    """
+
+    __CHUNK_SIZE = 64 * 1024
+    __NAMESPACE_SEPARATOR = " "
+
+    def __init__(self, stream: BinaryIO):
+        """
+        :param stream: binary stream of the text XML file
+        """
+        self.__stream = stream
+        # NOTE: the same few names (e.g. android:name) are split over and over.
+        self.__names: Dict[str, Tuple[str, str]] = {}
+
+    def iter_elements(self) -> Iterator[Tuple[int, AxmlElement]]:
+        """
+        :return: the (START_ELEMENT or END_ELEMENT, element) events, in document order, where the attribute values are
+                 all strings
+        :raise: ValueError if the content is malformed
+        """
+        events: List[Tuple[int, AxmlElement]] = []
+        parser = expat.ParserCreate(namespace_separator=XmlDocument.__NAMESPACE_SEPARATOR)
+        parser.StartElementHandler = lambda name, attributes: events.append(
+            (AxmlDocument.START_ELEMENT, self.__get_element(name, attributes))
+        )
+        parser.EndElementHandler = lambda name: events.append(
+            (AxmlDocument.END_ELEMENT, self.__get_element(name, {}))
+        )
+        while True:
+            chunk = self.__stream.read(XmlDocument.__CHUNK_SIZE)
+            try:
+                parser.Parse(chunk, not chunk)
+            except expat.ExpatError as error:
+                raise ValueError(f"Malformed XML: {error}") from error
+            yield from events
+            events.clear()
+            if not chunk:
+                break
+
+    def __get_element(self, name: str, attributes: Dict[str, str]) -> AxmlElement:
+        namespace, name = self.__split_name(name)
+        return AxmlElement(
+            namespace,
+            name,
+            tuple(
+                AxmlAttribute(*self.__split_name(attribute), None, value, AxmlAttribute.TYPE_STRING, 0)
+                for attribute, value in attributes.items()
+            )
+        )
+
+    def __split_name(self, name: str) -> Tuple[str, str]:
+        """
+        :return: the (namespace, local name) of the given expat name (i.e. "NAMESPACE NAME", or just "NAME")
+        """
+        split_name = self.__names.get(name)
+        if split_name is None:
+            namespace, _, local_name = name.rpartition(XmlDocument.__NAMESPACE_SEPARATOR)
+            split_name = self.__names[name] = (namespace, local_name)
+        return split_name
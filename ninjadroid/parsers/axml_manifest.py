@@ -0,0 +1,197 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ninjadroid.parsers.axml import AxmlDocument, AxmlElement
+
+
+# pylint: disable=too-many-instance-attributes
+class AxmlManifest:
+    """
+    Reader of an AndroidManifest.xml file, collecting its summary (i.e. root and uses-sdk elements, permissions) and
+    its app components in a single pass over its elements: the chunks of the binary file, without decompiling it into
+    XML first, the SAX events of the text one, without building its DOM first, or the lines of its aapt dump.
+
+    The lookups have the same semantic of the DOM getElementsByTagName() ones (e.g. the meta-data and intent filters of
+    a component are all those among its descendants, the components are those of the first application element),
+    while the android: attributes are identified by their resource id, hence also when their names are obfuscated.
+    """
+
+    ACTIVITY = "activity"
+    SERVICE = "service"
+    RECEIVER = "receiver"
+    COMPONENTS = (ACTIVITY, SERVICE, RECEIVER)
+
+    # NOTE: the resource ids of the android: attributes (i.e. android.R.attr).
+    __ANDROID_ATTRIBUTES = {
+        "enabled": 0x0101000e,
+        "exported": 0x01010010,
+        "isolatedProcess": 0x010103a9,
+        "launchMode": 0x0101001d,
+        "maxSdkVersion": 0x01010271,
+        "mimeType": 0x01010026,
+        "minSdkVersion": 0x0101020c,
+        "name": 0x01010003,
+        "noHistory": 0x0101022d,
+        "parentActivityName": 0x010103a7,
+        "priority": 0x0101001c,
+        "process": 0x01010011,
+        "scheme": 0x01010027,
+        "targetSdkVersion": 0x01010270,
+        "value": 0x01010024,
+        "versionCode": 0x0101021b,
+        "versionName": 0x0101021c,
+    }
+    __COMPONENT_OPENED = "component"
+    __INTENT_FILTER_OPENED = "intent-filter"
+    __APPLICATION_OPENED = "application"
+
+    def __init__(self, elements: Iterator[Tuple[int, AxmlElement]], extended_processing: bool = True):
+        """
+        :param elements: the (START_ELEMENT or END_ELEMENT, element) events of the AndroidManifest.xml file, as read
+                         from its binary (i.e. AxmlDocument) or text (i.e. XmlDocument) format, or from its aapt dump
+                         (i.e. AaptXmlTree)
+        :param extended_processing: (optional) whether to collect the app components too. True by default.
+        :raise: ValueError if the content is not a valid XML file
+        """
+        self.__extended_processing = extended_processing
+        self.__root: Optional[AxmlElement] = None
+        self.__sdk: Optional[AxmlElement] = None
+        self.__permissions: List[str] = []
+        self.__components: Dict[str, List[Dict]] = {tag: [] for tag in AxmlManifest.COMPONENTS}
+        # NOTE: what each open element has opened (if anything), so that its end closes it.
+        self.__opened: List[Optional[str]] = []
+        self.__open_components: List[Dict] = []
+        self.__open_intent_filters: List[Dict] = []
+        self.__application: Optional[bool] = None
+        for event, element in elements:
+            if event == AxmlDocument.START_ELEMENT:
+                self.__opened.append(self.__start_element(element))
+            elif self.__opened and self.__end_element():
+                # NOTE: whatever follows the root element (e.g. garbage appended by a packer) is not read at all.
+                break
+        if self.__root is None:
+            raise ValueError("Missing root element")
+
+    def get_root(self) -> AxmlElement:
+        return self.__root
+
+    def get_sdk(self) -> Optional[AxmlElement]:
+        """
+        :return: the first uses-sdk element, if any
+        """
+        return self.__sdk
+
+    def get_permissions(self) -> List[str]:
+        return self.__permissions
+
+    def get_components(self, tag: str) -> List[Dict]:
+        """
+        :param tag: the tag of the components (i.e. ACTIVITY, SERVICE or RECEIVER)
+        :return: the components, each one as its "element" together with its "meta-data" and "intent-filter" lists
+        """
+        return self.__components[tag]
+
+    # pylint: disable=too-many-branches
+    def __start_element(self, element: AxmlElement) -> Optional[str]:
+        """
+        :return: what the element opens, if anything (i.e. the application, a component or an intent filter)
+        """
+        name = element.name
+        if self.__root is None:
+            self.__root = element
+        elif name == "uses-sdk":
+            if self.__sdk is None:
+                self.__sdk = element
+        elif name == "uses-permission":
+            self.__permissions.append(AxmlManifest.get_attribute(element, "name") or "")
+        elif not self.__extended_processing:
+            pass
+        elif name == "application":
+            if self.__application is None:
+                self.__application = True
+                return AxmlManifest.__APPLICATION_OPENED
+        elif not self.__application:
+            pass
+        elif name in self.__components:
+            component = {"element": element, "meta-data": [], "intent-filter": []}
+            self.__components[name].append(component)
+            self.__open_components.append(component)
+            return AxmlManifest.__COMPONENT_OPENED
+        elif name == "meta-data":
+            metadata = AxmlManifest.get_attributes(element, {"name": "name", "value": "value"})
+            for component in self.__open_components:
+                component["meta-data"].append(metadata)
+        elif name == "intent-filter":
+            intent_filter = {"element": element, "action": [], "category": [], "data": []}
+            for component in self.__open_components:
+                component["intent-filter"].append(intent_filter)
+            self.__open_intent_filters.append(intent_filter)
+            return AxmlManifest.__INTENT_FILTER_OPENED
+        elif name in ("action", "category"):
+            for intent_filter in self.__open_intent_filters:
+                intent_filter[name].append(AxmlManifest.get_attribute(element, "name") or "")
+        elif name == "data":
+            data = AxmlManifest.get_attributes(element, {"scheme": "scheme", "mimeType": "mimeType"})
+            for intent_filter in self.__open_intent_filters:
+                intent_filter["data"].append(data)
+        return None
+
+    def __end_element(self) -> bool:
+        """
+        :return: whether the root element has ended
+        """
+        closed = self.__opened.pop()
+        if closed == AxmlManifest.__COMPONENT_OPENED:
+            self.__open_components.pop()
+        elif closed == AxmlManifest.__INTENT_FILTER_OPENED:
+            self.__open_intent_filters.pop()
+        elif closed == AxmlManifest.__APPLICATION_OPENED:
+            self.__application = False
+        return not self.__opened
+
+    @staticmethod
+    def get_intent_filters(component: Dict) -> List[Dict]:
+        """
+        :return: the intent filters of the component, as dicts with the "priority", "action", "category" and "data"
+                 keys (if any)
+        """
+        intent_filters = []
+        for intent_filter in component["intent-filter"]:
+            res = AxmlManifest.get_attributes(intent_filter["element"], {"priority": "priority"})
+            for key in ("action", "category"):
+                if intent_filter[key]:
+                    res[key] = sorted(intent_filter[key])
+            if intent_filter["data"]:
+                res["data"] = intent_filter["data"]
+            intent_filters.append(res)
+        return intent_filters
+
+    @staticmethod
+    def get_attribute(element: Optional[AxmlElement], name: str) -> Optional[str]:
+        """
+        :param element: the element, if any
+        :param name: the name of the attribute (e.g. "name" for android:name, "package" for package)
+        :return: the value of the attribute as text, or None if there is no such attribute
+        """
+        if element is None:
+            return None
+        attribute = element.get_attribute(AxmlManifest.__ANDROID_ATTRIBUTES.get(name), name)
+        return attribute.get_value() if attribute is not None else None
+
+    @staticmethod
+    def get_bool_attribute(element: Optional[AxmlElement], name: str) -> Optional[bool]:
+        value = AxmlManifest.get_attribute(element, name)
+        return value == "true" if value is not None else None
+
+    @staticmethod
+    def get_attributes(element: AxmlElement, attributes: Dict[str, str]) -> Dict:
+        """
+        :param element: the element
+        :param attributes: the names of the attributes to get, by key
+        :return: the value of the attributes as text by key, leaving out the missing ones
+        """
+        res = {}
+        for key, name in attributes.items():
+            value = AxmlManifest.get_attribute(element, name)
+            if value is not None:
+                res[key] = value
+        return res
@@ -0,0 +1,245 @@
+from collections import OrderedDict
+import hashlib
+import json
+from logging import getLogger
+import os
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ninjadroid.parsers.file import File, HashProfile
+from ninjadroid.signatures.shell_signature import ShellSignature
+from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.uri_signature import UriSignature
+
+
+default_logger = getLogger(__name__)
+
+
+class ResultCache:
+    """
+    On-disk cache of the APK analyses (i.e. APK.as_dict()), content-addressed by the sha256 of the APK package.
+
+    The key also covers whatever else changes the analysis (i.e. NinjaDroid version, signature configs, extended
+    processing and digests), hence stale entries are never returned but just left to the LRU eviction, which keeps the
+    whole cache below a maximum size.
+    """
+
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+    __EXTENSION = ".json"
+    __SIGNATURE_CLASSES = (UriSignature, ShellSignature, Signature)
+
+    def __init__(self, directory: str, version: str, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        :param directory: the cache directory, created on first use
+        :param version: the NinjaDroid version
+        :param max_size: (optional) the maximum size of the cache in bytes, after which the least recently used
+                         entries are evicted. 256 MiB by default.
+        """
+        self.directory = directory
+        self.version = version
+        self.max_size = max_size
+        self.__signatures = None
+        # NOTE: the size of the cache as last scanned plus what has been written since, so that the entries are only
+        # scanned again (i.e. evicted) once it exceeds the maximum size, rather than on every put().
+        self.__size: Optional[int] = None
+        self.__size_lock = Lock()
+
+    def __getstate__(self) -> Dict:
+        # NOTE: the cache is passed to the worker processes of a batch, hence it must be picklable, which the lock is
+        # not. Each process keeps track of its own size, starting with a scan of the cache.
+        state = self.__dict__.copy()
+        del state["_ResultCache__size_lock"]
+        state["_ResultCache__size"] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self.__size_lock = Lock()
+
+    @staticmethod
+    def get_default_directory() -> str:
+        """
+        :return: the "ninjadroid" directory in the user cache directory (i.e. $XDG_CACHE_HOME, or ~/.cache)
+        """
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cache_home, "ninjadroid")
+
+    def get_key(self, sha256: str, extended_processing: bool, hash_profile: HashProfile) -> str:
+        """
+        :param sha256: the sha256 of the APK package
+        :param extended_processing: whether the analysis retrieves all the information or only a summary
+        :param hash_profile: the digests computed by the analysis
+        :return: the cache key of the analysis
+        """
+        if self.__signatures is None:
+            self.__signatures = {
+                signature_class.__name__: signature_class.get_config_hash()
+                for signature_class in ResultCache.__SIGNATURE_CLASSES
+            }
+        key = {
+            "sha256": sha256,
+            "version": self.version,
+            "signatures": self.__signatures,
+            "extended_processing": extended_processing,
+            "hashes": {category: hash_profile.get_algorithms(category) for category in HashProfile.CATEGORIES},
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        :param key: the cache key
+        :return: the cached analysis, or None if there is no such (readable) entry
+        """
+        path = self.__get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as entry:
+                dump = json.load(entry)
+            # NOTE: the modification time is the last use, which is what the eviction looks at.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            default_logger.debug("Cannot read cache entry %s: %s", path, error)
+            self.__remove(path)
+            return None
+        return dump
+
+    def put(self, key: str, dump: Dict):
+        """
+        :param key: the cache key
+        :param dump: the analysis to store, which must be JSON serializable
+        """
+        path = self.__get_path(key)
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # NOTE: the entry is written aside and then moved in place, so that concurrent readers (e.g. --jobs workers)
+            # never see it half-written.
+            directory = os.path.dirname(path)
+            with NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as tmp:
+                json.dump(dump, tmp, ensure_ascii=False)
+            size = os.path.getsize(tmp.name)
+            os.replace(tmp.name, path)
+        except (OSError, TypeError, ValueError) as error:
+            default_logger.warning("Cannot write cache entry %s: %s", path, error)
+            if tmp is not None:
+                self.__remove(tmp.name)
+            return
+        with self.__size_lock:
+            if self.__size is not None:
+                # NOTE: overwritten entries (or entries written by other processes) make this an estimate, which the
+                # next eviction corrects anyway.
+                self.__size += size
+                if self.__size <= self.max_size:
+                    return
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used entries, until the cache is no bigger than its maximum size.
+        """
+        entries = self.__list_entries()
+        size = sum(entry_size for _, _, entry_size in entries)
+        for _, path, entry_size in sorted(entries):
+            if size <= self.max_size:
+                break
+            self.__remove(path)
+            size -= entry_size
+        with self.__size_lock:
+            self.__size = size
+
+    def clear(self):
+        for _, path, _ in self.__list_entries():
+            self.__remove(path)
+        with self.__size_lock:
+            self.__size = 0
+
+    def __get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ResultCache.__EXTENSION)
+
+    def __list_entries(self) -> List[Tuple[float, str, int]]:
+        """
+        :return: the (last use, path, size) of the cache entries
+        """
+        entries = []
+        try:
+            subdirectories = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for subdirectory in subdirectories:
+            try:
+                for entry in os.scandir(subdirectory.path):
+                    if entry.name.endswith(ResultCache.__EXTENSION):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.path, stat.st_size))
+            except OSError:
+                # NOTE: another process may be evicting the same entries.
+                continue
+        return entries
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class EntryKey(NamedTuple):
+    """
+    Identity of the content of an APK entry: CRC32 and size come for free from the zip central directory, while the
+    sha256 tells apart the (unlikely) different contents with the same CRC32 and size.
+    """
+
+    category: str
+    crc32: int
+    size: int
+    sha256: str
+
+
+class EntryCache:
+    """
+    In-memory LRU cache of the parsed APK entries (e.g. dex and cert files), so that the byte-identical entries shared
+    by many APK packages of a batch (e.g. common SDKs, repackaged apps, same signing certificate) are parsed once.
+    """
+
+    DEFAULT_MAX_ENTRIES = 32
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        :param max_entries: (optional) the maximum number of cached entries, after which the least recently used ones
+                            are evicted. 32 by default.
+        """
+        self.max_entries = max_entries
+        self.__entries: "OrderedDict[EntryKey, File]" = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def may_contain(self, category: str, crc32: int, size: int) -> bool:
+        """
+        :return: whether an entry with the same CRC32 and size is cached, meaning that the sha256 is worth computing
+        """
+        with self.__lock:
+            return any(key[:3] == (category, crc32, size) for key in self.__entries)
+
+    def get(self, key: EntryKey) -> Optional[File]:
+        with self.__lock:
+            file = self.__entries.get(key)
+            if file is not None:
+                self.__entries.move_to_end(key)
+            return file
+
+    def put(self, key: EntryKey, file: File):
+        with self.__lock:
+            self.__entries[key] = file
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
@@ -1,13 +1,16 @@
+import hashlib
 from logging import getLogger, Logger
 import re
 from subprocess import PIPE, Popen
 from datetime import datetime
 from fnmatch import fnmatch
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Sequence
 from dateutil.tz import tzutc
 from tzlocal import get_localzone
 
-from ninjadroid.parsers.file import File, FileParser, FileParsingError
+from ninjadroid.keytool.keytool import KeytoolWorker, KeytoolWorkerError
+from ninjadroid.parsers.file import File, FileParser, FileParsingError, HashProfile, Lazy, LazyDigests
+from ninjadroid.parsers.pkcs7 import Pkcs7Parser, X509Certificate
 
 
 default_logger = getLogger(__name__)
@@ -18,6 +21,8 @@ class CertValidity:
    CERT validity information.
    """
 
+    __slots__ = ("__from", "__to")
+
     def __init__(self, valid_from: str, valid_to: str):
         self.__from = valid_from
         self.__to = valid_to
@@ -39,12 +44,18 @@ class CertValidity:
             "until": self.__to
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "CertValidity":
+        return CertValidity(valid_from=dump["from"], valid_to=dump["until"])
+
 
 class CertFingerprint:
     """
    CERT fingerprint information.
    """
 
+    __slots__ = ("__md5", "__sha1", "__sha256", "__signature", "__version")
+
     # pylint: disable=too-many-arguments
     def __init__(self, md5: str, sha1: str, sha256: str, signature: str, version: str):
         self.__md5 = md5
@@ -85,6 +96,16 @@ class CertFingerprint:
             "version": self.__version
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "CertFingerprint":
+        return CertFingerprint(
+            md5=dump["md5"],
+            sha1=dump["sha1"],
+            sha256=dump["sha256"],
+            signature=dump["signature"],
+            version=dump["version"]
+        )
+
 
 # pylint: disable=too-many-instance-attributes
 class CertParticipant:
@@ -92,6 +113,8 @@ class CertParticipant:
    CERT owner/issuer information.
    """
 
+    __slots__ = ("__name", "__email", "__unit", "__organization", "__city", "__state", "__country", "__domain")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -160,12 +183,27 @@ class CertParticipant:
             "domain": self.__domain,
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "CertParticipant":
+        return CertParticipant(
+            name=dump["name"],
+            email=dump["email"],
+            unit=dump["unit"],
+            organization=dump["organization"],
+            city=dump["city"],
+            state=dump["state"],
+            country=dump["country"],
+            domain=dump["domain"]
+        )
+
 
 class Cert(File):
     """
    Android CERT.RSA/DSA certificate file information.
    """
 
+    __slots__ = ("__serial_number", "__validity", "__fingerprint", "__owner", "__issuer")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -205,13 +243,67 @@ class Cert(File):
 
     def as_dict(self) -> Dict:
         dump = super().as_dict()
-        dump["serial_number"] = self.__serial_number
-        dump["validity"] = self.__validity.as_dict()
-        dump["fingerprint"] = self.__fingerprint.as_dict()
-        dump["owner"] = self.__owner.as_dict()
-        dump["issuer"] = self.__issuer.as_dict()
+        dump["serial_number"] = self.get_serial_number()
+        dump["validity"] = self.get_validity().as_dict()
+        dump["fingerprint"] = self.get_fingerprint().as_dict()
+        dump["owner"] = self.get_owner().as_dict()
+        dump["issuer"] = self.get_issuer().as_dict()
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "Cert":
+        return Cert(
+            filename=dump["file"],
+            size=dump["size"],
+            md5hash=dump["md5"],
+            sha1hash=dump["sha1"],
+            sha256hash=dump["sha256"],
+            sha512hash=dump["sha512"],
+            serial_number=dump["serial_number"],
+            validity=CertValidity.from_dict(dump["validity"]),
+            fingerprint=CertFingerprint.from_dict(dump["fingerprint"]),
+            owner=CertParticipant.from_dict(dump["owner"]),
+            issuer=CertParticipant.from_dict(dump["issuer"])
+        )
+
+
+class LazyCert(LazyDigests, Cert):
+    """
+    Android CERT.RSA/DSA certificate file information, computed on first access: the digests and the certificate
+    details (i.e. serial number, validity, fingerprint, owner and issuer).
+    """
+
+    def __init__(self, filename: str, size: int, read: Callable[[], bytes], parser: "CertParser"):
+        """
+        :param filename: name of the CERT file
+        :param size: size of the CERT file
+        :param read: the reading of the CERT file content, called on demand (i.e. for the digests and for the details)
+        :param parser: the CERT parser, which selects the digests to compute
+        :raise: CertParsingError, on the first access to the certificate details, if cannot parse the file as a CERT
+        """
+        Cert.__init__(self, filename, size, "", "", "", "", "", None, None, None, None)
+        LazyDigests.__init__(
+            self,
+            lambda: FileParser(parser.logger, parser.hash_algorithms).parse_bytes(read(), filename)
+        )
+        # NOTE: the details are parsed without digests, as those are computed only if asked.
+        self.__cert = Lazy(lambda: CertParser(parser.logger, ()).parse_bytes(read(), filename))
+
+    def get_serial_number(self) -> str:
+        return self.__cert.get().get_serial_number()
+
+    def get_validity(self) -> CertValidity:
+        return self.__cert.get().get_validity()
+
+    def get_fingerprint(self) -> CertFingerprint:
+        return self.__cert.get().get_fingerprint()
+
+    def get_owner(self) -> CertParticipant:
+        return self.__cert.get().get_owner()
+
+    def get_issuer(self) -> CertParticipant:
+        return self.__cert.get().get_issuer()
+
 
 class CertParsingError(FileParsingError):
     """
@@ -230,8 +322,9 @@ class CertParser:
     Parser implementation for Android CERT.RSA/DSA certificate file.
     """
 
-    def __init__(self, logger: Logger = default_logger):
+    def __init__(self, logger: Logger = default_logger, hash_algorithms: Sequence[str] = HashProfile.ALGORITHMS):
         self.logger = logger
+        self.hash_algorithms = hash_algorithms
 
     def parse(self, filepath: str, filename: str = "") -> Cert:
         """
@@ -242,9 +335,83 @@ class CertParser:
         :raise: CertParsingError if cannot parse the file as a CERT
         """
         self.logger.debug("Parsing CERT file: filepath=\"%s\", filename=\"%s\"", filepath, filename)
-        file = FileParser(self.logger).parse(filepath, filename)
+        file = FileParser(self.logger, self.hash_algorithms).parse(filepath, filename)
+        with open(filepath, "rb") as cert:
+            certificate = self.__parse_certificate(cert.read())
+        if certificate is not None:
+            return self.__build_cert_from_certificate(file, certificate)
         raw = self.parse_cert(filepath)
+        return self.__build_cert(file, raw)
+
+    def parse_bytes(self, raw: bytes, filename: str) -> Cert:
+        """
+        :param raw: content of the CERT file
+        :param filename: name of the CERT file
+        :return: the parsed CERT file
+        :raise: CertParsingError if cannot parse the file as a CERT
+        """
+        self.logger.debug("Parsing CERT file from memory: filename=\"%s\"", filename)
+        file = FileParser(self.logger, self.hash_algorithms).parse_bytes(raw, filename)
+        certificate = self.__parse_certificate(raw)
+        if certificate is not None:
+            return self.__build_cert_from_certificate(file, certificate)
+        return self.__build_cert(file, self.parse_cert_from_bytes(raw))
+
+    def __parse_certificate(self, raw: bytes) -> Optional[X509Certificate]:
+        try:
+            certificates = Pkcs7Parser.parse(raw)
+        except ValueError as error:
+            self.logger.debug("Cannot parse CERT file natively, falling back to keytool: %s", error)
+            return None
+        if not certificates:
+            self.logger.debug("No certificates in CERT file, falling back to keytool")
+            return None
+        # NOTE: as keytool, the first certificate is the one shown.
+        return certificates[0]
+
+    @staticmethod
+    def __build_cert_from_certificate(file: File, certificate: X509Certificate) -> Cert:
+        return Cert(
+            filename=file.get_file_name(),
+            size=file.get_size(),
+            md5hash=file.get_md5(),
+            sha1hash=file.get_sha1(),
+            sha256hash=file.get_sha256(),
+            sha512hash=file.get_sha512(),
+            serial_number=format(certificate.serial_number, "x"),
+            validity=CertValidity(
+                valid_from=certificate.valid_from.strftime("%Y-%m-%d %H:%M:%SZ"),
+                valid_to=certificate.valid_to.strftime("%Y-%m-%d %H:%M:%SZ")
+            ),
+            fingerprint=CertFingerprint(
+                md5=CertParser.__get_fingerprint(hashlib.md5, certificate.encoded),
+                sha1=CertParser.__get_fingerprint(hashlib.sha1, certificate.encoded),
+                sha256=CertParser.__get_fingerprint(hashlib.sha256, certificate.encoded),
+                signature=certificate.signature_algorithm,
+                version=str(certificate.version)
+            ),
+            owner=CertParser.__build_participant(certificate.subject),
+            issuer=CertParser.__build_participant(certificate.issuer)
+        )
 
+    @staticmethod
+    def __get_fingerprint(algorithm: Callable, encoded: bytes) -> str:
+        return algorithm(encoded).digest().hex(":").upper()
+
+    @staticmethod
+    def __build_participant(name: Dict[str, str]) -> CertParticipant:
+        return CertParticipant(
+            name=name.get("CN", ""),
+            email=name.get("EMAILADDRESS", ""),
+            unit=name.get("OU", ""),
+            organization=name.get("O", ""),
+            city=name.get("L", ""),
+            state=name.get("ST", ""),
+            country=name.get("C", ""),
+            domain=name.get("DC", "")
+        )
+
+    def __build_cert(self, file: File, raw: str) -> Cert:
         return Cert(
             filename=file.get_file_name(),
             size=file.get_size(),
@@ -261,7 +428,10 @@ class CertParser:
 
     @staticmethod
     def parse_cert(filepath: str) -> str:
-        raw = ""
+        with open(filepath, "rb") as cert:
+            raw = CertParser.__print_cert_with_worker(cert.read())
+        if raw is not None:
+            return raw
         command = "keytool -printcert -file " + filepath
         with Popen(command, stdout=PIPE, stderr=None, shell=True) as process:
             raw = process.communicate()[0].decode("utf-8")
@@ -269,6 +439,38 @@ class CertParser:
             raise CertParsingError
         return raw
 
+    @staticmethod
+    def parse_cert_from_bytes(cert: bytes) -> str:
+        raw = CertParser.__print_cert_with_worker(cert)
+        if raw is not None:
+            return raw
+        # NOTE: when no file is given, keytool reads the certificate from stdin.
+        command = "keytool -printcert"
+        with Popen(command, stdin=PIPE, stdout=PIPE, stderr=None, shell=True) as process:
+            raw = process.communicate(cert)[0].decode("utf-8")
+        if re.search("^keytool error", raw, re.IGNORECASE):
+            raise CertParsingError
+        return raw
+
+    @staticmethod
+    def __print_cert_with_worker(cert: bytes) -> Optional[str]:
+        """
+        :return: the keytool output from the shared keytool worker, or None if the worker is not available
+        :raise: CertParsingError if keytool cannot print the certificate
+        """
+        worker = KeytoolWorker.get()
+        if worker is None:
+            return None
+        try:
+            raw = worker.print_cert(cert)
+        except KeytoolWorkerError as error:
+            default_logger.debug("Cannot use keytool worker, falling back to keytool: %s", error)
+            KeytoolWorker.disable()
+            return None
+        if re.search("^keytool error", raw, re.IGNORECASE):
+            raise CertParsingError
+        return raw
+
     @staticmethod
     def parse_validity(raw: str) -> CertValidity:
         valid_from = ""
@@ -1,12 +1,13 @@
 from logging import getLogger, Logger
+from mmap import mmap, ACCESS_READ
 import re
-from subprocess import PIPE, Popen
-from typing import Dict, Optional, List
+import struct
+from typing import Callable, Dict, Optional, List, Sequence
 
-from ninjadroid.parsers.file import File, FileParser
+from ninjadroid.parsers.file import File, FileParser, HashProfile, Lazy, LazyDigests
 from ninjadroid.signatures.uri_signature import UriSignature
 from ninjadroid.signatures.shell_signature import ShellSignature
-from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.signature import Signature, SignatureRegistry
 
 
 default_logger = getLogger(__name__)
@@ -17,6 +18,8 @@ class Dex(File):
     Android dex file information.
     """
 
+    __slots__ = ("__strings", "__urls", "__commands", "__signatures")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -51,21 +54,130 @@ class Dex(File):
 
     def as_dict(self) -> Dict:
         dump = super().as_dict()
-        dump["strings"] = self.__strings
-        dump["urls"] = self.__urls
-        dump["shell_commands"] = self.__commands
-        # TODO: improve custom signatures parsing performance (commented in the meanwhile because far too slow)
-        # dump["custom_signatures"] = self.__signatures
+        dump["strings"] = self.get_strings()
+        dump["urls"] = self.get_urls()
+        dump["shell_commands"] = self.get_shell_commands()
+        dump["custom_signatures"] = self.get_custom_signatures()
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "Dex":
+        return Dex(
+            filename=dump["file"],
+            size=dump["size"],
+            md5hash=dump["md5"],
+            sha1hash=dump["sha1"],
+            sha256hash=dump["sha256"],
+            sha512hash=dump["sha512"],
+            strings=dump["strings"],
+            urls=dump["urls"],
+            shell_commands=dump["shell_commands"],
+            custom_signatures=dump["custom_signatures"]
+        )
+
+
+class LazyDex(LazyDigests, Dex):
+    """
+    Android dex file information, computed piece by piece on first access: the digests, the strings and each kind of
+    signature (i.e. URLs, shell commands and custom signatures).
+    """
+
+    def __init__(self, filename: str, size: int, read: Callable[[], bytes], parser: "DexParser"):
+        """
+        :param filename: name of the dex file
+        :param size: size of the dex file
+        :param read: the reading of the dex file content, called on demand (i.e. for the digests and for the strings)
+        :param parser: the dex parser, which selects the digests to compute
+        """
+        Dex.__init__(self, filename, size, "", "", "", "", [], [], [], [])
+        LazyDigests.__init__(
+            self,
+            lambda: FileParser(parser.logger, parser.hash_algorithms).parse_bytes(read(), filename)
+        )
+        self.__strings = Lazy(lambda: DexParser.parse_strings_from_bytes(read()))
+        self.__urls = Lazy(lambda: DexParser.parse_urls(self.get_strings()))
+        self.__commands = Lazy(lambda: DexParser.parse_shell_commands(self.get_strings()))
+        self.__signatures = Lazy(lambda: DexParser.parse_custom_signatures(self.get_strings()))
+
+    def get_strings(self) -> List[str]:
+        return self.__strings.get()
+
+    def get_urls(self) -> List[str]:
+        return self.__urls.get()
+
+    def get_shell_commands(self) -> List[str]:
+        return self.__commands.get()
+
+    def get_custom_signatures(self) -> List[str]:
+        return self.__signatures.get()
+
+
+class DexStringTable:
+    """
+    Lazily decoded view of the strings of a dex file, as listed in its string_ids section.
+    """
+
+    __MAGIC = b"dex\n"
+    __HEADER_SIZE = 0x70
+    __STRING_IDS_OFFSET = 0x38
+    __SURROGATES_REGEX = re.compile("[\ud800-\udfff]")
+
+    def __init__(self, data: bytes):
+        """
+        :param data: content of the dex file (i.e. bytes or memory-mapped file)
+        :raise: ValueError if the content is not a valid dex file
+        """
+        if len(data) < DexStringTable.__HEADER_SIZE or data[0:4] != DexStringTable.__MAGIC:
+            raise ValueError("Not a dex file")
+        size, offset = struct.unpack_from("<II", data, DexStringTable.__STRING_IDS_OFFSET)
+        if offset + 4 * size > len(data):
+            raise ValueError("Truncated string_ids section")
+        self.__data = data
+        self.__offsets = struct.unpack_from(f"<{size}I", data, offset)
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def __getitem__(self, index: int) -> str:
+        """
+        :raise: IndexError if there is no such string, ValueError if its string_data_item is corrupt (i.e. beyond the
+                end of the file or unterminated)
+        """
+        offset = self.__offsets[index]
+        # NOTE: each string_data_item starts with its UTF-16 length as ULEB128, which is not needed here.
+        while offset < len(self.__data) and self.__data[offset] & 0x80:
+            offset += 1
+        if offset >= len(self.__data):
+            raise ValueError("string_data_item beyond the end of the file")
+        start = offset + 1
+        end = self.__data.find(b"\x00", start)
+        if end == -1:
+            raise ValueError("Unterminated string_data_item")
+        return self.decode_mutf8(self.__data[start:end])
+
+    @staticmethod
+    def decode_mutf8(raw: bytes) -> str:
+        """
+        Decode a Modified UTF-8 (MUTF-8) string, as used by dex files: NUL is encoded as 0xC0 0x80 and supplementary
+        characters are encoded as surrogate pairs, each one of them on three bytes.
+        """
+        try:
+            string = raw.replace(b"\xc0\x80", b"\x00").decode("utf-8", "surrogatepass")
+        except UnicodeDecodeError:
+            return raw.decode("utf-8", "replace")
+        if DexStringTable.__SURROGATES_REGEX.search(string) is not None:
+            string = string.encode("utf-16-le", "surrogatepass").decode("utf-16-le", "replace")
+        return string
+
 
 class DexParser:
     """
     Parser implementation for Android dex files.
     """
 
-    def __init__(self, logger: Logger = default_logger):
+    def __init__(self, logger: Logger = default_logger, hash_algorithms: Sequence[str] = HashProfile.ALGORITHMS):
         self.logger = logger
+        self.hash_algorithms = hash_algorithms
 
     def parse(self, filepath: str, filename: str) -> Dex:
         """
@@ -75,24 +187,41 @@ class DexParser:
         :raise: FileParsingError if cannot parse the file
         """
         self.logger.debug("Parsing dex file: filepath=\"%s\", filename=\"%s\"", filepath, filename)
-        file = FileParser(self.logger).parse(filepath, filename)
+        file = FileParser(self.logger, self.hash_algorithms).parse(filepath, filename)
 
         self.logger.debug("Extracting strings...")
         strings = self.parse_strings(filepath)
         self.logger.debug("Strings extracted: %d", len(strings))
 
+        return self.__build_dex(file, strings)
+
+    def parse_bytes(self, raw: bytes, filename: str) -> Dex:
+        """
+        :param raw: content of the dex file
+        :param filename: name of the dex file
+        :return: the parsed dex file
+        """
+        self.logger.debug("Parsing dex file from memory: filename=\"%s\"", filename)
+        file = FileParser(self.logger, self.hash_algorithms).parse_bytes(raw, filename)
+
+        self.logger.debug("Extracting strings...")
+        strings = self.parse_strings_from_bytes(raw)
+        self.logger.debug("Strings extracted: %d", len(strings))
+
+        return self.__build_dex(file, strings)
+
+    def __build_dex(self, file: File, strings: List[str]) -> Dex:
         self.logger.debug("Extracting URLs...")
-        urls = self.parse_signatures(signature=UriSignature(), strings=strings, min_string_len=6)
+        urls = self.parse_urls(strings)
         self.logger.debug("URLs extracted: %s ", len(urls))
 
         self.logger.debug("Extracting shell commands...")
-        shell_commands = self.parse_signatures(signature=ShellSignature(), strings=strings)
+        shell_commands = self.parse_shell_commands(strings)
         self.logger.debug("Shell commands extracted: %s", len(shell_commands))
 
-        # TODO: improve custom signatures parsing performance (commented in the meanwhile because far too slow)
-        # self.logger.debug("Extracting custom signatures...")
-        custom_signatures = []  # self.extract_signatures(signature=Signature(), strings=self._strings)
-        # self.logger.debug("Custom signatures extracted: %s", len(custom_signatures))
+        self.logger.debug("Extracting custom signatures...")
+        custom_signatures = self.parse_custom_signatures(strings)
+        self.logger.debug("Custom signatures extracted: %s", len(custom_signatures))
 
         return Dex(
             filename=file.get_file_name(),
@@ -109,22 +238,55 @@ class DexParser:
 
     @staticmethod
     def parse_strings(filepath: str) -> List:
-        with Popen("strings " + filepath, stdout=PIPE, stderr=None, shell=True) as process:
-            strings = filter(
-                lambda string: string != "",
-                (string.strip() for string in process.communicate()[0].decode("utf-8").splitlines())
-            )
-            return sorted(strings)
+        with open(filepath, "rb") as file:
+            try:
+                with mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+                    return DexParser.__sort_strings(data)
+            except ValueError:
+                # NOTE: empty files cannot be memory-mapped.
+                return []
+
+    @staticmethod
+    def parse_strings_from_bytes(raw: bytes) -> List:
+        return DexParser.__sort_strings(raw)
+
+    @staticmethod
+    def __sort_strings(data: bytes) -> List:
+        try:
+            table = DexStringTable(data)
+        except ValueError:
+            return []
+        strings = []
+        # NOTE: the strings are read by index, rather than iterated, so that an IndexError cannot end the loop early.
+        for index in range(len(table)):  # pylint: disable=consider-using-enumerate
+            try:
+                string = table[index]
+            except ValueError:
+                # NOTE: a corrupt string is skipped, rather than the whole dex file (or the strings after it).
+                continue
+            if string != "":
+                strings.append(string)
+        return sorted(strings)
+
+    @staticmethod
+    def parse_urls(strings: List) -> List:
+        return DexParser.parse_signatures(
+            signature=SignatureRegistry.get(UriSignature),
+            strings=strings,
+            min_string_len=6
+        )
+
+    @staticmethod
+    def parse_shell_commands(strings: List) -> List:
+        return DexParser.parse_signatures(signature=SignatureRegistry.get(ShellSignature), strings=strings)
+
+    @staticmethod
+    def parse_custom_signatures(strings: List) -> List:
+        return DexParser.parse_signatures(signature=SignatureRegistry.get(Signature), strings=strings)
 
     @staticmethod
-    def parse_signatures(signature: Signature, strings: List, min_string_len: Optional[bool] = None) -> List:
-        signatures = []
-        for string in strings:
-            if min_string_len is None or len(string) > min_string_len:
-                match, is_valid = signature.search(string)
-                if is_valid and match is not None and match != "":
-                    signatures.append(match)
-        return sorted(signatures)
+    def parse_signatures(signature: Signature, strings: List, min_string_len: Optional[int] = None) -> List:
+        return sorted(signature.search_all(strings, min_string_len))
 
     @staticmethod
     def looks_like_dex(filename: str) -> bool:
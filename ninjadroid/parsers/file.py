@@ -2,18 +2,23 @@ from logging import getLogger, Logger
 from hashlib import md5, sha1, sha256, sha512
 from os import access, R_OK
 from os.path import getsize, isfile, isdir
-from typing import Dict
+from threading import Lock
+from typing import BinaryIO, Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar
 from zipfile import is_zipfile
 
 
 default_logger = getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class File:
     """
     Generic file information.
     """
 
+    __slots__ = ("__name", "__size", "__md5", "__sha1", "__sha256", "__sha512")
+
     # pylint: disable=too-many-arguments
     def __init__(self, filename: str, size: str, md5hash: str, sha1hash: str, sha256hash: str, sha512hash: str):
         self.__name = filename
@@ -43,14 +48,204 @@ class File:
 
     def as_dict(self) -> Dict:
         return {
-            "file": self.__name,
-            "size": self.__size,
-            "md5": self.__md5,
-            "sha1": self.__sha1,
-            "sha256": self.__sha256,
-            "sha512": self.__sha512,
+            "file": self.get_file_name(),
+            "size": self.get_size(),
+            "md5": self.get_md5(),
+            "sha1": self.get_sha1(),
+            "sha256": self.get_sha256(),
+            "sha512": self.get_sha512(),
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "File":
+        """
+        :param dump: the file information, as returned by as_dict()
+        :return: the equivalent file
+        """
+        return File(
+            filename=dump["file"],
+            size=dump["size"],
+            md5hash=dump["md5"],
+            sha1hash=dump["sha1"],
+            sha256hash=dump["sha256"],
+            sha512hash=dump["sha512"]
+        )
+
+
+class Lazy(Generic[T]):
+    """
+    Value computed on its first access and then memoized, also when accessed by many threads at once.
+
+    If the computation fails, its error is raised and the value is computed again on the next access.
+    """
+
+    __slots__ = ("__compute", "__value", "__computed", "__lock")
+
+    def __init__(self, compute: Callable[[], T]):
+        self.__compute = compute
+        self.__value = None
+        self.__computed = False
+        self.__lock = Lock()
+
+    def get(self) -> T:
+        if not self.__computed:
+            with self.__lock:
+                if not self.__computed:
+                    self.__value = self.__compute()
+                    self.__computed = True
+                    # NOTE: whatever the computation holds (e.g. the file content) is not needed anymore.
+                    self.__compute = None
+        return self.__value
+
+    def is_computed(self) -> bool:
+        return self.__computed
+
+
+class LazyDigests:
+    """
+    Mixin of the lazy file models, computing all the digests of the file (in a single pass) on the first access to any
+    of them.
+    """
+
+    def __init__(self, parse_file: Callable[[], File]):
+        """
+        :param parse_file: the parsing of the file, which computes its digests
+        """
+        self.__file = Lazy(parse_file)
+
+    def get_md5(self) -> str:
+        return self.__file.get().get_md5()
+
+    def get_sha1(self) -> str:
+        return self.__file.get().get_sha1()
+
+    def get_sha256(self) -> str:
+        return self.__file.get().get_sha256()
+
+    def get_sha512(self) -> str:
+        return self.__file.get().get_sha512()
+
+
+class LazyFile(LazyDigests, File):
+    """
+    Generic file information, whose digests are computed on first access.
+    """
+
+    def __init__(self, filename: str, size: int, parse_file: Callable[[], File]):
+        """
+        :param filename: name of the file
+        :param size: size of the file
+        :param parse_file: the parsing of the file, which computes its digests
+        """
+        File.__init__(self, filename, size, "", "", "", "")
+        LazyDigests.__init__(self, parse_file)
+
+
+class HashProfile:
+    """
+    Selection of the digests to compute for each category of file.
+    """
+
+    ALGORITHMS = ("md5", "sha1", "sha256", "sha512")
+
+    APK = "apk"
+    DEX = "dex"
+    CERT = "cert"
+    MANIFEST = "manifest"
+    OTHER = "other"
+    CATEGORIES = (APK, DEX, CERT, MANIFEST, OTHER)
+
+    def __init__(self, algorithms: Optional[Dict[str, Sequence[str]]] = None):
+        """
+        :param algorithms: (optional) digests to compute per category. All the digests by default.
+        :raise: ValueError if either a category or an algorithm is unknown
+        """
+        self.__algorithms = {category: HashProfile.ALGORITHMS for category in HashProfile.CATEGORIES}
+        for category, selected in (algorithms or {}).items():
+            if category not in HashProfile.CATEGORIES:
+                raise ValueError(f"Unknown file category: {category}")
+            for algorithm in selected:
+                if algorithm not in HashProfile.ALGORITHMS:
+                    raise ValueError(f"Unknown hash algorithm: {algorithm}")
+            self.__algorithms[category] = tuple(
+                algorithm for algorithm in HashProfile.ALGORITHMS if algorithm in selected
+            )
+
+    def get_algorithms(self, category: str) -> Tuple[str, ...]:
+        return self.__algorithms[category]
+
+    @staticmethod
+    def from_string(profile: str) -> "HashProfile":
+        """
+        :param profile: comma-separated list of "[CATEGORY=]ALGORITHM[+ALGORITHM...]" items, where the items without
+                        a category apply to all the categories and "none" selects no digest at all
+                        (e.g. "sha256,apk=md5+sha256", "sha256,other=none").
+        :return: the parsed hash profile
+        :raise: ValueError if the profile is not valid
+        """
+        algorithms = {}
+        for item in profile.split(","):
+            category, _, selected = item.strip().rpartition("=")
+            selected = [] if selected.strip() == "none" else [algorithm.strip() for algorithm in selected.split("+")]
+            if category == "":
+                algorithms.update({category: selected for category in HashProfile.CATEGORIES})
+            else:
+                algorithms[category.strip()] = selected
+        return HashProfile(algorithms)
+
+
+class FileHasher:
+    """
+    Single-pass hasher, feeding all the selected file digests from the same fixed-size buffer.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, algorithms: Sequence[str] = HashProfile.ALGORITHMS):
+        constructors = {"md5": md5, "sha1": sha1, "sha256": sha256, "sha512": sha512}
+        self.__size = 0
+        self.__digests = {algorithm: constructors[algorithm]() for algorithm in algorithms}
+
+    def update(self, raw: bytes) -> "FileHasher":
+        view = memoryview(raw)
+        for offset in range(0, len(view), FileHasher.CHUNK_SIZE):
+            self.__update_digests(view[offset:offset + FileHasher.CHUNK_SIZE])
+        return self
+
+    def update_from_stream(self, stream: BinaryIO) -> "FileHasher":
+        while True:
+            chunk = stream.read(FileHasher.CHUNK_SIZE)
+            if not chunk:
+                break
+            self.__update_digests(chunk)
+        return self
+
+    def __update_digests(self, chunk: bytes):
+        self.__size += len(chunk)
+        for digest in self.__digests.values():
+            digest.update(chunk)
+
+    def get_size(self) -> int:
+        return self.__size
+
+    def get_hexdigest(self, algorithm: str) -> str:
+        """
+        :param algorithm: name of the digest algorithm
+        :return: the hexadecimal digest, or an empty string if the digest was not computed
+        """
+        digest = self.__digests.get(algorithm)
+        return digest.hexdigest() if digest is not None else ""
+
+    def build_file(self, filename: str, size: int) -> File:
+        return File(
+            filename=filename,
+            size=size,
+            md5hash=self.get_hexdigest("md5"),
+            sha1hash=self.get_hexdigest("sha1"),
+            sha256hash=self.get_hexdigest("sha256"),
+            sha512hash=self.get_hexdigest("sha512")
+        )
+
 
 class FileParsingError(Exception):
     """
@@ -69,8 +264,9 @@ class FileParser:
     Parser implementation for generic files.
     """
 
-    def __init__(self, logger: Logger = default_logger):
+    def __init__(self, logger: Logger = default_logger, hash_algorithms: Sequence[str] = HashProfile.ALGORITHMS):
         self.logger = logger
+        self.hash_algorithms = hash_algorithms
 
     def parse(self, filepath: str, filename: str = "") -> File:
         """
@@ -84,17 +280,32 @@ class FileParser:
 
         with open(filepath, "rb") as file:
             self.logger.debug("Reading file: filepath=\"%s\"", filepath)
-            raw = file.read()
+            hasher = FileHasher(self.hash_algorithms).update_from_stream(file)
 
-        return File(
+        return hasher.build_file(
             filename=filename if filename != "" else filepath,
-            size=getsize(filepath),
-            md5hash=md5(raw).hexdigest(),
-            sha1hash=sha1(raw).hexdigest(),
-            sha256hash=sha256(raw).hexdigest(),
-            sha512hash=sha512(raw).hexdigest()
+            size=getsize(filepath)
         )
 
+    def parse_bytes(self, raw: bytes, filename: str) -> File:
+        """
+        :param raw: content of the file
+        :param filename: name of the file
+        :return: the parsed file
+        """
+        self.logger.debug("Reading file from memory: filename=\"%s\"", filename)
+        return FileHasher(self.hash_algorithms).update(raw).build_file(filename=filename, size=len(raw))
+
+    def parse_stream(self, stream: BinaryIO, filename: str) -> File:
+        """
+        :param stream: binary stream of the file content (e.g. as returned by ZipFile.open())
+        :param filename: name of the file
+        :return: the parsed file
+        """
+        self.logger.debug("Reading file from stream: filename=\"%s\"", filename)
+        hasher = FileHasher(self.hash_algorithms).update_from_stream(stream)
+        return hasher.build_file(filename=filename, size=hasher.get_size())
+
     @staticmethod
     def is_file(path: str) -> bool:
         return path != "" and isfile(path)
@@ -1,12 +1,11 @@
+from io import BytesIO
 from logging import getLogger, Logger
-from xml.dom import minidom
-from xml.dom.minidom import Element
-from xml.parsers.expat import ExpatError
-from typing import Any, Dict, List, Optional
-from pyaxmlparser.axmlprinter import AXMLPrinter
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-from ninjadroid.aapt.aapt import Aapt
-from ninjadroid.parsers.file import File, FileParser, FileParsingError
+from ninjadroid.aapt.aapt import AaptSession, AaptXmlTree
+from ninjadroid.parsers.axml import AxmlDocument, XmlDocument
+from ninjadroid.parsers.axml_manifest import AxmlManifest
+from ninjadroid.parsers.file import File, FileParser, FileParsingError, HashProfile, Lazy, LazyDigests
 
 
 default_logger = getLogger(__name__)
@@ -17,6 +16,8 @@ class AppVersion:
     AndroidManifest version information.
     """
 
+    __slots__ = ("__code", "__name")
+
     def __init__(self, code: Optional[int], name: str):
         self.__code = code
         self.__name = name
@@ -38,12 +39,18 @@ class AppVersion:
             "name": self.__name
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AppVersion":
+        return AppVersion(code=dump["code"] if dump["code"] != "" else None, name=dump["name"])
+
 
 class AppSdk:
     """
     AndroidManifest SDK information.
     """
 
+    __slots__ = ("__min", "__target", "__max")
+
     def __init__(self, min_version: str, target_version: str, max_version: Optional[str]):
         self.__min = min_version
         self.__target = target_version
@@ -71,12 +78,22 @@ class AppSdk:
             "max": self.__max if self.__max is not None else ""
         }
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AppSdk":
+        return AppSdk(
+            min_version=dump["min"],
+            target_version=dump["target"],
+            max_version=dump["max"] if dump["max"] != "" else None
+        )
+
 
 class AppComponent:
     """
     AndroidManifest generic component (i.e. activity, service or broadcast-receiver) information.
     """
 
+    __slots__ = ("__name", "__metadata", "__intent_filters")
+
     def __init__(self, name: str, metadata: Optional[List[Dict]] = None, intent_filters: Optional[List[Dict]] = None):
         self.__name = name
         self.__metadata = metadata if metadata is not None else []
@@ -111,6 +128,8 @@ class AppActivity(AppComponent):
     AndroidManifest activity information.
     """
 
+    __slots__ = ("__parent_name", "__launch_mode", "__no_history")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -154,12 +173,25 @@ class AppActivity(AppComponent):
             dump["noHistory"] = self.__no_history
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AppActivity":
+        return AppActivity(
+            name=dump["name"],
+            metadata=dump.get("meta-data"),
+            intent_filters=dump.get("intent-filter"),
+            parent_name=dump.get("parentActivityName"),
+            launch_mode=dump.get("launchMode"),
+            no_history=dump.get("noHistory")
+        )
+
 
 class AppService(AppComponent):
     """
     AndroidManifest service information.
     """
 
+    __slots__ = ("__enabled", "__exported", "__process", "__isolated_process")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -211,12 +243,26 @@ class AppService(AppComponent):
             dump["isolatedProcess"] = self.__isolated_process
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AppService":
+        return AppService(
+            name=dump["name"],
+            metadata=dump.get("meta-data"),
+            intent_filters=dump.get("intent-filter"),
+            enabled=dump.get("enabled"),
+            exported=dump.get("exported"),
+            process=dump.get("process"),
+            isolated_process=dump.get("isolatedProcess")
+        )
+
 
 class AppBroadcastReceiver(AppComponent):
     """
     AndroidManifest broadcast-receiver information.
     """
 
+    __slots__ = ("__enabled", "__exported")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -252,12 +298,24 @@ class AppBroadcastReceiver(AppComponent):
             dump["exported"] = self.__exported
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AppBroadcastReceiver":
+        return AppBroadcastReceiver(
+            name=dump["name"],
+            metadata=dump.get("meta-data"),
+            intent_filters=dump.get("intent-filter"),
+            enabled=dump.get("enabled"),
+            exported=dump.get("exported")
+        )
+
 
 class AndroidManifest(File):
     """
     AndroidManifest.xml file information.
     """
 
+    __slots__ = ("__package_name", "__version", "__sdk", "__permissions", "__activities", "__services", "__receivers")
+
     # pylint: disable=too-many-arguments
     def __init__(
             self,
@@ -307,18 +365,98 @@ class AndroidManifest(File):
 
     def as_dict(self) -> Dict:
         dump = super().as_dict()
-        dump["package"] = self.__package_name
-        dump["version"] = self.__version.as_dict()
-        dump["sdk"] = self.__sdk.as_dict()
-        dump["permissions"] = self.__permissions
-        if self.__activities:
-            dump["activities"] = [activity.as_dict() for activity in self.__activities]
-        if self.__services:
-            dump["services"] = [service.as_dict() for service in self.__services]
-        if self.__receivers:
-            dump["receivers"] = [receiver.as_dict() for receiver in self.__receivers]
+        dump["package"] = self.get_package_name()
+        dump["version"] = self.get_version().as_dict()
+        dump["sdk"] = self.get_sdk().as_dict()
+        dump["permissions"] = self.get_permissions()
+        activities = self.get_activities()
+        if activities:
+            dump["activities"] = [activity.as_dict() for activity in activities]
+        services = self.get_services()
+        if services:
+            dump["services"] = [service.as_dict() for service in services]
+        receivers = self.get_broadcast_receivers()
+        if receivers:
+            dump["receivers"] = [receiver.as_dict() for receiver in receivers]
         return dump
 
+    @staticmethod
+    def from_dict(dump: Dict) -> "AndroidManifest":
+        return AndroidManifest(
+            filename=dump["file"],
+            size=dump["size"],
+            md5hash=dump["md5"],
+            sha1hash=dump["sha1"],
+            sha256hash=dump["sha256"],
+            sha512hash=dump["sha512"],
+            package_name=dump["package"],
+            version=AppVersion.from_dict(dump["version"]),
+            sdk=AppSdk.from_dict(dump["sdk"]),
+            permissions=dump["permissions"],
+            activities=[AppActivity.from_dict(activity) for activity in dump.get("activities", [])],
+            services=[AppService.from_dict(service) for service in dump.get("services", [])],
+            receivers=[AppBroadcastReceiver.from_dict(receiver) for receiver in dump.get("receivers", [])]
+        )
+
+
+class LazyAndroidManifest(LazyDigests, AndroidManifest):
+    """
+    AndroidManifest.xml file information, computed on first access: the digests, the summary (i.e. package, version,
+    SDK and permissions) and the components (i.e. activities, services and broadcast receivers).
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            filename: str,
+            size: int,
+            read: Callable[[], bytes],
+            apk_path: str,
+            parser: "AndroidManifestParser"
+    ):
+        """
+        :param filename: name of the AndroidManifest.xml file
+        :param size: size of the AndroidManifest.xml file
+        :param read: the reading of the (binary) AndroidManifest.xml file content, called on demand
+        :param apk_path: path of the APK package containing this AndroidManifest.xml file, to fall back to aapt
+        :param parser: the AndroidManifest.xml parser, which selects the digests to compute
+        :raise: AndroidManifestParsingError, on the first access to anything but the digests, if cannot parse the file
+                as an AndroidManifest.xml
+        """
+        AndroidManifest.__init__(self, filename, size, "", "", "", "", "", None, None, [], [], [], [])
+        LazyDigests.__init__(
+            self,
+            lambda: FileParser(parser.logger, parser.hash_algorithms).parse_bytes(read(), filename)
+        )
+        # NOTE: the manifest is parsed without digests, as those are computed only if asked.
+        manifest_parser = AndroidManifestParser(parser.logger, ())
+        self.__components = Lazy(lambda: manifest_parser.parse_bytes(read(), True, apk_path, True))
+        self.__summary = Lazy(
+            lambda: self.__components.get() if self.__components.is_computed() else
+            manifest_parser.parse_bytes(read(), True, apk_path, False)
+        )
+
+    def get_package_name(self) -> str:
+        return self.__summary.get().get_package_name()
+
+    def get_version(self) -> AppVersion:
+        return self.__summary.get().get_version()
+
+    def get_sdk(self) -> AppSdk:
+        return self.__summary.get().get_sdk()
+
+    def get_permissions(self) -> List[str]:
+        return self.__summary.get().get_permissions()
+
+    def get_activities(self) -> List[AppActivity]:
+        return self.__components.get().get_activities()
+
+    def get_services(self) -> List[AppService]:
+        return self.__components.get().get_services()
+
+    def get_broadcast_receivers(self) -> List[AppBroadcastReceiver]:
+        return self.__components.get().get_broadcast_receivers()
+
 
 class AndroidManifestParsingError(FileParsingError):
     """
@@ -337,66 +475,116 @@ class AndroidManifestParser:
     Parser implementation for AndroidManifest.xml files.
     """
 
-    def __init__(self, logger: Logger = default_logger):
+    def __init__(self, logger: Logger = default_logger, hash_algorithms: Sequence[str] = HashProfile.ALGORITHMS):
         self.logger = logger
+        self.hash_algorithms = hash_algorithms
 
+    # pylint: disable=too-many-arguments
     def parse(
             self,
             filepath: str,
             binary: bool = False,
             apk_path: Optional[str] = None,
-            extended_processing: bool = True
+            extended_processing: bool = True,
+            aapt: Optional[AaptSession] = None
     ):
         """
         :param filepath: path of the AndroidManifest.xml file
         :param binary: (optional) whether the AndroidManifest.xml file is in binary format or not. False by default.
         :param apk_path: (optional) path of the APK package containing this AndroidManifest.xml file. None by default.
         :param extended_processing: (optional) whether should parse all information or only a summary. True by default.
+        :param aapt: (optional) aapt session of the APK package, to share its dumps. A new one by default.
         :return: the parsed AndroidManifest.xml file
         :raise: FileParsingError if cannot parse the file
         :raise: AndroidManifestParsingError if cannot parse the file as an AndroidManifest.xml
         """
         self.logger.debug("Parsing AndroidManifest.xml file: filepath=\"%s\"", filepath)
-        file = FileParser(self.logger).parse(filepath, "AndroidManifest.xml")
+        file = FileParser(self.logger, self.hash_algorithms).parse(filepath, "AndroidManifest.xml")
+
+        def build_manifest() -> AndroidManifest:
+            try:
+                with open(filepath, "rb") as manifest:
+                    # NOTE: the text file is streamed, while the binary one is read at once (i.e. its string pool).
+                    raw = manifest.read() if binary else manifest
+                    return self.build_manifest_from_xml(file, extended_processing, raw, binary)
+            except IOError as error:
+                raise AndroidManifestParsingError from error
+
+        return self.__build_manifest(file, build_manifest, apk_path, extended_processing, aapt)
+
+    # pylint: disable=too-many-arguments
+    def parse_bytes(
+            self,
+            raw: bytes,
+            binary: bool = False,
+            apk_path: Optional[str] = None,
+            extended_processing: bool = True,
+            aapt: Optional[AaptSession] = None
+    ):
+        """
+        :param raw: content of the AndroidManifest.xml file
+        :param binary: (optional) whether the AndroidManifest.xml file is in binary format or not. False by default.
+        :param apk_path: (optional) path of the APK package containing this AndroidManifest.xml file. None by default.
+        :param extended_processing: (optional) whether should parse all information or only a summary. True by default.
+        :param aapt: (optional) aapt session of the APK package, to share its dumps. A new one by default.
+        :return: the parsed AndroidManifest.xml file
+        :raise: AndroidManifestParsingError if cannot parse the file as an AndroidManifest.xml
+        """
+        self.logger.debug("Parsing AndroidManifest.xml file from memory...")
+        file = FileParser(self.logger, self.hash_algorithms).parse_bytes(raw, "AndroidManifest.xml")
+
+        def build_manifest() -> AndroidManifest:
+            return self.build_manifest_from_xml(file, extended_processing, raw if binary else BytesIO(raw), binary)
+
+        return self.__build_manifest(file, build_manifest, apk_path, extended_processing, aapt)
+
+    def __build_manifest(
+            self,
+            file: File,
+            build_manifest: Callable[[], AndroidManifest],
+            apk_path: Optional[str],
+            extended_processing: bool,
+            aapt: Optional[AaptSession]
+    ) -> AndroidManifest:
         try:
-            self.logger.debug("Parsing AndroidManifest.xml from DOM...")
-            dom = self.parse_manifest_dom(filepath, binary)
+            self.logger.debug("Parsing AndroidManifest.xml...")
+            return build_manifest()
         except AndroidManifestParsingError as error:
-            self.logger.debug("Cannot parse AndroidManifest.xml from DOM!")
+            self.logger.debug("Cannot parse AndroidManifest.xml from XML!")
             if apk_path is None or apk_path == "":
                 self.logger.debug("Cannot parse AndroidManifest.xml from APK!")
                 raise error
             self.logger.debug("Parsing AndroidManifest.xml from APK: apk_path=%s", apk_path)
-            return self.build_manifest_from_apk(file, extended_processing, apk_path)
-        return self.build_manifest_from_dom(file, extended_processing, dom)
+            return self.build_manifest_from_apk(file, extended_processing, apk_path, aapt)
 
     @staticmethod
-    def parse_manifest_dom(filepath: str, binary: bool) -> Element:
-        dom = None
-        with open(filepath, 'rb') as manifest:
-            try:
-                if binary:
-                    raw = AXMLPrinter(manifest.read()).get_buff()
-                    dom = minidom.parseString(raw)
-                else:
-                    dom = minidom.parse(filepath)
-            except (ExpatError, IOError) as error:
-                raise AndroidManifestParsingError from error
-        if dom is None:
-            raise AndroidManifestParsingError
-        return dom.documentElement
+    def build_manifest_from_xml(
+            file: File,
+            extended_processing: bool,
+            raw: Union[bytes, BinaryIO],
+            binary: bool = True
+    ) -> AndroidManifest:
+        """
+        Build the manifest in a single pass over the elements of the AndroidManifest.xml file (see AxmlManifest).
 
-    @staticmethod
-    def build_manifest_from_dom(file: File, extended_processing: bool, dom: Element) -> AndroidManifest:
-        if extended_processing:
-            application = dom.getElementsByTagName("application")[0]
-            activities = AndroidManifestParser.parse_activities_from_dom(application)
-            services = AndroidManifestParser.parse_services_from_dom(application)
-            receivers = AndroidManifestParser.parse_broadcast_receivers_from_dom(application)
-        else:
-            activities = []
-            services = []
-            receivers = []
+        :param file: the AndroidManifest.xml file
+        :param extended_processing: whether should parse all information or only a summary
+        :param raw: content of the binary AndroidManifest.xml file, or binary stream of the text one
+        :param binary: (optional) whether the AndroidManifest.xml file is in binary format or not. True by default.
+        :raise: AndroidManifestParsingError if the (binary or text) XML is malformed
+        """
+        try:
+            document = AxmlDocument(raw) if binary else XmlDocument(raw)
+            axml = AxmlManifest(document.iter_elements(), extended_processing)
+        except ValueError as error:
+            raise AndroidManifestParsingError from error
+        try:
+            version_code = int(AxmlManifest.get_attribute(axml.get_root(), "versionCode"))
+        except (TypeError, ValueError):
+            version_code = None
+        activities, services, receivers = AndroidManifestParser.build_components(axml)
+        min_version = AxmlManifest.get_attribute(axml.get_sdk(), "minSdkVersion") or "1"
+        target_version = AxmlManifest.get_attribute(axml.get_sdk(), "targetSdkVersion")
         return AndroidManifest(
             filename=file.get_file_name(),
             size=file.get_size(),
@@ -404,30 +592,85 @@ class AndroidManifestParser:
             sha1hash=file.get_sha1(),
             sha256hash=file.get_sha256(),
             sha512hash=file.get_sha512(),
-            package_name=dom.getAttribute("package"),
-            version=AndroidManifestParser.parse_version_from_dom(dom),
-            sdk=AndroidManifestParser.parse_sdk_from_dom(dom),
-            permissions=AndroidManifestParser.__parse_list_from_dom(
-                dom,
-                tag="uses-permission",
-                attribute="android:name"
+            package_name=AxmlManifest.get_attribute(axml.get_root(), "package") or "",
+            version=AppVersion(
+                code=version_code,
+                name=AxmlManifest.get_attribute(axml.get_root(), "versionName") or ""
+            ),
+            sdk=AppSdk(
+                min_version=min_version,
+                target_version=target_version if target_version is not None else min_version,
+                max_version=AxmlManifest.get_attribute(axml.get_sdk(), "maxSdkVersion")
             ),
+            permissions=sorted(axml.get_permissions()),
             activities=activities,
             services=services,
             receivers=receivers
         )
 
     @staticmethod
-    def build_manifest_from_apk(file: File, extended_processing: bool, apk_path: str) -> AndroidManifest:
-        apk = Aapt.get_apk_info(apk_path)
+    def build_components(
+            axml: AxmlManifest
+    ) -> Tuple[List[AppActivity], List[AppService], List[AppBroadcastReceiver]]:
+        """
+        :return: the activities, services and broadcast receivers of the manifest, with all their attributes
+        """
+        activities = [
+            AppActivity(
+                name=AxmlManifest.get_attribute(activity["element"], "name") or "",
+                metadata=activity["meta-data"],
+                intent_filters=AxmlManifest.get_intent_filters(activity),
+                parent_name=AxmlManifest.get_attribute(activity["element"], "parentActivityName"),
+                launch_mode=AxmlManifest.get_attribute(activity["element"], "launchMode"),
+                no_history=AxmlManifest.get_attribute(activity["element"], "noHistory")
+            )
+            for activity in axml.get_components(AxmlManifest.ACTIVITY)
+        ]
+        services = [
+            AppService(
+                name=AxmlManifest.get_attribute(service["element"], "name") or "",
+                metadata=service["meta-data"],
+                intent_filters=AxmlManifest.get_intent_filters(service),
+                enabled=AxmlManifest.get_bool_attribute(service["element"], "enabled"),
+                exported=AxmlManifest.get_bool_attribute(service["element"], "exported"),
+                process=AxmlManifest.get_attribute(service["element"], "process"),
+                isolated_process=AxmlManifest.get_bool_attribute(service["element"], "isolatedProcess")
+            )
+            for service in axml.get_components(AxmlManifest.SERVICE)
+        ]
+        receivers = [
+            AppBroadcastReceiver(
+                name=AxmlManifest.get_attribute(receiver["element"], "name") or "",
+                metadata=receiver["meta-data"],
+                intent_filters=AxmlManifest.get_intent_filters(receiver),
+                enabled=AxmlManifest.get_bool_attribute(receiver["element"], "enabled"),
+                exported=AxmlManifest.get_bool_attribute(receiver["element"], "exported")
+            )
+            for receiver in axml.get_components(AxmlManifest.RECEIVER)
+        ]
+        return activities, services, receivers
+
+    @staticmethod
+    def build_manifest_from_apk(
+            file: File,
+            extended_processing: bool,
+            apk_path: str,
+            aapt: Optional[AaptSession] = None
+    ) -> AndroidManifest:
+        if aapt is None:
+            aapt = AaptSession(apk_path)
+        # NOTE: the dumps are independent, hence they run concurrently.
+        aapt.prefetch("badging", "permissions", *(("xmltree",) if extended_processing else ()))
+        apk = aapt.get_apk_info()
         activities = []
         services = []
         receivers = []
         if extended_processing:
-            manifest = Aapt.get_manifest_info(apk_path)
-            activities = [AppActivity(name=activity) for activity in manifest["activities"]]
-            services = [AppService(name=service) for service in manifest["services"]]
-            receivers = [AppBroadcastReceiver(name=receiver) for receiver in manifest["receivers"]]
+            try:
+                axml = AxmlManifest(AaptXmlTree(aapt.dump_xmltree()).iter_elements())
+                activities, services, receivers = AndroidManifestParser.build_components(axml)
+            except (RuntimeError, ValueError):
+                pass
         return AndroidManifest(
             filename=file.get_file_name(),
             size=file.get_size(),
@@ -442,159 +685,12 @@ class AndroidManifestParser:
                 min_version=apk["sdk"]["min"],
                 max_version=apk["sdk"]["max"]
             ),
-            permissions=Aapt.get_app_permissions(apk_path),
+            permissions=aapt.get_app_permissions(),
             activities=activities,
             services=services,
             receivers=receivers
         )
 
-    @staticmethod
-    def parse_version_from_dom(dom: Element) -> AppVersion:
-        try:
-            version_code = int(dom.getAttribute("android:versionCode"))
-        except ValueError:
-            version_code = None
-        return AppVersion(
-            code=version_code,
-            name=dom.getAttribute("android:versionName")
-        )
-
-    @staticmethod
-    def parse_sdk_from_dom(dom: Element) -> Optional[AppVersion]:
-        min_version = "1"
-        target_version = None
-        max_version = None
-        for element in dom.getElementsByTagName("uses-sdk"):
-            if element.hasAttribute("android:minSdkVersion"):
-                min_version = element.getAttribute("android:minSdkVersion")
-            target_version = AndroidManifestParser.__parse_str_from_dom(element, "android:targetSdkVersion")
-            max_version = AndroidManifestParser.__parse_str_from_dom(element, "android:maxSdkVersion")
-            break
-        return AppSdk(
-            min_version=min_version,
-            target_version=target_version if target_version is not None else min_version,
-            max_version=max_version
-        )
-
-    @staticmethod
-    def parse_activities_from_dom(dom: Element) -> List[AppActivity]:
-        activities = []
-        for element in dom.getElementsByTagName("activity"):
-            activity = AppActivity(
-                name=element.getAttribute("android:name"),
-                metadata=AndroidManifestParser.__parse_metadata_from_dom(element),
-                intent_filters=AndroidManifestParser.__parse_intent_filters_from_dom(element),
-                parent_name=AndroidManifestParser.__parse_str_from_dom(element, "android:parentActivityName"),
-                launch_mode=AndroidManifestParser.__parse_str_from_dom(element, "android:launchMode"),
-                no_history=AndroidManifestParser.__parse_str_from_dom(element, "android:noHistory")
-            )
-            activities.append(activity)
-        return activities
-
-    @staticmethod
-    def parse_services_from_dom(dom: Element) -> List[Dict]:
-        services = []
-        for element in dom.getElementsByTagName("service"):
-            service = AppService(
-                name=element.getAttribute("android:name"),
-                metadata=AndroidManifestParser.__parse_metadata_from_dom(element),
-                intent_filters=AndroidManifestParser.__parse_intent_filters_from_dom(element),
-                enabled=AndroidManifestParser.__parse_bool_from_dom(element, "android:enabled"),
-                exported=AndroidManifestParser.__parse_bool_from_dom(element, "android:exported"),
-                process=AndroidManifestParser.__parse_str_from_dom(element, "android:process"),
-                isolated_process=AndroidManifestParser.__parse_bool_from_dom(element, "android:isolatedProcess")
-            )
-            services.append(service)
-        return services
-
-    @staticmethod
-    def parse_broadcast_receivers_from_dom(dom: Element) -> List[Dict]:
-        receivers = []
-        for element in dom.getElementsByTagName("receiver"):
-            receiver = AppBroadcastReceiver(
-                name=element.getAttribute("android:name"),
-                metadata=AndroidManifestParser.__parse_metadata_from_dom(element),
-                intent_filters=AndroidManifestParser.__parse_intent_filters_from_dom(element),
-                enabled=AndroidManifestParser.__parse_bool_from_dom(element, "android:enabled"),
-                exported=AndroidManifestParser.__parse_bool_from_dom(element, "android:exported")
-            )
-            receivers.append(receiver)
-        return receivers
-
-    @staticmethod
-    def __parse_metadata_from_dom(dom: Element) -> List[Dict]:
-        metadata = []
-        for element in dom.getElementsByTagName("meta-data"):
-            data = AndroidManifestParser.__parse_dict_from_dom(
-                element,
-                attributes={
-                    "name": "android:name",
-                    "value": "android:value"
-                }
-            )
-            metadata.append(data)
-        return metadata
-
-    @staticmethod
-    def __parse_intent_filters_from_dom(dom: Element) -> List[Dict]:
-        intent_filters = []
-        for element in dom.getElementsByTagName("intent-filter"):
-            intent_filter = AndroidManifestParser.__parse_dict_from_dom(
-                element,
-                attributes={
-                    "priority": "android:priority",
-                    "action": [
-                        "android:name"
-                    ],
-                    "category": [
-                        "android:name"
-                    ],
-                    "data": {
-                        "scheme": "android:scheme",
-                        "mimeType": "android:mimeType"
-                    }
-                }
-            )
-            intent_filters.append(intent_filter)
-        return intent_filters
-
-    @staticmethod
-    def __parse_str_from_dom(dom: Element, attribute: str) -> Optional[str]:
-        if dom.hasAttribute(attribute):
-            return dom.getAttribute(attribute)
-        return None
-
-    @staticmethod
-    def __parse_bool_from_dom(dom: Element, attribute: str) -> Optional[str]:
-        attribute = AndroidManifestParser.__parse_str_from_dom(dom, attribute)
-        return attribute == "true" if attribute is not None else None
-
-    @staticmethod
-    def __parse_dict_from_dom(dom: Element, attributes: Dict[str, Any]) -> Dict:
-        res = {}
-        for key, value in attributes.items():
-            if isinstance(value, dict):
-                tmp = []
-                for element in dom.getElementsByTagName(key):
-                    tmp.append(AndroidManifestParser.__parse_dict_from_dom(element, attributes[key]))
-                if tmp:
-                    res[key] = tmp
-            elif isinstance(value, list):
-                tmp = AndroidManifestParser.__parse_list_from_dom(dom, key, value[0])
-                if tmp:
-                    res[key] = tmp
-            else:
-                if dom.hasAttribute(attributes[key]):
-                    res[key] = dom.getAttribute(attributes[key])
-        return res
-
-    @staticmethod
-    def __parse_list_from_dom(dom: Element, tag: str, attribute: str) -> List[str]:
-        res = []
-        for element in dom.getElementsByTagName(tag):
-            res.append(element.getAttribute(attribute))
-        return sorted(res)
-
     @staticmethod
     def looks_like_manifest(filename: str) -> bool:
         return filename == "AndroidManifest.xml"
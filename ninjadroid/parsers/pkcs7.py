@@ -0,0 +1,267 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Asn1Element(NamedTuple):
+    """
+    ASN.1 element of a BER/DER encoded content: its tag and the position of its encoding and of its value.
+    """
+
+    tag: int
+    start: int
+    value_start: int
+    value_end: int
+    end: int
+
+
+class Asn1Reader:
+    """
+    Minimal reader of BER/DER encoded contents, enough to walk PKCS#7 and X.509 structures.
+    """
+
+    SEQUENCE = 0x30
+    SET = 0x31
+    INTEGER = 0x02
+    OBJECT_IDENTIFIER = 0x06
+    UTC_TIME = 0x17
+    GENERALIZED_TIME = 0x18
+
+    __END_OF_CONTENTS = b"\x00\x00"
+    __STRING_ENCODINGS = {
+        0x0c: "utf-8",  # UTF8String
+        0x12: "ascii",  # NumericString
+        0x13: "ascii",  # PrintableString
+        0x14: "latin-1",  # TeletexString
+        0x16: "ascii",  # IA5String
+        0x1a: "ascii",  # VisibleString
+        0x1c: "utf-32-be",  # UniversalString
+        0x1e: "utf-16-be",  # BMPString
+    }
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self, offset: int, end: Optional[int] = None) -> Asn1Element:
+        """
+        :return: the element at the given offset
+        :raise: ValueError if the content is malformed or goes beyond the given end
+        """
+        end = len(self.data) if end is None else end
+        if offset + 2 > end:
+            raise ValueError("Truncated ASN.1 element")
+        tag = self.data[offset]
+        if tag & 0x1f == 0x1f:
+            raise ValueError("Unsupported ASN.1 high tag number")
+        length = self.data[offset + 1]
+        value_start = offset + 2
+        if length == 0x80:
+            # NOTE: indefinite length (BER only, still produced by some signing tools), its value ends with two zeros.
+            if not tag & 0x20:
+                raise ValueError("Indefinite length of a primitive ASN.1 element")
+            value_end = value_start
+            while self.data[value_end:value_end + 2] != Asn1Reader.__END_OF_CONTENTS:
+                value_end = self.read(value_end, end).end
+            return Asn1Element(tag, offset, value_start, value_end, value_end + 2)
+        if length & 0x80:
+            size = length & 0x7f
+            if size > 4 or value_start + size > end:
+                raise ValueError("Invalid ASN.1 length")
+            length = int.from_bytes(self.data[value_start:value_start + size], "big")
+            value_start += size
+        if value_start + length > end:
+            raise ValueError("Truncated ASN.1 element")
+        return Asn1Element(tag, offset, value_start, value_start + length, value_start + length)
+
+    def children(self, element: Asn1Element) -> Iterator[Asn1Element]:
+        offset = element.value_start
+        while offset < element.value_end:
+            child = self.read(offset, element.value_end)
+            yield child
+            offset = child.end
+
+    def expect(self, element: Asn1Element, tag: int) -> Asn1Element:
+        if element.tag != tag:
+            raise ValueError(f"Unexpected ASN.1 tag: {element.tag:#x} instead of {tag:#x}")
+        return element
+
+    def get_bytes(self, element: Asn1Element) -> bytes:
+        return bytes(self.data[element.value_start:element.value_end])
+
+    def get_encoding(self, element: Asn1Element) -> bytes:
+        return bytes(self.data[element.start:element.end])
+
+    def get_integer(self, element: Asn1Element) -> int:
+        return int.from_bytes(self.get_bytes(self.expect(element, Asn1Reader.INTEGER)), "big", signed=True)
+
+    def get_oid(self, element: Asn1Element) -> str:
+        value = self.get_bytes(self.expect(element, Asn1Reader.OBJECT_IDENTIFIER))
+        if not value:
+            raise ValueError("Empty object identifier")
+        arcs = []
+        arc = 0
+        for byte in value:
+            arc = arc << 7 | byte & 0x7f
+            if not byte & 0x80:
+                arcs.append(arc)
+                arc = 0
+        first = min(arcs[0] // 40, 2)
+        return ".".join(str(arc) for arc in [first, arcs[0] - 40 * first] + arcs[1:])
+
+    def get_string(self, element: Asn1Element) -> str:
+        encoding = Asn1Reader.__STRING_ENCODINGS.get(element.tag, "latin-1")
+        return self.get_bytes(element).decode(encoding, "replace")
+
+    def get_time(self, element: Asn1Element) -> datetime:
+        value = self.get_bytes(element).decode("ascii", "replace")
+        try:
+            if element.tag == Asn1Reader.UTC_TIME:
+                # NOTE: as per RFC 5280, two-digit years from 50 on are in the 20th century.
+                time = datetime.strptime(value, "%y%m%d%H%M%SZ")
+                if time.year >= 2050:
+                    time = time.replace(year=time.year - 100)
+            elif element.tag == Asn1Reader.GENERALIZED_TIME:
+                time = datetime.strptime(value, "%Y%m%d%H%M%SZ")
+            else:
+                raise ValueError(f"Unexpected ASN.1 time tag: {element.tag:#x}")
+        except ValueError as error:
+            raise ValueError(f"Invalid ASN.1 time: {value}") from error
+        return time.replace(tzinfo=timezone.utc)
+
+
+class X509Certificate(NamedTuple):
+    """
+    The fields of an X.509 certificate shown by NinjaDroid.
+    """
+
+    encoded: bytes
+    version: int
+    serial_number: int
+    signature_algorithm: str
+    issuer: Dict[str, str]
+    valid_from: datetime
+    valid_to: datetime
+    subject: Dict[str, str]
+
+
+# pylint: disable=too-few-public-methods
+class Pkcs7Parser:
+    """
+    Parser of the X.509 certificates of PKCS#7 signature blocks (e.g. META-INF/CERT.RSA), without keytool.
+    """
+
+    __SIGNED_DATA_OID = "1.2.840.113549.1.7.2"
+    __CERTIFICATES_TAG = 0xa0
+    __VERSION_TAG = 0xa0
+    # NOTE: the names used by keytool (i.e. the Java standard algorithm names).
+    __SIGNATURE_ALGORITHMS = {
+        "1.2.840.113549.1.1.2": "MD2withRSA",
+        "1.2.840.113549.1.1.4": "MD5withRSA",
+        "1.2.840.113549.1.1.5": "SHA1withRSA",
+        "1.2.840.113549.1.1.10": "RSASSA-PSS",
+        "1.2.840.113549.1.1.11": "SHA256withRSA",
+        "1.2.840.113549.1.1.12": "SHA384withRSA",
+        "1.2.840.113549.1.1.13": "SHA512withRSA",
+        "1.2.840.113549.1.1.14": "SHA224withRSA",
+        "1.2.840.10040.4.3": "SHA1withDSA",
+        "2.16.840.1.101.3.4.3.1": "SHA224withDSA",
+        "2.16.840.1.101.3.4.3.2": "SHA256withDSA",
+        "1.2.840.10045.4.1": "SHA1withECDSA",
+        "1.2.840.10045.4.3.1": "SHA224withECDSA",
+        "1.2.840.10045.4.3.2": "SHA256withECDSA",
+        "1.2.840.10045.4.3.3": "SHA384withECDSA",
+        "1.2.840.10045.4.3.4": "SHA512withECDSA",
+        "1.3.101.112": "Ed25519",
+        "1.3.101.113": "Ed448",
+    }
+    __ATTRIBUTES = {
+        "2.5.4.3": "CN",
+        "2.5.4.6": "C",
+        "2.5.4.7": "L",
+        "2.5.4.8": "ST",
+        "2.5.4.10": "O",
+        "2.5.4.11": "OU",
+        "1.2.840.113549.1.9.1": "EMAILADDRESS",
+        "0.9.2342.19200300.100.1.25": "DC",
+    }
+
+    @staticmethod
+    def parse(data: bytes) -> List[X509Certificate]:
+        """
+        :param data: content of either a PKCS#7 signature block or a single X.509 certificate, BER/DER encoded
+        :return: the certificates, in the same order as in the signature block
+        :raise: ValueError if the content is not a valid PKCS#7 signature block nor X.509 certificate
+        """
+        reader = Asn1Reader(data)
+        try:
+            root = reader.expect(reader.read(0), Asn1Reader.SEQUENCE)
+            first = next(reader.children(root), None)
+            if first is None:
+                raise ValueError("Empty ASN.1 sequence")
+            if first.tag == Asn1Reader.SEQUENCE:
+                return [Pkcs7Parser.__parse_certificate(reader, root)]
+            return [
+                Pkcs7Parser.__parse_certificate(reader, certificate)
+                for certificate in Pkcs7Parser.__get_certificates(reader, root)
+            ]
+        except (IndexError, StopIteration) as error:
+            raise ValueError("Truncated ASN.1 content") from error
+
+    @staticmethod
+    def __get_certificates(reader: Asn1Reader, content_info: Asn1Element) -> List[Asn1Element]:
+        content_type, content = list(reader.children(content_info))[:2]
+        if reader.get_oid(content_type) != Pkcs7Parser.__SIGNED_DATA_OID:
+            raise ValueError("Not a PKCS#7 signed data")
+        signed_data = reader.expect(next(reader.children(content)), Asn1Reader.SEQUENCE)
+        for element in reader.children(signed_data):
+            if element.tag == Pkcs7Parser.__CERTIFICATES_TAG:
+                return list(reader.children(element))
+        raise ValueError("No certificates in PKCS#7 signed data")
+
+    @staticmethod
+    def __parse_certificate(reader: Asn1Reader, certificate: Asn1Element) -> X509Certificate:
+        certificate = reader.expect(certificate, Asn1Reader.SEQUENCE)
+        tbs_certificate, signature_algorithm = list(reader.children(certificate))[:2]
+        fields = list(reader.children(reader.expect(tbs_certificate, Asn1Reader.SEQUENCE)))
+        version = 1
+        if fields[0].tag == Pkcs7Parser.__VERSION_TAG:
+            version = reader.get_integer(next(reader.children(fields[0]))) + 1
+            fields = fields[1:]
+        serial_number, _, issuer, validity, subject = fields[:5]
+        valid_from, valid_to = list(reader.children(reader.expect(validity, Asn1Reader.SEQUENCE)))[:2]
+        return X509Certificate(
+            encoded=reader.get_encoding(certificate),
+            version=version,
+            serial_number=reader.get_integer(serial_number),
+            signature_algorithm=Pkcs7Parser.__get_algorithm_name(reader, signature_algorithm),
+            issuer=Pkcs7Parser.__get_name(reader, issuer),
+            valid_from=reader.get_time(valid_from),
+            valid_to=reader.get_time(valid_to),
+            subject=Pkcs7Parser.__get_name(reader, subject)
+        )
+
+    @staticmethod
+    def __get_algorithm_name(reader: Asn1Reader, algorithm: Asn1Element) -> str:
+        oid = reader.get_oid(next(reader.children(reader.expect(algorithm, Asn1Reader.SEQUENCE))))
+        return Pkcs7Parser.__SIGNATURE_ALGORITHMS.get(oid, oid)
+
+    @staticmethod
+    def __get_name(reader: Asn1Reader, name: Asn1Element) -> Dict[str, str]:
+        """
+        :return: the attributes of the distinguished name (e.g. {"CN": "Name", "O": "Organization"}), where the most
+                 specific one is kept when an attribute is repeated (i.e. the first one shown by keytool)
+        """
+        attributes = {}
+        for relative_name in reader.children(reader.expect(name, Asn1Reader.SEQUENCE)):
+            for attribute in reader.children(reader.expect(relative_name, Asn1Reader.SET)):
+                attribute_type, attribute_value = Pkcs7Parser.__get_pair(reader, attribute)
+                key = Pkcs7Parser.__ATTRIBUTES.get(reader.get_oid(attribute_type))
+                if key is not None:
+                    attributes[key] = reader.get_string(attribute_value)
+        return attributes
+
+    @staticmethod
+    def __get_pair(reader: Asn1Reader, element: Asn1Element) -> Tuple[Asn1Element, Asn1Element]:
+        children = list(reader.children(reader.expect(element, Asn1Reader.SEQUENCE)))
+        if len(children) < 2:
+            raise ValueError("Truncated ASN.1 sequence")
+        return children[0], children[1]
@@ -1,8 +1,7 @@
 import os.path
-import re
-from typing import Dict, Pattern, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.signature import Signature, SignatureMatcher, SignatureScanner
 
 
 class ShellSignature(Signature):
@@ -14,7 +13,7 @@ class ShellSignature(Signature):
     SIGNATURE_KEYS_LIST = ["commands", "dirs"]
 
     @staticmethod
-    def compile_regex(signatures: Dict) -> Tuple[Pattern, Pattern]:
+    def build_regex(signatures: Dict) -> Tuple[str, str]:
         regex = r'('
 
         # Shell command:
@@ -35,7 +34,19 @@ class ShellSignature(Signature):
 
         regex += r')'
 
-        is_regex = re.compile(regex, re.IGNORECASE)
-        is_contained_regex = re.compile(regex, re.IGNORECASE)
+        return regex, regex
 
-        return is_regex, is_contained_regex
+    @staticmethod
+    def compile_matcher(signatures: Dict[str, List[str]]) -> Optional[SignatureMatcher]:
+        # NOTE: shell commands are not plain words, hence the regexes are always used.
+        return None
+
+    @staticmethod
+    def compile_scanner(signatures: Dict[str, List[str]]) -> Optional[SignatureScanner]:
+        try:
+            return SignatureScanner(
+                r"(?:^|[\s_#])(?:" + SignatureScanner.join(signatures["commands"]) + r")|"
+                + SignatureScanner.join(signatures["dirs"])
+            )
+        except ValueError:
+            return None
@@ -1,7 +1,150 @@
+from bisect import bisect_right
+import hashlib
+from itertools import accumulate
 import os.path
 import json
 import re
-from typing import Dict, Optional, Pattern, Tuple
+from threading import Lock, RLock
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple, Type, TypeVar
+
+
+class SignatureMatcher:
+    """
+    Matcher for plain-word signatures (e.g. "AdMob", "root"), equivalent to Signature regexes but in linear time.
+
+    The generic Signature regex backtracks over every start position and, when anchored, over every way of splitting
+    the trailing words. Here the signatures are first looked up with a single alternation search, then the match is
+    anchored at the beginning of the string and extended with a tail that cannot backtrack.
+    """
+
+    __REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+    __TAIL_REGEX = re.compile(r"(?:\s?\S+)*")
+    __LAST_DOUBLE_WHITESPACE_REGEX = re.compile(r"(?s:.*)\s\s")
+
+    def __init__(self, signatures: Sequence[str]):
+        """
+        :param signatures: plain-word signatures, in the order in which they are tried at the same position
+        :raise: ValueError if any of the signatures contains regex metacharacters
+        """
+        if not all(self.is_literal(signature) for signature in signatures):
+            raise ValueError("Signatures must be plain words")
+        alternation = "|".join(signatures)
+        self.__any_regex = re.compile(alternation, re.IGNORECASE)
+        self.__prefix_regex = re.compile(r"(?:|(?s:.*))(?:" + alternation + r")", re.IGNORECASE)
+        self.__signature_regexes = [(re.compile(signature, re.IGNORECASE), len(signature)) for signature in signatures]
+
+    @staticmethod
+    def is_literal(signature: str) -> bool:
+        return not any(char in SignatureMatcher.__REGEX_METACHARACTERS for char in signature)
+
+    def is_valid(self, pattern: str) -> bool:
+        """
+        :param pattern: The pattern to validate
+        :returns: true if the whole pattern is a signature followed by single-space separated words
+        """
+        # NOTE: as for "$", the match can end either at the end of the pattern or just before a final newline.
+        ends = [len(pattern)]
+        if pattern.endswith("\n"):
+            ends.append(len(pattern) - 1)
+        for end in ends:
+            start = self.__get_tail_start(pattern, end)
+            for signature_regex, signature_len in self.__signature_regexes:
+                if signature_regex.search(pattern, max(start - signature_len, 0), end) is not None:
+                    return True
+        return False
+
+    def __get_tail_start(self, pattern: str, end: int) -> int:
+        """
+        :returns: the lowest position from which the tail can match the pattern up to the given end
+        """
+        if end > 0 and pattern[end - 1].isspace():
+            return end
+        match = self.__LAST_DOUBLE_WHITESPACE_REGEX.match(pattern, 0, end)
+        return match.end() - 1 if match is not None else 0
+
+    def search(self, pattern: str) -> Optional[str]:
+        """
+        :param pattern: The pattern to search
+        :returns: the optional match
+        """
+        if self.__any_regex.search(pattern) is None:
+            return None
+        # NOTE: a signature at the beginning of the pattern has priority, otherwise the last one is picked.
+        signature_end = self.__prefix_regex.match(pattern).end()
+        return pattern[:self.__TAIL_REGEX.match(pattern, signature_end).end()].strip()
+
+
+class SignatureScanner:
+    """
+    Cheap sweep over a buffer of many patterns joined by newlines (e.g. all the strings of a dex file), finding where
+    the signatures may occur, so that only the patterns there have to be searched with the signature regexes.
+
+    Rather than ignoring the case, the alternation of the lowercase signatures runs over the lowercase buffer, which is
+    several times faster. Non-ASCII chars may match the regexes anyway (e.g. "\u017f" is "S" when ignoring the case),
+    hence patterns containing them are always candidates.
+    """
+
+    __REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+    __QUANTIFIERS = frozenset("*+?{")
+
+    def __init__(self, regex_source: str):
+        """
+        :param regex_source: the regex matching, in lowercase ASCII text, wherever a signature may occur (see join()).
+                             As the patterns are joined by newlines, "^" matches at the beginning of each one of them.
+        """
+        self.__regex = re.compile(regex_source, re.IGNORECASE | re.MULTILINE)
+        self.__lowercase_regex = re.compile(regex_source + r"|[^\x00-\x7f]", re.MULTILINE)
+
+    @staticmethod
+    def join(signatures: Sequence[str]) -> str:
+        """
+        :param signatures: the signatures, either plain words or regexes
+        :returns: the alternation of the lowercase literal prefixes that every match of the signatures starts with
+        :raise: ValueError if any of the signatures has no such prefix
+        """
+        if not signatures:
+            raise ValueError("Missing signatures")
+        return "|".join(re.escape(SignatureScanner.get_literal_prefix(signature)) for signature in signatures)
+
+    @staticmethod
+    def get_literal_prefix(signature: str) -> str:
+        """
+        :param signature: the signature, either a plain word or a regex
+        :returns: the lowercase prefix that every match of the signature starts with (e.g. "check-los" for
+                  "check-lost+found")
+        :raise: ValueError if the signature has no such prefix
+        """
+        if "|" in signature or not signature.isascii():
+            raise ValueError("Signatures must be ASCII and without alternations")
+        end = next(
+            (index for index, char in enumerate(signature) if char in SignatureScanner.__REGEX_METACHARACTERS),
+            len(signature)
+        )
+        if end < len(signature) and signature[end] in SignatureScanner.__QUANTIFIERS:
+            end -= 1
+        if end <= 0:
+            raise ValueError("Signatures must start with a plain word")
+        return signature[:end].lower()
+
+    def scan(self, buffer: str) -> Callable[[int], int]:
+        """
+        :param buffer: The buffer to scan
+        :returns: the function telling, from a given position, the position of the first char of the buffer where a
+                  signature may occur, or -1 if there is none
+        """
+        lowercase_buffer = buffer.lower()
+        if len(lowercase_buffer) == len(buffer):
+            regex, buffer = self.__lowercase_regex, lowercase_buffer
+        else:
+            # NOTE: some chars (e.g. "\u0130") become longer in lowercase, which would shift the positions.
+            regex = self.__regex
+
+        def find(start: int) -> int:
+            match = regex.search(buffer, start)
+            # NOTE: the last char of the match, since a prefix of the regex may belong to the previous pattern.
+            return match.end() - 1 if match is not None else -1
+
+        return find
 
 
 class Signature:
@@ -12,37 +155,85 @@ class Signature:
     CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "config", "signatures.json")
     SIGNATURE_KEYS_LIST = ["signatures"]
     IS_REGEX = None
+    IS_REGEX_SOURCE = None
     IS_CONTAINED_REGEX = None
+    MATCHER = None
+    PREFILTER = None
+    SCANNER = None
+    __LOCK = RLock()
 
-    # pylint: disable=invalid-name
     def __init__(self):
-        # NOTE: IS_REGEX and IS_CONTAINED_REGEX are time-consuming to compile.
-        # Since they don't change at runtime we can do this just once.
-        if self.IS_REGEX is None or self.IS_CONTAINED_REGEX is None:
-            signatures_regex = self.get_signature_regex_from_config()
-            (self.IS_REGEX, self.IS_CONTAINED_REGEX) = self.compile_regex(signatures_regex)
+        self.prepare()
 
+    # pylint: disable=invalid-name
     @classmethod
-    def get_signature_regex_from_config(cls) -> Dict:
-        signatures_regex = {}
+    def prepare(cls):
+        """
+        Compile the signatures of the class, if not done yet.
+
+        NOTE: the regexes are time-consuming to compile and they don't change at runtime, hence this is done just once
+        per class. The compiled state is stored in the class itself (i.e. neither in the instances, nor inherited from
+        the base class), so that it is shared by all the instances. Moreover, IS_REGEX is only needed by is_valid() and
+        it is compiled on first use.
+        """
+        if cls.__dict__.get("IS_CONTAINED_REGEX") is not None:
+            return
+        with Signature.__LOCK:
+            if cls.__dict__.get("IS_CONTAINED_REGEX") is not None:
+                return
+            signatures = cls.get_signatures_from_config()
+            (cls.IS_REGEX_SOURCE, is_contained_regex_source) = cls.build_regex(cls.join_signatures(signatures))
+            cls.IS_REGEX = None
+            cls.MATCHER = cls.compile_matcher(signatures)
+            cls.PREFILTER = cls.compile_prefilter(signatures)
+            cls.SCANNER = cls.compile_scanner(signatures)
+            cls.IS_CONTAINED_REGEX = re.compile(is_contained_regex_source, re.IGNORECASE)
+
+    @classmethod
+    def get_is_regex(cls) -> Pattern:
+        cls.prepare()
+        if cls.IS_REGEX is None:
+            with Signature.__LOCK:
+                if cls.IS_REGEX is None:
+                    cls.IS_REGEX = re.compile(cls.IS_REGEX_SOURCE, re.IGNORECASE)
+        return cls.IS_REGEX
+
+    @classmethod
+    def get_signatures_from_config(cls) -> Dict[str, List[str]]:
+        """
+        :returns: dictionary of the signature lists, in alternation order, whose keys are the ones declared in
+                  SIGNATURE_KEYS_LIST.
+        """
+        signatures = {}
         with open(cls.CONFIG_FILE, "r", encoding="utf-8") as config_file:
             config = json.load(config_file)
             for signature_name in cls.SIGNATURE_KEYS_LIST:
                 signatures_list = config[signature_name]
                 signatures_list.reverse()
+                signatures[signature_name] = signatures_list
+        return signatures
 
-                signatures_regex[signature_name] = ""
+    @classmethod
+    def get_config_hash(cls) -> str:
+        """
+        :returns: the sha256 of the config file, which changes whenever the signatures do
+        """
+        with open(cls.CONFIG_FILE, "rb") as config_file:
+            return hashlib.sha256(config_file.read()).hexdigest()
 
-                for signature in signatures_list:
-                    signatures_regex[signature_name] += r'' + signature + r'|'
-                signatures_regex[signature_name] = signatures_regex[signature_name][:-1]
-        return signatures_regex
+    @classmethod
+    def get_signature_regex_from_config(cls) -> Dict:
+        return cls.join_signatures(cls.get_signatures_from_config())
 
     @staticmethod
-    def compile_regex(signatures: Dict) -> Tuple[Pattern, Pattern]:
+    def join_signatures(signatures: Dict[str, List[str]]) -> Dict:
+        return {signature_name: r'|'.join(signatures_list) for signature_name, signatures_list in signatures.items()}
+
+    @staticmethod
+    def build_regex(signatures: Dict) -> Tuple[str, str]:
         """
         :param signatures: Dictionary of the signature regex, whose keys are the ones declared in SIGNATURE_KEYS_LIST.
-        :returns: tuple of compiled regexes
+        :returns: tuple of regexes, to be compiled ignoring the case, validating and searching a pattern respectively
         """
         regex = r'('
 
@@ -56,10 +247,39 @@ class Signature:
 
         regex += r')'
 
-        is_regex = re.compile(r'^' + regex + r'$', re.IGNORECASE)
-        is_contained_regex = re.compile(regex, re.IGNORECASE)
+        return r'^' + regex + r'$', regex
+
+    @staticmethod
+    def compile_matcher(signatures: Dict[str, List[str]]) -> Optional[SignatureMatcher]:
+        """
+        :param signatures: Dictionary of the signature lists, whose keys are the ones declared in SIGNATURE_KEYS_LIST.
+        :returns: the linear-time matcher equivalent to the compiled regexes, if the signatures allow for one
+        """
+        signatures_list = signatures["signatures"] if signatures["signatures"] else ["apk"]
+        try:
+            return SignatureMatcher(signatures_list)
+        except ValueError:
+            return None
 
-        return is_regex, is_contained_regex
+    @staticmethod
+    # pylint: disable-next=unused-argument
+    def compile_prefilter(signatures: Dict[str, List[str]]) -> Optional[Callable[[str], bool]]:
+        """
+        :param signatures: Dictionary of the signature lists, whose keys are the ones declared in SIGNATURE_KEYS_LIST.
+        :returns: an optional cheap check telling whether a pattern may match at all, before running the regexes
+        """
+        return None
+
+    @staticmethod
+    def compile_scanner(signatures: Dict[str, List[str]]) -> Optional[SignatureScanner]:
+        """
+        :param signatures: Dictionary of the signature lists, whose keys are the ones declared in SIGNATURE_KEYS_LIST.
+        :returns: the optional sweep finding the patterns which may match among many of them (see search_all())
+        """
+        try:
+            return SignatureScanner(SignatureScanner.join(signatures["signatures"] or ["apk"]))
+        except ValueError:
+            return None
 
     def is_valid(self, pattern: str) -> bool:
         """
@@ -68,7 +288,11 @@ class Signature:
         """
         if pattern is None or pattern == "":
             return False
-        return self.IS_REGEX.search(pattern) is not None
+        if self.PREFILTER is not None and not self.PREFILTER(pattern):  # pylint: disable=not-callable
+            return False
+        if self.MATCHER is not None:
+            return self.MATCHER.is_valid(pattern)
+        return self.get_is_regex().search(pattern) is not None
 
     def search(self, pattern: str) -> Tuple[Optional[str], bool]:
         """
@@ -77,7 +301,86 @@ class Signature:
         """
         if pattern is None or pattern == "":
             return None, False
+        if self.PREFILTER is not None and not self.PREFILTER(pattern):  # pylint: disable=not-callable
+            return None, False
+        return self.__search(pattern)
+
+    def __search(self, pattern: str) -> Tuple[Optional[str], bool]:
+        if self.MATCHER is not None:
+            match = self.MATCHER.search(pattern)
+            return (match, True) if match is not None else (None, False)
         match = self.IS_CONTAINED_REGEX.search(pattern)
         if match is None or match.group(0) is None:
             return None, False
         return str(match.group(0)).strip(), True
+
+    def search_all(self, patterns: Sequence[str], min_length: Optional[int] = None) -> List[str]:
+        """
+        Search many patterns at once (e.g. all the strings of a dex file), with the same result of calling search() on
+        each one of them: a single sweep over the patterns joined by newlines finds the few candidates that may match
+        (see find_candidates()), so that only those are searched one by one.
+
+        :param patterns: The patterns to search
+        :param min_length: (optional) the length a pattern must exceed to be searched. None by default, meaning any.
+        :returns: the non-empty matches, in the same order of the patterns
+        """
+        if min_length is not None:
+            patterns = [pattern for pattern in patterns if len(pattern) > min_length]
+        # NOTE: the scanner takes the place of the prefilter, which only rejects patterns that cannot match anyway.
+        search = self.__search if self.SCANNER is not None else self.search
+        matches = []
+        for index in self.find_candidates(patterns):
+            match, is_valid = search(patterns[index])
+            if is_valid and match:
+                matches.append(match)
+        return matches
+
+    def find_candidates(self, patterns: Sequence[str]) -> Iterator[int]:
+        """
+        :param patterns: The patterns to scan
+        :returns: the indexes of the patterns which may match, in increasing order, found by sweeping the scanner over
+                  the patterns joined by newlines, or all of them if there is no scanner
+        """
+        if self.SCANNER is None:
+            yield from range(len(patterns))
+            return
+        find = self.SCANNER.scan("\n".join(patterns))
+        # NOTE: the end of each pattern, including its newline separator.
+        ends = list(accumulate(len(pattern) + 1 for pattern in patterns))
+        index = 0
+        position = find(0)
+        while position != -1:
+            index = bisect_right(ends, position, index)
+            yield index
+            # NOTE: a single candidate per pattern is enough, hence the sweep skips to the following one.
+            position = find(ends[index])
+
+
+SignatureT = TypeVar("SignatureT", bound=Signature)
+
+
+class SignatureRegistry:
+    """
+    Process-wide registry of signature parsers, sharing a single instance of each signature class.
+    """
+
+    __signatures = {}
+    __lock = Lock()
+
+    @staticmethod
+    def get(signature_class: Type[SignatureT]) -> SignatureT:
+        """
+        :param signature_class: the signature class (e.g. UriSignature)
+        :returns: the shared instance of the given signature class
+        """
+        with SignatureRegistry.__lock:
+            signature = SignatureRegistry.__signatures.get(signature_class)
+            if signature is None:
+                signature = signature_class()
+                SignatureRegistry.__signatures[signature_class] = signature
+            return signature
+
+    @staticmethod
+    def clear():
+        with SignatureRegistry.__lock:
+            SignatureRegistry.__signatures.clear()
@@ -1,8 +1,54 @@
 import os.path
 import re
-from typing import Dict, Pattern, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.signature import Signature, SignatureMatcher
+
+
+# pylint: disable=too-few-public-methods
+class UriPrefilter:
+    """
+    Cheap check rejecting the patterns that cannot contain a URI, before running the URI regexes.
+
+    Every URI matched by UriSignature contains either a dot between a host label and a TLD or a dot between two digits
+    (IP address), hence all the other patterns are rejected by scanning the dots and looking the TLDs up by length.
+    """
+
+    # NOTE: non-ASCII chars may match the regexes anyway (e.g. "\u212a" is "K" when ignoring the case, "\u0661" is a
+    # digit), so patterns containing them are always candidates.
+    # NOTE: the dots come first (i.e. before the lookbehinds), so that the regex skips quickly from one to the next.
+    __CANDIDATE_REGEX = re.compile(r"\.(?<=[A-Za-z0-9-][A-Za-z0-9]\.)|\.(?<=\d\.)(?=\d)|[^\x00-\x7f]")
+
+    def __init__(self, tlds: Sequence[str]):
+        """
+        :param tlds: the TLDs recognised by the URI regexes
+        """
+        tlds_by_length = {}
+        for tld in tlds:
+            tlds_by_length.setdefault(len(tld), set()).add(tld.lower())
+        self.__tlds_by_length = sorted((length, frozenset(tlds)) for length, tlds in tlds_by_length.items())
+        self.__max_tld_length = max(tlds_by_length) if tlds_by_length else 0
+
+    def __call__(self, pattern: str) -> bool:
+        """
+        :param pattern: The pattern to check
+        :returns: false if the pattern cannot contain a URI, true if it may
+        """
+        if "." not in pattern:
+            return False
+        for match in self.__CANDIDATE_REGEX.finditer(pattern):
+            if match.group(0) != ".":
+                return True
+            start = match.end()
+            if pattern[start:start + 1].isdigit() and pattern[match.start() - 1].isdigit():
+                return True
+            suffix = pattern[start:start + self.__max_tld_length].lower()
+            for length, tlds in self.__tlds_by_length:
+                if length > len(suffix):
+                    break
+                if suffix[:length] in tlds:
+                    return True
+        return False
 
 
 class UriSignature(Signature):
@@ -14,7 +60,7 @@ class UriSignature(Signature):
     SIGNATURE_KEYS_LIST = ["tlds"]
 
     @staticmethod
-    def compile_regex(signatures: Dict) -> Tuple[Pattern, Pattern]:
+    def build_regex(signatures: Dict) -> Tuple[str, str]:
         regex = r'('
 
         # Scheme (HTTP, HTTPS, FTP and SFTP):
@@ -47,7 +93,21 @@ class UriSignature(Signature):
 
         regex += r')'
 
-        is_regex = re.compile(r'^' + regex + r'$', re.IGNORECASE)
-        is_contained_regex = re.compile(regex, re.IGNORECASE)
+        return r'^' + regex + r'$', regex
 
-        return is_regex, is_contained_regex
+    @staticmethod
+    def compile_matcher(signatures: Dict[str, List[str]]) -> Optional[SignatureMatcher]:
+        # NOTE: URIs are not plain words, hence the regexes are always used.
+        return None
+
+    @staticmethod
+    def compile_prefilter(signatures: Dict[str, List[str]]) -> Optional[UriPrefilter]:
+        if not signatures["tlds"]:
+            # NOTE: without a TLD list any sequence of 2-6 letters is a valid TLD, hence nothing is worth filtering.
+            return None
+        return UriPrefilter(signatures["tlds"])
+
+    @staticmethod
+    def compile_scanner(signatures: Dict[str, List[str]]) -> None:
+        # NOTE: the prefilter already rejects most patterns as cheaply as a sweep over all of them would.
+        return None
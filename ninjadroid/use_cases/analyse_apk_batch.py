@@ -0,0 +1,220 @@
+from concurrent.futures import Future, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from glob import glob, has_magic
+from logging import getLogger, Logger
+import os
+import sys
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from ninjadroid.parsers.apk import APK, ApkParser, ApkParsingError
+from ninjadroid.parsers.cache import EntryCache, ResultCache
+from ninjadroid.parsers.file import FileParser, FileParsingError, HashProfile
+from ninjadroid.signatures.shell_signature import ShellSignature
+from ninjadroid.signatures.signature import Signature, SignatureRegistry
+from ninjadroid.signatures.uri_signature import UriSignature
+from ninjadroid.use_cases.apk_json_writer import ApkJsonWriter
+
+
+default_logger = getLogger(__name__)
+
+
+class ApkBatchResult(NamedTuple):
+    """
+    Outcome of the analysis of a single APK package of a batch: either the parsed APK or an error message.
+    """
+
+    filepath: str
+    apk: Optional[APK] = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict:
+        if self.apk is not None:
+            return self.apk.as_dict()
+        return {"file": self.filepath, "error": self.error}
+
+    def write(self, stream: TextIO, as_json_lines: bool = False):
+        """
+        Write the result to the given stream incrementally, either as a single JSON line of as_dict() or as JSON Lines
+        records (see ApkJsonWriter.get_records()), in which case an error is an "error" record.
+        """
+        if not as_json_lines:
+            ApkJsonWriter.write_record(self.as_dict(), stream)
+        elif self.apk is not None:
+            ApkJsonWriter.write_json_lines(self.apk, stream)
+        else:
+            ApkJsonWriter.write_record({"record": ApkJsonWriter.ERROR_RECORD, **self.as_dict()}, stream)
+
+
+class AnalyseApkBatch:
+    """
+    Analyse many APK packages, reusing the same parser (and hence signatures) for all of them.
+
+    The APK packages are analysed either one after the other in the current process or by a pool of worker processes,
+    each one with its own parser. Each parser remembers the dex and cert files it has already parsed, so that the ones
+    shared by many APK packages (e.g. a common library or signing certificate) are parsed only once.
+    """
+
+    __worker = None
+
+    def __init__(
+            self,
+            logger: Logger = default_logger,
+            hash_profile: Optional[HashProfile] = None,
+            threads: int = 1,
+            cache: Optional[ResultCache] = None
+    ):
+        self.logger = logger
+        self.hash_profile = hash_profile
+        self.threads = threads
+        self.cache = cache
+        self.parser = ApkParser(logger, hash_profile, threads, cache, EntryCache())
+
+    # pylint: disable=too-many-arguments
+    def execute(
+            self,
+            filepaths: Iterable[str],
+            extended_processing: bool,
+            in_memory: bool = False,
+            jobs: int = 1,
+            ordered: bool = True,
+            fast: bool = False
+    ) -> Iterator[ApkBatchResult]:
+        """
+        :param filepaths: paths of the APK packages
+        :param extended_processing: whether to retrieve all the information or only a summary
+        :param in_memory: whether to read the APK entries in memory, without extracting them
+        :param jobs: how many APK packages to analyse in parallel, each one in a separate worker process
+        :param ordered: whether to return the results in the same order of the given paths, or as soon as they are
+                        available (only relevant with more than one job)
+        :param fast: whether to retrieve only a fast summary, from the zip central directory, manifest and cert
+        :return: the analysis results, as soon as they are available
+        """
+        if jobs <= 1:
+            for filepath in filepaths:
+                yield self.analyse(filepath, extended_processing, in_memory, fast)
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=AnalyseApkBatch.init_worker,
+                initargs=(
+                    self.logger.name,
+                    self.logger.getEffectiveLevel(),
+                    self.hash_profile,
+                    self.threads,
+                    self.cache
+                )
+        ) as pool:
+            # NOTE: the paths are submitted lazily, keeping the workers busy without queueing the whole batch.
+            pending = {}
+            for filepath in filepaths:
+                future = pool.submit(
+                    AnalyseApkBatch.analyse_in_worker,
+                    filepath,
+                    extended_processing,
+                    in_memory,
+                    fast
+                )
+                pending[future] = filepath
+                if len(pending) >= 2 * jobs:
+                    yield from self.__collect(pending, ordered)
+            while pending:
+                yield from self.__collect(pending, ordered)
+
+    def __collect(self, pending: Dict[Future, str], ordered: bool) -> Iterator[ApkBatchResult]:
+        if ordered:
+            # NOTE: dictionaries preserve the insertion order, hence the first pending future is the oldest one.
+            done = list(pending)[:1]
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            filepath = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # NOTE: whatever happens in a worker (e.g. a crash), it must not stop the rest of the batch.
+                self.logger.error("Cannot analyse the target file ('%s'): %s", filepath, repr(error))
+                result = ApkBatchResult(filepath, error=repr(error))
+            yield result
+
+    @staticmethod
+    def init_worker(
+            logger_name: str,
+            logger_level: int,
+            hash_profile: Optional[HashProfile],
+            threads: int = 1,
+            cache: Optional[ResultCache] = None
+    ):
+        """
+        Set up a worker process, warming up its state (i.e. parser and compiled signatures) before any APK arrives.
+        """
+        logger = getLogger(logger_name)
+        logger.setLevel(logger_level)
+        AnalyseApkBatch.__worker = AnalyseApkBatch(logger, hash_profile, threads, cache)
+        for signature_class in (UriSignature, ShellSignature, Signature):
+            SignatureRegistry.get(signature_class)
+
+    @staticmethod
+    def analyse_in_worker(
+            filepath: str,
+            extended_processing: bool,
+            in_memory: bool,
+            fast: bool = False
+    ) -> ApkBatchResult:
+        return AnalyseApkBatch.__worker.analyse(filepath, extended_processing, in_memory, fast)
+
+    def analyse(
+            self,
+            filepath: str,
+            extended_processing: bool,
+            in_memory: bool = False,
+            fast: bool = False
+    ) -> ApkBatchResult:
+        self.logger.debug("Reading %s...", filepath)
+        try:
+            apk = self.parser.parse(filepath, extended_processing, in_memory, fast)
+        except ApkParsingError:
+            self.logger.error("The target file ('%s') must be an APK package!", filepath)
+            return ApkBatchResult(filepath, error=str(ApkParsingError()))
+        except FileParsingError:
+            self.logger.error("The target file ('%s') must be an existing, readable file!", filepath)
+            return ApkBatchResult(filepath, error=str(FileParsingError()))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # NOTE: as with the worker processes, whatever happens with an APK package must not stop the whole batch.
+            self.logger.error("Cannot analyse the target file ('%s'): %s", filepath, repr(error))
+            return ApkBatchResult(filepath, error=repr(error))
+        return ApkBatchResult(filepath, apk=apk)
+
+    @staticmethod
+    def list_apk_files(target: str, stdin: TextIO = sys.stdin) -> Iterator[str]:
+        """
+        :param target: either a directory (searched recursively for .apk files), a glob pattern, a file listing one
+                       APK path per line, a single APK package or "-" to read the list of APK paths from stdin
+        :param stdin: the stream to read the list of APK paths from, when the target is "-"
+        :return: the paths of the APK packages
+        :raise: FileParsingError if the target is neither of them (e.g. missing or unreadable)
+        """
+        if target == "-":
+            yield from AnalyseApkBatch.__read_list(stdin)
+        elif FileParser.is_directory(target):
+            for directory, subdirectories, filenames in os.walk(target):
+                subdirectories.sort()
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(".apk"):
+                        yield os.path.join(directory, filename)
+        elif has_magic(target):
+            yield from sorted(glob(target, recursive=True))
+        elif FileParser.is_zip_file(target):
+            yield target
+        else:
+            try:
+                with open(target, "r", encoding="utf-8") as file:
+                    yield from AnalyseApkBatch.__read_list(file)
+            except (OSError, UnicodeDecodeError) as error:
+                raise FileParsingError() from error
+
+    @staticmethod
+    def __read_list(stream: TextIO) -> Iterator[str]:
+        for line in stream:
+            filepath = line.strip()
+            if filepath != "":
+                yield filepath
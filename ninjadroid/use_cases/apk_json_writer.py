@@ -0,0 +1,62 @@
+import json
+from typing import Dict, Iterator, TextIO
+
+from ninjadroid.parsers.apk import APK
+from ninjadroid.parsers.file import File
+
+
+class ApkJsonWriter:
+    """
+    Incremental JSON serializer of the APK information, writing it chunk by chunk to a text stream (e.g. stdout or the
+    report file) rather than building the whole JSON document in memory first.
+    """
+
+    APK_RECORD = "apk"
+    MANIFEST_RECORD = "manifest"
+    CERT_RECORD = "cert"
+    DEX_RECORD = "dex"
+    OTHER_RECORD = "other"
+    ERROR_RECORD = "error"
+
+    @staticmethod
+    def write_json(apk: APK, stream: TextIO):
+        """
+        Write the APK information as a single, indented JSON document (i.e. the same as json.dumps() of as_dict()),
+        without a trailing new line.
+        """
+        json.dump(apk.as_dict(), stream, sort_keys=True, ensure_ascii=False, indent=4)
+
+    @staticmethod
+    def write_json_lines(apk: APK, stream: TextIO):
+        """
+        Write the APK information as JSON Lines, with one compact record per line (see get_records()).
+        """
+        for record in ApkJsonWriter.get_records(apk):
+            ApkJsonWriter.write_record(record, stream)
+
+    @staticmethod
+    def write_record(record: Dict, stream: TextIO):
+        # NOTE: unlike json.dumps(), json.dump() encodes the record piece by piece (e.g. one dex string at a time).
+        json.dump(record, stream, sort_keys=True, ensure_ascii=False)
+        stream.write("\n")
+
+    @staticmethod
+    def get_records(apk: APK) -> Iterator[Dict]:
+        """
+        :param apk: the APK information
+        :return: the JSON Lines records of the APK information, one at a time: first the APK package itself and then
+                 its manifest, cert, dex and other files. Each record has a "record" key telling its kind (i.e. "apk",
+                 "manifest", "cert", "dex" or "other") and each entry record has an "apk" key with the APK file name.
+        """
+        filename = apk.get_file_name()
+        yield {"record": ApkJsonWriter.APK_RECORD, **File.as_dict(apk), "name": apk.get_app_name()}
+        yield ApkJsonWriter.__get_entry_record(ApkJsonWriter.MANIFEST_RECORD, filename, apk.get_manifest())
+        yield ApkJsonWriter.__get_entry_record(ApkJsonWriter.CERT_RECORD, filename, apk.get_cert())
+        for dex in apk.get_dex_files():
+            yield ApkJsonWriter.__get_entry_record(ApkJsonWriter.DEX_RECORD, filename, dex)
+        for file in apk.get_other_files():
+            yield ApkJsonWriter.__get_entry_record(ApkJsonWriter.OTHER_RECORD, filename, file)
+
+    @staticmethod
+    def __get_entry_record(record: str, apk_filename: str, file: File) -> Dict:
+        return {"record": record, "apk": apk_filename, **file.as_dict()}
@@ -1,8 +1,8 @@
-import json
 from logging import getLogger, Logger
 import os
 
 from ninjadroid.parsers.apk import APK
+from ninjadroid.use_cases.apk_json_writer import ApkJsonWriter
 
 default_logger = getLogger(__name__)
 
@@ -10,7 +10,7 @@ default_logger = getLogger(__name__)
 # pylint: disable=too-few-public-methods
 class GenerateApkInfoReport:
     """
-    Generate the APK report and store it a JSON file.
+    Generate the APK report and store it a JSON (or JSON Lines) file.
     """
 
     __REPORT_FILENAME_PREFIX = "report-"
@@ -18,10 +18,13 @@ class GenerateApkInfoReport:
     def __init__(self, logger: Logger = default_logger):
         self.logger = logger
 
-    def execute(self, apk: APK, input_filename: str,  output_directory: str):
+    def execute(self, apk: APK, input_filename: str,  output_directory: str, as_json_lines: bool = False):
         self.logger.info("Generating JSON report file...")
-        report_filename = GenerateApkInfoReport.__REPORT_FILENAME_PREFIX + input_filename + ".json"
+        extension = ".jsonl" if as_json_lines else ".json"
+        report_filename = GenerateApkInfoReport.__REPORT_FILENAME_PREFIX + input_filename + extension
         self.logger.info("Creating %s/%s...", output_directory, report_filename)
         with open(os.path.join(output_directory, report_filename), "w", encoding="utf-8") as file:
-            apk_info = json.dumps(apk.as_dict(), sort_keys=True, ensure_ascii=False, indent=4)
-            file.write(apk_info)
+            if as_json_lines:
+                ApkJsonWriter.write_json_lines(apk, file)
+            else:
+                ApkJsonWriter.write_json(apk, file)
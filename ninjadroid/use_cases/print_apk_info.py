@@ -1,8 +1,8 @@
-import json
-
-from typing import Any, Optional
+import sys
+from typing import Any, Optional, TextIO
 
 from ninjadroid.parsers.apk import APK
+from ninjadroid.use_cases.apk_json_writer import ApkJsonWriter
 
 
 # pylint: disable=too-few-public-methods
@@ -14,10 +14,19 @@ class PrintApkInfo:
     def __init__(self):
         pass
 
-    def execute(self, apk: APK, as_json: bool):
-        if as_json:
-            apk_info = json.dumps(apk.as_dict(), sort_keys=True, ensure_ascii=False, indent=4)
-            print(apk_info)
+    def execute(self, apk: APK, as_json: bool, as_json_lines: bool = False, stream: Optional[TextIO] = None):
+        """
+        :param apk: the APK information
+        :param as_json: whether to print it as JSON
+        :param as_json_lines: (optional) whether to print it as JSON Lines, one record per entry. False by default.
+        :param stream: (optional) where to print the JSON (Lines) output to. stdout by default.
+        """
+        stream = stream if stream is not None else sys.stdout
+        if as_json_lines:
+            ApkJsonWriter.write_json_lines(apk, stream)
+        elif as_json:
+            ApkJsonWriter.write_json(apk, stream)
+            stream.write("\n")
         else:
             self.print_dictionary(apk.as_dict())
 
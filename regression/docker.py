@@ -44,8 +44,6 @@ class DockerRegressionSuite(RegressionSuite):
         )
 
         result = self.execute_command(self.BASE_COMMAND + "ninjadroid /apks/Example.apk --all")
-        # NOTE: the below hack is needed to remove the SHA1withRSA signature algorithm warning...
-        result = "\n".join(result.split('\n')[4:])
 
         self.assert_plain_text_equal(expected, result, multiline=False)
 
@@ -57,6 +55,14 @@ class DockerRegressionSuite(RegressionSuite):
 
         self.assert_json_equal(expected, result)
 
+    @RegressionSuite.test
+    def show_json_fast(self):
+        expected = self.read_json_file("regression/expected/fast.json", overrides={"file": "/apks/Example.apk"})
+
+        result = self.execute_command(self.BASE_COMMAND + "ninjadroid /apks/Example.apk --fast --json")
+
+        self.assert_json_equal(expected, result)
+
     @RegressionSuite.test
     def show_json_extended(self):
         expected = self.read_json_file(
@@ -67,8 +73,6 @@ class DockerRegressionSuite(RegressionSuite):
         )
 
         result = self.execute_command(self.BASE_COMMAND + "ninjadroid /apks/Example.apk --all --json")
-        # NOTE: the below hack is needed to remove the SHA1withRSA signature algorithm warning...
-        result = "\n".join(result.split('\n')[4:])
 
         self.assert_json_equal(expected, result)
 
@@ -77,7 +81,7 @@ class DockerRegressionSuite(RegressionSuite):
         expected = self.read_plain_text_file(
             "regression/expected/extract.txt",
             overrides={
-                22: "7ab36f88adf38f96df05c9e024d548ab  output/report-Example.json"
+                22: "ab413c29ba9a1d68eebb707b32e9ffc9  output/report-Example.json"
             }
         )
 
@@ -39,6 +39,14 @@ class FlatpakRegressionSuite(RegressionSuite):
 
         self.assert_json_equal(expected, result)
 
+    @RegressionSuite.test
+    def show_json_fast(self):
+        expected = self.read_json_file("regression/expected/fast.json")
+
+        result = self.execute_command(self.BASE_COMMAND + "ninjadroid regression/data/Example.apk --fast --json")
+
+        self.assert_json_equal(expected, result)
+
     @RegressionSuite.test
     def show_json_extended(self):
         expected = self.read_json_file("regression/expected/extended.json")
@@ -38,6 +38,14 @@ class NativeRegressionSuite(RegressionSuite):
 
         self.assert_json_equal(expected, result)
 
+    @RegressionSuite.test
+    def show_json_fast(self):
+        expected = self.read_json_file("regression/expected/fast.json")
+
+        result = self.execute_command("ninjadroid regression/data/Example.apk --fast --json")
+
+        self.assert_json_equal(expected, result)
+
     @RegressionSuite.test
     def show_json_extended(self):
         expected = self.read_json_file("regression/expected/extended.json")
@@ -41,18 +41,16 @@ class SnapRegressionSuite(RegressionSuite):
         self.assert_json_equal(expected, result)
 
     @RegressionSuite.test
-    def show_json_extended(self):
-        expected = self.read_json_file(
-            "regression/expected/extended.json",
-            overrides={
-                "cert": {
-                    "fingerprint": {
-                        "signature": "SHA1withRSA (weak)"
-                    }
-                },
+    def show_json_fast(self):
+        expected = self.read_json_file("regression/expected/fast.json")
 
-            }
-        )
+        result = self.execute_command(self.BASE_PATH + "ninjadroid regression/data/Example.apk --fast --json")
+
+        self.assert_json_equal(expected, result)
+
+    @RegressionSuite.test
+    def show_json_extended(self):
+        expected = self.read_json_file("regression/expected/extended.json")
 
         result = self.execute_command(self.BASE_PATH + "ninjadroid regression/data/Example.apk --all --json")
 
@@ -65,7 +63,7 @@ class SnapRegressionSuite(RegressionSuite):
         expected = self.read_plain_text_file(
             "regression/expected/extract.txt",
             overrides={
-                18: "25ada2132e42197adfaccd8293c8363a  output/report-Example.json"
+                18: "39ca1cdf32bf5a4a53988024131f37fd  output/report-Example.json"
             }
         )
 
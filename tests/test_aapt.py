@@ -1,8 +1,13 @@
+import asyncio
 import unittest
-from unittest.mock import patch
-from tests.utils.popen import any_popen, assert_popen_called_once
+from asyncio.subprocess import PIPE
+from unittest.mock import ANY, call, patch
+from parameterized import parameterized
+from tests.utils.popen import any_async_process, any_popen, assert_popen_called_once, assert_popen_called_once_with
+from tests.utils.resources import ANDROID_NAMESPACE
 
-from ninjadroid.aapt.aapt import Aapt
+from ninjadroid.aapt.aapt import Aapt, AaptSession, AaptXmlTree
+from ninjadroid.parsers.axml import AxmlAttribute, AxmlDocument, AxmlElement
 
 
 # pylint: disable=too-many-public-methods,protected-access
@@ -126,65 +131,38 @@ class TestAapt(unittest.TestCase):
 
         self.assertEqual("", min_version)
 
-    def test_extract_activities(self):
-        dump_badging = """N: android=http://schemas.android.com/apk/res/android
-              E: manifest (line=2)
-                E: application (line=8)
-                  E: activity (line=9)
-                    A: android:name(0x01010003)="com.example.app.HomeActivity" (Raw: "...")
-                  E: activity (line=15)
-                    A: android:name(0x01010003)="com.example.app.OtherActivity" (Raw: "...")
+    def test_extract_components(self):
+        dump_xmltree = """N: android=http://schemas.android.com/apk/res/android
+          E: manifest (line=2)
+            E: application (line=8)
+              E: activity (line=9)
+                A: android:name(0x01010003)="com.example.app.HomeActivity" (Raw: "...")
+              E: activity (line=15)
+                A: android:name(0x01010003)="com.example.app.OtherActivity" (Raw: "...")
+                E: intent-filter (line=17)
+                  E: action (line=18)
+                    A: android:name(0x01010003)="android.intent.action.VIEW" (Raw: "...")
+              E: service (line=25)
+                A: android:name(0x01010003)="com.example.app.ExampleService" (Raw: "...")
+              E: receiver (line=38)
+                A: android:name(0x01010003)="com.example.app.ExampleBrodcastReceiver" (Raw: "...")
         """
 
-        activities = Aapt._extract_activities(dump_badging)
-
-        self.assertEqual(["com.example.app.HomeActivity", "com.example.app.OtherActivity"], activities)
-
-    def test_extract_activities_when_missing(self):
-        activities = Aapt._extract_activities("")
-
-        self.assertEqual([], activities)
-
-    def test_extract_services(self):
-        dump_badging = """N: android=http://schemas.android.com/apk/res/android
-              E: manifest (line=2)
-                E: application (line=8)
-                  E: service (line=25)
-                    A: android:name(0x01010003)="com.example.app.ExampleService" (Raw: "...")
-                  E: service (line=28)
-                    A: android:name(0x01010003)="com.example.app.OtherService" (Raw: "...")
-        """
-
-        services = Aapt._extract_services(dump_badging)
-
-        self.assertEqual(["com.example.app.ExampleService", "com.example.app.OtherService"], services)
-
-    def test_extract_services_when_missing(self):
-        services = Aapt._extract_services("")
-
-        self.assertEqual([], services)
-
-    def test_extract_broadcast_receivers(self):
-        dump_badging = """N: android=http://schemas.android.com/apk/res/android
-              E: manifest (line=2)
-                E: application (line=8)
-                  E: receiver (line=38)
-                    A: android:name(0x01010003)="com.example.app.ExampleBrodcastReceiver" (Raw: "...")
-                  E: receiver (line=44)
-                    A: android:name(0x01010003)="com.example.app.OtherBrodcastReceiver" (Raw: "...")
-        """
-
-        receivers = Aapt._extract_broadcast_receivers(dump_badging)
+        components = Aapt._extract_components(dump_xmltree)
 
         self.assertEqual(
-            ["com.example.app.ExampleBrodcastReceiver", "com.example.app.OtherBrodcastReceiver"],
-            receivers
+            {
+                "activities": ["com.example.app.HomeActivity", "com.example.app.OtherActivity"],
+                "services": ["com.example.app.ExampleService"],
+                "receivers": ["com.example.app.ExampleBrodcastReceiver"]
+            },
+            components
         )
 
-    def test_extract_broadcast_receivers_when_missing(self):
-        receivers = Aapt._extract_broadcast_receivers("")
+    def test_extract_components_when_missing(self):
+        components = Aapt._extract_components("")
 
-        self.assertEqual([], receivers)
+        self.assertEqual({"activities": [], "services": [], "receivers": []}, components)
 
     @patch('ninjadroid.aapt.aapt.Popen')
     def test_get_app_name(self, mock_popen):
@@ -353,5 +331,208 @@ class TestAapt(unittest.TestCase):
         self.assertEqual([], permissions)
 
 
+class TestAaptSession(unittest.TestCase):
+    """
+    Test AaptSession class.
+    """
+
+    def setUp(self):
+        AaptSession.clear()
+
+    def tearDown(self):
+        AaptSession.clear()
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    def test_dump_badging_is_executed_once(self, mock_popen):
+        dump_badging = b"package: name='com.example.app' versionCode='1' versionName='1.0'\n" \
+                       b"application: label='Example' icon='res/ic_launcher.png'\n"
+        mock_popen.return_value = any_popen(dump_badging)
+        session = AaptSession("any-file-path", "any-checksum")
+
+        app_name = session.get_app_name()
+        apk = session.get_apk_info()
+
+        assert_popen_called_once_with(mock_popen, ANY)
+        self.assertIn(" dump badging any-file-path", mock_popen.call_args[0][0])
+        self.assertEqual("Example", app_name)
+        self.assertEqual("com.example.app", apk["package_name"])
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    def test_dumps_are_executed_once_each(self, mock_popen):
+        mock_popen.side_effect = [
+            any_popen(b"uses-permission: name='android.permission.INTERNET'"),
+            any_popen(b"E: application (line=8)\n"),
+        ]
+        session = AaptSession("any-file-path")
+
+        permissions = session.get_app_permissions()
+        manifest = session.get_manifest_info()
+        session.get_app_permissions()
+        session.get_manifest_info()
+
+        self.assertEqual(2, mock_popen.call_count)
+        self.assertEqual(["android.permission.INTERNET"], permissions)
+        self.assertEqual({"activities": [], "services": [], "receivers": []}, manifest)
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    def test_dump_is_executed_again_when_failing(self, mock_popen):
+        mock_popen.side_effect = [RuntimeError(), any_popen(b"application: label='Example' icon=''\n")]
+        session = AaptSession("any-file-path")
+
+        self.assertEqual("", session.get_app_name())
+        self.assertEqual("Example", session.get_app_name())
+        self.assertEqual(2, mock_popen.call_count)
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    @patch('ninjadroid.aapt.aapt.asyncio.create_subprocess_exec')
+    def test_prefetch(self, mock_create_subprocess_exec, mock_popen):
+        mock_create_subprocess_exec.side_effect = [
+            any_async_process(b"application: label='Example' icon=''\n"),
+            any_async_process(b"uses-permission: name='android.permission.INTERNET'"),
+            any_async_process(b"E: application (line=8)\n"),
+        ]
+        session = AaptSession("any-file-path")
+
+        session.prefetch("permissions", "badging", "xmltree", "badging")
+        session.prefetch("badging")
+
+        self.assertEqual(
+            [
+                call(ANY, "dump", "badging", "any-file-path", stdout=PIPE, stderr=None),
+                call(ANY, "dump", "permissions", "any-file-path", stdout=PIPE, stderr=None),
+                call(ANY, "dump", "xmltree", "any-file-path", "AndroidManifest.xml", stdout=PIPE, stderr=None),
+            ],
+            mock_create_subprocess_exec.call_args_list
+        )
+        self.assertEqual("Example", session.get_app_name())
+        self.assertEqual(["android.permission.INTERNET"], session.get_app_permissions())
+        self.assertEqual({"activities": [], "services": [], "receivers": []}, session.get_manifest_info())
+        mock_popen.assert_not_called()
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    @patch('ninjadroid.aapt.aapt.asyncio.create_subprocess_exec')
+    def test_prefetch_from_a_running_event_loop(self, mock_create_subprocess_exec, mock_popen):
+        mock_create_subprocess_exec.side_effect = [
+            any_async_process(b"application: label='Example' icon=''\n"),
+            any_async_process(b"uses-permission: name='android.permission.INTERNET'"),
+        ]
+        session = AaptSession("any-file-path")
+
+        async def prefetch():
+            session.prefetch("badging", "permissions")
+
+        asyncio.run(prefetch())
+
+        self.assertEqual(2, mock_create_subprocess_exec.call_count)
+        self.assertEqual("Example", session.get_app_name())
+        self.assertEqual(["android.permission.INTERNET"], session.get_app_permissions())
+        mock_popen.assert_not_called()
+
+    @patch('ninjadroid.aapt.aapt.Popen')
+    @patch('ninjadroid.aapt.aapt.asyncio.create_subprocess_exec')
+    def test_prefetch_when_a_dump_fails(self, mock_create_subprocess_exec, mock_popen):
+        mock_create_subprocess_exec.side_effect = [
+            OSError(),
+            any_async_process(b"uses-permission: name='android.permission.INTERNET'"),
+        ]
+        mock_popen.return_value = any_popen(b"application: label='Example' icon=''\n")
+        session = AaptSession("any-file-path")
+
+        session.prefetch("badging", "permissions")
+
+        self.assertEqual("Example", session.get_app_name())
+        self.assertEqual(["android.permission.INTERNET"], session.get_app_permissions())
+        assert_popen_called_once(mock_popen)
+
+    def test_of(self):
+        session = AaptSession.of("any-file-path", "any-checksum")
+
+        self.assertEqual(("any-file-path", "any-checksum"), session.get_key())
+        self.assertIs(session, AaptSession.of("any-file-path", "any-checksum"))
+        self.assertIsNot(session, AaptSession.of("any-file-path", "any-other-checksum"))
+        self.assertIsNot(session, AaptSession.of("any-other-file-path", "any-checksum"))
+
+    def test_of_without_checksum(self):
+        session = AaptSession.of("any-file-path", "")
+
+        self.assertIsNot(session, AaptSession.of("any-file-path", ""))
+
+    def test_of_when_too_many_sessions(self):
+        session = AaptSession.of("any-file-path", "any-checksum")
+        for index in range(8):
+            AaptSession.of(f"any-other-file-path-{index}", "any-checksum")
+
+        self.assertIsNot(session, AaptSession.of("any-file-path", "any-checksum"))
+
+
+class TestAaptXmlTree(unittest.TestCase):
+    """
+    Test AaptXmlTree.
+    """
+
+    def test_iter_elements(self):
+        dump_xmltree = "N: android=http://schemas.android.com/apk/res/android\n" \
+                       "  E: manifest (line=2)\n" \
+                       "    A: android:versionCode(0x0101021b)=(type 0x10)0x1\n" \
+                       "    A: package=\"com.example.app\" (Raw: \"com.example.app\")\n" \
+                       "    E: application (line=8)\n" \
+                       "      A: android:label(0x01010001)=@0x7f040000\n" \
+                       "      E: activity (line=9)\n" \
+                       "        A: android:exported(0x01010010)=(type 0x12)0xffffffff\n" \
+                       "    E: uses-permission (line=12)\n"
+
+        elements = list(AaptXmlTree(dump_xmltree).iter_elements())
+
+        self.assertEqual(
+            [
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "manifest", (
+                        AxmlAttribute(ANDROID_NAMESPACE, "versionCode", 0x0101021b, None, 0x10, 1),
+                        AxmlAttribute("", "package", None, "com.example.app", 0x03, 0),
+                    ))
+                ),
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "application", (
+                        AxmlAttribute(ANDROID_NAMESPACE, "label", 0x01010001, None, 0x01, 0x7f040000),
+                    ))
+                ),
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "activity", (
+                        AxmlAttribute(ANDROID_NAMESPACE, "exported", 0x01010010, None, 0x12, 0xffffffff),
+                    ))
+                ),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "activity")),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "application")),
+                (AxmlDocument.START_ELEMENT, AxmlElement("", "uses-permission")),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "uses-permission")),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "manifest")),
+            ],
+            elements
+        )
+
+    @parameterized.expand([
+        ["A: android:name(0x01010003)=\"any-name\" (Raw: \"any-name\")", "any-name"],
+        [r'A: android:name(0x01010003)="any \"quoted\" name" (Raw: "any \"quoted\" name")', "any \"quoted\" name"],
+        [r'A: android:name(0x01010003)="any (Raw: \"name\")" (Raw: "any")', "any (Raw: \"name\")"],
+        [r'A: android:name(0x01010003)="any\nname"', "any\nname"],
+        ["A: android:versionCode(0x0101021b)=(type 0x10)0x11 (Raw: \"17\")", "17"],
+        ["A: android:enabled(0x0101000e)=(type 0x12)0x0", "false"],
+        ["A: android:theme(0x01010000)=@0x01030005", "@android:01030005"],
+        ["A: android:textColor(0x01010098)=?0x7f010000", "?7F010000"],
+    ])
+    def test_iter_elements_with_attribute_value(self, line, expected):
+        dump_xmltree = f"E: application (line=8)\n  {line}\n"
+
+        _, element = next(AaptXmlTree(dump_xmltree).iter_elements())
+
+        self.assertEqual(expected, element.attributes[0].get_value())
+
+    def test_iter_elements_when_empty(self):
+        self.assertEqual([], list(AaptXmlTree("").iter_elements()))
+
+
 if __name__ == "__main__":
     unittest.main()
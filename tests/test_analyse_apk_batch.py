@@ -0,0 +1,232 @@
+from concurrent.futures import Future
+from io import StringIO
+import json
+import unittest
+from unittest.mock import ANY, Mock, call, mock_open, patch
+
+from ninjadroid.parsers.apk import ApkParsingError
+from ninjadroid.parsers.cache import EntryCache
+from ninjadroid.parsers.file import FileParsingError
+from ninjadroid.use_cases.analyse_apk_batch import AnalyseApkBatch, ApkBatchResult
+
+
+class TestAnalyseApkBatch(unittest.TestCase):
+    """
+    Test AnalyseApkBatch use case.
+    """
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ApkParser')
+    def test_execute(self, mock_apk_parser):
+        apk = Mock()
+        mock_apk_parser.return_value.parse.side_effect = [apk, ApkParsingError(), FileParsingError()]
+
+        results = list(AnalyseApkBatch().execute(
+            ["any-apk-path", "any-non-apk-path", "any-non-existing-path"],
+            extended_processing=True,
+            in_memory=True
+        ))
+
+        mock_apk_parser.assert_called_once()
+        mock_apk_parser.return_value.parse.assert_has_calls([
+            call("any-apk-path", True, True, False),
+            call("any-non-apk-path", True, True, False),
+            call("any-non-existing-path", True, True, False),
+        ])
+        self.assertEqual(
+            [
+                ApkBatchResult("any-apk-path", apk=apk),
+                ApkBatchResult("any-non-apk-path", error="Cannot parse the file as an APK!"),
+                ApkBatchResult("any-non-existing-path", error="Cannot parse the file!"),
+            ],
+            results
+        )
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ApkParser')
+    def test_execute_when_an_apk_fails_unexpectedly(self, mock_apk_parser):
+        apk = Mock()
+        mock_apk_parser.return_value.parse.side_effect = [RuntimeError("any-error"), apk]
+
+        results = list(AnalyseApkBatch().execute(["any-apk-path", "any-other-apk-path"], extended_processing=True))
+
+        # NOTE: like with many jobs, an unexpected error with an APK package does not stop the rest of the batch.
+        self.assertEqual(
+            [
+                ApkBatchResult("any-apk-path", error="RuntimeError('any-error')"),
+                ApkBatchResult("any-other-apk-path", apk=apk),
+            ],
+            results
+        )
+
+    @staticmethod
+    def any_future(result=None, error=None) -> Future:
+        future = Future()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        return future
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ProcessPoolExecutor')
+    def test_execute_with_jobs(self, mock_pool_executor):
+        results = [ApkBatchResult(f"any-apk-path-{index}", apk=Mock()) for index in range(5)]
+        mock_pool = mock_pool_executor.return_value.__enter__.return_value
+        mock_pool.submit.side_effect = [
+            self.any_future(result=results[0]),
+            self.any_future(result=results[1]),
+            self.any_future(error=RuntimeError("any-error")),
+            self.any_future(result=results[3]),
+            self.any_future(result=results[4]),
+        ]
+
+        actual = list(AnalyseApkBatch(threads=3).execute(
+            [result.filepath for result in results],
+            extended_processing=False,
+            jobs=2
+        ))
+
+        mock_pool_executor.assert_called_once_with(
+            max_workers=2,
+            initializer=AnalyseApkBatch.init_worker,
+            initargs=(ANY, ANY, None, 3, None)
+        )
+        mock_pool.submit.assert_has_calls([
+            call(AnalyseApkBatch.analyse_in_worker, result.filepath, False, False, False) for result in results
+        ])
+        # NOTE: the results are in the same order of the paths and the failing ones don't stop the batch
+        self.assertEqual(
+            [
+                results[0],
+                results[1],
+                ApkBatchResult("any-apk-path-2", error="RuntimeError('any-error')"),
+                results[3],
+                results[4],
+            ],
+            actual
+        )
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ProcessPoolExecutor')
+    def test_execute_with_jobs_unordered(self, mock_pool_executor):
+        results = [ApkBatchResult(f"any-apk-path-{index}", apk=Mock()) for index in range(3)]
+        mock_pool = mock_pool_executor.return_value.__enter__.return_value
+        mock_pool.submit.side_effect = [self.any_future(result=result) for result in results]
+
+        actual = list(AnalyseApkBatch().execute(
+            [result.filepath for result in results],
+            extended_processing=True,
+            jobs=4,
+            ordered=False
+        ))
+
+        self.assertCountEqual(results, actual)
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.SignatureRegistry')
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ApkParser')
+    def test_analyse_in_worker(self, mock_apk_parser, mock_signature_registry):
+        apk = Mock()
+        mock_apk_parser.return_value.parse.return_value = apk
+
+        AnalyseApkBatch.init_worker("any-logger", 10, None, 2)
+        result = AnalyseApkBatch.analyse_in_worker("any-apk-path", True, False)
+
+        mock_apk_parser.assert_called_once_with(ANY, None, 2, None, ANY)
+        self.assertIsInstance(mock_apk_parser.call_args[0][4], EntryCache)
+        self.assertEqual(3, mock_signature_registry.get.call_count)
+        mock_apk_parser.return_value.parse.assert_called_once_with("any-apk-path", True, False, False)
+        self.assertEqual(ApkBatchResult("any-apk-path", apk=apk), result)
+
+    def test_result_write(self):
+        apk = Mock()
+        apk.as_dict.return_value = {"file": "any-apk-path", "size": 10}
+        stream = StringIO()
+
+        ApkBatchResult("any-apk-path", apk=apk).write(stream)
+
+        self.assertEqual("{\"file\": \"any-apk-path\", \"size\": 10}\n", stream.getvalue())
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.ApkJsonWriter.write_json_lines')
+    def test_result_write_as_json_lines(self, mock_write_json_lines):
+        apk = Mock()
+        stream = StringIO()
+
+        ApkBatchResult("any-apk-path", apk=apk).write(stream, as_json_lines=True)
+
+        mock_write_json_lines.assert_called_once_with(apk, stream)
+
+    def test_error_result_write_as_json_lines(self):
+        stream = StringIO()
+
+        ApkBatchResult("any-path", error="any-error").write(stream, as_json_lines=True)
+
+        self.assertEqual(
+            {"record": "error", "file": "any-path", "error": "any-error"},
+            json.loads(stream.getvalue())
+        )
+
+    def test_list_apk_files_from_stdin(self):
+        stdin = StringIO("any-apk-path\n\n  any-other-apk-path  \n")
+
+        filepaths = list(AnalyseApkBatch.list_apk_files("-", stdin))
+
+        self.assertEqual(["any-apk-path", "any-other-apk-path"], filepaths)
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.os.walk')
+    @patch('ninjadroid.use_cases.analyse_apk_batch.FileParser')
+    def test_list_apk_files_from_directory(self, mock_file_parser, mock_walk):
+        mock_file_parser.is_directory.return_value = True
+        mock_walk.return_value = [
+            ("any-directory", ["any-subdirectory"], ["b.apk", "a.APK", "any-file.txt"]),
+            ("any-directory/any-subdirectory", [], ["c.apk"]),
+        ]
+
+        filepaths = list(AnalyseApkBatch.list_apk_files("any-directory"))
+
+        mock_walk.assert_called_once_with("any-directory")
+        self.assertEqual(
+            ["any-directory/a.APK", "any-directory/b.apk", "any-directory/any-subdirectory/c.apk"],
+            filepaths
+        )
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.glob')
+    @patch('ninjadroid.use_cases.analyse_apk_batch.FileParser')
+    def test_list_apk_files_from_glob(self, mock_file_parser, mock_glob):
+        mock_file_parser.is_directory.return_value = False
+        mock_glob.return_value = ["any-directory/b.apk", "any-directory/a.apk"]
+
+        filepaths = list(AnalyseApkBatch.list_apk_files("any-directory/*.apk"))
+
+        mock_glob.assert_called_once_with("any-directory/*.apk", recursive=True)
+        self.assertEqual(["any-directory/a.apk", "any-directory/b.apk"], filepaths)
+
+    @patch('ninjadroid.use_cases.analyse_apk_batch.FileParser')
+    def test_list_apk_files_from_single_apk(self, mock_file_parser):
+        mock_file_parser.is_directory.return_value = False
+        mock_file_parser.is_zip_file.return_value = True
+
+        filepaths = list(AnalyseApkBatch.list_apk_files("any-apk-path"))
+
+        self.assertEqual(["any-apk-path"], filepaths)
+
+    @patch("builtins.open", new_callable=mock_open, read_data="any-apk-path\nany-other-apk-path\n")
+    @patch('ninjadroid.use_cases.analyse_apk_batch.FileParser')
+    def test_list_apk_files_from_list_file(self, mock_file_parser, mock_file):
+        mock_file_parser.is_directory.return_value = False
+        mock_file_parser.is_zip_file.return_value = False
+
+        filepaths = list(AnalyseApkBatch.list_apk_files("any-list-path"))
+
+        mock_file.assert_called_once_with("any-list-path", "r", encoding="utf-8")
+        self.assertEqual(["any-apk-path", "any-other-apk-path"], filepaths)
+
+    @patch("builtins.open")
+    @patch('ninjadroid.use_cases.analyse_apk_batch.FileParser')
+    def test_list_apk_files_when_target_is_missing(self, mock_file_parser, mock_file):
+        mock_file_parser.is_directory.return_value = False
+        mock_file_parser.is_zip_file.return_value = False
+        mock_file.side_effect = FileNotFoundError()
+
+        with self.assertRaises(FileParsingError):
+            list(AnalyseApkBatch.list_apk_files("any-non-existing-path"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,11 @@
+from typing import Dict
 import unittest
 
-from ninjadroid.parsers.apk import APK
+from ninjadroid.parsers.apk import APK, ApkEntry
 from ninjadroid.parsers.cert import Cert, CertFingerprint, CertParticipant, CertValidity
 from ninjadroid.parsers.dex import Dex
 from ninjadroid.parsers.manifest import AndroidManifest, AppSdk, AppVersion
-from tests.utils.file import any_file
+from tests.utils.file import any_apk, any_file
 
 
 class TestAPK(unittest.TestCase):
@@ -182,7 +183,8 @@ class TestAPK(unittest.TestCase):
                         "sha512": "any-dex-file-sha512",
                         "strings": [],
                         "urls": [],
-                        "shell_commands": []
+                        "shell_commands": [],
+                        "custom_signatures": []
                     }
                 ],
                 "other": [
@@ -199,6 +201,150 @@ class TestAPK(unittest.TestCase):
             result
         )
 
+    def test_apk_from_dict(self):
+        dump = {
+            "file": "any-apk-file-name",
+            "size": 10,
+            "md5": "any-apk-file-md5",
+            "sha1": "any-apk-file-sha1",
+            "sha256": "any-apk-file-sha256",
+            "sha512": "any-apk-file-sha512",
+            "name": "any-app-name",
+            "cert": {
+                "file": "any-cert-file-name",
+                "size": 20,
+                "md5": "any-cert-file-md5",
+                "sha1": "any-cert-file-sha1",
+                "sha256": "any-cert-file-sha256",
+                "sha512": "any-cert-file-sha512",
+                "serial_number": "any-cert-serial-number",
+                "validity": {
+                    "from": "any-cert-validity-from",
+                    "until": "any-cert-validity-to"
+                },
+                "fingerprint": {
+                    "md5": "any-cert-fingerprint-md5",
+                    "sha1": "any-cert-fingerprint-sha1",
+                    "sha256": "any-cert-fingerprint-sha256",
+                    "signature": "any-cert-fingerprint-signature",
+                    "version": "any-cert-fingerprint-version"
+                },
+                "owner": self.any_participant_dict("any-cert-owner"),
+                "issuer": self.any_participant_dict("any-cert-issuer")
+            },
+            "manifest": self.any_manifest_dict(),
+            "dex": [
+                {
+                    "file": "any-dex-file-name",
+                    "size": 40,
+                    "md5": "any-dex-file-md5",
+                    "sha1": "any-dex-file-sha1",
+                    "sha256": "any-dex-file-sha256",
+                    "sha512": "any-dex-file-sha512",
+                    "strings": ["any-string", "any-url"],
+                    "urls": ["any-url"],
+                    "shell_commands": [],
+                    "custom_signatures": []
+                }
+            ],
+            "other": [self.any_file_dict("any-resource-file")]
+        }
+
+        apk = APK.from_dict(dump)
+
+        self.assertIsInstance(apk.get_cert(), Cert)
+        self.assertEqual(
+            CertValidity(valid_from="any-cert-validity-from", valid_to="any-cert-validity-to"),
+            apk.get_cert().get_validity()
+        )
+        self.assertIsInstance(apk.get_dex_files()[0], Dex)
+        self.assertEqual(["any-url"], apk.get_dex_files()[0].get_urls())
+        self.assertEqual("any-package-name", apk.get_manifest().get_package_name())
+        self.assertEqual(dump, apk.as_dict())
+
+    def test_apk_from_dict_without_extended_processing(self):
+        dump = {
+            **self.any_file_dict("any-apk-file"),
+            "name": "any-app-name",
+            "cert": self.any_file_dict("any-cert-file"),
+            "manifest": self.any_manifest_dict(),
+            "dex": [self.any_file_dict("any-dex-file")],
+            "other": []
+        }
+
+        apk = APK.from_dict(dump)
+
+        # NOTE: without extended processing, the cert and dex files are generic files
+        self.assertNotIsInstance(apk.get_cert(), Cert)
+        self.assertNotIsInstance(apk.get_dex_files()[0], Dex)
+        self.assertEqual(dump, apk.as_dict())
+
+    def test_apk_from_dict_with_fast_summary(self):
+        dump = {
+            **self.any_file_dict("any-apk-file"),
+            "name": "",
+            "cert": self.any_file_dict("any-cert-file"),
+            "manifest": self.any_manifest_dict(),
+            "dex": [{"file": "any-dex-file-name", "size": 40, "crc32": "0000abcd"}],
+            "other": [{"file": "any-resource-file-name", "size": 50, "crc32": "ffff0000"}]
+        }
+
+        apk = APK.from_dict(dump)
+
+        # NOTE: in the fast summary, the dex and other files are just listed from the zip central directory
+        self.assertIsInstance(apk.get_dex_files()[0], ApkEntry)
+        self.assertIsInstance(apk.get_other_files()[0], ApkEntry)
+        self.assertEqual(dump, apk.as_dict())
+
+    def test_apk_entry_as_dict(self):
+        entry = ApkEntry(filename="any-entry-file-name", size=10, crc32="0000abcd")
+
+        self.assertEqual({"file": "any-entry-file-name", "size": 10, "crc32": "0000abcd"}, entry.as_dict())
+        self.assertEqual("", entry.get_sha256())
+        self.assertEqual(entry.as_dict(), ApkEntry.from_dict(entry.as_dict()).as_dict())
+
+    def test_apk_is_slotted(self):
+        apk = any_apk()
+        entry = ApkEntry(filename="any-entry-file-name", size=10, crc32="0000abcd")
+
+        self.assertFalse(hasattr(apk, "__dict__"))
+        self.assertFalse(hasattr(entry, "__dict__"))
+
+    @staticmethod
+    def any_file_dict(prefix: str) -> Dict:
+        return {
+            "file": prefix + "-name",
+            "size": 10,
+            "md5": prefix + "-md5",
+            "sha1": prefix + "-sha1",
+            "sha256": prefix + "-sha256",
+            "sha512": prefix + "-sha512",
+        }
+
+    @staticmethod
+    def any_participant_dict(prefix: str) -> Dict:
+        return {
+            key: prefix + "-" + key
+            for key in ("name", "email", "unit", "organization", "city", "state", "country", "domain")
+        }
+
+    @staticmethod
+    def any_manifest_dict() -> Dict:
+        return {
+            **TestAPK.any_file_dict("any-manifest-file"),
+            "package": "any-package-name",
+            "version": {
+                "code": 1,
+                "name": "any-version-name"
+            },
+            "sdk": {
+                "min": "10",
+                "target": "15",
+                "max": "20"
+            },
+            "permissions": []
+        }
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+from io import StringIO
+import json
+import unittest
+
+from ninjadroid.use_cases.apk_json_writer import ApkJsonWriter
+from tests.utils.file import any_apk, any_file
+
+
+class TestApkJsonWriter(unittest.TestCase):
+    """
+    Test ApkJsonWriter.
+    """
+
+    def test_write_json(self):
+        apk = any_apk()
+        stream = StringIO()
+
+        ApkJsonWriter.write_json(apk, stream)
+
+        self.assertEqual(json.dumps(apk.as_dict(), sort_keys=True, ensure_ascii=False, indent=4), stream.getvalue())
+
+    def test_write_json_lines(self):
+        apk = any_apk()
+        stream = StringIO()
+
+        ApkJsonWriter.write_json_lines(apk, stream)
+
+        lines = stream.getvalue().split("\n")
+        self.assertEqual("", lines.pop())
+        self.assertEqual(
+            [
+                {"record": "apk", **any_file(filename="any-apk-file-name").as_dict(), "name": "any-app-name"},
+                {"record": "manifest", "apk": "any-apk-file-name", **apk.get_manifest().as_dict()},
+                {"record": "cert", "apk": "any-apk-file-name", **any_file(filename="META-INF/CERT.RSA").as_dict()},
+                {"record": "dex", "apk": "any-apk-file-name", **any_file(filename="classes.dex").as_dict()},
+            ],
+            [json.loads(line) for line in lines]
+        )
+
+    def test_write_record(self):
+        stream = StringIO()
+
+        ApkJsonWriter.write_record({"strings": ["àny-string", "any-other-string"], "file": "classes.dex"}, stream)
+
+        self.assertEqual(
+            "{\"file\": \"classes.dex\", \"strings\": [\"àny-string\", \"any-other-string\"]}\n",
+            stream.getvalue()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,25 @@
-from typing import List
+# pylint: disable=too-many-lines
+import hashlib
+import struct
+from threading import Event
+from typing import List, Optional, Tuple
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, call, Mock, patch
 from zipfile import BadZipFile
+import zlib
 from parameterized import parameterized
 
-from ninjadroid.parsers.apk import APK, ApkParser, ApkParsingError
+from ninjadroid.parsers.apk import APK, ApkParser, ApkParsingError, LazyAPK
+from ninjadroid.parsers.cache import EntryCache
 from ninjadroid.parsers.cert import CertParsingError
+from ninjadroid.parsers.dex import Dex, DexParser
 from ninjadroid.parsers.manifest import AndroidManifestParsingError
-from ninjadroid.parsers.file import File, FileParsingError
-from tests.utils.file import any_file, assert_file_equal
+from ninjadroid.parsers.file import File, FileParsingError, HashProfile
+from tests.utils.file import any_apk, any_file, assert_file_equal
+from tests.utils.resources import ANDROID_NAMESPACE, AxmlBuilder, any_arsc
 
 
-# pylint: disable=too-many-arguments,too-many-locals
+# pylint: disable=too-many-arguments,too-many-locals,too-many-public-methods
 class TestApkParser(unittest.TestCase):
     """
     Test APK parser.
@@ -32,7 +40,17 @@ class TestApkParser(unittest.TestCase):
         self.assertEqual(dex_files, apk.get_dex_files())
         self.assertEqual(other_files, apk.get_other_files())
 
-    @patch('ninjadroid.parsers.apk.Aapt')
+    @staticmethod
+    def any_zip_entry(filename: str, is_dir: bool = False, content: bytes = b"") -> Mock:
+        entry = Mock()
+        entry.filename = filename
+        entry.is_dir.return_value = is_dir
+        entry.CRC = zlib.crc32(content)
+        entry.file_size = len(content)
+        entry.content = content
+        return entry
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
     @patch('ninjadroid.parsers.apk.DexParser')
     @patch('ninjadroid.parsers.apk.CertParser')
     @patch('ninjadroid.parsers.apk.AndroidManifestParser')
@@ -49,7 +67,7 @@ class TestApkParser(unittest.TestCase):
             mock_manifest_parser,
             mock_cert_parser,
             mock_dex_parser,
-            mock_aapt
+            mock_aapt_session
     ):
         file = any_file(filename="any-apk-file")
         manifest = any_file(filename="any-manifest-file-name")
@@ -72,7 +90,7 @@ class TestApkParser(unittest.TestCase):
         mock_manifest_parser.return_value.parse.return_value = manifest
         mock_cert_parser.looks_like_cert.side_effect = [True, False, False, False]
         mock_dex_parser.looks_like_dex.side_effect = [True, False, False]
-        mock_aapt.get_app_name.return_value = "any-app-name"
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
 
         apk = ApkParser().parse("any-file-path", extended_processing=False)
 
@@ -89,7 +107,7 @@ class TestApkParser(unittest.TestCase):
             other_files=[]
         )
 
-    @patch('ninjadroid.parsers.apk.Aapt')
+    @patch('ninjadroid.parsers.apk.AaptSession')
     @patch('ninjadroid.parsers.apk.DexParser')
     @patch('ninjadroid.parsers.apk.CertParser')
     @patch('ninjadroid.parsers.apk.AndroidManifestParser')
@@ -106,7 +124,7 @@ class TestApkParser(unittest.TestCase):
             mock_manifest_parser,
             mock_cert_parser,
             mock_dex_parser,
-            mock_aapt
+            mock_aapt_session
     ):
         tmp_directory = Mock()
         file = any_file(filename="any-apk-file")
@@ -131,7 +149,7 @@ class TestApkParser(unittest.TestCase):
         mock_cert_parser.return_value.parse.return_value = cert
         mock_dex_parser.looks_like_dex.side_effect = [True, False, False]
         mock_dex_parser.return_value.parse.return_value = dex
-        mock_aapt.get_app_name.return_value = "any-app-name"
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
 
         apk = ApkParser().parse("any-file-path", extended_processing=True)
 
@@ -148,7 +166,7 @@ class TestApkParser(unittest.TestCase):
             other_files=[resource]
         )
 
-    @patch('ninjadroid.parsers.apk.Aapt')
+    @patch('ninjadroid.parsers.apk.AaptSession')
     @patch('ninjadroid.parsers.apk.DexParser')
     @patch('ninjadroid.parsers.apk.CertParser')
     @patch('ninjadroid.parsers.apk.AndroidManifestParser')
@@ -165,7 +183,7 @@ class TestApkParser(unittest.TestCase):
             mock_manifest_parser,
             mock_cert_parser,
             mock_dex_parser,
-            mock_aapt
+            mock_aapt_session
     ):
         file = any_file(filename="any-apk-file")
         manifest = any_file(filename="any-manifest-file-name")
@@ -184,7 +202,7 @@ class TestApkParser(unittest.TestCase):
         mock_manifest_parser.looks_like_manifest.side_effect = [True, False, False]
         mock_manifest_parser.return_value.parse.return_value = manifest
         mock_cert_parser.looks_like_cert.side_effect = [True, False]
-        mock_aapt.get_app_name.return_value = "any-app-name"
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
         mock_dex_parser.looks_like_dex.side_effect = [True]
 
         apk = ApkParser().parse("any-file-path", extended_processing=False)
@@ -202,6 +220,147 @@ class TestApkParser(unittest.TestCase):
             other_files=[]
         )
 
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.mkdtemp')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_in_memory(
+            self,
+            mock_zipfile,
+            mock_mkdtemp,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        file = any_file(filename="any-apk-file")
+        manifest = any_file(filename="any-manifest-file-name")
+        cert = any_file(filename="any-cert-file-name")
+        dex = any_file(filename="any-dex-file-name")
+        mock_zipfile.return_value.__enter__.return_value.infolist.return_value = [
+            self.any_zip_entry("any-manifest-file-name"),
+            self.any_zip_entry("any-cert-file-name"),
+            self.any_zip_entry("any-dex-file-name"),
+            self.any_zip_entry("any-resource-file"),
+            self.any_zip_entry("any-resource-directory", is_dir=True)
+        ]
+        mock_zipfile.return_value.__enter__.return_value.read.return_value = b"any-entry-content"
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = file
+        mock_file_parser.return_value.parse_bytes.side_effect = [cert, dex]
+        mock_manifest_parser.looks_like_manifest.side_effect = [True, False, False, False, False]
+        mock_manifest_parser.return_value.parse_bytes.return_value = manifest
+        mock_cert_parser.looks_like_cert.side_effect = [True, False, False, False]
+        mock_dex_parser.looks_like_dex.side_effect = [True, False, False]
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        apk = ApkParser().parse("any-file-path", extended_processing=False, in_memory=True)
+
+        mock_mkdtemp.assert_not_called()
+        mock_zipfile.assert_called_with("any-file-path")
+        mock_manifest_parser.return_value.parse_bytes.assert_called_once_with(
+            b"any-entry-content",
+            True,
+            "any-file-path",
+            False,
+            mock_aapt_session.of.return_value
+        )
+        assert_file_equal(self, expected=file, actual=apk)
+        self.assert_apk_equal(
+            apk=apk,
+            app_name="any-app-name",
+            manifest=manifest,
+            cert=cert,
+            dex_files=[dex],
+            other_files=[]
+        )
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.mkdtemp')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_in_memory_with_extended_processing(
+            self,
+            mock_zipfile,
+            mock_mkdtemp,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        file = any_file(filename="any-apk-file")
+        manifest = any_file(filename="any-manifest-file-name")
+        cert = any_file(filename="any-cert-file-name")
+        dex = any_file(filename="any-dex-file-name")
+        resource = any_file(filename="any-resource-file")
+        mock_zipfile.return_value.__enter__.return_value.infolist.return_value = [
+            self.any_zip_entry("any-manifest-file-name"),
+            self.any_zip_entry("any-cert-file-name"),
+            self.any_zip_entry("any-dex-file-name"),
+            self.any_zip_entry("any-resource-file"),
+            self.any_zip_entry("any-resource-directory", is_dir=True)
+        ]
+        mock_zipfile.return_value.__enter__.return_value.read.return_value = b"any-entry-content"
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = file
+        mock_file_parser.return_value.parse_stream.return_value = resource
+        mock_manifest_parser.looks_like_manifest.side_effect = [True, False, False, False, False]
+        mock_manifest_parser.return_value.parse_bytes.return_value = manifest
+        mock_cert_parser.looks_like_cert.side_effect = [True, False, False, False]
+        mock_cert_parser.return_value.parse_bytes.return_value = cert
+        mock_dex_parser.looks_like_dex.side_effect = [True, False, False]
+        mock_dex_parser.return_value.parse_bytes.return_value = dex
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        apk = ApkParser().parse("any-file-path", extended_processing=True, in_memory=True)
+
+        mock_mkdtemp.assert_not_called()
+        mock_cert_parser.return_value.parse_bytes.assert_called_once_with(b"any-entry-content", "any-cert-file-name")
+        mock_dex_parser.return_value.parse_bytes.assert_called_once_with(b"any-entry-content", "any-dex-file-name")
+        mock_file_parser.return_value.parse_stream.assert_called_once_with(ANY, "any-resource-file")
+        assert_file_equal(self, expected=file, actual=apk)
+        self.assert_apk_equal(
+            apk=apk,
+            app_name="any-app-name",
+            manifest=manifest,
+            cert=cert,
+            dex_files=[dex],
+            other_files=[resource]
+        )
+
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_in_memory_when_cert_parser_fails(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser
+    ):
+        mock_zipfile.return_value.__enter__.return_value.infolist.return_value = [
+            self.any_zip_entry("any-manifest-file-name"),
+            self.any_zip_entry("any-cert-file-name")
+        ]
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = any_file(filename="any-apk-file")
+        mock_manifest_parser.looks_like_manifest.side_effect = [True, False]
+        mock_manifest_parser.return_value.parse_bytes.return_value = any_file(filename="any-manifest-file-name")
+        mock_cert_parser.looks_like_cert.side_effect = [True]
+        mock_cert_parser.return_value.parse_bytes.side_effect = CertParsingError()
+
+        with self.assertRaises(ApkParsingError):
+            ApkParser().parse("any-file-path", extended_processing=True, in_memory=True)
+
     @patch('ninjadroid.parsers.apk.AndroidManifestParser')
     @patch('ninjadroid.parsers.apk.FileParser')
     @patch('ninjadroid.parsers.apk.rmtree')
@@ -311,7 +470,7 @@ class TestApkParser(unittest.TestCase):
             ApkParser().parse("any-file-path", extended_processing=True)
         mock_rmtree.assert_called_with(tmp_directory)
 
-    @patch('ninjadroid.parsers.apk.Aapt')
+    @patch('ninjadroid.parsers.apk.AaptSession')
     @patch('ninjadroid.parsers.apk.DexParser')
     @patch('ninjadroid.parsers.apk.CertParser')
     @patch('ninjadroid.parsers.apk.AndroidManifestParser')
@@ -328,7 +487,7 @@ class TestApkParser(unittest.TestCase):
             mock_manifest_parser,
             mock_cert_parser,
             mock_dex_parser,
-            mock_aapt
+            mock_aapt_session
     ):
         tmp_directory = Mock()
         file = any_file(filename="any-apk-file")
@@ -351,7 +510,7 @@ class TestApkParser(unittest.TestCase):
         mock_cert_parser.return_value.parse.return_value = cert
         mock_dex_parser.looks_like_dex.side_effect = [True, False]
         mock_dex_parser.return_value.parse.return_value = dex
-        mock_aapt.get_app_name.return_value = "any-app-name"
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
 
         apk = ApkParser().parse("any-file-path", extended_processing=True)
 
@@ -494,6 +653,569 @@ class TestApkParser(unittest.TestCase):
         with self.assertRaises(BadZipFile):
             ApkParser().parse("any-file-path", extended_processing=False)
 
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.rmtree')
+    @patch('ninjadroid.parsers.apk.mkdtemp')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_with_max_workers(
+            self,
+            mock_zipfile,
+            mock_mkdtemp,
+            mock_rmtree,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        tmp_directory = Mock()
+        file = any_file(filename="any-apk-file")
+        manifest = any_file(filename="AndroidManifest.xml")
+        cert = any_file(filename="META-INF/CERT.RSA")
+        dex_files = [any_file(filename="classes.dex"), any_file(filename="classes2.dex")]
+        resource = any_file(filename="any-resource-file")
+        second_dex_parsed = Event()
+
+        def parse_dex(filepath: str, filename: str) -> File:  # pylint: disable=unused-argument
+            # NOTE: the first dex file completes only after the second one, which must not change their order.
+            if filename == "classes.dex":
+                self.assertTrue(second_dex_parsed.wait(timeout=5))
+                return dex_files[0]
+            second_dex_parsed.set()
+            return dex_files[1]
+
+        mock_zipfile.return_value.__enter__.return_value.namelist.return_value = [
+            "classes.dex",
+            "AndroidManifest.xml",
+            "classes2.dex",
+            "META-INF/CERT.RSA",
+            "any-resource-file"
+        ]
+        mock_zipfile.return_value.__enter__.return_value.extract.side_effect = lambda filename, directory: filename
+        mock_mkdtemp.return_value = tmp_directory
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.is_directory.return_value = False
+        mock_file_parser.return_value.parse.side_effect = [file, resource]
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse.return_value = manifest
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_cert_parser.return_value.parse.return_value = cert
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_dex_parser.return_value.parse.side_effect = parse_dex
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        apk = ApkParser(max_workers=4).parse("any-file-path", extended_processing=True)
+
+        mock_aapt_session.of.assert_called_once_with("any-file-path", "any-file-sha256")
+        mock_aapt_session.of.return_value.get_app_name.assert_called_once_with()
+        mock_rmtree.assert_called_with(tmp_directory)
+        self.assert_apk_equal(
+            apk=apk,
+            app_name="any-app-name",
+            manifest=manifest,
+            cert=cert,
+            dex_files=dex_files,
+            other_files=[resource]
+        )
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.rmtree')
+    @patch('ninjadroid.parsers.apk.mkdtemp')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_with_max_workers_when_dex_parser_fails(
+            self,
+            mock_zipfile,
+            mock_mkdtemp,
+            mock_rmtree,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        tmp_directory = Mock()
+        mock_zipfile.return_value.__enter__.return_value.namelist.return_value = [
+            "AndroidManifest.xml",
+            "META-INF/CERT.RSA",
+            "classes.dex"
+        ]
+        mock_mkdtemp.return_value = tmp_directory
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = any_file(filename="any-apk-file")
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse.return_value = any_file(filename="AndroidManifest.xml")
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_cert_parser.return_value.parse.return_value = any_file(filename="META-INF/CERT.RSA")
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_dex_parser.return_value.parse.side_effect = FileParsingError()
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        with self.assertRaises(ApkParsingError):
+            ApkParser(max_workers=4).parse("any-file-path", extended_processing=True)
+        mock_rmtree.assert_called_with(tmp_directory)
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_in_memory_with_max_workers(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        file = any_file(filename="any-apk-file")
+        manifest = any_file(filename="AndroidManifest.xml")
+        cert = any_file(filename="META-INF/CERT.RSA")
+        dex_files = [any_file(filename="classes.dex"), any_file(filename="classes2.dex")]
+        resources = [any_file(filename="any-resource-file"), any_file(filename="any-other-resource-file")]
+        mock_zipfile.return_value.__enter__.return_value.infolist.return_value = [
+            self.any_zip_entry("any-resource-file"),
+            self.any_zip_entry("classes.dex"),
+            self.any_zip_entry("META-INF/CERT.RSA"),
+            self.any_zip_entry("AndroidManifest.xml"),
+            self.any_zip_entry("classes2.dex"),
+            self.any_zip_entry("any-other-resource-file")
+        ]
+        mock_zipfile.return_value.__enter__.return_value.read.return_value = b"any-entry-content"
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = file
+        mock_file_parser.return_value.parse_stream.side_effect = resources
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse_bytes.return_value = manifest
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_cert_parser.return_value.parse_bytes.return_value = cert
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_dex_parser.return_value.parse_bytes.side_effect = lambda raw, filename: dex_files[
+            0 if filename == "classes.dex" else 1
+        ]
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        apk = ApkParser(max_workers=4).parse("any-file-path", extended_processing=True, in_memory=True)
+
+        self.assert_apk_equal(
+            apk=apk,
+            app_name="any-app-name",
+            manifest=manifest,
+            cert=cert,
+            dex_files=dex_files,
+            other_files=resources
+        )
+
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    def test_init_with_hash_profile(self, mock_file_parser, mock_manifest_parser, mock_cert_parser, mock_dex_parser):
+        logger = Mock()
+
+        ApkParser(logger, HashProfile.from_string("sha256,apk=md5+sha256,other=none"))
+
+        mock_file_parser.assert_has_calls([
+            call(logger, ("md5", "sha256")),
+            call(logger, ("sha256",)),
+            call(logger, ("sha256",)),
+            call(logger, ("sha256",)),
+            call(logger, ())
+        ])
+        # NOTE: the fast summary computes no digest at all.
+        mock_manifest_parser.assert_has_calls([call(logger, ("sha256",)), call(logger, ())])
+        mock_cert_parser.assert_has_calls([call(logger, ("sha256",)), call(logger, ())])
+        mock_dex_parser.assert_called_once_with(logger, ("sha256",))
+
+    @staticmethod
+    def any_apk_resources(label: Tuple[Optional[str], int, int], arsc: Optional[bytes] = None) -> Mock:
+        raw_value, value_type, data = label
+        resources = {
+            "AndroidManifest.xml": AxmlBuilder({"label": 0x01010001})
+            .start("manifest")
+            .start("application", [(ANDROID_NAMESPACE, "label", raw_value, value_type, data)])
+            .build()
+        }
+        if arsc is not None:
+            resources["resources.arsc"] = arsc
+        apk = Mock()
+        apk.read.side_effect = lambda name: resources[name]
+        return apk
+
+    def test_parse_app_name_from_resources(self):
+        apk = self.any_apk_resources(
+            label=(None, 0x01, 0x7f010000),
+            arsc=any_arsc([" Example "], {0: [(0x03, 0)]})
+        )
+
+        app_name = ApkParser.parse_app_name(apk)
+
+        self.assertEqual("Example", app_name)
+
+    def test_parse_app_name_from_raw_value(self):
+        apk = self.any_apk_resources(label=("Example", 0x03, 0))
+
+        app_name = ApkParser.parse_app_name(apk)
+
+        self.assertEqual("Example", app_name)
+
+    @parameterized.expand([
+        # NOTE: missing resources.arsc
+        [(None, 0x01, 0x7f010000), None],
+        # NOTE: missing resource
+        [(None, 0x01, 0x7f010001), any_arsc(["Example"], {0: [(0x03, 0)]})],
+        # NOTE: not a string
+        [(None, 0x10, 1), None],
+        # NOTE: malformed resources.arsc
+        [(None, 0x01, 0x7f010000), b"any-malformed-arsc"],
+    ])
+    def test_parse_app_name_when_cannot_be_resolved(self, label, arsc):
+        apk = self.any_apk_resources(label=label, arsc=arsc)
+
+        app_name = ApkParser.parse_app_name(apk)
+
+        self.assertEqual("", app_name)
+
+    def test_parse_app_name_when_manifest_has_a_malformed_chunk(self):
+        manifest = AxmlBuilder({"label": 0x01010001}) \
+            .start("application", [(ANDROID_NAMESPACE, "label", "Example", 0x03, 0)]) \
+            .build()
+        apk = Mock()
+        # NOTE: the header of the resource map is bigger than the whole chunk.
+        apk.read.return_value = manifest.replace(
+            struct.pack("<HHI", 0x0180, 8, 12),
+            struct.pack("<HHI", 0x0180, 24, 12)
+        )
+
+        app_name = ApkParser.parse_app_name(apk)
+
+        self.assertEqual("", app_name)
+
+    def test_parse_app_name_when_manifest_is_not_binary(self):
+        apk = Mock()
+        apk.read.return_value = b"<?xml version=\"1.0\" encoding=\"utf-8\"?><manifest/>"
+
+        app_name = ApkParser.parse_app_name(apk)
+
+        self.assertEqual("", app_name)
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_with_app_name_from_resources(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        mock_apk = self.any_apk_resources(label=("Example", 0x03, 0))
+        read_resource = mock_apk.read.side_effect
+        mock_apk.read.side_effect = lambda entry: read_resource(entry) if isinstance(entry, str) else b"any-content"
+        mock_apk.infolist.return_value = [
+            self.any_zip_entry("AndroidManifest.xml"),
+            self.any_zip_entry("META-INF/CERT.RSA"),
+            self.any_zip_entry("classes.dex")
+        ]
+        mock_zipfile.return_value.__enter__.return_value = mock_apk
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = any_file(filename="any-apk-file")
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+
+        apk = ApkParser().parse("any-file-path", extended_processing=False, in_memory=True)
+
+        mock_aapt_session.of.return_value.get_app_name.assert_not_called()
+        self.assertEqual("Example", apk.get_app_name())
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_from_cache(self, mock_zipfile, mock_file_parser, mock_aapt_session):
+        cache = Mock()
+        cache.get_key.return_value = "any-cache-key"
+        cached = any_apk(filename="any-other-file-path")
+        cache.get.return_value = cached.as_dict()
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = any_file(filename="any-file-path")
+        hash_profile = HashProfile()
+
+        apk = ApkParser(hash_profile=hash_profile, cache=cache).parse("any-file-path", extended_processing=True)
+
+        cache.get_key.assert_called_once_with("any-file-sha256", True, hash_profile)
+        cache.get.assert_called_once_with("any-cache-key")
+        cache.put.assert_not_called()
+        mock_zipfile.assert_not_called()
+        mock_aapt_session.of.assert_not_called()
+        # NOTE: the same APK package may have been cached from another path
+        self.assertEqual({**cached.as_dict(), "file": "any-file-path"}, apk.as_dict())
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_when_not_in_cache(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        cache = Mock()
+        cache.get_key.return_value = "any-cache-key"
+        cache.get.return_value = None
+        mock_apk = Mock()
+        mock_apk.read.return_value = b"any-content"
+        mock_apk.infolist.return_value = [
+            self.any_zip_entry("AndroidManifest.xml"),
+            self.any_zip_entry("META-INF/CERT.RSA"),
+            self.any_zip_entry("classes.dex")
+        ]
+        mock_zipfile.return_value.__enter__.return_value = mock_apk
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.side_effect = [
+            any_file(filename="any-file-path", sha256=""),
+            any_file(filename="any-file-path", sha256="any-computed-sha256")
+        ]
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="any-entry")
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+
+        apk = ApkParser(cache=cache).parse("any-file-path", extended_processing=False, in_memory=True)
+
+        # NOTE: without the sha256 of the APK package, it is computed on purpose for the cache key
+        mock_file_parser.assert_any_call(ANY, ("sha256",))
+        cache.get_key.assert_called_once_with("any-computed-sha256", False, ANY)
+        cache.get.assert_called_once_with("any-cache-key")
+        cache.put.assert_called_once_with("any-cache-key", apk.as_dict())
+        self.assertEqual("any-app-name", apk.get_app_name())
+
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_with_entry_cache(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session
+    ):
+        mock_apk = Mock()
+        mock_apk.infolist.return_value = [
+            self.any_zip_entry("AndroidManifest.xml", content=b"any-manifest-content"),
+            self.any_zip_entry("META-INF/CERT.RSA", content=b"any-cert-content"),
+            self.any_zip_entry("classes.dex", content=b"any-dex-content"),
+            self.any_zip_entry("classes2.dex", content=b"any-dex-content"),
+            self.any_zip_entry("classes3.dex", content=b"any-other-dex-content")
+        ]
+        mock_apk.read.side_effect = lambda entry: entry.content if not isinstance(entry, str) else b""
+        mock_zipfile.return_value.__enter__.return_value = mock_apk
+        mock_file_parser.is_zip_file.return_value = True
+        mock_file_parser.return_value.parse.return_value = any_file(filename="any-apk-file")
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_cert_parser.return_value.parse_bytes.return_value = any_file(filename="META-INF/CERT.RSA", sha256="")
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_dex_parser.return_value.parse_bytes.side_effect = lambda raw, filename: Dex(
+            filename, len(raw), "", "", hashlib.sha256(raw).hexdigest(), "", [raw.decode()], [], [], []
+        )
+        mock_aapt_session.of.return_value.get_app_name.return_value = "any-app-name"
+        parser = ApkParser(entry_cache=EntryCache())
+
+        parser.parse("any-file-path", extended_processing=True, in_memory=True)
+        apk = parser.parse("any-other-file-path", extended_processing=True, in_memory=True)
+
+        # NOTE: the byte-identical entries are parsed once, also within the same APK package.
+        mock_cert_parser.return_value.parse_bytes.assert_called_once_with(b"any-cert-content", "META-INF/CERT.RSA")
+        mock_dex_parser.return_value.parse_bytes.assert_has_calls([
+            call(b"any-dex-content", "classes.dex"),
+            call(b"any-other-dex-content", "classes3.dex")
+        ])
+        self.assertEqual(2, mock_dex_parser.return_value.parse_bytes.call_count)
+        self.assertEqual(2, mock_manifest_parser.return_value.parse_bytes.call_count)
+        self.assertEqual("META-INF/CERT.RSA", apk.get_cert().get_file_name())
+        self.assertEqual(
+            [
+                ("classes.dex", ["any-dex-content"]),
+                ("classes2.dex", ["any-dex-content"]),
+                ("classes3.dex", ["any-other-dex-content"])
+            ],
+            [(dex.get_file_name(), dex.get_strings()) for dex in apk.get_dex_files()]
+        )
+
+    @patch('ninjadroid.parsers.apk.os.path.getsize')
+    @patch('ninjadroid.parsers.apk.AaptSession')
+    @patch('ninjadroid.parsers.apk.DexParser')
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_fast_summary(
+            self,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser,
+            mock_dex_parser,
+            mock_aapt_session,
+            mock_getsize
+    ):
+        manifest = any_file(filename="AndroidManifest.xml")
+        cert = any_file(filename="META-INF/CERT.RSA")
+        mock_apk = Mock()
+        mock_apk.infolist.return_value = [
+            self.any_zip_entry("AndroidManifest.xml", content=b"any-manifest-content"),
+            self.any_zip_entry("META-INF/CERT.RSA", content=b"any-cert-content"),
+            self.any_zip_entry("classes.dex", content=b"any-dex-content"),
+            self.any_zip_entry("res/", is_dir=True),
+            self.any_zip_entry("res/any-resource", content=b"any-resource-content")
+        ]
+        mock_apk.read.side_effect = lambda entry: entry.content
+        mock_zipfile.return_value.__enter__.return_value = mock_apk
+        mock_file_parser.is_zip_file.return_value = True
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_manifest_parser.return_value.parse_bytes.return_value = manifest
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        mock_cert_parser.return_value.parse_bytes.return_value = cert
+        mock_dex_parser.looks_like_dex.side_effect = lambda filename: filename.endswith(".dex")
+        mock_getsize.return_value = 100
+        cache = Mock()
+
+        apk = ApkParser(cache=cache).parse("any-file-path", extended_processing=True, fast=True)
+
+        # NOTE: only the manifest and the cert are read, neither the APK package nor its entries are hashed.
+        mock_apk.read.assert_has_calls([call(ANY), call(ANY)])
+        self.assertEqual(2, mock_apk.read.call_count)
+        mock_manifest_parser.return_value.parse_bytes.assert_called_once_with(
+            b"any-manifest-content",
+            True,
+            "any-file-path",
+            False
+        )
+        mock_cert_parser.return_value.parse_bytes.assert_called_once_with(b"any-cert-content", "META-INF/CERT.RSA")
+        mock_file_parser.return_value.parse.assert_not_called()
+        mock_dex_parser.return_value.parse.assert_not_called()
+        mock_aapt_session.of.assert_not_called()
+        cache.get_key.assert_not_called()
+        self.assertEqual(
+            {
+                "file": "any-file-path",
+                "size": 100,
+                "md5": "",
+                "sha1": "",
+                "sha256": "",
+                "sha512": "",
+                "name": "",
+                "cert": cert.as_dict(),
+                "manifest": manifest.as_dict(),
+                "dex": [{"file": "classes.dex", "size": 15, "crc32": f"{zlib.crc32(b'any-dex-content'):08x}"}],
+                "other": [
+                    {"file": "res/any-resource", "size": 20, "crc32": f"{zlib.crc32(b'any-resource-content'):08x}"}
+                ]
+            },
+            apk.as_dict()
+        )
+
+    @parameterized.expand([
+        [AndroidManifestParsingError()],
+        [CertParsingError()],
+        [BadZipFile()]
+    ])
+    @patch('ninjadroid.parsers.apk.CertParser')
+    @patch('ninjadroid.parsers.apk.AndroidManifestParser')
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_fast_summary_with_failure(
+            self,
+            error,
+            mock_zipfile,
+            mock_file_parser,
+            mock_manifest_parser,
+            mock_cert_parser
+    ):
+        mock_apk = Mock()
+        mock_apk.infolist.return_value = [
+            self.any_zip_entry("AndroidManifest.xml"),
+            self.any_zip_entry("META-INF/CERT.RSA"),
+            self.any_zip_entry("classes.dex")
+        ]
+        mock_zipfile.return_value.__enter__.return_value = mock_apk
+        mock_file_parser.is_zip_file.return_value = True
+        mock_manifest_parser.looks_like_manifest.side_effect = lambda filename: filename == "AndroidManifest.xml"
+        mock_cert_parser.looks_like_cert.side_effect = lambda filename: filename == "META-INF/CERT.RSA"
+        if isinstance(error, AndroidManifestParsingError):
+            mock_manifest_parser.return_value.parse_bytes.side_effect = error
+        elif isinstance(error, CertParsingError):
+            mock_cert_parser.return_value.parse_bytes.side_effect = error
+        else:
+            mock_zipfile.side_effect = error
+
+        with self.assertRaises(ApkParsingError):
+            ApkParser().parse("any-file-path", extended_processing=False, fast=True)
+
+    def test_parse_lazy(self):
+        parser = ApkParser()
+
+        with patch.object(DexParser, "parse_strings_from_bytes") as mock_parse_strings:
+            apk = parser.parse_lazy("regression/data/Example.apk")
+
+            self.assertIsInstance(apk, LazyAPK)
+            self.assertEqual("com.example.app", apk.get_manifest().get_package_name())
+            self.assertEqual("classes.dex", apk.get_dex_files()[0].get_file_name())
+            # NOTE: only what is read is parsed.
+            mock_parse_strings.assert_not_called()
+
+        self.assertEqual(
+            parser.parse("regression/data/Example.apk", extended_processing=True, in_memory=True).as_dict(),
+            apk.as_dict()
+        )
+
+    @parameterized.expand([
+        ["AndroidManifest.xml"],
+        ["META-INF/CERT.RSA"],
+        ["classes.dex"]
+    ])
+    @patch('ninjadroid.parsers.apk.FileParser')
+    @patch('ninjadroid.parsers.apk.ZipFile')
+    def test_parse_lazy_with_missing_entry(self, missing, mock_zipfile, mock_file_parser):
+        mock_zipfile.return_value.__enter__.return_value.infolist.return_value = [
+            self.any_zip_entry(filename)
+            for filename in ("AndroidManifest.xml", "META-INF/CERT.RSA", "classes.dex")
+            if filename != missing
+        ]
+        mock_file_parser.is_zip_file.return_value = True
+
+        with self.assertRaises(ApkParsingError):
+            ApkParser().parse_lazy("any-file-path")
+
     @parameterized.expand([
         ["Example.apk", True],
         ["AndroidManifest.xml", False],
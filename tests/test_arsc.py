@@ -0,0 +1,71 @@
+import unittest
+from parameterized import parameterized
+
+from ninjadroid.parsers.arsc import ResourceTable
+from tests.utils.resources import any_arsc
+
+
+class TestResourceTable(unittest.TestCase):
+    """
+    Test ResourceTable.
+    """
+
+    LOCALE_IT = int.from_bytes(b"itIT", "little")
+
+    def test_get_value(self):
+        table = ResourceTable(any_arsc(["any-string"], {0: [(0x10, 42), None, (0x03, 0)]}))
+
+        self.assertEqual((0x10, 42), table.get_value(0x7f010000))
+        self.assertIsNone(table.get_value(0x7f010001))
+        self.assertEqual((0x03, 0), table.get_value(0x7f010002))
+        self.assertIsNone(table.get_value(0x7f010003))
+        self.assertIsNone(table.get_value(0x7f020000))
+        self.assertIsNone(table.get_value(0x01010000))
+
+    def test_get_string(self):
+        table = ResourceTable(any_arsc(["Example", "Esempio"], {0: [(0x03, 0)], self.LOCALE_IT: [(0x03, 1)]}))
+
+        self.assertEqual("Example", table.get_string(0x7f010000))
+
+    def test_get_string_prefers_default_configuration(self):
+        table = ResourceTable(any_arsc(["Example", "Esempio"], {self.LOCALE_IT: [(0x03, 1)], 0: [(0x03, 0)]}))
+
+        self.assertEqual("Example", table.get_string(0x7f010000))
+
+    def test_get_string_when_only_in_other_configuration(self):
+        table = ResourceTable(any_arsc(["Esempio"], {0: [None], self.LOCALE_IT: [(0x03, 0)]}))
+
+        self.assertEqual("Esempio", table.get_string(0x7f010000))
+
+    def test_get_string_through_references(self):
+        table = ResourceTable(any_arsc(["Example"], {0: [(0x01, 0x7f010001), (0x01, 0x7f010002), (0x03, 0)]}))
+
+        self.assertEqual("Example", table.get_string(0x7f010000))
+
+    @parameterized.expand([
+        [[(0x10, 42)]],
+        [[(0x01, 0x7f010000)]],
+        [[None]],
+    ])
+    def test_get_string_when_not_a_string(self, entries):
+        table = ResourceTable(any_arsc(["Example"], {0: entries}))
+
+        self.assertIsNone(table.get_string(0x7f010000))
+
+    @parameterized.expand([
+        [b""],
+        [b"\x03\x00\x08\x00\x08\x00\x00\x00"],
+    ])
+    def test_init_when_not_a_resources_table(self, data):
+        with self.assertRaises(ValueError):
+            ResourceTable(data)
+
+    def test_init_when_truncated(self):
+        data = any_arsc(["Example"], {0: [(0x03, 0)]})
+
+        with self.assertRaises(ValueError):
+            ResourceTable(data[:-8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+from io import BytesIO
+import struct
+import unittest
+from parameterized import parameterized
+
+from ninjadroid.parsers.axml import AxmlAttribute, AxmlDocument, AxmlElement, StringPool, XmlDocument
+from tests.utils.resources import ANDROID_NAMESPACE, AxmlBuilder, any_chunk, any_string_pool
+
+
+class TestStringPool(unittest.TestCase):
+    """
+    Test StringPool.
+    """
+
+    @parameterized.expand([
+        [False],
+        [True]
+    ])
+    def test_getitem(self, utf8):
+        pool = StringPool(any_string_pool(["any-string", "", "àny-ütf-string"], utf8))
+
+        self.assertEqual(3, len(pool))
+        self.assertEqual("any-string", pool[0])
+        self.assertEqual("", pool[1])
+        self.assertEqual("àny-ütf-string", pool[2])
+
+    def test_get_when_missing(self):
+        pool = StringPool(any_string_pool(["any-string"]))
+
+        self.assertIsNone(pool.get(1))
+        self.assertIsNone(pool.get(0xFFFFFFFF))
+
+    @parameterized.expand([
+        [b""],
+        [b"\x01\x00\x1c\x00"],
+        [b"\x03\x00\x08\x00\x08\x00\x00\x00" + b"\x00" * 20],
+    ])
+    def test_init_when_not_a_string_pool(self, data):
+        with self.assertRaises(ValueError):
+            StringPool(data)
+
+
+class TestAxmlAttribute(unittest.TestCase):
+    """
+    Test AxmlAttribute.
+    """
+
+    @parameterized.expand([
+        [0x03, "any-string", 0, "any-string"],
+        [0x03, "any-string\x00any-garbage", 0, "any-string"],
+        [0x01, None, 0x7f040000, "@7F040000"],
+        [0x01, None, 0x01040000, "@android:01040000"],
+        [0x02, None, 0x01010036, "?android:01010036"],
+        [0x04, None, 0x3fc00000, "1.500000"],
+        [0x05, None, 0x00001001, "16.000000dip"],
+        [0x06, None, 0x00004010, "50.000000%"],
+        [0x10, None, 20, "20"],
+        [0x10, None, 0xffffffff, "-1"],
+        [0x11, None, 0x480, "0x00000480"],
+        [0x12, None, 0, "false"],
+        [0x12, None, 0xffffffff, "true"],
+        [0x1c, None, 0xff00ff00, "#FF00FF00"],
+        [0x00, None, 0, "<0x0, type 0x00>"],
+    ])
+    def test_get_value(self, value_type, raw_value, data, expected):
+        attribute = AxmlAttribute(ANDROID_NAMESPACE, "any-name", None, raw_value, value_type, data)
+
+        self.assertEqual(expected, attribute.get_value())
+
+
+class TestAxmlDocument(unittest.TestCase):
+    """
+    Test AxmlDocument.
+    """
+
+    def test_iter_elements(self):
+        data = AxmlBuilder({"label": 0x01010001}) \
+            .start("manifest", [("", "package", "com.example.app", 0x03, 0)]) \
+            .start("application", [(ANDROID_NAMESPACE, "label", None, 0x01, 0x7f040000)]) \
+            .end("application") \
+            .end("manifest") \
+            .build()
+
+        elements = list(AxmlDocument(data).iter_elements())
+
+        self.assertEqual(
+            [
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "manifest", (AxmlAttribute("", "package", None, "com.example.app", 0x03, 0),))
+                ),
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement(
+                        "",
+                        "application",
+                        (AxmlAttribute(ANDROID_NAMESPACE, "label", 0x01010001, None, 0x01, 0x7f040000),)
+                    )
+                ),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "application")),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "manifest")),
+            ],
+            elements
+        )
+
+    def test_get_attribute_by_resource_id(self):
+        # NOTE: obfuscated manifests may rename the attributes, which are still identified by their resource id.
+        data = AxmlBuilder({"a": 0x01010001}) \
+            .start("application", [(ANDROID_NAMESPACE, "a", "Example", 0x03, 0)]) \
+            .build()
+
+        _, element = next(AxmlDocument(data).iter_elements())
+
+        self.assertEqual("Example", element.get_attribute(0x01010001, "label").raw_value)
+
+    def test_get_attribute_by_name(self):
+        data = AxmlBuilder().start("application", [(ANDROID_NAMESPACE, "label", "Example", 0x03, 0)]).build()
+
+        _, element = next(AxmlDocument(data).iter_elements())
+
+        self.assertEqual("Example", element.get_attribute(0x01010001, "label").raw_value)
+        self.assertIsNone(element.get_attribute(0x01010002, "icon"))
+
+    def test_get_attribute_by_name_and_namespace(self):
+        data = AxmlBuilder() \
+            .start("manifest", [("", "package", "com.example.app", 0x03, 0), ("", "label", "Example", 0x03, 0)]) \
+            .build()
+
+        _, element = next(AxmlDocument(data).iter_elements())
+
+        self.assertEqual("com.example.app", element.get_attribute(None, "package").raw_value)
+        # NOTE: an un-namespaced attribute is not the android: one.
+        self.assertIsNone(element.get_attribute(0x01010001, "label"))
+
+    def test_iter_elements_with_padded_node_header(self):
+        data = AxmlBuilder().start("manifest", [("", "package", "com.example.app", 0x03, 0)]).end("manifest").build()
+        # NOTE: the node header of the start element grows by 4 bytes, which the element must be read after.
+        start = data.index(struct.pack("<HHI", 0x0102, 16, 56))
+        data = data[:start] + struct.pack("<HHI", 0x0102, 20, 60) + data[start + 8:start + 16] + b"\x00" * 4 + \
+            data[start + 16:]
+        data = data[:4] + struct.pack("<I", len(data)) + data[8:]
+
+        elements = list(AxmlDocument(data).iter_elements())
+
+        self.assertEqual(
+            [
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "manifest", (AxmlAttribute("", "package", None, "com.example.app", 0x03, 0),))
+                ),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "manifest")),
+            ],
+            elements
+        )
+
+    @parameterized.expand([
+        [b""],
+        [b"<?xml version=\"1.0\" encoding=\"utf-8\"?>"],
+    ])
+    def test_init_when_not_a_binary_xml(self, data):
+        with self.assertRaises(ValueError):
+            AxmlDocument(data)
+
+    def test_iter_elements_when_truncated(self):
+        data = AxmlBuilder().start("application").build()
+
+        with self.assertRaises(ValueError):
+            list(AxmlDocument(data[:-4]).iter_elements())
+
+    @parameterized.expand([
+        # NOTE: a resource map whose header is bigger than the whole chunk.
+        [struct.pack("<HHI", 0x0180, 24, 8)],
+        # NOTE: a resource map whose header is smaller than the chunk header itself.
+        [struct.pack("<HHI", 0x0180, 4, 12) + b"\x00" * 4],
+        # NOTE: an element chunk bigger than the whole file.
+        [struct.pack("<HHI", 0x0102, 16, 64) + b"\x00" * 8],
+    ])
+    def test_iter_elements_when_malformed_chunk(self, chunk):
+        data = any_chunk(0x0003, b"", any_string_pool(["manifest"]) + chunk)
+
+        with self.assertRaises(ValueError):
+            list(AxmlDocument(data).iter_elements())
+
+
+class TestXmlDocument(unittest.TestCase):
+    """
+    Test XmlDocument.
+    """
+
+    def test_iter_elements(self):
+        data = (
+            "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+            f"<manifest xmlns:android=\"{ANDROID_NAMESPACE}\" package=\"com.example.app\">"
+            "<application android:label=\"@7F040000\"></application>"
+            "</manifest>"
+        ).encode("utf-8")
+
+        elements = list(XmlDocument(BytesIO(data)).iter_elements())
+
+        self.assertEqual(
+            [
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement("", "manifest", (AxmlAttribute("", "package", None, "com.example.app", 0x03, 0),))
+                ),
+                (
+                    AxmlDocument.START_ELEMENT,
+                    AxmlElement(
+                        "",
+                        "application",
+                        (AxmlAttribute(ANDROID_NAMESPACE, "label", None, "@7F040000", 0x03, 0),)
+                    )
+                ),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "application")),
+                (AxmlDocument.END_ELEMENT, AxmlElement("", "manifest")),
+            ],
+            elements
+        )
+
+    def test_get_attribute(self):
+        data = (
+            f"<manifest xmlns:android=\"{ANDROID_NAMESPACE}\" xmlns:other=\"any-namespace\" "
+            "package=\"com.example.app\">"
+            "<activity name=\"any-name\" other:exported=\"true\" android:enabled=\"false\"/>"
+            "</manifest>"
+        ).encode("utf-8")
+
+        elements = [element for _, element in XmlDocument(BytesIO(data)).iter_elements()]
+
+        self.assertEqual("com.example.app", elements[0].get_attribute(None, "package").raw_value)
+        self.assertIsNone(elements[1].get_attribute(0x01010003, "name"))
+        self.assertIsNone(elements[1].get_attribute(0x01010010, "exported"))
+        self.assertEqual("false", elements[1].get_attribute(0x0101000e, "enabled").raw_value)
+
+    def test_iter_elements_across_chunks(self):
+        # NOTE: the content is read 64 KiB at a time, hence many elements are split across chunks.
+        data = b"<manifest>" + b"<uses-permission name=\"any-permission\"/>" * 10000 + b"</manifest>"
+
+        elements = list(XmlDocument(BytesIO(data)).iter_elements())
+
+        self.assertEqual(2 * 10000 + 2, len(elements))
+        self.assertEqual(
+            (AxmlDocument.START_ELEMENT, AxmlElement("", "uses-permission", (
+                AxmlAttribute("", "name", None, "any-permission", 0x03, 0),
+            ))),
+            elements[-3]
+        )
+
+    @parameterized.expand([
+        [b""],
+        [b"any-manifest-content"],
+        [b"<manifest><application></manifest>"],
+    ])
+    def test_iter_elements_when_malformed(self, data):
+        with self.assertRaises(ValueError):
+            list(XmlDocument(BytesIO(data)).iter_elements())
+
+
+if __name__ == "__main__":
+    unittest.main()
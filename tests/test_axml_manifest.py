@@ -0,0 +1,107 @@
+import unittest
+
+from ninjadroid.parsers.axml import AxmlDocument
+from ninjadroid.parsers.axml_manifest import AxmlManifest
+from tests.utils.resources import ANDROID_NAMESPACE, AxmlBuilder
+
+
+class TestAxmlManifest(unittest.TestCase):
+    """
+    Test AxmlManifest.
+    """
+
+    @staticmethod
+    def name(value: str):
+        return ANDROID_NAMESPACE, "name", value, 0x03, 0
+
+    def test_get_components(self):
+        raw = AxmlBuilder({"name": 0x01010003}) \
+            .start("manifest") \
+            .start("application") \
+            .start("activity", [self.name("any-activity-name")]) \
+            .start("intent-filter") \
+            .start("action", [self.name("any-action-1")]).end("action") \
+            .start("action", [self.name("any-action-0")]).end("action") \
+            .end("intent-filter") \
+            .end("activity") \
+            .start("activity-alias", [self.name("any-alias-name")]) \
+            .start("intent-filter") \
+            .start("action", [self.name("any-alias-action")]).end("action") \
+            .end("intent-filter") \
+            .end("activity-alias") \
+            .start("service", [self.name("any-service-name")]) \
+            .start("meta-data", [self.name("any-metadata-name")]).end("meta-data") \
+            .end("service") \
+            .end("application") \
+            .start("application") \
+            .start("receiver", [self.name("any-other-application-receiver-name")]).end("receiver") \
+            .end("application") \
+            .end("manifest") \
+            .build()
+
+        manifest = AxmlManifest(AxmlDocument(raw).iter_elements())
+
+        activities = manifest.get_components(AxmlManifest.ACTIVITY)
+        self.assertEqual(["any-activity-name"], [AxmlManifest.get_attribute(a["element"], "name") for a in activities])
+        self.assertEqual([{"action": ["any-action-0", "any-action-1"]}], AxmlManifest.get_intent_filters(activities[0]))
+        services = manifest.get_components(AxmlManifest.SERVICE)
+        self.assertEqual([{"name": "any-metadata-name"}], services[0]["meta-data"])
+        self.assertEqual([], AxmlManifest.get_intent_filters(services[0]))
+        # NOTE: like the DOM lookups, only the components of the first application element are read.
+        self.assertEqual([], manifest.get_components(AxmlManifest.RECEIVER))
+
+    def test_get_components_when_nested(self):
+        # NOTE: like the DOM lookups, the meta-data of a component are all those among its descendants.
+        raw = AxmlBuilder({"name": 0x01010003}) \
+            .start("manifest") \
+            .start("application") \
+            .start("activity", [self.name("any-outer-activity-name")]) \
+            .start("activity", [self.name("any-inner-activity-name")]) \
+            .start("meta-data", [self.name("any-metadata-name")]).end("meta-data") \
+            .end("activity") \
+            .end("activity") \
+            .end("application") \
+            .end("manifest") \
+            .build()
+
+        activities = AxmlManifest(AxmlDocument(raw).iter_elements()).get_components(AxmlManifest.ACTIVITY)
+
+        self.assertEqual(2, len(activities))
+        self.assertEqual([{"name": "any-metadata-name"}], activities[0]["meta-data"])
+        self.assertEqual([{"name": "any-metadata-name"}], activities[1]["meta-data"])
+
+    def test_get_components_without_extended_processing(self):
+        raw = AxmlBuilder() \
+            .start("manifest") \
+            .start("uses-permission", [self.name("any-permission")]).end("uses-permission") \
+            .start("application") \
+            .start("activity", [self.name("any-activity-name")]).end("activity") \
+            .end("application") \
+            .end("manifest") \
+            .build()
+
+        manifest = AxmlManifest(AxmlDocument(raw).iter_elements(), extended_processing=False)
+
+        self.assertEqual(["any-permission"], manifest.get_permissions())
+        self.assertEqual([], manifest.get_components(AxmlManifest.ACTIVITY))
+
+    def test_init_with_unbalanced_end_elements(self):
+        raw = AxmlBuilder() \
+            .end("application") \
+            .start("manifest", [("", "package", "any-package-name", 0x03, 0)]) \
+            .start("uses-sdk").end("uses-sdk") \
+            .end("manifest") \
+            .build()
+
+        manifest = AxmlManifest(AxmlDocument(raw).iter_elements())
+
+        self.assertEqual("any-package-name", AxmlManifest.get_attribute(manifest.get_root(), "package"))
+        self.assertIsNotNone(manifest.get_sdk())
+
+    def test_init_without_root_element(self):
+        with self.assertRaises(ValueError):
+            AxmlManifest(AxmlDocument(AxmlBuilder().build()).iter_elements())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import Mock, patch
 
-from ninjadroid.parsers.cert import Cert, CertFingerprint, CertParticipant, CertValidity
+from ninjadroid.parsers.cert import Cert, CertFingerprint, CertParticipant, CertParser, CertValidity, LazyCert
+from tests.utils.file import any_file
 
 
 class TestCert(unittest.TestCase):
@@ -96,6 +98,54 @@ class TestCert(unittest.TestCase):
             result
         )
 
+    def test_cert_is_slotted(self):
+        participant = CertParticipant("any-name", "", "", "", "", "", "", "")
+        cert = Cert(
+            filename="any-file-name",
+            size=10,
+            md5hash="",
+            sha1hash="",
+            sha256hash="",
+            sha512hash="",
+            serial_number="any-serial-number",
+            validity=CertValidity(valid_from="any-validity-from", valid_to="any-validity-to"),
+            fingerprint=CertFingerprint(md5="", sha1="", sha256="", signature="", version=""),
+            owner=participant,
+            issuer=participant
+        )
+
+        for model in (cert, cert.get_validity(), cert.get_fingerprint(), participant):
+            self.assertFalse(hasattr(model, "__dict__"), type(model).__name__)
+
+
+class TestLazyCert(unittest.TestCase):
+    """
+    Test LazyCert class.
+    """
+
+    @patch('ninjadroid.parsers.cert.FileParser')
+    @patch('ninjadroid.parsers.cert.CertParser')
+    def test_lazy_cert(self, mock_cert_parser, mock_file_parser):
+        read = Mock(return_value=b"any-cert-content")
+        parser = CertParser(Mock(), ("md5",))
+        cert = Mock()
+        cert.get_serial_number.return_value = "any-serial-number"
+        mock_cert_parser.return_value.parse_bytes.return_value = cert
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="any-cert-file-name")
+
+        lazy_cert = LazyCert("any-cert-file-name", 10, read, parser)
+
+        read.assert_not_called()
+        self.assertEqual("any-serial-number", lazy_cert.get_serial_number())
+        self.assertEqual(cert.get_owner.return_value, lazy_cert.get_owner())
+        # NOTE: the details are parsed once, without digests.
+        mock_cert_parser.assert_called_once_with(parser.logger, ())
+        mock_cert_parser.return_value.parse_bytes.assert_called_once_with(b"any-cert-content", "any-cert-file-name")
+        mock_file_parser.assert_not_called()
+
+        self.assertEqual("any-file-md5", lazy_cert.get_md5())
+        mock_file_parser.assert_called_once_with(parser.logger, ("md5",))
+
 
 if __name__ == "__main__":
     unittest.main()
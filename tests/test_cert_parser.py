@@ -1,15 +1,19 @@
+import hashlib
+from subprocess import PIPE
 import unittest
-from unittest.mock import call, Mock, patch
+from unittest.mock import call, Mock, mock_open, patch
 from parameterized import parameterized
 from tests.utils.file import any_file, any_file_parser, any_file_parser_failure, assert_file_equal, \
     assert_file_parser_called_once_with
+from tests.utils.der import any_certificate, any_pkcs7
 from tests.utils.popen import any_popen, assert_popen_called_once_with
 
+from ninjadroid.keytool.keytool import KeytoolWorkerError
 from ninjadroid.parsers.cert import CertFingerprint, CertParticipant, CertParser, CertParsingError, CertValidity
 from ninjadroid.parsers.file import FileParsingError
 
 
-# pylint: disable=line-too-long
+# pylint: disable=line-too-long,too-many-arguments
 class TestCertParser(unittest.TestCase):
     """
     Test Cert parser.
@@ -17,10 +21,13 @@ class TestCertParser(unittest.TestCase):
 
     sut = CertParser()
 
+    @patch('ninjadroid.parsers.cert.open', new_callable=mock_open, read_data=b"any-non-pkcs7-content")
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
     @patch('ninjadroid.parsers.cert.Popen')
     @patch('ninjadroid.parsers.cert.get_localzone')
     @patch('ninjadroid.parsers.cert.FileParser')
-    def test_init(self, mock_file_parser, mock_get_localzone, mock_popen):
+    def test_init(self, mock_file_parser, mock_get_localzone, mock_popen, mock_keytool_worker, mock_file):
+        mock_keytool_worker.get.return_value = None
         file = any_file()
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
@@ -45,6 +52,7 @@ class TestCertParser(unittest.TestCase):
         cert = self.sut.parse("any-file-path", "any-file-name")
 
         assert_file_parser_called_once_with(mock_parser_instance, filepath="any-file-path", filename="any-file-name")
+        mock_file.assert_has_calls([call("any-file-path", "rb")])
         assert_popen_called_once_with(mock_popen, "keytool -printcert -file any-file-path")
         assert_file_equal(self, expected=file, actual=cert)
         self.assertEqual("558e7595", cert.get_serial_number())
@@ -101,9 +109,12 @@ class TestCertParser(unittest.TestCase):
         assert_file_parser_called_once_with(mock_parser_instance, filepath="any-file-path", filename="any-file-name")
         mock_popen.assert_not_called()
 
+    @patch('ninjadroid.parsers.cert.open', new_callable=mock_open, read_data=b"any-non-pkcs7-content")
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
     @patch('ninjadroid.parsers.cert.Popen')
     @patch('ninjadroid.parsers.cert.FileParser')
-    def test_parse_fails_when_keytool_fails(self, mock_file_parser, mock_popen):
+    def test_parse_fails_when_keytool_fails(self, mock_file_parser, mock_popen, mock_keytool_worker, _):
+        mock_keytool_worker.get.return_value = None
         mock_file_parser.return_value = any_file_parser(file=any_file())
         mock_popen.return_value = any_popen(b"keytool error")
 
@@ -112,7 +123,72 @@ class TestCertParser(unittest.TestCase):
         assert_popen_called_once_with(mock_popen, "keytool -printcert -file any-file-path")
 
     @patch('ninjadroid.parsers.cert.Popen')
-    def test_parse_cert(self, mock_popen):
+    @patch('ninjadroid.parsers.cert.FileParser')
+    def test_parse_natively(self, mock_file_parser, mock_popen):
+        file = any_file()
+        mock_parser_instance = any_file_parser(file=file)
+        mock_file_parser.return_value = mock_parser_instance
+        certificate = any_certificate(
+            serial_number=0x558e7595,
+            issuer={"CN": "IssuerName", "OU": "IssuerUnit", "O": "IssuerOrganization", "C": "IssuerCountry"},
+            subject={"CN": "OwnerName", "L": "OwnerCity", "ST": "OwnerState", "EMAILADDRESS": "owner@any-domain"},
+            valid_from=b"150627100613Z",
+            valid_to=b"25150226100613Z"
+        )
+
+        with patch('ninjadroid.parsers.cert.open', mock_open(read_data=any_pkcs7([certificate, any_certificate()]))):
+            cert = self.sut.parse("any-file-path", "any-file-name")
+
+        assert_file_parser_called_once_with(mock_parser_instance, filepath="any-file-path", filename="any-file-name")
+        mock_popen.assert_not_called()
+        assert_file_equal(self, expected=file, actual=cert)
+        self.assertEqual("558e7595", cert.get_serial_number())
+        self.assertEqual(
+            CertValidity(valid_from="2015-06-27 10:06:13Z", valid_to="2515-02-26 10:06:13Z"),
+            cert.get_validity()
+        )
+        self.assertEqual(
+            CertFingerprint(
+                md5=hashlib.md5(certificate).digest().hex(":").upper(),
+                sha1=hashlib.sha1(certificate).digest().hex(":").upper(),
+                sha256=hashlib.sha256(certificate).digest().hex(":").upper(),
+                signature="SHA1withRSA",
+                version="3"
+            ),
+            cert.get_fingerprint()
+        )
+        self.assertEqual(
+            CertParticipant(
+                name="OwnerName",
+                email="owner@any-domain",
+                unit="",
+                organization="",
+                city="OwnerCity",
+                state="OwnerState",
+                country="",
+                domain=""
+            ),
+            cert.get_owner()
+        )
+        self.assertEqual(
+            CertParticipant(
+                name="IssuerName",
+                email="",
+                unit="IssuerUnit",
+                organization="IssuerOrganization",
+                city="",
+                state="",
+                country="IssuerCountry",
+                domain=""
+            ),
+            cert.get_issuer()
+        )
+
+    @patch('ninjadroid.parsers.cert.open', new_callable=mock_open, read_data=b"any-cert-content")
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert(self, mock_popen, mock_keytool_worker, _):
+        mock_keytool_worker.get.return_value = None
         mock_popen.return_value = any_popen(b"any-cert")
 
         cert = CertParser.parse_cert("any-file-path")
@@ -120,6 +196,111 @@ class TestCertParser(unittest.TestCase):
         assert_popen_called_once_with(mock_popen, "keytool -printcert -file any-file-path")
         self.assertEqual("any-cert", cert)
 
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    @patch('ninjadroid.parsers.cert.FileParser')
+    def test_parse_bytes(self, mock_file_parser, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value = None
+        file = any_file()
+        mock_file_parser.return_value.parse_bytes.return_value = file
+        mock_popen.return_value = any_popen(
+            response=b"Owner: CN=OwnerName, OU=OwnerUnit, O=OwnerOrganization, L=OwnerCity, ST=OwnerState, "
+                     b"C=OwnerCountry\n"
+                     b"Serial number: 558e7595\n"
+                     b"Version: 3"
+        )
+
+        cert = self.sut.parse_bytes(b"any-cert-content", "any-file-name")
+
+        mock_file_parser.return_value.parse_bytes.assert_called_once_with(b"any-cert-content", "any-file-name")
+        mock_popen.return_value.communicate.assert_called_once_with(b"any-cert-content")
+        assert_file_equal(self, expected=file, actual=cert)
+        self.assertEqual("558e7595", cert.get_serial_number())
+        self.assertEqual("3", cert.get_fingerprint().get_version())
+        self.assertEqual("OwnerName", cert.get_owner().get_name())
+
+    @patch('ninjadroid.parsers.cert.Popen')
+    @patch('ninjadroid.parsers.cert.FileParser')
+    def test_parse_bytes_natively(self, mock_file_parser, mock_popen):
+        file = any_file()
+        mock_file_parser.return_value.parse_bytes.return_value = file
+        raw = any_pkcs7([any_certificate(serial_number=0x558e7595, subject={"CN": "OwnerName"})])
+
+        cert = self.sut.parse_bytes(raw, "any-file-name")
+
+        mock_file_parser.return_value.parse_bytes.assert_called_once_with(raw, "any-file-name")
+        mock_popen.assert_not_called()
+        assert_file_equal(self, expected=file, actual=cert)
+        self.assertEqual("558e7595", cert.get_serial_number())
+        self.assertEqual("3", cert.get_fingerprint().get_version())
+        self.assertEqual("OwnerName", cert.get_owner().get_name())
+
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_from_bytes(self, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value = None
+        mock_popen.return_value = any_popen(b"any-cert")
+
+        cert = CertParser.parse_cert_from_bytes(b"any-cert-content")
+
+        mock_popen.assert_called_once_with("keytool -printcert", stdin=PIPE, stdout=PIPE, stderr=None, shell=True)
+        mock_popen.return_value.communicate.assert_called_once_with(b"any-cert-content")
+        self.assertEqual("any-cert", cert)
+
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_from_bytes_when_keytool_fails(self, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value = None
+        mock_popen.return_value = any_popen(b"keytool error")
+
+        with self.assertRaises(CertParsingError):
+            CertParser.parse_cert_from_bytes(b"any-cert-content")
+
+    @patch('ninjadroid.parsers.cert.open', new_callable=mock_open, read_data=b"any-cert-content")
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_with_keytool_worker(self, mock_popen, mock_keytool_worker, mock_file):
+        mock_keytool_worker.get.return_value.print_cert.return_value = "any-cert"
+
+        cert = CertParser.parse_cert("any-file-path")
+
+        mock_file.assert_called_once_with("any-file-path", "rb")
+        mock_keytool_worker.get.return_value.print_cert.assert_called_once_with(b"any-cert-content")
+        mock_popen.assert_not_called()
+        self.assertEqual("any-cert", cert)
+
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_from_bytes_with_keytool_worker(self, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value.print_cert.return_value = "any-cert"
+
+        cert = CertParser.parse_cert_from_bytes(b"any-cert-content")
+
+        mock_keytool_worker.get.return_value.print_cert.assert_called_once_with(b"any-cert-content")
+        mock_popen.assert_not_called()
+        self.assertEqual("any-cert", cert)
+
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_from_bytes_when_keytool_worker_fails(self, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value.print_cert.return_value = "keytool error: any-error"
+
+        with self.assertRaises(CertParsingError):
+            CertParser.parse_cert_from_bytes(b"any-cert-content")
+        mock_popen.assert_not_called()
+
+    @patch('ninjadroid.parsers.cert.KeytoolWorker')
+    @patch('ninjadroid.parsers.cert.Popen')
+    def test_parse_cert_from_bytes_when_keytool_worker_is_broken(self, mock_popen, mock_keytool_worker):
+        mock_keytool_worker.get.return_value.print_cert.side_effect = KeytoolWorkerError()
+        mock_popen.return_value = any_popen(b"any-cert")
+
+        cert = CertParser.parse_cert_from_bytes(b"any-cert-content")
+
+        mock_keytool_worker.disable.assert_called_once_with()
+        mock_popen.return_value.communicate.assert_called_once_with(b"any-cert-content")
+        self.assertEqual("any-cert", cert)
+
     @patch('ninjadroid.parsers.cert.datetime')
     @patch('ninjadroid.parsers.cert.get_localzone')
     def test_parse_validity(self, mock_get_localzone, mock_datetime):
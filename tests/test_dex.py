@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import Mock, patch
 
-from ninjadroid.parsers.dex import Dex
+from ninjadroid.parsers.dex import Dex, DexParser, LazyDex
+from tests.utils.file import any_file
 
 
 class TestDex(unittest.TestCase):
@@ -16,10 +18,10 @@ class TestDex(unittest.TestCase):
             sha1hash="any-file-sha1",
             sha256hash="any-file-sha256",
             sha512hash="any-file-sha512",
-            strings=["any-command", "any-string", "any-url"],
+            strings=["any-command", "any-root-string", "any-string", "any-url"],
             urls=["any-url"],
             shell_commands=["any-command"],
-            custom_signatures=[]
+            custom_signatures=["any-root-string"]
         )
 
         result = dex.as_dict()
@@ -32,13 +34,66 @@ class TestDex(unittest.TestCase):
                 "sha1": "any-file-sha1",
                 "sha256": "any-file-sha256",
                 "sha512": "any-file-sha512",
-                "strings": ["any-command", "any-string", "any-url"],
+                "strings": ["any-command", "any-root-string", "any-string", "any-url"],
                 "urls": ["any-url"],
-                "shell_commands": ["any-command"]
+                "shell_commands": ["any-command"],
+                "custom_signatures": ["any-root-string"]
             },
             result
         )
 
+    def test_dex_is_slotted(self):
+        dex = Dex("any-file-name", 10, "", "", "", "", strings=[], urls=[], shell_commands=[], custom_signatures=[])
+
+        self.assertFalse(hasattr(dex, "__dict__"))
+
+
+class TestLazyDex(unittest.TestCase):
+    """
+    Test LazyDex class.
+    """
+
+    # pylint: disable=too-many-arguments
+    @patch.object(DexParser, "parse_custom_signatures")
+    @patch.object(DexParser, "parse_shell_commands")
+    @patch.object(DexParser, "parse_urls")
+    @patch.object(DexParser, "parse_strings_from_bytes")
+    @patch('ninjadroid.parsers.dex.FileParser')
+    def test_lazy_dex(
+            self,
+            mock_file_parser,
+            mock_parse_strings,
+            mock_parse_urls,
+            mock_parse_shell_commands,
+            mock_parse_custom_signatures
+    ):
+        read = Mock(return_value=b"any-dex-content")
+        parser = DexParser(Mock(), ("sha256",))
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="any-dex-file-name")
+        mock_parse_strings.return_value = ["any-string", "any-url"]
+        mock_parse_urls.return_value = ["any-url"]
+        mock_parse_shell_commands.return_value = []
+        mock_parse_custom_signatures.return_value = []
+
+        dex = LazyDex("any-dex-file-name", 10, read, parser)
+        urls = dex.get_urls()
+
+        # NOTE: the URLs need the strings, but neither the digests nor the other signatures.
+        self.assertEqual(["any-url"], urls)
+        read.assert_called_once_with()
+        mock_parse_strings.assert_called_once_with(b"any-dex-content")
+        mock_parse_urls.assert_called_once_with(["any-string", "any-url"])
+        mock_file_parser.assert_not_called()
+        mock_parse_shell_commands.assert_not_called()
+        mock_parse_custom_signatures.assert_not_called()
+
+        self.assertEqual("any-file-sha256", dex.get_sha256())
+        self.assertEqual(["any-url"], dex.get_urls())
+        mock_file_parser.assert_called_once_with(parser.logger, ("sha256",))
+        mock_file_parser.return_value.parse_bytes.assert_called_once_with(b"any-dex-content", "any-dex-file-name")
+        mock_parse_urls.assert_called_once()
+        self.assertEqual(2, read.call_count)
+
 
 if __name__ == "__main__":
     unittest.main()
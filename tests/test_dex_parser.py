@@ -1,15 +1,16 @@
+import struct
 import unittest
-from unittest.mock import call, Mock, patch
+from unittest.mock import Mock, mock_open, patch
 from typing import List
 from parameterized import parameterized
 from tests.utils.file import any_file, any_file_parser, any_file_parser_failure, assert_file_equal, \
     assert_file_parser_called_once_with
-from tests.utils.popen import any_popen, assert_popen_called_once_with
 
-from ninjadroid.parsers.dex import DexParser
+from ninjadroid.parsers.dex import DexParser, DexStringTable
 from ninjadroid.parsers.file import FileParsingError
 
 
+# pylint: disable=too-many-arguments
 class TestDexParser(unittest.TestCase):
     """
     Test Dex parser.
@@ -18,59 +19,100 @@ class TestDexParser(unittest.TestCase):
     sut = DexParser()
 
     @staticmethod
-    def any_signature(matches: List):
+    def any_signature(matches: List[str]):
         signature = Mock()
-        signature.search.side_effect = matches
+        signature.search_all.return_value = matches
         return signature
 
+    @staticmethod
+    def any_dex(strings: List) -> bytes:
+        header = bytearray(0x70)
+        header[0:8] = b"dex\n035\x00"
+        struct.pack_into("<II", header, 0x38, len(strings), len(header))
+        offsets = []
+        data = b""
+        data_offset = len(header) + 4 * len(strings)
+        for string in strings:
+            offsets.append(data_offset + len(data))
+            # NOTE: the test strings are shorter than 128 chars, hence their ULEB128 length is on a single byte.
+            data += bytes([len(string)]) + string + b"\x00"
+        return bytes(header) + struct.pack(f"<{len(strings)}I", *offsets) + data
+
+    @patch('ninjadroid.parsers.dex.Signature')
     @patch('ninjadroid.parsers.dex.ShellSignature')
     @patch('ninjadroid.parsers.dex.UriSignature')
-    @patch('ninjadroid.parsers.dex.Popen')
+    @patch('ninjadroid.parsers.dex.mmap')
+    @patch('ninjadroid.parsers.dex.open', new_callable=mock_open)
     @patch('ninjadroid.parsers.dex.FileParser')
-    def test_parse(self, mock_file_parser, mock_popen, mock_uri_signature, mock_shell_signature):
+    def test_parse(
+            self,
+            mock_file_parser,
+            mock_file,
+            mock_mmap,
+            mock_uri_signature,
+            mock_shell_signature,
+            mock_signature
+    ):
         file = any_file()
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_popen.return_value = any_popen(b"any-string\nany-url\nany-command")
-        mock_uri_signature.return_value = self.any_signature(matches=[
-            (None, False),
-            ("any-url", True),
-            (None, False)
-        ])
-        mock_shell_signature.return_value = self.any_signature(matches=[
-            (None, False),
-            (None, False),
-            ("any-command", True)
-        ])
+        mock_mmap.return_value.__enter__.return_value = self.any_dex([b"any-string", b"any-url", b"any-command"])
+        mock_uri_signature.return_value = self.any_signature(matches=["any-url"])
+        mock_shell_signature.return_value = self.any_signature(matches=["any-command"])
+        mock_signature.return_value = self.any_signature(matches=["any-string"])
 
         dex = DexParser().parse("any-file-path", "any-file-name")
 
         assert_file_parser_called_once_with(mock_parser_instance, filepath="any-file-path", filename="any-file-name")
-        assert_popen_called_once_with(mock_popen, "strings any-file-path")
+        mock_file.assert_called_once_with("any-file-path", "rb")
         assert_file_equal(self, expected=file, actual=dex)
         self.assertEqual(["any-command", "any-string", "any-url"], dex.get_strings())
         self.assertEqual(["any-url"], dex.get_urls())
         self.assertEqual(["any-command"], dex.get_shell_commands())
-        self.assertEqual([], dex.get_custom_signatures())
+        self.assertEqual(["any-string"], dex.get_custom_signatures())
 
-    @patch('ninjadroid.parsers.dex.Popen')
+    @patch('ninjadroid.parsers.dex.Signature')
+    @patch('ninjadroid.parsers.dex.ShellSignature')
+    @patch('ninjadroid.parsers.dex.UriSignature')
     @patch('ninjadroid.parsers.dex.FileParser')
-    def test_parse_fails_when_file_parser_fails(self, mock_file_parser, mock_popen):
+    def test_parse_bytes(self, mock_file_parser, mock_uri_signature, mock_shell_signature, mock_signature):
+        file = any_file()
+        mock_file_parser.return_value.parse_bytes.return_value = file
+        raw = self.any_dex([b"any-string", b"any-url", b"any-command"])
+        mock_uri_signature.return_value = self.any_signature(matches=["any-url"])
+        mock_shell_signature.return_value = self.any_signature(matches=["any-command"])
+        mock_signature.return_value = self.any_signature(matches=["any-string"])
+
+        dex = DexParser().parse_bytes(raw, "any-file-name")
+
+        mock_file_parser.return_value.parse_bytes.assert_called_once_with(raw, "any-file-name")
+        assert_file_equal(self, expected=file, actual=dex)
+        self.assertEqual(["any-command", "any-string", "any-url"], dex.get_strings())
+        self.assertEqual(["any-url"], dex.get_urls())
+        self.assertEqual(["any-command"], dex.get_shell_commands())
+        self.assertEqual(["any-string"], dex.get_custom_signatures())
+
+    @patch('ninjadroid.parsers.dex.mmap')
+    @patch('ninjadroid.parsers.dex.FileParser')
+    def test_parse_fails_when_file_parser_fails(self, mock_file_parser, mock_mmap):
         mock_parser_instance = any_file_parser_failure()
         mock_file_parser.return_value = mock_parser_instance
 
         with self.assertRaises(FileParsingError):
             self.sut.parse("any-file-path", "any-file-name")
         assert_file_parser_called_once_with(mock_parser_instance, filepath="any-file-path", filename="any-file-name")
-        mock_popen.assert_not_called()
+        mock_mmap.assert_not_called()
 
-    @patch('ninjadroid.parsers.dex.Popen')
-    def test_parse_strings(self, mock_popen):
-        mock_popen.return_value = any_popen(b"1-any-string\n2-any-other-string\n0-yet-another-string")
+    @patch('ninjadroid.parsers.dex.mmap')
+    @patch('ninjadroid.parsers.dex.open', new_callable=mock_open)
+    def test_parse_strings(self, mock_file, mock_mmap):
+        mock_mmap.return_value.__enter__.return_value = self.any_dex(
+            [b"1-any-string", b"2-any-other-string", b"0-yet-another-string"]
+        )
 
         strings = DexParser.parse_strings("any-file-path")
 
-        assert_popen_called_once_with(mock_popen, "strings any-file-path")
+        mock_file.assert_called_once_with("any-file-path", "rb")
         # NOTE: the strings are returned alphabetically ordered
         self.assertEqual(
             [
@@ -81,78 +123,92 @@ class TestDexParser(unittest.TestCase):
             strings
         )
 
-    def test_parse_signatures(self):
-        mock_signature = Mock()
-        mock_signature.search.side_effect = [
-            ("any-match-1", True),
-            (None, False),
-            ("", True),
-            ("any-match-2", True),
-            ("any-match-0", True)
-        ]
-
-        urls = DexParser.parse_signatures(
-            signature=mock_signature,
-            strings=[
-                "any-match-1",
-                "any-non-match",
-                "any-empty-match",
-                "any-match-2",
-                "any-match-0"
-            ]
+    def test_parse_strings_from_bytes(self):
+        raw = self.any_dex([b"1-any-string", b"2-any-other-string", b"0-yet-another-string", b""])
+
+        strings = DexParser.parse_strings_from_bytes(raw)
+
+        # NOTE: the empty strings are discarded
+        self.assertEqual(
+            [
+                "0-yet-another-string",
+                "1-any-string",
+                "2-any-other-string",
+            ],
+            strings
         )
 
-        mock_signature.search.assert_has_calls([
-            call("any-match-1"),
-            call("any-non-match"),
-            call("any-empty-match"),
-            call("any-match-2"),
-            call("any-match-0")
-        ])
-        # NOTE: the signatures are returned alphabetically ordered
-        self.assertEqual(["any-match-0", "any-match-1", "any-match-2"], urls)
+    def test_parse_strings_from_bytes_with_string_beyond_end_of_file(self):
+        raw = bytearray(self.any_dex([b"1-any-string", b"0-any-other-string", b"2-yet-another-string"]))
+        struct.pack_into("<I", raw, 0x70, 0xffffff)
 
-    def test_parse_signatures_with_min_string_len(self):
-        mock_signature = Mock()
-        mock_signature.search.return_value = ("any-match", True)
+        strings = DexParser.parse_strings_from_bytes(bytes(raw))
 
-        signatures = DexParser.parse_signatures(
-            signature=mock_signature,
-            strings=[
-                "any-match",
-                "nop"  # NOTE: this string is too short and will be filtered before calling Signature.search()
-             ],
-            min_string_len=6
-        )
+        # NOTE: the corrupt string is skipped, while the following ones are still extracted.
+        self.assertEqual(["0-any-other-string", "2-yet-another-string"], strings)
 
-        mock_signature.search.assert_has_calls([call("any-match")])
-        self.assertEqual(["any-match"], signatures)
+    def test_parse_strings_from_bytes_with_unterminated_string(self):
+        raw = self.any_dex([b"1-any-string", b"0-any-other-string", b"2-yet-another-string"])
 
-    def test_parse_signatures_when_no_match_is_found(self):
-        mock_signature = Mock()
-        mock_signature.search.return_value = (None, False)
+        strings = DexParser.parse_strings_from_bytes(raw[:-1])
 
-        signatures = DexParser.parse_signatures(signature=mock_signature, strings=["any-non-match"])
+        self.assertEqual(["0-any-other-string", "1-any-string"], strings)
 
-        mock_signature.search.assert_called_with("any-non-match")
-        self.assertEqual([], signatures)
+    @patch('ninjadroid.parsers.dex.mmap')
+    @patch('ninjadroid.parsers.dex.open', new_callable=mock_open)
+    def test_parse_strings_of_empty_file(self, _mock_file, mock_mmap):
+        mock_mmap.side_effect = ValueError("cannot mmap an empty file")
 
-    def test_parse_signatures_when_empty_match_is_found(self):
-        mock_signature = Mock()
-        mock_signature.search.return_value = ("", True)
+        strings = DexParser.parse_strings("any-file-path")
 
-        signatures = DexParser.parse_signatures(signature=mock_signature, strings=["any-empty-match"])
+        self.assertEqual([], strings)
 
-        mock_signature.search.assert_called_with("any-empty-match")
-        self.assertEqual([], signatures)
+    @parameterized.expand([
+        [b""],
+        [b"not-a-dex-file"],
+        # NOTE: the string_ids section goes beyond the end of the file
+        [b"dex\n035\x00" + bytes(0x30) + struct.pack("<II", 0xffff, 0x70) + bytes(0x30)],
+    ])
+    def test_parse_strings_from_bytes_of_invalid_dex(self, raw):
+        strings = DexParser.parse_strings_from_bytes(raw)
+
+        self.assertEqual([], strings)
 
-    def test_parse_signatures_when_no_string_is_passed(self):
-        mock_signature = Mock()
+    @parameterized.expand([
+        [b"any-string", "any-string"],
+        [b"\xc3\xa0\xe2\x82\xac", "\u00e0\u20ac"],
+        # NOTE: MUTF-8 encodes NUL on two bytes...
+        [b"any\xc0\x80string", "any\x00string"],
+        # NOTE: ...and supplementary characters as surrogate pairs.
+        [b"\xed\xa0\xbd\xed\xb8\x80", "\U0001f600"],
+        [b"\xed\xa0\xbd", "\ufffd"],
+        [b"any\xffstring", "any\ufffdstring"],
+    ])
+    def test_decode_mutf8(self, raw, expected):
+        string = DexStringTable.decode_mutf8(raw)
 
-        urls = DexParser.parse_signatures(signature=mock_signature, strings=[])
+        self.assertEqual(expected, string)
 
-        mock_signature.search.assert_not_called()
-        self.assertEqual([], urls)
+    def test_parse_signatures(self):
+        mock_signature = self.any_signature(matches=["any-match-1", "any-match-2", "any-match-0"])
+
+        signatures = DexParser.parse_signatures(signature=mock_signature, strings=["any-string", "any-other-string"])
+
+        mock_signature.search_all.assert_called_once_with(["any-string", "any-other-string"], None)
+        # NOTE: the signatures are returned alphabetically ordered
+        self.assertEqual(["any-match-0", "any-match-1", "any-match-2"], signatures)
+
+    def test_parse_signatures_with_min_string_len(self):
+        mock_signature = self.any_signature(matches=["any-match"])
+
+        signatures = DexParser.parse_signatures(
+            signature=mock_signature,
+            strings=["any-match", "nop"],
+            min_string_len=6
+        )
+
+        mock_signature.search_all.assert_called_once_with(["any-match", "nop"], 6)
+        self.assertEqual(["any-match"], signatures)
 
     @parameterized.expand([
         ["classes.dex", True],
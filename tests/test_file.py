@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import Mock
 
-from tests.utils.file import any_file
+from ninjadroid.parsers.file import File, Lazy, LazyFile
+from tests.utils.file import any_file, assert_file_equal
 
 
 class TestFile(unittest.TestCase):
@@ -32,6 +34,76 @@ class TestFile(unittest.TestCase):
             result
         )
 
+    def test_file_from_dict(self):
+        dump = {
+            "file": "any-file-name",
+            "size": 10,
+            "md5": "any-file-md5",
+            "sha1": "",
+            "sha256": "any-file-sha256",
+            "sha512": "",
+        }
+
+        file = File.from_dict(dump)
+
+        assert_file_equal(
+            self,
+            expected=any_file(md5="any-file-md5", sha1="", sha256="any-file-sha256", sha512=""),
+            actual=file
+        )
+        self.assertEqual(dump, file.as_dict())
+
+    def test_file_is_slotted(self):
+        file = any_file()
+
+        self.assertFalse(hasattr(file, "__dict__"))
+        with self.assertRaises(AttributeError):
+            setattr(file, "any_attribute", "any-value")
+
+
+class TestLazy(unittest.TestCase):
+    """
+    Test Lazy class.
+    """
+
+    def test_get(self):
+        compute = Mock(return_value="any-value")
+        lazy = Lazy(compute)
+
+        self.assertFalse(lazy.is_computed())
+        self.assertEqual("any-value", lazy.get())
+        self.assertEqual("any-value", lazy.get())
+        self.assertTrue(lazy.is_computed())
+        compute.assert_called_once_with()
+
+    def test_get_after_failure(self):
+        compute = Mock(side_effect=[ValueError(), "any-value"])
+        lazy = Lazy(compute)
+
+        with self.assertRaises(ValueError):
+            lazy.get()
+
+        self.assertFalse(lazy.is_computed())
+        self.assertEqual("any-value", lazy.get())
+
+
+class TestLazyFile(unittest.TestCase):
+    """
+    Test LazyFile class.
+    """
+
+    def test_lazy_file(self):
+        parse_file = Mock(return_value=any_file(filename="any-file-name", size=10))
+
+        file = LazyFile("any-file-name", 10, parse_file)
+
+        self.assertEqual("any-file-name", file.get_file_name())
+        self.assertEqual(10, file.get_size())
+        parse_file.assert_not_called()
+        self.assertEqual(any_file(filename="any-file-name", size=10).as_dict(), file.as_dict())
+        # NOTE: all the digests come from the same parsing.
+        parse_file.assert_called_once_with()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,11 @@
+from hashlib import md5, sha1, sha256, sha512
+from io import BytesIO
 import unittest
 from unittest.mock import patch, mock_open
 from parameterized import parameterized
 from tests.utils.file import any_file, assert_file_equal
 
-from ninjadroid.parsers.file import FileParser, FileParsingError
+from ninjadroid.parsers.file import FileHasher, FileParser, FileParsingError, HashProfile
 
 
 # pylint: disable=too-many-arguments,line-too-long
@@ -107,6 +109,119 @@ class TestFileParser(unittest.TestCase):
             actual=file
         )
 
+    @patch('ninjadroid.parsers.file.sha512')
+    @patch('ninjadroid.parsers.file.sha256')
+    @patch('ninjadroid.parsers.file.sha1')
+    @patch('ninjadroid.parsers.file.md5')
+    def test_parse_bytes(self, mock_md5, mock_sha1, mock_sha256, mock_sha512):
+        mock_md5.return_value.hexdigest.return_value = self.ANY_FILE_MD5
+        mock_sha1.return_value.hexdigest.return_value = self.ANY_FILE_SHA1
+        mock_sha256.return_value.hexdigest.return_value = self.ANY_FILE_SHA256
+        mock_sha512.return_value.hexdigest.return_value = self.ANY_FILE_SHA512
+
+        file = self.sut.parse_bytes(b"any-file-content", "any-file-name")
+
+        mock_md5.return_value.update.assert_called_once_with(b"any-file-content")
+        mock_sha512.return_value.update.assert_called_once_with(b"any-file-content")
+        assert_file_equal(
+            self,
+            expected=any_file(
+                filename="any-file-name",
+                size=16,
+                md5=self.ANY_FILE_MD5,
+                sha1=self.ANY_FILE_SHA1,
+                sha256=self.ANY_FILE_SHA256,
+                sha512=self.ANY_FILE_SHA512
+            ),
+            actual=file
+        )
+
+    def test_parse_stream(self):
+        raw = b"any-file-content" * FileHasher.CHUNK_SIZE
+
+        file = self.sut.parse_stream(BytesIO(raw), "any-file-name")
+
+        assert_file_equal(
+            self,
+            expected=any_file(
+                filename="any-file-name",
+                size=len(raw),
+                md5=md5(raw).hexdigest(),
+                sha1=sha1(raw).hexdigest(),
+                sha256=sha256(raw).hexdigest(),
+                sha512=sha512(raw).hexdigest()
+            ),
+            actual=file
+        )
+
+    @parameterized.expand([
+        [0],
+        [1],
+        [FileHasher.CHUNK_SIZE],
+        [FileHasher.CHUNK_SIZE + 1],
+        [3 * FileHasher.CHUNK_SIZE - 1]
+    ])
+    def test_file_hasher(self, size):
+        raw = bytes(index % 251 for index in range(size))
+
+        from_bytes = FileHasher().update(raw).build_file("any-file-name", size)
+        from_stream = FileHasher().update_from_stream(BytesIO(raw)).build_file("any-file-name", size)
+
+        expected = any_file(
+            filename="any-file-name",
+            size=size,
+            md5=md5(raw).hexdigest(),
+            sha1=sha1(raw).hexdigest(),
+            sha256=sha256(raw).hexdigest(),
+            sha512=sha512(raw).hexdigest()
+        )
+        assert_file_equal(self, expected=expected, actual=from_bytes)
+        assert_file_equal(self, expected=expected, actual=from_stream)
+
+    def test_parse_bytes_with_hash_algorithms(self):
+        file = FileParser(hash_algorithms=("sha256",)).parse_bytes(b"any-file-content", "any-file-name")
+
+        assert_file_equal(
+            self,
+            expected=any_file(
+                filename="any-file-name",
+                size=16,
+                md5="",
+                sha1="",
+                sha256=sha256(b"any-file-content").hexdigest(),
+                sha512=""
+            ),
+            actual=file
+        )
+
+    def test_hash_profile(self):
+        profile = HashProfile()
+
+        for category in HashProfile.CATEGORIES:
+            self.assertEqual(("md5", "sha1", "sha256", "sha512"), profile.get_algorithms(category))
+
+    @parameterized.expand([
+        ["sha256", ("sha256",), ("sha256",)],
+        ["sha512+md5", ("md5", "sha512"), ("md5", "sha512")],
+        ["sha256,apk=md5+sha256", ("md5", "sha256"), ("sha256",)],
+        ["apk=none", (), ("md5", "sha1", "sha256", "sha512")],
+        ["sha256, other=none", ("sha256",), ()],
+    ])
+    def test_hash_profile_from_string(self, profile, expected_apk, expected_other):
+        result = HashProfile.from_string(profile)
+
+        self.assertEqual(expected_apk, result.get_algorithms(HashProfile.APK))
+        self.assertEqual(expected_other, result.get_algorithms(HashProfile.OTHER))
+
+    @parameterized.expand([
+        ["crc32"],
+        ["apk=sha256+crc32"],
+        ["unknown=sha256"],
+    ])
+    def test_hash_profile_from_string_fails_with_invalid_profile(self, profile):
+        with self.assertRaises(ValueError):
+            HashProfile.from_string(profile)
+
     @patch('ninjadroid.parsers.file.access')
     @patch('ninjadroid.parsers.file.isfile')
     @patch("builtins.open", new_callable=mock_open)
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import mock_open, patch
 
@@ -12,19 +13,16 @@ class TestGenerateApkInfoReport(unittest.TestCase):
     ANY_FILE = "any-file"
     ANY_DIRECTORY = "any-directory"
     ANY_JSON_PATH = "any-json-path"
-    ANY_JSON_REPORT = "any-json-report"
     ANY_APK_DUMP = {"any-key": "any-value"}
 
     sut = GenerateApkInfoReport()
 
-    @patch('ninjadroid.use_cases.generate_apk_info_report.json')
     @patch('ninjadroid.parsers.apk')
     @patch('ninjadroid.use_cases.generate_apk_info_report.os')
     @patch("builtins.open", new_callable=mock_open)
-    def test_execute(self, mock_file, mock_os, mock_apk, mock_json):
+    def test_execute(self, mock_file, mock_os, mock_apk):
         mock_os.path.join.return_value = TestGenerateApkInfoReport.ANY_JSON_PATH
         mock_apk.as_dict.return_value = TestGenerateApkInfoReport.ANY_APK_DUMP
-        mock_json.dumps.return_value = TestGenerateApkInfoReport.ANY_JSON_REPORT
 
         self.sut.execute(
             apk=mock_apk,
@@ -33,14 +31,30 @@ class TestGenerateApkInfoReport(unittest.TestCase):
         )
 
         mock_apk.as_dict.assert_called_once_with()
-        mock_json.dumps.assert_called_once_with(
-            TestGenerateApkInfoReport.ANY_APK_DUMP,
-            sort_keys=True,
-            ensure_ascii=False,
-            indent=4
-        )
+        mock_os.path.join.assert_called_once_with(TestGenerateApkInfoReport.ANY_DIRECTORY, "report-any-file.json")
         mock_file.assert_called_with(TestGenerateApkInfoReport.ANY_JSON_PATH, "w", encoding="utf-8")
-        mock_file().write.assert_called_once_with(TestGenerateApkInfoReport.ANY_JSON_REPORT)
+        # NOTE: the report is written incrementally, without building the whole JSON document in memory first.
+        self.assertEqual(
+            json.dumps(TestGenerateApkInfoReport.ANY_APK_DUMP, sort_keys=True, ensure_ascii=False, indent=4),
+            "".join(write.args[0] for write in mock_file().write.call_args_list)
+        )
+
+    @patch('ninjadroid.use_cases.generate_apk_info_report.ApkJsonWriter')
+    @patch('ninjadroid.parsers.apk')
+    @patch('ninjadroid.use_cases.generate_apk_info_report.os')
+    @patch("builtins.open", new_callable=mock_open)
+    def test_execute_as_json_lines(self, mock_file, mock_os, mock_apk, mock_apk_json_writer):
+        mock_os.path.join.return_value = TestGenerateApkInfoReport.ANY_JSON_PATH
+
+        self.sut.execute(
+            apk=mock_apk,
+            input_filename=TestGenerateApkInfoReport.ANY_FILE,
+            output_directory=TestGenerateApkInfoReport.ANY_DIRECTORY,
+            as_json_lines=True
+        )
+
+        mock_os.path.join.assert_called_once_with(TestGenerateApkInfoReport.ANY_DIRECTORY, "report-any-file.jsonl")
+        mock_apk_json_writer.write_json_lines.assert_called_once_with(mock_apk, mock_file())
 
 
 if __name__ == "__main__":
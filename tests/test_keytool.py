@@ -0,0 +1,120 @@
+import base64
+import unittest
+from unittest.mock import Mock, call, patch
+
+from ninjadroid.keytool.keytool import KeytoolWorker, KeytoolWorkerError
+
+
+class TestKeytoolWorker(unittest.TestCase):
+    """
+    Test KeytoolWorker.
+    """
+
+    @staticmethod
+    def any_process(responses=()) -> Mock:
+        process = Mock()
+        process.poll.return_value = None
+        process.stdout.readline.side_effect = list(responses)
+        return process
+
+    @staticmethod
+    def any_response(*lines: str):
+        return [line.encode("utf-8") + b"\n" for line in lines] + [KeytoolWorker.END_MARKER.encode("utf-8") + b"\n"]
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_print_cert(self, mock_popen):
+        process = self.any_process(
+            self.any_response("Owner: CN=any-name", "Serial number: 558e7595") +
+            self.any_response("Owner: CN=any-other-name")
+        )
+        mock_popen.return_value = process
+        worker = KeytoolWorker()
+
+        first = worker.print_cert(b"any-cert-content")
+        second = worker.print_cert(b"any-other-cert-content")
+
+        # NOTE: the same JVM serves all the requests.
+        mock_popen.assert_called_once()
+        self.assertEqual("java", mock_popen.call_args[0][0][0])
+        self.assertTrue(mock_popen.call_args[0][0][1].endswith("KeytoolWorker.java"))
+        process.stdin.write.assert_has_calls([
+            call(base64.b64encode(b"any-cert-content") + b"\n"),
+            call(base64.b64encode(b"any-other-cert-content") + b"\n"),
+        ])
+        self.assertEqual("Owner: CN=any-name\nSerial number: 558e7595\n", first)
+        self.assertEqual("Owner: CN=any-other-name\n", second)
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_print_cert_restarts_exited_worker(self, mock_popen):
+        exited_process = self.any_process(self.any_response("any-cert"))
+        process = self.any_process(self.any_response("any-other-cert"))
+        mock_popen.side_effect = [exited_process, process]
+        worker = KeytoolWorker()
+
+        worker.print_cert(b"any-cert-content")
+        exited_process.poll.return_value = 1
+        cert = worker.print_cert(b"any-other-cert-content")
+
+        self.assertEqual(2, mock_popen.call_count)
+        self.assertEqual("any-other-cert\n", cert)
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_print_cert_fails_when_worker_cannot_start(self, mock_popen):
+        mock_popen.side_effect = FileNotFoundError("java")
+
+        with self.assertRaises(KeytoolWorkerError):
+            KeytoolWorker().print_cert(b"any-cert-content")
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_print_cert_fails_when_worker_exits(self, mock_popen):
+        process = self.any_process([b"Owner: CN=any-name\n", b""])
+        mock_popen.return_value = process
+
+        with self.assertRaises(KeytoolWorkerError):
+            KeytoolWorker().print_cert(b"any-cert-content")
+        process.stdin.close.assert_called_once_with()
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_shutdown(self, mock_popen):
+        process = self.any_process(self.any_response("any-cert"))
+        mock_popen.return_value = process
+        worker = KeytoolWorker()
+        worker.print_cert(b"any-cert-content")
+
+        worker.shutdown()
+        worker.shutdown()
+
+        process.stdin.close.assert_called_once_with()
+        process.wait.assert_called_once_with(timeout=5)
+        process.kill.assert_not_called()
+
+    @patch('ninjadroid.keytool.keytool.Popen')
+    def test_shutdown_without_requests(self, mock_popen):
+        KeytoolWorker().shutdown()
+
+        mock_popen.assert_not_called()
+
+    @patch('ninjadroid.keytool.keytool.atexit')
+    @patch.object(KeytoolWorker, "_KeytoolWorker__disabled", False)
+    @patch.object(KeytoolWorker, "_KeytoolWorker__instance", None)
+    def test_get(self, mock_atexit):
+        worker = KeytoolWorker.get()
+
+        self.assertIs(worker, KeytoolWorker.get())
+        mock_atexit.register.assert_called_once_with(worker.shutdown)
+
+    @patch('ninjadroid.keytool.keytool.atexit')
+    @patch.object(KeytoolWorker, "_KeytoolWorker__disabled", False)
+    @patch.object(KeytoolWorker, "_KeytoolWorker__instance", None)
+    def test_get_when_disabled(self, _):
+        worker = KeytoolWorker.get()
+        worker.shutdown = Mock()
+
+        KeytoolWorker.disable()
+
+        worker.shutdown.assert_called_once_with()
+        self.assertIsNone(KeytoolWorker.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
+from unittest.mock import Mock, patch
 
 from ninjadroid.parsers.manifest import AndroidManifest, AppActivity, AppBroadcastReceiver, AppService, AppSdk, \
-    AppVersion
+    AppVersion, LazyAndroidManifest
 
 
 class TestAndroidManifest(unittest.TestCase):
@@ -284,6 +285,179 @@ class TestAndroidManifest(unittest.TestCase):
             result
         )
 
+    def test_manifest_from_dict(self):
+        dump = {
+            "file": "any-file-name",
+            "size": 10,
+            "md5": "any-file-md5",
+            "sha1": "any-file-sha1",
+            "sha256": "any-file-sha256",
+            "sha512": "any-file-sha512",
+            "package": "any-package-name",
+            "version": {
+                "code": "",
+                "name": "any-version-name"
+            },
+            "sdk": {
+                "min": "10",
+                "target": "15",
+                "max": ""
+            },
+            "permissions": ["any-permission"],
+            "activities": [
+                {
+                    "name": "any-activity-name-1",
+                    "meta-data": [{"name": "any-activity-metadata-name", "value": "any-activity-metadata-value"}],
+                    "intent-filter": [{"action": ["any-activity-intent-filter-action"]}],
+                    "parentActivityName": "any-activity-parent-name",
+                    "launchMode": "1",
+                    "noHistory": True
+                },
+                {
+                    "name": "any-activity-name-2"
+                }
+            ],
+            "services": [
+                {
+                    "name": "any-service-name",
+                    "enabled": False,
+                    "exported": True,
+                    "process": "any-service-process",
+                    "isolatedProcess": True
+                }
+            ],
+            "receivers": [
+                {
+                    "name": "any-broadcast-receiver-name",
+                    "intent-filter": [{"action": ["any-broadcast-receiver-intent-filter-action"]}],
+                    "enabled": True,
+                    "exported": False
+                }
+            ]
+        }
+
+        manifest = AndroidManifest.from_dict(dump)
+
+        self.assertEqual("any-package-name", manifest.get_package_name())
+        self.assertEqual(AppVersion(code=None, name="any-version-name"), manifest.get_version())
+        self.assertEqual(AppSdk(min_version="10", target_version="15", max_version=None), manifest.get_sdk())
+        self.assertEqual(AppActivity(name="any-activity-name-2"), manifest.get_activities()[1])
+        self.assertEqual(
+            AppService(
+                name="any-service-name",
+                enabled=False,
+                exported=True,
+                process="any-service-process",
+                isolated_process=True
+            ),
+            manifest.get_services()[0]
+        )
+        self.assertEqual(dump, manifest.as_dict())
+
+    def test_manifest_from_dict_without_extended_processing(self):
+        dump = {
+            "file": "any-file-name",
+            "size": 10,
+            "md5": "any-file-md5",
+            "sha1": "any-file-sha1",
+            "sha256": "any-file-sha256",
+            "sha512": "any-file-sha512",
+            "package": "any-package-name",
+            "version": {
+                "code": 1,
+                "name": "any-version-name"
+            },
+            "sdk": {
+                "min": "10",
+                "target": "15",
+                "max": "20"
+            },
+            "permissions": []
+        }
+
+        manifest = AndroidManifest.from_dict(dump)
+
+        self.assertEqual([], manifest.get_activities())
+        self.assertEqual([], manifest.get_services())
+        self.assertEqual([], manifest.get_broadcast_receivers())
+        self.assertEqual(dump, manifest.as_dict())
+
+    def test_manifest_is_slotted(self):
+        manifest = AndroidManifest(
+            filename="any-file-name",
+            size=10,
+            md5hash="",
+            sha1hash="",
+            sha256hash="",
+            sha512hash="",
+            package_name="any-package-name",
+            version=AppVersion(code=1, name="any-version-name"),
+            sdk=AppSdk(min_version="10", target_version="15", max_version="20"),
+            permissions=[],
+            activities=[AppActivity(name="any-activity-name")],
+            services=[AppService(name="any-service-name")],
+            receivers=[AppBroadcastReceiver(name="any-receiver-name")]
+        )
+
+        for model in (
+                manifest,
+                manifest.get_version(),
+                manifest.get_sdk(),
+                manifest.get_activities()[0],
+                manifest.get_services()[0],
+                manifest.get_broadcast_receivers()[0]
+        ):
+            self.assertFalse(hasattr(model, "__dict__"), type(model).__name__)
+
+
+class TestLazyAndroidManifest(unittest.TestCase):
+    """
+    Test LazyAndroidManifest class.
+    """
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    @patch('ninjadroid.parsers.manifest.AndroidManifestParser')
+    def test_lazy_manifest(self, mock_manifest_parser, mock_file_parser):
+        read = Mock(return_value=b"any-manifest-content")
+        summary = Mock()
+        summary.get_package_name.return_value = "any-package-name"
+        components = Mock()
+        components.get_activities.return_value = [AppActivity(name="any-activity")]
+        mock_manifest_parser.return_value.parse_bytes.side_effect = [summary, components]
+
+        manifest = LazyAndroidManifest("AndroidManifest.xml", 10, read, "any-apk-path", Mock())
+
+        read.assert_not_called()
+        self.assertEqual("any-package-name", manifest.get_package_name())
+        self.assertEqual(summary.get_permissions.return_value, manifest.get_permissions())
+        mock_manifest_parser.return_value.parse_bytes.assert_called_once_with(
+            b"any-manifest-content",
+            True,
+            "any-apk-path",
+            False
+        )
+        self.assertEqual([AppActivity(name="any-activity")], manifest.get_activities())
+        mock_manifest_parser.return_value.parse_bytes.assert_called_with(
+            b"any-manifest-content",
+            True,
+            "any-apk-path",
+            True
+        )
+        mock_file_parser.assert_not_called()
+
+    @patch('ninjadroid.parsers.manifest.AndroidManifestParser')
+    def test_lazy_manifest_reuses_components(self, mock_manifest_parser):
+        manifest = Mock()
+        manifest.get_package_name.return_value = "any-package-name"
+        mock_manifest_parser.return_value.parse_bytes.return_value = manifest
+
+        lazy_manifest = LazyAndroidManifest("AndroidManifest.xml", 10, Mock(), "any-apk-path", Mock())
+        lazy_manifest.get_services()
+
+        # NOTE: the summary is part of the full parsing, which is not repeated.
+        self.assertEqual("any-package-name", lazy_manifest.get_package_name())
+        mock_manifest_parser.return_value.parse_bytes.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
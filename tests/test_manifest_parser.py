@@ -1,15 +1,16 @@
-from typing import Dict, List
+from typing import Dict, List, Sequence
 import unittest
-from unittest.mock import ANY, Mock, mock_open, patch
-from xml.parsers.expat import ExpatError
+from unittest.mock import mock_open, patch
+from zipfile import ZipFile
 from parameterized import parameterized
 from tests.utils.file import any_file, any_file_parser, assert_file_equal, assert_file_parser_called_once_with
+from tests.utils.resources import ANDROID_NAMESPACE, AxmlBuilder
 
 from ninjadroid.parsers.manifest import AndroidManifest, AndroidManifestParser, AndroidManifestParsingError, \
     AppActivity, AppBroadcastReceiver, AppService, AppSdk, AppVersion
 
 
-# pylint: disable=too-many-arguments,too-many-locals,unused-argument
+# pylint: disable=too-many-arguments,too-many-locals,too-many-public-methods,unused-argument
 class TestAndroidManifestParser(unittest.TestCase):
     """
     Test AndroidManifest parser.
@@ -18,10 +19,76 @@ class TestAndroidManifestParser(unittest.TestCase):
     sut = AndroidManifestParser()
 
     @staticmethod
-    def any_axmlprinter() -> Mock:
-        axmlprinter = Mock()
-        axmlprinter.get_buff.return_value = "any-axml-raw-value"
-        return axmlprinter
+    def any_axml_manifest() -> bytes:
+        android = ANDROID_NAMESPACE
+        return AxmlBuilder({
+            "versionCode": 0x0101021b,
+            "versionName": 0x0101021c,
+            "minSdkVersion": 0x0101020c,
+            "targetSdkVersion": 0x01010270,
+            "maxSdkVersion": 0x01010271,
+            "name": 0x01010003,
+            "value": 0x01010024,
+            "launchMode": 0x0101001d,
+            "noHistory": 0x0101022d,
+            "enabled": 0x0101000e,
+            "exported": 0x01010010,
+            "isolatedProcess": 0x010103a9,
+            "priority": 0x0101001c,
+            "scheme": 0x01010027,
+            "mimeType": 0x01010026,
+        }) \
+            .start("manifest", [
+                ("", "package", "any-package-name", 0x03, 0),
+                (android, "versionCode", None, 0x10, 1),
+                (android, "versionName", "any-version-name", 0x03, 0)
+            ]) \
+            .start("uses-sdk", [
+                (android, "minSdkVersion", None, 0x10, 10),
+                (android, "targetSdkVersion", None, 0x10, 15),
+                (android, "maxSdkVersion", None, 0x10, 20)
+            ]) \
+            .end("uses-sdk") \
+            .start("uses-permission", [(android, "name", "any-permission-1", 0x03, 0)]).end("uses-permission") \
+            .start("uses-permission", [(android, "name", "any-permission-2", 0x03, 0)]).end("uses-permission") \
+            .start("uses-permission", [(android, "name", "any-permission-0", 0x03, 0)]).end("uses-permission") \
+            .start("application") \
+            .start("activity", [
+                (android, "name", "any-activity-name", 0x03, 0),
+                (android, "launchMode", None, 0x10, 1),
+                (android, "noHistory", None, 0x12, 0xffffffff)
+            ]) \
+            .start("meta-data", [
+                (android, "name", "any-metadata-name", 0x03, 0),
+                (android, "value", "any-metadata-value", 0x03, 0)
+            ]) \
+            .end("meta-data") \
+            .start("intent-filter") \
+            .start("action", [(android, "name", "any-action-1", 0x03, 0)]).end("action") \
+            .start("action", [(android, "name", "any-action-0", 0x03, 0)]).end("action") \
+            .start("category", [(android, "name", "any-category", 0x03, 0)]).end("category") \
+            .start("data", [(android, "scheme", "any-scheme", 0x03, 0)]).end("data") \
+            .start("data", [(android, "mimeType", "any-mime-type", 0x03, 0)]).end("data") \
+            .end("intent-filter") \
+            .end("activity") \
+            .start("service", [
+                (android, "name", "any-service-name", 0x03, 0),
+                (android, "enabled", None, 0x12, 0),
+                (android, "exported", None, 0x12, 0xffffffff),
+                (android, "isolatedProcess", None, 0x12, 0)
+            ]) \
+            .end("service") \
+            .start("receiver", [
+                (android, "name", "any-broadcast-receiver-name", 0x03, 0),
+                (android, "exported", None, 0x12, 0)
+            ]) \
+            .start("intent-filter", [(android, "priority", None, 0x10, 0xffffffff)]) \
+            .start("action", [(android, "name", "any-action-0", 0x03, 0)]).end("action") \
+            .end("intent-filter") \
+            .end("receiver") \
+            .end("application") \
+            .end("manifest") \
+            .build()
 
     @staticmethod
     def any_aapt_apk_info(
@@ -46,46 +113,34 @@ class TestAndroidManifestParser(unittest.TestCase):
         }
 
     @staticmethod
-    def any_aapt_manifest_info(activities: List[str], services: List[str], receivers: str) -> Dict:
-        return {
-            "activities": activities,
-            "services": services,
-            "receivers": receivers
-        }
-
-    @staticmethod
-    def any_axmlprinter_xml(
-            package_name: str,
-            version_code: str,
-            version_name: str,
-            sdk_min: str,
-            sdk_target: str,
-            sdk_max: str,
-            permissions: List[str]
-    ) -> Mock:
-        xml = Mock()
-        xml.documentElement.getAttribute.side_effect = [
-            package_name,
-            version_code,
-            version_name
-        ]
-        sdk_xml = Mock()
-        sdk_xml.hasAttribute.return_value = True
-        sdk_xml.getAttribute.side_effect = [
-            sdk_min,
-            sdk_target,
-            sdk_max
-        ]
-        permissions_xml = Mock()
-        permissions_xml.getAttribute.side_effect = permissions
-        xml.documentElement.getElementsByTagName.side_effect = [
-            [sdk_xml],
-            [permissions_xml, permissions_xml, permissions_xml]
-        ]
-        return xml
+    def any_aapt_xmltree() -> str:
+        return "N: android=http://schemas.android.com/apk/res/android\n" \
+               "  E: manifest (line=2)\n" \
+               "    A: package=\"any-package-name\" (Raw: \"any-package-name\")\n" \
+               "    E: application (line=8)\n" \
+               "      E: activity (line=9)\n" \
+               "        A: android:name(0x01010003)=\"any-activity-name\" (Raw: \"any-activity-name\")\n" \
+               "        A: android:launchMode(0x0101001d)=(type 0x10)0x1\n" \
+               "        E: meta-data (line=10)\n" \
+               "          A: android:name(0x01010003)=\"any-key\" (Raw: \"any-key\")\n" \
+               "          A: android:value(0x01010024)=\"any-value\" (Raw: \"any-value\")\n" \
+               "        E: intent-filter (line=11)\n" \
+               "          A: android:priority(0x0101001c)=(type 0x10)0x5\n" \
+               "          E: action (line=12)\n" \
+               "            A: android:name(0x01010003)=\"any-action\" (Raw: \"any-action\")\n" \
+               "          E: data (line=13)\n" \
+               "            A: android:scheme(0x01010027)=\"any-scheme\" (Raw: \"any-scheme\")\n" \
+               "      E: service (line=16)\n" \
+               "        A: android:name(0x01010003)=\"any-service-name\" (Raw: \"any-service-name\")\n" \
+               "        A: android:enabled(0x0101000e)=(type 0x12)0x0\n" \
+               "        A: android:exported(0x01010010)=(type 0x12)0xffffffff\n" \
+               "      E: receiver (line=17)\n" \
+               "        A: android:name(0x01010003)=\"any-broadcast-receiver-name\" " \
+               "(Raw: \"any-broadcast-receiver-name\")\n" \
+               "        A: android:exported(0x01010010)=(type 0x12)0x0\n"
 
     @staticmethod
-    def any_axmlprinter_xml_with_extended_processing(
+    def any_xml_manifest(
             package_name: str,
             version_code: str,
             version_name: str,
@@ -93,49 +148,25 @@ class TestAndroidManifestParser(unittest.TestCase):
             sdk_target: str,
             sdk_max: str,
             permissions: List[str],
-            activities: List[str],
-            services: List[str],
-            receivers: List[str]
-    ) -> Mock:
-        xml = Mock()
-        xml.documentElement.getAttribute.side_effect = [
-            package_name,
-            version_code,
-            version_name
-        ]
-        sdk_xml = Mock()
-        sdk_xml.hasAttribute.return_value = True
-        sdk_xml.getAttribute.side_effect = [
-            sdk_min,
-            sdk_target,
-            sdk_max
-        ]
-        permissions_xml = Mock()
-        permissions_xml.getAttribute.side_effect = permissions
-        application_xml = Mock()
-        activity_xml = Mock()
-        activity_xml.getAttribute.side_effect = activities
-        activity_xml.hasAttribute.return_value = False
-        activity_xml.getElementsByTagName.return_value = []
-        service_xml = Mock()
-        service_xml.getAttribute.side_effect = services
-        service_xml.hasAttribute.return_value = False
-        service_xml.getElementsByTagName.return_value = []
-        receiver_xml = Mock()
-        receiver_xml.getAttribute.side_effect = receivers
-        receiver_xml.hasAttribute.return_value = False
-        receiver_xml.getElementsByTagName.return_value = []
-        application_xml.getElementsByTagName.side_effect = [
-            [activity_xml],
-            [service_xml],
-            [receiver_xml]
-        ]
-        xml.documentElement.getElementsByTagName.side_effect = [
-            [application_xml],
-            [sdk_xml],
-            [permissions_xml, permissions_xml, permissions_xml]
-        ]
-        return xml
+            activities: Sequence[str] = (),
+            services: Sequence[str] = (),
+            receivers: Sequence[str] = ()
+    ) -> bytes:
+        components = "".join(
+            f"<{tag} android:name=\"{name}\"/>"
+            for tag, names in (("activity", activities), ("service", services), ("receiver", receivers))
+            for name in names
+        )
+        return (
+            "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+            f"<manifest xmlns:android=\"{ANDROID_NAMESPACE}\" package=\"{package_name}\" "
+            f"android:versionCode=\"{version_code}\" android:versionName=\"{version_name}\">"
+            f"<uses-sdk android:minSdkVersion=\"{sdk_min}\" android:targetSdkVersion=\"{sdk_target}\" "
+            f"android:maxSdkVersion=\"{sdk_max}\"/>"
+            + "".join(f"<uses-permission android:name=\"{permission}\"/>" for permission in permissions)
+            + f"<application>{components}</application>"
+            "</manifest>"
+        ).encode("utf-8")
 
     def assert_manifest_equal(
             self,
@@ -156,14 +187,12 @@ class TestAndroidManifestParser(unittest.TestCase):
         self.assertEqual(services, manifest.get_services())
         self.assertEqual(receivers, manifest.get_broadcast_receivers())
 
-    @patch('ninjadroid.parsers.manifest.minidom')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse(self, mock_file, mock_file_parser, mock_minidom):
+    def test_parse(self, mock_file_parser):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.return_value = self.any_axmlprinter_xml(
+        raw = self.any_xml_manifest(
             package_name="any-package-name",
             version_code="1",
             version_name="any-version-name",
@@ -173,12 +202,13 @@ class TestAndroidManifestParser(unittest.TestCase):
             permissions=["any-permission-1", "any-permission-2", "any-permission-0"]
         )
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=False,
-            apk_path="any_apk_path",
-            extended_processing=False
-        )
+        with patch("builtins.open", mock_open(read_data=raw)) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=False,
+                apk_path="any_apk_path",
+                extended_processing=False
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -186,7 +216,6 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_minidom.parse.assert_called_with("any-file-path")
         assert_file_equal(self, expected=file, actual=manifest)
         self.assert_manifest_equal(
             manifest=manifest,
@@ -199,14 +228,12 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=[]
         )
 
-    @patch('ninjadroid.parsers.manifest.minidom')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_with_extended_processing(self, mock_file, mock_file_parser, mock_minidom):
+    def test_parse_with_extended_processing(self, mock_file_parser):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.return_value = self.any_axmlprinter_xml_with_extended_processing(
+        raw = self.any_xml_manifest(
             package_name="any-package-name",
             version_code="1",
             version_name="any-version-name",
@@ -219,12 +246,13 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=["any-broadcast-receiver-name"]
         )
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=False,
-            apk_path="any_apk_path",
-            extended_processing=True
-        )
+        with patch("builtins.open", mock_open(read_data=raw)) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=False,
+                apk_path="any_apk_path",
+                extended_processing=True
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -232,7 +260,6 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_minidom.parse.assert_called_with("any-file-path")
         assert_file_equal(self, expected=file, actual=manifest)
         self.assert_manifest_equal(
             manifest=manifest,
@@ -245,14 +272,12 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=[AppBroadcastReceiver(name="any-broadcast-receiver-name")]
         )
 
-    @patch('ninjadroid.parsers.manifest.minidom')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_with_invalid_version_code(self, mock_file, mock_file_parser, mock_minidom):
+    def test_parse_with_invalid_version_code(self, mock_file_parser):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.return_value = self.any_axmlprinter_xml(
+        raw = self.any_xml_manifest(
             package_name="any-package-name",
             version_code="A",
             version_name="any-version-name",
@@ -262,12 +287,13 @@ class TestAndroidManifestParser(unittest.TestCase):
             permissions=["any-permission-1", "any-permission-2", "any-permission-0"]
         )
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=False,
-            apk_path="any_apk_path",
-            extended_processing=False
-        )
+        with patch("builtins.open", mock_open(read_data=raw)) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=False,
+                apk_path="any_apk_path",
+                extended_processing=False
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -275,7 +301,6 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_minidom.parse.assert_called_with("any-file-path")
         self.assert_manifest_equal(
             manifest=manifest,
             package_name="any-package-name",
@@ -288,31 +313,19 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=[]
         )
 
-    @patch('ninjadroid.parsers.manifest.minidom')
-    @patch('ninjadroid.parsers.manifest.AXMLPrinter')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_binary(self, mock_file, mock_file_parser, mock_axmlprinter, mock_minidom):
+    def test_parse_binary(self, mock_file_parser):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_axmlprinter.return_value = self.any_axmlprinter()
-        mock_minidom.parseString.return_value = self.any_axmlprinter_xml(
-            package_name="any-package-name",
-            version_code="1",
-            version_name="any-version-name",
-            sdk_max="20",
-            sdk_min="10",
-            sdk_target="15",
-            permissions=["any-permission-1", "any-permission-2", "any-permission-0"]
-        )
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=True,
-            apk_path=None,
-            extended_processing=False
-        )
+        with patch("builtins.open", mock_open(read_data=self.any_axml_manifest())) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=True,
+                apk_path=None,
+                extended_processing=False
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -320,8 +333,6 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_axmlprinter.assert_called_with(ANY)
-        mock_minidom.parseString.assert_called_with("any-axml-raw-value")
         assert_file_equal(self, expected=file, actual=manifest)
         self.assert_manifest_equal(
             manifest=manifest,
@@ -334,51 +345,203 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=[]
         )
 
-    @patch('ninjadroid.parsers.manifest.minidom')
-    @patch('ninjadroid.parsers.manifest.AXMLPrinter')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_binary_when_axmlprinter_fails(self, mock_file, mock_file_parser, mock_axmlprinter, mock_minidom):
+    def test_parse_binary_when_malformed(self, mock_file_parser):
+        mock_file_parser.return_value = any_file_parser(file=any_file(filename="AndroidManifest.xml"))
+
+        with patch("builtins.open", mock_open(read_data=self.any_axml_manifest()[:-4])):
+            with self.assertRaises(AndroidManifestParsingError):
+                self.sut.parse(
+                    filepath="any-file-path",
+                    binary=True,
+                    apk_path=None,
+                    extended_processing=False
+                )
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_bytes(self, mock_file_parser):
         file = any_file(filename="AndroidManifest.xml")
-        mock_parser_instance = any_file_parser(file=file)
-        mock_file_parser.return_value = mock_parser_instance
-        mock_axmlprinter.side_effect = IOError()
+        mock_file_parser.return_value.parse_bytes.return_value = file
+        raw = self.any_axml_manifest()
 
-        with self.assertRaises(AndroidManifestParsingError):
-            self.sut.parse(
-                filepath="any-file-path",
-                binary=True,
-                apk_path=None,
-                extended_processing=False
-            )
+        manifest = self.sut.parse_bytes(
+            raw=raw,
+            binary=True,
+            apk_path=None,
+            extended_processing=False
+        )
+
+        mock_file_parser.return_value.parse_bytes.assert_called_once_with(raw, "AndroidManifest.xml")
+        assert_file_equal(self, expected=file, actual=manifest)
+        self.assert_manifest_equal(
+            manifest=manifest,
+            package_name="any-package-name",
+            version=AppVersion(code=1, name="any-version-name"),
+            sdk=AppSdk(min_version="10", target_version="15", max_version="20"),
+            permissions=["any-permission-0", "any-permission-1", "any-permission-2"],
+            activities=[],
+            services=[],
+            receivers=[]
+        )
 
-    @patch('ninjadroid.parsers.manifest.minidom')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_when_minidom_fails_without_apk_path(self, mock_file, mock_file_parser, mock_minidom):
-        file = any_file(filename="AndroidManifest.xml")
-        mock_parser_instance = any_file_parser(file=file)
-        mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.side_effect = ExpatError()
+    def test_parse_bytes_with_extended_processing(self, mock_file_parser):
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+
+        manifest = self.sut.parse_bytes(
+            raw=self.any_axml_manifest(),
+            binary=True,
+            apk_path=None,
+            extended_processing=True
+        )
+
+        self.assert_manifest_equal(
+            manifest=manifest,
+            package_name="any-package-name",
+            version=AppVersion(code=1, name="any-version-name"),
+            sdk=AppSdk(min_version="10", target_version="15", max_version="20"),
+            permissions=["any-permission-0", "any-permission-1", "any-permission-2"],
+            activities=[
+                AppActivity(
+                    name="any-activity-name",
+                    metadata=[{"name": "any-metadata-name", "value": "any-metadata-value"}],
+                    intent_filters=[
+                        {
+                            "action": ["any-action-0", "any-action-1"],
+                            "category": ["any-category"],
+                            "data": [{"scheme": "any-scheme"}, {"mimeType": "any-mime-type"}]
+                        }
+                    ],
+                    launch_mode="1",
+                    no_history="true"
+                )
+            ],
+            services=[AppService(name="any-service-name", enabled=False, exported=True, isolated_process=False)],
+            receivers=[
+                AppBroadcastReceiver(
+                    name="any-broadcast-receiver-name",
+                    intent_filters=[{"priority": "-1", "action": ["any-action-0"]}],
+                    exported=False
+                )
+            ]
+        )
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_bytes_with_obfuscated_attribute_names(self, mock_file_parser):
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+        # NOTE: the android: attributes are still identified by their resource id.
+        raw = AxmlBuilder({"a": 0x0101021b, "b": 0x0101021c, "c": 0x0101020c, "d": 0x01010003}) \
+            .start("manifest", [
+                ("", "package", "any-package-name", 0x03, 0),
+                ("any-namespace", "a", None, 0x10, 7),
+                ("any-namespace", "b", "any-version-name", 0x03, 0)
+            ]) \
+            .start("uses-sdk", [("any-namespace", "c", None, 0x10, 21)]).end("uses-sdk") \
+            .start("application") \
+            .start("service", [("any-namespace", "d", "any-service-name", 0x03, 0)]).end("service") \
+            .end("application") \
+            .end("manifest") \
+            .build()
+
+        manifest = self.sut.parse_bytes(raw=raw, binary=True, apk_path=None, extended_processing=True)
+
+        self.assert_manifest_equal(
+            manifest=manifest,
+            package_name="any-package-name",
+            version=AppVersion(code=7, name="any-version-name"),
+            sdk=AppSdk(min_version="21", target_version="21", max_version=None),
+            permissions=[],
+            activities=[],
+            services=[AppService(name="any-service-name")],
+            receivers=[]
+        )
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_bytes_with_trailing_garbage(self, mock_file_parser):
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+        raw = self.any_axml_manifest() + b"\x02\x01\x10\x00\xff\xff\xff\xff"
+
+        manifest = self.sut.parse_bytes(raw=raw, binary=True, apk_path=None, extended_processing=False)
+
+        self.assertEqual("any-package-name", manifest.get_package_name())
+
+    @patch('ninjadroid.parsers.manifest.AaptSession')
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_bytes_when_malformed_with_apk_path(self, mock_file_parser, mock_aapt_session):
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
+        mock_aapt_session.return_value.get_apk_info.return_value = self.any_aapt_apk_info(
+            package_name="any-package-name",
+            version_code=1,
+            version_name="any-version-name",
+            sdk_max="20",
+            sdk_min="10",
+            sdk_target="15"
+        )
+        mock_aapt_session.return_value.get_app_permissions.return_value = ["any-permission-0"]
+
+        manifest = self.sut.parse_bytes(
+            raw=self.any_axml_manifest()[:-4],
+            binary=True,
+            apk_path="any_apk_path",
+            extended_processing=False
+        )
+
+        mock_aapt_session.assert_called_once_with("any_apk_path")
+        mock_aapt_session.return_value.prefetch.assert_called_once_with("badging", "permissions")
+        self.assertEqual("any-package-name", manifest.get_package_name())
+        self.assertEqual(["any-permission-0"], manifest.get_permissions())
+
+    def test_parse_binary_as_text(self):
+        binary = AndroidManifestParser(hash_algorithms=()).parse(
+            "regression/data/AndroidManifestBinary.xml",
+            binary=True
+        )
+        text = AndroidManifestParser(hash_algorithms=()).parse("regression/data/AndroidManifest.xml", binary=False)
+
+        self.assertEqual(text.get_package_name(), binary.get_package_name())
+        self.assertEqual(text.get_version(), binary.get_version())
+        self.assertEqual(text.get_sdk(), binary.get_sdk())
+        self.assertEqual(text.get_permissions(), binary.get_permissions())
+        self.assertEqual(
+            [activity.get_name() for activity in text.get_activities()],
+            [activity.get_name() for activity in binary.get_activities()]
+        )
+        self.assertEqual(text.get_services(), binary.get_services())
+        self.assertEqual(text.get_broadcast_receivers(), binary.get_broadcast_receivers())
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_bytes_when_malformed_text_without_apk_path(self, mock_file_parser):
+        mock_file_parser.return_value.parse_bytes.return_value = any_file(filename="AndroidManifest.xml")
 
         with self.assertRaises(AndroidManifestParsingError):
-            self.sut.parse(
-                filepath="any-file-path",
+            self.sut.parse_bytes(
+                raw=b"any-manifest-content",
                 binary=False,
                 apk_path=None,
                 extended_processing=False
             )
 
-    @patch('ninjadroid.parsers.manifest.Aapt')
-    @patch('ninjadroid.parsers.manifest.minidom')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_when_minidom_fails_with_apk_path(self, mock_file, mock_file_parser, mock_minidom, mock_aapt):
+    def test_parse_when_malformed_text_without_apk_path(self, mock_file_parser):
+        mock_file_parser.return_value = any_file_parser(file=any_file(filename="AndroidManifest.xml"))
+
+        with patch("builtins.open", mock_open(read_data=b"any-manifest-content")):
+            with self.assertRaises(AndroidManifestParsingError):
+                self.sut.parse(
+                    filepath="any-file-path",
+                    binary=False,
+                    apk_path=None,
+                    extended_processing=False
+                )
+
+    @patch('ninjadroid.parsers.manifest.AaptSession')
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_when_malformed_text_with_apk_path(self, mock_file_parser, mock_aapt_session):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.side_effect = ExpatError()
-        mock_aapt.get_apk_info.return_value = self.any_aapt_apk_info(
+        raw = b"any-manifest-content"
+        mock_aapt_session.return_value.get_apk_info.return_value = self.any_aapt_apk_info(
             package_name="any-package-name",
             version_code=1,
             version_name="any-version-name",
@@ -386,14 +549,19 @@ class TestAndroidManifestParser(unittest.TestCase):
             sdk_min="10",
             sdk_target="15"
         )
-        mock_aapt.get_app_permissions.return_value = ["any-permission-0", "any-permission-1", "any-permission-2"]
+        mock_aapt_session.return_value.get_app_permissions.return_value = [
+            "any-permission-0",
+            "any-permission-1",
+            "any-permission-2"
+        ]
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=False,
-            apk_path="any_apk_path",
-            extended_processing=False
-        )
+        with patch("builtins.open", mock_open(read_data=raw)) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=False,
+                apk_path="any_apk_path",
+                extended_processing=False
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -401,9 +569,10 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_minidom.parse.assert_called_with("any-file-path")
-        mock_aapt.get_apk_info.assert_called_with("any_apk_path")
-        mock_aapt.get_app_permissions.assert_called_with("any_apk_path")
+        mock_aapt_session.assert_called_once_with("any_apk_path")
+        mock_aapt_session.return_value.prefetch.assert_called_once_with("badging", "permissions")
+        mock_aapt_session.return_value.get_apk_info.assert_called_once_with()
+        mock_aapt_session.return_value.get_app_permissions.assert_called_once_with()
         assert_file_equal(self, expected=file, actual=manifest)
         self.assert_manifest_equal(
             manifest=manifest,
@@ -416,22 +585,14 @@ class TestAndroidManifestParser(unittest.TestCase):
             receivers=[]
         )
 
-    @patch('ninjadroid.parsers.manifest.Aapt')
-    @patch('ninjadroid.parsers.manifest.minidom')
+    @patch('ninjadroid.parsers.manifest.AaptSession')
     @patch('ninjadroid.parsers.manifest.FileParser')
-    @patch("builtins.open", new_callable=mock_open)
-    def test_parse_when_minidom_fails_with_apk_path_and_extended_processing(
-            self,
-            mock_file,
-            mock_file_parser,
-            mock_minidom,
-            mock_aapt
-    ):
+    def test_parse_when_malformed_text_with_apk_path_and_extended_processing(self, mock_file_parser, mock_aapt_session):
         file = any_file(filename="AndroidManifest.xml")
         mock_parser_instance = any_file_parser(file=file)
         mock_file_parser.return_value = mock_parser_instance
-        mock_minidom.parse.side_effect = ExpatError()
-        mock_aapt.get_apk_info.return_value = self.any_aapt_apk_info(
+        raw = b"any-manifest-content"
+        mock_aapt_session.return_value.get_apk_info.return_value = self.any_aapt_apk_info(
             package_name="any-package-name",
             version_code=1,
             version_name="any-version-name",
@@ -439,19 +600,20 @@ class TestAndroidManifestParser(unittest.TestCase):
             sdk_min="10",
             sdk_target="15"
         )
-        mock_aapt.get_app_permissions.return_value = ["any-permission-0", "any-permission-1", "any-permission-2"]
-        mock_aapt.get_manifest_info.return_value = self.any_aapt_manifest_info(
-            activities=["any-activity-name"],
-            services=["any-service-name"],
-            receivers=["any-broadcast-receiver-name"]
-        )
+        mock_aapt_session.return_value.get_app_permissions.return_value = [
+            "any-permission-0",
+            "any-permission-1",
+            "any-permission-2"
+        ]
+        mock_aapt_session.return_value.dump_xmltree.return_value = self.any_aapt_xmltree()
 
-        manifest = self.sut.parse(
-            filepath="any-file-path",
-            binary=False,
-            apk_path="any_apk_path",
-            extended_processing=True
-        )
+        with patch("builtins.open", mock_open(read_data=raw)) as mock_file:
+            manifest = self.sut.parse(
+                filepath="any-file-path",
+                binary=False,
+                apk_path="any_apk_path",
+                extended_processing=True
+            )
 
         assert_file_parser_called_once_with(
             mock_parser_instance,
@@ -459,10 +621,11 @@ class TestAndroidManifestParser(unittest.TestCase):
             filename="AndroidManifest.xml"
         )
         mock_file.assert_called_with("any-file-path", "rb")
-        mock_minidom.parse.assert_called_with("any-file-path")
-        mock_aapt.get_apk_info.assert_called_with("any_apk_path")
-        mock_aapt.get_app_permissions.assert_called_with("any_apk_path")
-        mock_aapt.get_manifest_info.assert_called_with("any_apk_path")
+        mock_aapt_session.assert_called_once_with("any_apk_path")
+        mock_aapt_session.return_value.prefetch.assert_called_once_with("badging", "permissions", "xmltree")
+        mock_aapt_session.return_value.get_apk_info.assert_called_once_with()
+        mock_aapt_session.return_value.get_app_permissions.assert_called_once_with()
+        mock_aapt_session.return_value.dump_xmltree.assert_called_once_with()
         assert_file_equal(self, expected=file, actual=manifest)
         self.assert_manifest_equal(
             manifest=manifest,
@@ -470,11 +633,37 @@ class TestAndroidManifestParser(unittest.TestCase):
             version=AppVersion(code=1, name="any-version-name"),
             sdk=AppSdk(min_version="10", target_version="15", max_version="20"),
             permissions=["any-permission-0", "any-permission-1", "any-permission-2"],
-            activities=[AppActivity(name="any-activity-name")],
-            services=[AppService(name="any-service-name")],
-            receivers=[AppBroadcastReceiver(name="any-broadcast-receiver-name")]
+            activities=[
+                AppActivity(
+                    name="any-activity-name",
+                    metadata=[{"name": "any-key", "value": "any-value"}],
+                    intent_filters=[{"priority": "5", "action": ["any-action"], "data": [{"scheme": "any-scheme"}]}],
+                    launch_mode="1"
+                )
+            ],
+            services=[AppService(name="any-service-name", enabled=False, exported=True)],
+            receivers=[AppBroadcastReceiver(name="any-broadcast-receiver-name", exported=False)]
+        )
+
+    @patch('ninjadroid.parsers.manifest.FileParser')
+    def test_parse_from_apk_as_binary(self, mock_file_parser):
+        # NOTE: the aapt fallback must find the same components of the binary AndroidManifest.xml file.
+        mock_file_parser.return_value = any_file_parser(file=any_file(filename="AndroidManifest.xml"))
+        with ZipFile("regression/data/Example.apk") as apk:
+            raw = apk.read("AndroidManifest.xml")
+
+        binary = self.sut.parse_bytes(raw=raw, binary=True, apk_path=None, extended_processing=True)
+        aapt = self.sut.parse_bytes(
+            raw=b"any-manifest-content",
+            binary=False,
+            apk_path="regression/data/Example.apk",
+            extended_processing=True
         )
 
+        self.assertEqual(binary.get_activities(), aapt.get_activities())
+        self.assertEqual(binary.get_services(), aapt.get_services())
+        self.assertEqual(binary.get_broadcast_receivers(), aapt.get_broadcast_receivers())
+
     @parameterized.expand([
         ["AndroidManifest.xml", True],
         ["AndroidManifest", False],
@@ -0,0 +1,155 @@
+from datetime import datetime, timezone
+import unittest
+from parameterized import parameterized
+
+from ninjadroid.parsers.pkcs7 import Asn1Reader, Pkcs7Parser, X509Certificate
+from tests.utils.der import SHA256_WITH_RSA, any_certificate, any_der, any_oid, any_pkcs7, any_sequence
+
+
+class TestAsn1Reader(unittest.TestCase):
+    """
+    Test Asn1Reader.
+    """
+
+    def test_read_with_long_length(self):
+        data = any_der(0x04, b"a" * 300)
+
+        element = Asn1Reader(data).read(0)
+
+        self.assertEqual(0x04, element.tag)
+        self.assertEqual(4, element.value_start)
+        self.assertEqual(304, element.end)
+
+    def test_read_with_indefinite_length(self):
+        data = b"\x30\x80" + any_der(0x02, b"\x01") + any_der(0x02, b"\x02") + b"\x00\x00"
+        reader = Asn1Reader(data)
+
+        element = reader.read(0)
+
+        self.assertEqual(len(data), element.end)
+        self.assertEqual([1, 2], [reader.get_integer(child) for child in reader.children(element)])
+
+    @parameterized.expand([
+        [b"\x30"],
+        [b"\x30\x05\x02\x01"],
+        [b"\x1f\x01\x00"],
+        [b"\x04\x80\x00\x00"],
+        [b"\x04\x85\x00\x00\x00\x00\x01"],
+    ])
+    def test_read_fails_when_malformed(self, data):
+        with self.assertRaises(ValueError):
+            Asn1Reader(data).read(0)
+
+    @parameterized.expand([
+        ["1.2.840.113549.1.7.2"],
+        ["2.5.4.3"],
+        ["0.9.2342.19200300.100.1.25"],
+    ])
+    def test_get_oid(self, oid):
+        reader = Asn1Reader(any_oid(oid))
+
+        self.assertEqual(oid, reader.get_oid(reader.read(0)))
+
+    @parameterized.expand([
+        [0x17, b"150627100613Z", datetime(2015, 6, 27, 10, 6, 13, tzinfo=timezone.utc)],
+        [0x17, b"491231235959Z", datetime(2049, 12, 31, 23, 59, 59, tzinfo=timezone.utc)],
+        [0x17, b"500101000000Z", datetime(1950, 1, 1, 0, 0, 0, tzinfo=timezone.utc)],
+        [0x18, b"25150226100613Z", datetime(2515, 2, 26, 10, 6, 13, tzinfo=timezone.utc)],
+    ])
+    def test_get_time(self, tag, value, expected):
+        reader = Asn1Reader(any_der(tag, value))
+
+        self.assertEqual(expected, reader.get_time(reader.read(0)))
+
+    @parameterized.expand([
+        [0x17, b"any-time"],
+        [0x02, b"150627100613Z"],
+    ])
+    def test_get_time_fails_when_invalid(self, tag, value):
+        reader = Asn1Reader(any_der(tag, value))
+
+        with self.assertRaises(ValueError):
+            reader.get_time(reader.read(0))
+
+    def test_expect_fails_when_unexpected_tag(self):
+        reader = Asn1Reader(any_der(0x04, b""))
+
+        with self.assertRaises(ValueError):
+            reader.expect(reader.read(0), Asn1Reader.SEQUENCE)
+
+
+class TestPkcs7Parser(unittest.TestCase):
+    """
+    Test Pkcs7Parser.
+    """
+
+    def test_parse(self):
+        first = any_certificate(
+            serial_number=0x558e7595,
+            issuer={"CN": "IssuerName", "OU": "IssuerUnit", "O": "IssuerOrganization", "C": "IssuerCountry"},
+            subject={"CN": "OwnerName", "L": "OwnerCity", "ST": "OwnerState", "EMAILADDRESS": "owner@any-domain"}
+        )
+        second = any_certificate(serial_number=1, algorithm=SHA256_WITH_RSA)
+
+        certificates = Pkcs7Parser.parse(any_pkcs7([first, second]))
+
+        self.assertEqual(
+            [
+                X509Certificate(
+                    encoded=first,
+                    version=3,
+                    serial_number=0x558e7595,
+                    signature_algorithm="SHA1withRSA",
+                    issuer={"CN": "IssuerName", "OU": "IssuerUnit", "O": "IssuerOrganization", "C": "IssuerCountry"},
+                    valid_from=datetime(2015, 6, 27, 10, 6, 13, tzinfo=timezone.utc),
+                    valid_to=datetime(2515, 2, 26, 10, 6, 13, tzinfo=timezone.utc),
+                    subject={
+                        "CN": "OwnerName",
+                        "L": "OwnerCity",
+                        "ST": "OwnerState",
+                        "EMAILADDRESS": "owner@any-domain"
+                    }
+                ),
+                X509Certificate(
+                    encoded=second,
+                    version=3,
+                    serial_number=1,
+                    signature_algorithm="SHA256withRSA",
+                    issuer={"CN": "any-issuer"},
+                    valid_from=datetime(2015, 6, 27, 10, 6, 13, tzinfo=timezone.utc),
+                    valid_to=datetime(2515, 2, 26, 10, 6, 13, tzinfo=timezone.utc),
+                    subject={"CN": "any-subject"}
+                ),
+            ],
+            certificates
+        )
+
+    def test_parse_single_certificate(self):
+        certificate = any_certificate(serial_number=42)
+
+        certificates = Pkcs7Parser.parse(certificate)
+
+        self.assertEqual(1, len(certificates))
+        self.assertEqual(certificate, certificates[0].encoded)
+        self.assertEqual(42, certificates[0].serial_number)
+
+    def test_parse_with_unknown_signature_algorithm(self):
+        certificates = Pkcs7Parser.parse(any_certificate(algorithm="1.2.3.4"))
+
+        self.assertEqual("1.2.3.4", certificates[0].signature_algorithm)
+
+    @parameterized.expand([
+        [b""],
+        [b"any-content"],
+        [any_sequence()],
+        [any_sequence(any_oid("1.2.840.113549.1.7.1"), any_der(0xa0, any_sequence()))],
+        [any_pkcs7([])[:-4]],
+        [any_certificate()[:-20]],
+    ])
+    def test_parse_fails_when_malformed(self, data):
+        with self.assertRaises(ValueError):
+            Pkcs7Parser.parse(data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+from io import StringIO
+import json
 import unittest
 from unittest.mock import patch
 from parameterized import parameterized
@@ -10,7 +12,6 @@ class TestPrintApkInfo(unittest.TestCase):
     Test PrintApkInfo use case.
     """
 
-    ANY_JSON_REPORT = "any-json-report"
     ANY_APK_DUMP = {
         "any-key": "any-value",
         "any-dict-key": {
@@ -24,9 +25,9 @@ class TestPrintApkInfo(unittest.TestCase):
 
     sut = PrintApkInfo()
 
-    @patch('ninjadroid.use_cases.print_apk_info.json')
+    @patch('ninjadroid.use_cases.print_apk_info.ApkJsonWriter')
     @patch('ninjadroid.parsers.apk')
-    def test_execute(self, mock_apk, mock_json):
+    def test_execute(self, mock_apk, mock_apk_json_writer):
         mock_apk.as_dict.return_value = TestPrintApkInfo.ANY_APK_DUMP
 
         self.sut.execute(
@@ -35,27 +36,41 @@ class TestPrintApkInfo(unittest.TestCase):
         )
 
         mock_apk.as_dict.assert_called_once_with()
-        mock_json.dumps.assert_not_called()
+        mock_apk_json_writer.write_json.assert_not_called()
+        mock_apk_json_writer.write_json_lines.assert_not_called()
 
-    @patch('ninjadroid.use_cases.print_apk_info.json')
     @patch('ninjadroid.parsers.apk')
-    def test_execute_as_json(self, mock_apk, mock_json):
+    def test_execute_as_json(self, mock_apk):
         mock_apk.as_dict.return_value = TestPrintApkInfo.ANY_APK_DUMP
-        mock_json.dumps.return_value = TestPrintApkInfo.ANY_JSON_REPORT
+        stream = StringIO()
 
         self.sut.execute(
             apk=mock_apk,
-            as_json=True
+            as_json=True,
+            stream=stream
         )
 
         mock_apk.as_dict.assert_called_once_with()
-        mock_json.dumps.assert_called_once_with(
-            TestPrintApkInfo.ANY_APK_DUMP,
-            sort_keys=True,
-            ensure_ascii=False,
-            indent=4
+        self.assertEqual(
+            json.dumps(TestPrintApkInfo.ANY_APK_DUMP, sort_keys=True, ensure_ascii=False, indent=4) + "\n",
+            stream.getvalue()
         )
 
+    @patch('ninjadroid.use_cases.print_apk_info.ApkJsonWriter')
+    @patch('ninjadroid.parsers.apk')
+    def test_execute_as_json_lines(self, mock_apk, mock_apk_json_writer):
+        stream = StringIO()
+
+        self.sut.execute(
+            apk=mock_apk,
+            as_json=True,
+            as_json_lines=True,
+            stream=stream
+        )
+
+        mock_apk_json_writer.write_json_lines.assert_called_once_with(mock_apk, stream)
+        mock_apk_json_writer.write_json.assert_not_called()
+
     @parameterized.expand([
         [None, None, 0, "- None"],
         [None, None, 1, "\t- None"],
@@ -0,0 +1,196 @@
+import os
+import pickle
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from ninjadroid.parsers.cache import EntryCache, EntryKey, ResultCache
+from ninjadroid.parsers.file import HashProfile
+from ninjadroid.signatures.uri_signature import UriSignature
+from tests.utils.file import any_file
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Test ResultCache.
+    """
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+
+    def any_cache(self, version: str = "any-version", max_size: int = ResultCache.DEFAULT_MAX_SIZE) -> ResultCache:
+        return ResultCache(os.path.join(self.directory.name, "ninjadroid"), version, max_size)
+
+    def test_put_and_get(self):
+        cache = self.any_cache()
+        key = cache.get_key("any-sha256", True, HashProfile())
+
+        cache.put(key, {"file": "any-file-path", "size": 10, "dex": [{"strings": ["àny-string"]}]})
+
+        self.assertEqual(
+            {"file": "any-file-path", "size": 10, "dex": [{"strings": ["àny-string"]}]},
+            self.any_cache().get(key)
+        )
+
+    def test_get_when_missing(self):
+        cache = self.any_cache()
+
+        self.assertIsNone(cache.get(cache.get_key("any-sha256", True, HashProfile())))
+
+    def test_get_when_corrupted(self):
+        cache = self.any_cache()
+        key = cache.get_key("any-sha256", True, HashProfile())
+        cache.put(key, {"file": "any-file-path"})
+        path = os.path.join(cache.directory, key[:2], key + ".json")
+        with open(path, "w", encoding="utf-8") as entry:
+            entry.write("{\"file\": ")
+
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(os.path.exists(path))
+
+    def test_get_key(self):
+        cache = self.any_cache()
+        key = cache.get_key("any-sha256", True, HashProfile())
+
+        self.assertEqual(64, len(key))
+        self.assertEqual(key, self.any_cache().get_key("any-sha256", True, HashProfile()))
+        self.assertNotEqual(key, cache.get_key("any-other-sha256", True, HashProfile()))
+        self.assertNotEqual(key, cache.get_key("any-sha256", False, HashProfile()))
+        self.assertNotEqual(key, cache.get_key("any-sha256", True, HashProfile.from_string("sha256")))
+        self.assertNotEqual(key, self.any_cache(version="any-other-version").get_key("any-sha256", True, HashProfile()))
+
+    @patch.object(UriSignature, "get_config_hash")
+    def test_get_key_changes_with_signatures(self, mock_get_config_hash):
+        mock_get_config_hash.return_value = "any-config-hash"
+        key = self.any_cache().get_key("any-sha256", True, HashProfile())
+
+        mock_get_config_hash.return_value = "any-other-config-hash"
+
+        self.assertNotEqual(key, self.any_cache().get_key("any-sha256", True, HashProfile()))
+
+    def test_put_evicts_least_recently_used_entries(self):
+        cache = self.any_cache()
+        keys = [cache.get_key(f"any-sha256-{index}", True, HashProfile()) for index in range(3)]
+        for index, key in enumerate(keys):
+            cache.put(key, {"file": "a" * 30})
+            path = os.path.join(cache.directory, key[:2], key + ".json")
+            os.utime(path, (index, index))
+        # NOTE: reading the first entry makes the second one the least recently used.
+        cache.get(keys[0])
+        cache.max_size = 4 * len("{\"file\": \"\"}") + 3 * 30
+
+        cache.put(cache.get_key("any-sha256-3", True, HashProfile()), {"file": "a" * 30})
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_put_evicts_only_when_exceeding_max_size(self):
+        cache = self.any_cache(max_size=3 * len("{\"file\": \"\"}") + 3 * 30)
+        keys = [cache.get_key(f"any-sha256-{index}", True, HashProfile()) for index in range(4)]
+
+        with patch.object(ResultCache, "evict", autospec=True, side_effect=ResultCache.evict) as mock_evict:
+            for key in keys:
+                cache.put(key, {"file": "a" * 30})
+
+        # NOTE: the first put scans the cache, while the following ones keep track of its size until the last one.
+        self.assertEqual(2, mock_evict.call_count)
+        self.assertEqual(3, sum(cache.get(key) is not None for key in keys))
+
+    def test_pickle(self):
+        cache = self.any_cache(max_size=10)
+        key = cache.get_key("any-sha256", True, HashProfile())
+        cache.put(key, {"file": "any-file-path"})
+
+        unpickled = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual(
+            (cache.directory, cache.version, 10),
+            (unpickled.directory, unpickled.version, unpickled.max_size)
+        )
+        self.assertEqual(key, unpickled.get_key("any-sha256", True, HashProfile()))
+        unpickled.put(key, {"file": "any-other-file-path"})
+        self.assertIsNone(unpickled.get(key))
+
+    def test_put_when_not_serializable(self):
+        cache = self.any_cache()
+        key = cache.get_key("any-sha256", True, HashProfile())
+
+        cache.put(key, {"file": object()})
+
+        self.assertIsNone(cache.get(key))
+        self.assertEqual([], os.listdir(os.path.join(cache.directory, key[:2])))
+
+    def test_clear(self):
+        cache = self.any_cache()
+        key = cache.get_key("any-sha256", True, HashProfile())
+        cache.put(key, {"file": "any-file-path"})
+
+        cache.clear()
+
+        self.assertIsNone(cache.get(key))
+
+    @patch.dict(os.environ, {"XDG_CACHE_HOME": "/any-cache-home"})
+    def test_get_default_directory(self):
+        self.assertEqual("/any-cache-home/ninjadroid", ResultCache.get_default_directory())
+
+    @patch.dict(os.environ, {"XDG_CACHE_HOME": ""})
+    @patch('ninjadroid.parsers.cache.os.path.expanduser')
+    def test_get_default_directory_without_xdg_cache_home(self, mock_expanduser):
+        mock_expanduser.return_value = "/any-home"
+
+        self.assertEqual("/any-home/.cache/ninjadroid", ResultCache.get_default_directory())
+
+
+class TestEntryCache(unittest.TestCase):
+    """
+    Test EntryCache.
+    """
+
+    def test_put_and_get(self):
+        cache = EntryCache()
+        file = any_file(filename="classes.dex")
+
+        cache.put(EntryKey("dex", 1234, 10, "any-sha256"), file)
+
+        self.assertIs(file, cache.get(EntryKey("dex", 1234, 10, "any-sha256")))
+        self.assertIsNone(cache.get(EntryKey("dex", 1234, 10, "any-other-sha256")))
+        self.assertIsNone(cache.get(EntryKey("cert", 1234, 10, "any-sha256")))
+
+    def test_may_contain(self):
+        cache = EntryCache()
+
+        cache.put(EntryKey("dex", 1234, 10, "any-sha256"), any_file())
+
+        self.assertTrue(cache.may_contain("dex", 1234, 10))
+        self.assertFalse(cache.may_contain("dex", 1234, 11))
+        self.assertFalse(cache.may_contain("dex", 4321, 10))
+        self.assertFalse(cache.may_contain("cert", 1234, 10))
+
+    def test_put_evicts_least_recently_used_entries(self):
+        cache = EntryCache(max_entries=2)
+        keys = [EntryKey("dex", index, 10, f"any-sha256-{index}") for index in range(3)]
+        cache.put(keys[0], any_file())
+        cache.put(keys[1], any_file())
+        # NOTE: reading the first entry makes the second one the least recently used.
+        cache.get(keys[0])
+
+        cache.put(keys[2], any_file())
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_clear(self):
+        cache = EntryCache()
+        cache.put(EntryKey("dex", 1234, 10, "any-sha256"), any_file())
+
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+from unittest.mock import patch
 from parameterized import parameterized
 
-from ninjadroid.signatures.signature import Signature
+from ninjadroid.signatures.shell_signature import ShellSignature
+from ninjadroid.signatures.signature import Signature, SignatureMatcher, SignatureRegistry, SignatureScanner
+from ninjadroid.signatures.uri_signature import UriSignature
 
 
 class TestSignature(unittest.TestCase):
@@ -55,6 +58,197 @@ class TestSignature(unittest.TestCase):
         self.assertEqual(match, expected_match)
         self.assertEqual(is_valid, expected_is_valid)
 
+    def test_init_compiles_once_per_class(self):
+        # pylint: disable=too-few-public-methods
+        class AnySignature(Signature):
+            """
+            Signature parser whose compiled state is not shared with the other tests.
+            """
+
+        with patch.object(AnySignature, "get_signatures_from_config", wraps=AnySignature.get_signatures_from_config) \
+                as mock_get_signatures_from_config:
+            signature = AnySignature()
+            other_signature = AnySignature()
+
+        mock_get_signatures_from_config.assert_called_once()
+        self.assertIs(signature.IS_CONTAINED_REGEX, other_signature.IS_CONTAINED_REGEX)
+        self.assertIs(AnySignature.IS_CONTAINED_REGEX, signature.IS_CONTAINED_REGEX)
+        self.assertIsNot(UriSignature().IS_CONTAINED_REGEX, signature.IS_CONTAINED_REGEX)
+
+    def test_get_is_regex_compiles_on_first_use(self):
+        # pylint: disable=too-few-public-methods
+        class AnySignature(Signature):
+            """
+            Signature parser whose compiled state is not shared with the other tests.
+            """
+
+        AnySignature()
+        self.assertIsNone(AnySignature.IS_REGEX)
+
+        is_regex = AnySignature.get_is_regex()
+
+        self.assertIs(is_regex, AnySignature.IS_REGEX)
+        self.assertIs(is_regex, AnySignature.get_is_regex())
+        self.assertIsNotNone(is_regex.search("apk"))
+
+    def test_registry_shares_instances(self):
+        SignatureRegistry.clear()
+
+        signature = SignatureRegistry.get(Signature)
+
+        self.assertIsInstance(signature, Signature)
+        self.assertIs(signature, SignatureRegistry.get(Signature))
+        self.assertIsInstance(SignatureRegistry.get(UriSignature), UriSignature)
+
+    def test_init_compiles_matcher(self):
+        self.assertIsInstance(self.sut.MATCHER, SignatureMatcher)
+
+    @parameterized.expand([
+        [{"signatures": ["root", "apk"]}, True],
+        [{"signatures": []}, True],
+        [{"signatures": ["ro+t", "apk"]}, False],
+        [{"signatures": ["(?:root)"]}, False],
+    ])
+    def test_compile_matcher(self, signatures, expected_matcher):
+        matcher = Signature.compile_matcher(signatures)
+
+        self.assertEqual(expected_matcher, matcher is not None)
+
+    @parameterized.expand([
+        ["apk"],
+        ["root  access"],
+        ["root  access "],
+        ["some root access\n"],
+        ["some root access \n"],
+        ["hacked  rooted  app"],
+        ["xxx  "],
+        ["  AdMob"],
+        ["a  b  c  d  e  f  g  h  i  j  k  l  m  n  o  p  q  r  s  t  u  v  w  x  y  z  apk  "],
+        ["this root is not in the  end"],
+        ["not a signature"],
+    ])
+    def test_is_valid_is_equivalent_to_regex(self, raw_string):
+        expected = self.sut.get_is_regex().search(raw_string) is not None
+
+        result = self.sut.MATCHER.is_valid(raw_string)
+
+        self.assertEqual(expected, result)
+
+    @parameterized.expand([
+        ["apk rooted"],
+        ["the rooted apk is here"],
+        ["root\tthe apk  twice"],
+        ["some AdMob and some xxx  more xxx words  "],
+        ["%s hack"],
+        ["_exploit_"],
+        ["nothing to see"],
+    ])
+    def test_search_is_equivalent_to_regex(self, raw_string):
+        match = self.sut.IS_CONTAINED_REGEX.search(raw_string)
+        expected = match.group(0).strip() if match is not None else None
+
+        result = self.sut.MATCHER.search(raw_string)
+
+        self.assertEqual(expected, result)
+
+    @parameterized.expand([
+        [Signature],
+        [UriSignature],
+        [ShellSignature],
+    ])
+    def test_search_all_is_equivalent_to_search(self, signature_class):
+        signature = SignatureRegistry.get(signature_class)
+        patterns = [
+            "",
+            "apk",
+            "not a signature",
+            "some root access\n",
+            "the rooted apk\nis here",
+            "http://www.example.com/path",
+            "\n127.0.0.1:8080",
+            "example.com\n",
+            "chmod 777 /system/bin/su",
+            "su",
+            "x.co",
+            ".com",
+            "www.",
+            "\u212a.\u212a",
+            "tv_gen_exploit_msg",
+            "AdMob",
+            "any\nsu -c id",
+            "#CHMOD 777",
+            "check-losttttfound",
+            "\u0130 su",
+            "\u017fu",
+        ]
+        expected = [match for match, is_valid in map(signature.search, patterns) if is_valid and match]
+
+        matches = signature.search_all(patterns)
+
+        self.assertEqual(expected, matches)
+
+    def test_search_all_with_min_length(self):
+        matches = self.sut.search_all(["apk", "rooted", "the apk"], min_length=3)
+
+        self.assertEqual(["rooted", "the apk"], matches)
+
+    def test_find_candidates(self):
+        candidates = list(self.sut.find_candidates(["nothing", "apk", "no\nthing", "root\napk", "", "AdMob"]))
+
+        self.assertEqual([1, 3, 5], candidates)
+
+    def test_find_candidates_without_scanner(self):
+        with patch.object(self.sut, "SCANNER", None):
+            candidates = list(self.sut.find_candidates(["nothing", "apk"]))
+
+        self.assertEqual([0, 1], candidates)
+
+    @parameterized.expand([
+        ["root", "root"],
+        ["AdMob", "admob"],
+        ["check-lost+found", "check-los"],
+        ["ro?t", "r"],
+        ["Ro[o]t", "ro"],
+        ["/system/", "/system/"],
+    ])
+    def test_scanner_get_literal_prefix(self, signature, expected):
+        result = SignatureScanner.get_literal_prefix(signature)
+
+        self.assertEqual(expected, result)
+
+    @parameterized.expand([
+        ["r?oot"],
+        ["(root)"],
+        ["root|apk"],
+        ["r\u00f6\u00f6t"],
+    ])
+    def test_scanner_get_literal_prefix_without_prefix(self, signature):
+        with self.assertRaises(ValueError):
+            SignatureScanner.get_literal_prefix(signature)
+
+    def test_scanner_scan(self):
+        buffer = "nothing\nthe ROOT\n\u00e9\nAdMob"
+
+        find = SignatureScanner(SignatureScanner.join(["root", "admob"])).scan(buffer)
+
+        self.assertEqual(buffer.index("ROOT") + 3, find(0))
+        # NOTE: non-ASCII chars are always candidates.
+        self.assertEqual(buffer.index("\u00e9"), find(buffer.index("ROOT") + 4))
+        self.assertEqual(len(buffer) - 1, find(buffer.index("\u00e9") + 1))
+        self.assertEqual(-1, find(len(buffer)))
+
+    def test_scanner_scan_when_lowercase_is_longer(self):
+        buffer = "nothing\nthe ROOT\n\u0130\nAdMob"
+
+        find = SignatureScanner(SignatureScanner.join(["root", "admob"])).scan(buffer)
+
+        self.assertEqual(buffer.index("ROOT") + 3, find(0))
+        self.assertEqual(len(buffer) - 1, find(buffer.index("ROOT") + 4))
+
+    def test_matcher_requires_plain_words(self):
+        with self.assertRaises(ValueError):
+            SignatureMatcher(["ro+t"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from parameterized import parameterized
 
-from ninjadroid.signatures.uri_signature import UriSignature
+from ninjadroid.signatures.uri_signature import UriPrefilter, UriSignature
 
 
 class TestUriSignature(unittest.TestCase):
@@ -102,6 +102,44 @@ class TestUriSignature(unittest.TestCase):
         self.assertEqual(match, expected_match)
         self.assertEqual(is_valid, expected_is_valid)
 
+    @parameterized.expand([
+        ["http://www.domain.com", True],
+        ["domain.COM", True],
+        ["domain.community", True],
+        ["127.0.0.1", True],
+        ["v1.2", True],
+        ["domain.c\u0151m", True],
+        ["Landroid/app/Activity;", False],
+        ["onCreate", False],
+        ["a.com", False],
+        ["domain-.com", False],
+        ["domain.xyz123", False],
+        ["domain.", False],
+        [".com", False],
+    ])
+    def test_prefilter(self, raw_string, expected):
+        result = UriPrefilter(["com", "community", "org"])(raw_string)
+
+        self.assertEqual(expected, result)
+
+    @parameterized.expand([
+        ["VersionConstants.java"],
+        ["Landroid/app/Activity;"],
+        ["one two three."],
+    ])
+    def test_search_when_prefilter_rejects_the_pattern(self, pattern):
+        self.assertFalse(self.sut.PREFILTER(pattern))
+
+        match, is_valid = self.sut.search(pattern)
+
+        self.assertIsNone(match)
+        self.assertFalse(is_valid)
+
+    def test_compile_prefilter_without_tlds(self):
+        prefilter = UriSignature.compile_prefilter({"tlds": []})
+
+        self.assertIsNone(prefilter)
+
 
 if __name__ == '__main__':
     unittest.main()
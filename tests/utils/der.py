@@ -0,0 +1,89 @@
+from typing import Dict, Sequence
+
+
+SHA1_WITH_RSA = "1.2.840.113549.1.1.5"
+SHA256_WITH_RSA = "1.2.840.113549.1.1.11"
+NAME_ATTRIBUTES = {
+    "CN": "2.5.4.3",
+    "C": "2.5.4.6",
+    "L": "2.5.4.7",
+    "ST": "2.5.4.8",
+    "O": "2.5.4.10",
+    "OU": "2.5.4.11",
+    "EMAILADDRESS": "1.2.840.113549.1.9.1",
+}
+
+
+def any_der(tag: int, value: bytes) -> bytes:
+    if len(value) < 0x80:
+        return bytes([tag, len(value)]) + value
+    length = len(value).to_bytes((len(value).bit_length() + 7) // 8, "big")
+    return bytes([tag, 0x80 | len(length)]) + length + value
+
+
+def any_sequence(*elements: bytes) -> bytes:
+    return any_der(0x30, b"".join(elements))
+
+
+def any_integer(value: int) -> bytes:
+    return any_der(0x02, value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True))
+
+
+def any_oid(oid: str) -> bytes:
+    arcs = [int(arc) for arc in oid.split(".")]
+    value = b""
+    for arc in [40 * arcs[0] + arcs[1]] + arcs[2:]:
+        encoded = [arc & 0x7f]
+        arc >>= 7
+        while arc:
+            encoded.insert(0, 0x80 | arc & 0x7f)
+            arc >>= 7
+        value += bytes(encoded)
+    return any_der(0x06, value)
+
+
+def any_name(attributes: Dict[str, str]) -> bytes:
+    return any_sequence(*[
+        any_der(0x31, any_sequence(any_oid(NAME_ATTRIBUTES[key]), any_der(0x0c, value.encode("utf-8"))))
+        for key, value in attributes.items()
+    ])
+
+
+# pylint: disable=too-many-arguments
+def any_certificate(
+        serial_number: int = 0x558e7595,
+        algorithm: str = SHA1_WITH_RSA,
+        issuer: Dict[str, str] = None,
+        subject: Dict[str, str] = None,
+        valid_from: bytes = b"150627100613Z",
+        valid_to: bytes = b"25150226100613Z"
+) -> bytes:
+    """
+    :param valid_from: the UTCTime (i.e. YYMMDDhhmmssZ) or GeneralizedTime (i.e. YYYYMMDDhhmmssZ) value
+    :param valid_to: the UTCTime (i.e. YYMMDDhhmmssZ) or GeneralizedTime (i.e. YYYYMMDDhhmmssZ) value
+    """
+    algorithm_identifier = any_sequence(any_oid(algorithm), any_der(0x05, b""))
+    tbs_certificate = any_sequence(
+        any_der(0xa0, any_integer(2)),
+        any_integer(serial_number),
+        algorithm_identifier,
+        any_name(issuer or {"CN": "any-issuer"}),
+        any_sequence(
+            any_der(0x17 if len(valid_from) == 13 else 0x18, valid_from),
+            any_der(0x17 if len(valid_to) == 13 else 0x18, valid_to)
+        ),
+        any_name(subject or {"CN": "any-subject"}),
+        any_sequence(any_sequence(any_oid("1.2.840.113549.1.1.1")), any_der(0x03, b"\x00any-public-key"))
+    )
+    return any_sequence(tbs_certificate, algorithm_identifier, any_der(0x03, b"\x00any-signature"))
+
+
+def any_pkcs7(certificates: Sequence[bytes]) -> bytes:
+    signed_data = any_sequence(
+        any_integer(1),
+        any_der(0x31, b""),
+        any_sequence(any_oid("1.2.840.113549.1.7.1")),
+        any_der(0xa0, b"".join(certificates)),
+        any_der(0x31, b"")
+    )
+    return any_sequence(any_oid("1.2.840.113549.1.7.2"), any_der(0xa0, signed_data))
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import Mock
 
+from ninjadroid.parsers.apk import APK
 from ninjadroid.parsers.file import File, FileParsingError
+from ninjadroid.parsers.manifest import AndroidManifest, AppSdk, AppVersion
 
 
 # pylint: disable=too-many-arguments
@@ -23,6 +25,38 @@ def any_file(
     )
 
 
+def any_apk(filename: str = "any-apk-file-name") -> APK:
+    file = any_file()
+    manifest = AndroidManifest(
+        filename="AndroidManifest.xml",
+        size=10,
+        md5hash="any-manifest-md5",
+        sha1hash="any-manifest-sha1",
+        sha256hash="any-manifest-sha256",
+        sha512hash="any-manifest-sha512",
+        package_name="any-package-name",
+        version=AppVersion(code=1, name="any-version-name"),
+        sdk=AppSdk(min_version="10", target_version="15", max_version=None),
+        permissions=[],
+        activities=[],
+        services=[],
+        receivers=[]
+    )
+    return APK(
+        filename=filename,
+        size=file.get_size(),
+        md5hash=file.get_md5(),
+        sha1hash=file.get_sha1(),
+        sha256hash=file.get_sha256(),
+        sha512hash=file.get_sha512(),
+        app_name="any-app-name",
+        cert=any_file(filename="META-INF/CERT.RSA"),
+        manifest=manifest,
+        dex_files=[any_file(filename="classes.dex")],
+        other_files=[]
+    )
+
+
 def any_file_parser(file: File = any_file()) -> Mock:
     parser = Mock()
     parser.parse.return_value = file
@@ -1,5 +1,5 @@
 from subprocess import PIPE
-from unittest.mock import ANY, Mock
+from unittest.mock import ANY, AsyncMock, Mock
 
 
 def any_popen(response: str) -> Mock:
@@ -10,6 +10,12 @@ def any_popen(response: str) -> Mock:
     return popen
 
 
+def any_async_process(response: bytes) -> Mock:
+    process = Mock()
+    process.communicate = AsyncMock(return_value=(response, None))
+    return process
+
+
 def assert_popen_called_once(popen: Mock):
     popen.assert_called_once_with(ANY, stdout=PIPE, stderr=None, shell=True)
 
@@ -0,0 +1,105 @@
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+ANDROID_NAMESPACE = "http://schemas.android.com/apk/res/android"
+NO_INDEX = 0xFFFFFFFF
+
+
+def any_chunk(chunk_type: int, header: bytes, body: bytes) -> bytes:
+    return struct.pack("<HHI", chunk_type, 8 + len(header), 8 + len(header) + len(body)) + header + body
+
+
+def any_string_pool(strings: Sequence[str], utf8: bool = False) -> bytes:
+    data = b""
+    offsets = []
+    for string in strings:
+        offsets.append(len(data))
+        if utf8:
+            encoded = string.encode("utf-8")
+            # NOTE: the test strings are shorter than 128 chars, hence their lengths are on a single byte.
+            data += bytes([len(string), len(encoded)]) + encoded + b"\x00"
+        else:
+            data += struct.pack("<H", len(string)) + string.encode("utf-16-le") + b"\x00\x00"
+    data += b"\x00" * (-len(data) % 4)
+    strings_start = 28 + 4 * len(strings)
+    header = struct.pack("<IIIII", len(strings), 0, 0x100 if utf8 else 0, strings_start, 0)
+    return any_chunk(0x0001, header, struct.pack(f"<{len(strings)}I", *offsets) + data)
+
+
+class AxmlBuilder:
+    """
+    Builder of binary XML files, for testing purposes.
+    """
+
+    def __init__(self, attribute_names: Optional[Dict[str, int]] = None):
+        """
+        :param attribute_names: the names of the attributes having a resource id (i.e. in the resource map)
+        """
+        self.strings: List[str] = list(attribute_names or {})
+        self.resource_ids = list((attribute_names or {}).values())
+        self.chunks = b""
+
+    def string(self, string: Optional[str]) -> int:
+        if string is None:
+            return NO_INDEX
+        if string not in self.strings:
+            self.strings.append(string)
+        return self.strings.index(string)
+
+    def start(self, name: str, attributes: Sequence[Tuple[str, str, Optional[str], int, int]] = ()) -> "AxmlBuilder":
+        """
+        :param attributes: the (namespace, name, raw value, value type, data) attributes
+        """
+        body = struct.pack("<IIHHHHHH", NO_INDEX, self.string(name), 20, 20, len(attributes), 0, 0, 0)
+        for namespace, attribute, raw_value, value_type, data in attributes:
+            body += struct.pack(
+                "<IIIHBBI",
+                self.string(namespace) if namespace else NO_INDEX,
+                self.string(attribute),
+                self.string(raw_value),
+                8,
+                0,
+                value_type,
+                data
+            )
+        self.chunks += any_chunk(0x0102, struct.pack("<II", 1, NO_INDEX), body)
+        return self
+
+    def end(self, name: str) -> "AxmlBuilder":
+        body = struct.pack("<II", NO_INDEX, self.string(name))
+        self.chunks += any_chunk(0x0103, struct.pack("<II", 1, NO_INDEX), body)
+        return self
+
+    def build(self, utf8: bool = False) -> bytes:
+        resource_map = any_chunk(0x0180, b"", struct.pack(f"<{len(self.resource_ids)}I", *self.resource_ids))
+        return any_chunk(0x0003, b"", any_string_pool(self.strings, utf8) + resource_map + self.chunks)
+
+
+def any_arsc(
+        strings: Sequence[str],
+        entries: Dict[int, Sequence[Optional[Tuple[int, int]]]],
+        package_id: int = 0x7f,
+        type_id: int = 1
+) -> bytes:
+    """
+    :param strings: the global string pool
+    :param entries: for each locale (e.g. 0 for the default configuration), the (value type, data) of its entries
+    """
+    types = b""
+    for locale, values in entries.items():
+        offsets = []
+        data = b""
+        for value in values:
+            if value is None:
+                offsets.append(NO_INDEX)
+                continue
+            offsets.append(len(data))
+            data += struct.pack("<HHI", 8, 0, 0) + struct.pack("<HBBI", 8, 0, *value)
+        config = struct.pack("<III", 64, 0, locale) + b"\x00" * 52
+        header_size = 8 + 12 + len(config)
+        header = struct.pack("<BBHII", type_id, 0, 0, len(values), header_size + 4 * len(values)) + config
+        types += any_chunk(0x0201, header, struct.pack(f"<{len(values)}I", *offsets) + data)
+    package_header = struct.pack("<I", package_id) + b"\x00" * 256 + struct.pack("<IIII", 0, 0, 0, 0)
+    package = any_chunk(0x0200, package_header, types)
+    return any_chunk(0x0002, struct.pack("<I", 1), any_string_pool(strings) + package)